@@ -0,0 +1,18 @@
+# api/conf.py - REST API Settings
+"""
+Settings for the versioned REST API, read from settings.INVENTORY_API with
+the defaults below.
+"""
+
+from django.conf import settings
+
+DEFAULT_INVENTORY_API = {
+    'PAGE_SIZE': 100,
+    'MAX_PAGE_SIZE': 1000,
+    'MAX_BATCH_IDS': 500,
+    'CACHE_TIMEOUT': 300,
+}
+
+
+def get_api_setting(name):
+    return getattr(settings, 'INVENTORY_API', {}).get(name, DEFAULT_INVENTORY_API[name])
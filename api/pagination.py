@@ -0,0 +1,66 @@
+# api/pagination.py - Keyset Pagination for DRF
+"""
+DRF pagination class over bps_inventory.pagination.KeysetPaginator.
+
+Views set ``keyset_ordering``; clients follow the ``next`` link (or pass
+?cursor=) and choose the page size with ?limit=. Full catalogue pulls walk
+the primary key index without OFFSET or COUNT(*).
+"""
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from bps_inventory.pagination import InvalidCursor, KeysetPaginator
+
+from .conf import get_api_setting
+
+
+class KeysetCursorPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+
+    def get_limit(self, request):
+        limit = request.query_params.get(self.limit_query_param)
+        if limit is None:
+            return get_api_setting('PAGE_SIZE')
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValidationError({self.limit_query_param: 'Must be an integer.'})
+        return min(max(limit, 1), get_api_setting('MAX_PAGE_SIZE'))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = KeysetPaginator(queryset, view.keyset_ordering, per_page=self.get_limit(request))
+        try:
+            self.page = paginator.page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursor as e:
+            raise ValidationError({self.cursor_query_param: str(e)})
+        return list(self.page)
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self._link(self.page.next_cursor),
+            'previous': self._link(self.page.previous_cursor),
+            'count': len(data),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,210 @@
+# api/serializers.py - REST API Serializers (v1)
+"""
+Read serializers for the v1 REST API.
+
+Every serializer renders a flat, compact representation (related objects
+as ids plus a display name) and supports sparse fieldsets: only the fields
+named in ?fields= are serialized, and optimize_queryset() adds just the
+joins, prefetches and annotations those fields read.
+"""
+
+from django.db.models import Count, Prefetch, Q
+from rest_framework import serializers
+
+from inventory.models import Assignment, Device, Location, Staff
+
+LOCATION_PATH = ['building', 'block', 'floor', 'department', 'room']
+
+
+def location_related(prefix):
+    """select_related lookups needed for str() of the Location at prefix"""
+    return [f'{prefix}__{name}' for name in LOCATION_PATH]
+
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer limited to a requested subset of its fields.
+
+    Subclasses declare which queryset work each field depends on:
+
+        related_select = {'vendor_name': ['vendor']}
+        related_prefetch = {'current_assignment': [Prefetch(...)]}
+        related_annotate = {'active_assignments': Count(...)}
+    """
+
+    related_select = {}
+    related_prefetch = {}
+    related_annotate = {}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def available_fields(cls):
+        return list(cls.Meta.fields)
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields):
+        select, prefetch, annotate = [], [], {}
+        for name in fields:
+            select.extend(cls.related_select.get(name, []))
+            prefetch.extend(cls.related_prefetch.get(name, []))
+            if name in cls.related_annotate:
+                annotate[name] = cls.related_annotate[name]
+        if select:
+            queryset = queryset.select_related(*dict.fromkeys(select))
+        if prefetch:
+            queryset = queryset.prefetch_related(*dict.fromkeys(prefetch))
+        if annotate:
+            queryset = queryset.annotate(**annotate)
+        return queryset
+
+
+# ================================
+# DEVICES
+# ================================
+
+class DeviceSerializer(SparseFieldsetSerializer):
+    device_type_name = serializers.CharField(source='device_type.name', read_only=True)
+    category = serializers.CharField(source='device_type.subcategory.category.name', read_only=True)
+    vendor_name = serializers.CharField(source='vendor.name', read_only=True)
+    location_name = serializers.CharField(source='location', read_only=True)
+    current_assignment = serializers.SerializerMethodField()
+
+    related_select = {
+        'device_type_name': ['device_type'],
+        'category': ['device_type__subcategory__category'],
+        'vendor_name': ['vendor'],
+        'location_name': location_related('location'),
+    }
+    related_prefetch = {
+        'current_assignment': [
+            Prefetch(
+                'assignments',
+                queryset=Assignment.objects.filter(is_active=True).select_related(
+                    'assigned_to_staff__user', 'assigned_to_department'
+                ),
+                to_attr='active_assignments',
+            )
+        ],
+    }
+
+    class Meta:
+        model = Device
+        fields = [
+            'device_id', 'device_name', 'asset_tag', 'serial_number',
+            'device_type', 'device_type_name', 'category', 'brand', 'model',
+            'status', 'device_condition', 'is_critical',
+            'location', 'location_name', 'vendor', 'vendor_name',
+            'purchase_date', 'purchase_price', 'warranty_end_date',
+            'current_assignment', 'created_at', 'updated_at',
+        ]
+
+    def get_current_assignment(self, obj):
+        assignments = getattr(obj, 'active_assignments', None)
+        if not assignments:
+            return None
+        assignment = assignments[0]
+        staff = assignment.assigned_to_staff
+        department = assignment.assigned_to_department
+        return {
+            'assignment_id': assignment.assignment_id,
+            'staff': staff.pk if staff else None,
+            'staff_name': staff.full_name if staff else None,
+            'department': department.pk if department else None,
+            'department_name': department.name if department else None,
+            'expected_return_date': assignment.expected_return_date,
+        }
+
+
+# ================================
+# ASSIGNMENTS
+# ================================
+
+class AssignmentSerializer(SparseFieldsetSerializer):
+    device_name = serializers.CharField(source='device.device_name', read_only=True)
+    staff_name = serializers.CharField(source='assigned_to_staff.full_name', read_only=True)
+    department_name = serializers.CharField(source='assigned_to_department.name', read_only=True)
+    location_name = serializers.CharField(source='assigned_to_location', read_only=True)
+
+    related_select = {
+        'device_name': ['device'],
+        'staff_name': ['assigned_to_staff__user'],
+        'department_name': ['assigned_to_department'],
+        'location_name': location_related('assigned_to_location'),
+    }
+
+    class Meta:
+        model = Assignment
+        fields = [
+            'assignment_id', 'device', 'device_name',
+            'assigned_to_staff', 'staff_name',
+            'assigned_to_department', 'department_name',
+            'assigned_to_location', 'location_name',
+            'assignment_type', 'start_date', 'expected_return_date', 'actual_return_date',
+            'is_active', 'is_temporary', 'purpose', 'created_at', 'updated_at',
+        ]
+
+
+# ================================
+# STAFF
+# ================================
+
+class StaffSerializer(SparseFieldsetSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+    full_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    email = serializers.CharField(source='user.email', read_only=True)
+    department_name = serializers.CharField(source='department.name', read_only=True)
+    active_assignments = serializers.IntegerField(read_only=True)
+
+    related_select = {
+        'username': ['user'],
+        'full_name': ['user'],
+        'email': ['user'],
+        'department_name': ['department'],
+    }
+    related_annotate = {
+        'active_assignments': Count('device_assignments', filter=Q(device_assignments__is_active=True)),
+    }
+
+    class Meta:
+        model = Staff
+        fields = [
+            'id', 'employee_id', 'username', 'full_name', 'email',
+            'department', 'department_name', 'designation', 'employment_type',
+            'phone_number', 'office_location', 'is_active', 'joining_date',
+            'active_assignments', 'updated_at',
+        ]
+
+
+# ================================
+# LOCATIONS
+# ================================
+
+class LocationSerializer(SparseFieldsetSerializer):
+    name = serializers.CharField(source='__str__', read_only=True)
+    building_name = serializers.CharField(source='building.name', read_only=True)
+    block_name = serializers.CharField(source='block.name', read_only=True)
+    floor_name = serializers.CharField(source='floor.name', read_only=True)
+    department_name = serializers.CharField(source='department.name', read_only=True)
+    room_number = serializers.CharField(source='room.room_number', read_only=True)
+
+    related_select = {
+        'name': LOCATION_PATH,
+        'building_name': ['building'],
+        'block_name': ['block'],
+        'floor_name': ['floor'],
+        'department_name': ['department'],
+        'room_number': ['room'],
+    }
+
+    class Meta:
+        model = Location
+        fields = [
+            'id', 'name', 'building', 'building_name', 'block', 'block_name',
+            'floor', 'floor_name', 'department', 'department_name',
+            'room', 'room_number', 'description', 'is_active', 'updated_at',
+        ]
@@ -0,0 +1,125 @@
+# api/tests.py - REST API Tests
+"""
+Query parameters, pagination and conditional GETs of the v1 endpoints on a
+small generated dataset.
+"""
+
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from inventory.models import Device
+from inventory.synthetic import generate
+
+
+@pytest.fixture
+def dataset(db, django_capture_on_commit_callbacks):
+    """Reference data from setup_bps plus a few synthetic devices; returns the superuser"""
+    # Run the cache invalidations queued for commit, as a real commit would;
+    # later writes would otherwise join the never-flushed pending tags
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command('setup_bps', stdout=StringIO())
+        user = User.objects.filter(is_superuser=True).order_by('id').first()
+        generate(20, seed=0, creator=user)
+    return user
+
+
+@pytest.fixture
+def api_client(client, dataset, django_capture_on_commit_callbacks):
+    # Signing in saves last_login
+    with django_capture_on_commit_callbacks(execute=True):
+        client.force_login(dataset)
+    return client
+
+
+def devices_url(**params):
+    url = reverse('api:device-list', kwargs={'version': 'v1'})
+    if params:
+        url += '?' + '&'.join(f'{name}={value}' for name, value in params.items())
+    return url
+
+
+def device_ids(count):
+    return list(Device.objects.order_by('device_id').values_list('device_id', flat=True)[:count])
+
+
+def test_sparse_fieldset(api_client):
+    response = api_client.get(devices_url(fields='device_id,status'))
+
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert results
+    assert all(set(result) == {'device_id', 'status'} for result in results)
+
+
+def test_unknown_field_is_rejected(api_client):
+    response = api_client.get(devices_url(fields='device_id,no_such_field'))
+
+    assert response.status_code == 400
+    assert 'no_such_field' in response.json()['fields']
+
+
+def test_batch_fetch_by_ids(api_client, settings):
+    settings.INVENTORY_API = {'MAX_BATCH_IDS': 2}
+    ids = device_ids(3)
+
+    response = api_client.get(devices_url(ids=','.join(ids[:2])))
+    assert response.status_code == 200
+    assert sorted(result['device_id'] for result in response.json()['results']) == ids[:2]
+
+    response = api_client.get(devices_url(ids=','.join(ids)))
+    assert response.status_code == 400
+    assert 'ids' in response.json()
+
+
+def test_updated_since_must_be_a_datetime(api_client):
+    assert api_client.get(devices_url(updated_since='yesterday')).status_code == 400
+    assert api_client.get(devices_url(updated_since='2000-01-01T00:00:00Z')).status_code == 200
+
+
+def test_keyset_pagination(api_client):
+    first = api_client.get(devices_url(limit=5)).json()
+    assert first['count'] == 5
+    second = api_client.get(first['next']).json()
+
+    assert [result['device_id'] for result in first['results'] + second['results']] == device_ids(10)
+
+
+def test_invalid_cursor_is_rejected(api_client):
+    response = api_client.get(devices_url(cursor='not-a-cursor'))
+
+    assert response.status_code == 400
+    assert 'cursor' in response.json()
+
+
+def test_etag_round_trip_skips_the_database(api_client):
+    url = devices_url(fields='device_id,status')
+    etag = api_client.get(url)['ETag']
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+    assert not [query for query in queries if 'inventory_device' in query['sql']]
+
+
+def test_device_change_expires_cached_responses(api_client, django_capture_on_commit_callbacks):
+    url = devices_url(fields='device_id,device_name')
+    etag = api_client.get(url)['ETag']
+
+    device = Device.objects.order_by('device_id').first()
+    device.device_name = 'Renamed for the cache test'
+    # Tags are invalidated once the transaction commits
+    with django_capture_on_commit_callbacks(execute=True):
+        device.save()
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+    assert response.json()['results'][0]['device_name'] == 'Renamed for the cache test'
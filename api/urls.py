@@ -0,0 +1,17 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from . import views
+
+app_name = 'api'
+
+router = DefaultRouter()
+router.register('devices', views.DeviceViewSet, basename='device')
+router.register('assignments', views.AssignmentViewSet, basename='assignment')
+router.register('staff', views.StaffViewSet, basename='staff')
+router.register('locations', views.LocationViewSet, basename='location')
+
+urlpatterns = [
+    path('changes/', views.ChangeFeedView.as_view(), name='changes'),
+    path('', include(router.urls)),
+]
@@ -0,0 +1,268 @@
+# api/views.py - REST API Views
+"""
+Read-only, versioned endpoints for devices, assignments, staff and
+locations (see api.urls).
+
+Query parameters common to every endpoint:
+
+    fields=a,b,c          sparse fieldset; only these fields are serialized
+                          and only the joins they need are made
+    ids=1,2,3             batch fetch by primary key
+    updated_since=<ISO>   rows changed at or after the given time
+    cursor=..., limit=N   keyset pagination (see api.pagination)
+
+Responses are cached in the tagged cache under the full request URL and
+carry an ETag; a matching If-None-Match is answered with 304 from the
+cache, without touching the database. Inventory changes expire the cached
+responses through the cache tags of the models they are built from.
+
+changes/ is the change feed (inventory.change_feed): ordered writes after
+?after=<cursor>, each with the current representation of its object.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import viewsets
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from bps_inventory.cache import set_tagged
+from inventory.cache_tags import (
+    TAG_ASSIGNMENTS, TAG_DEVICES, TAG_LOCATIONS, TAG_STAFF, TAG_USERS, TAG_VENDORS,
+)
+from inventory import change_feed
+from inventory.models import Assignment, Device, Location, Staff
+
+from .conf import get_api_setting
+from .pagination import KeysetCursorPagination
+from .serializers import AssignmentSerializer, DeviceSerializer, LocationSerializer, StaffSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryReadViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Base for the inventory endpoints. Subclasses set queryset,
+    serializer_classes (one per API version), keyset_ordering and the
+    cache_tags of every model their representation reads.
+    """
+
+    renderer_classes = [JSONRenderer]
+    pagination_class = KeysetCursorPagination
+    filter_backends = [DjangoFilterBackend, SearchFilter]
+    serializer_classes = {}
+    keyset_ordering = ('pk',)
+    cache_tags = []
+
+    def get_serializer_class(self):
+        return self.serializer_classes[self.request.version]
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.requested_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    @property
+    def requested_fields(self):
+        if not hasattr(self, '_requested_fields'):
+            available = self.get_serializer_class().available_fields()
+            raw = self.request.query_params.get('fields')
+            if not raw:
+                self._requested_fields = available
+            else:
+                fields = [name.strip() for name in raw.split(',') if name.strip()]
+                unknown = [name for name in fields if name not in available]
+                if unknown:
+                    raise ValidationError({'fields': f"Unknown fields: {', '.join(unknown)}"})
+                self._requested_fields = fields
+        return self._requested_fields
+
+    def get_queryset(self):
+        queryset = self.get_serializer_class().optimize_queryset(self.queryset.all(), self.requested_fields)
+        params = self.request.query_params
+
+        ids = params.get('ids')
+        if ids:
+            queryset = queryset.filter(pk__in=self._parse_ids(ids))
+
+        updated_since = params.get('updated_since')
+        if updated_since:
+            timestamp = parse_datetime(updated_since)
+            if timestamp is None:
+                raise ValidationError({'updated_since': 'Expected an ISO 8601 date and time.'})
+            queryset = queryset.filter(updated_at__gte=timestamp)
+
+        return queryset
+
+    def _parse_ids(self, raw):
+        ids = list(dict.fromkeys(value.strip() for value in raw.split(',') if value.strip()))
+        limit = get_api_setting('MAX_BATCH_IDS')
+        if len(ids) > limit:
+            raise ValidationError({'ids': f'At most {limit} ids per request.'})
+        pk_field = self.queryset.model._meta.pk
+        try:
+            return [pk_field.to_python(value) for value in ids]
+        except DjangoValidationError:
+            raise ValidationError({'ids': 'Invalid id.'})
+
+    # Conditional GETs
+
+    def get_cache_key(self, request):
+        query = sorted(request.query_params.lists())
+        raw = f'{request.version}|{request.get_host()}|{request.path}|{query}'
+        return 'api_response_' + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+    def cached_response(self, request, build):
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = build()
+            if response.status_code != 200:
+                return response
+            body = json.dumps(response.data, cls=JSONEncoder, sort_keys=True)
+            entry = {
+                'data': response.data,
+                'etag': '"%s"' % hashlib.sha1(body.encode('utf-8')).hexdigest(),
+            }
+            set_tagged(key, entry, get_api_setting('CACHE_TIMEOUT'), self.cache_tags)
+
+        if entry['etag'] in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=304)
+        else:
+            response = Response(entry['data'])
+        response['ETag'] = entry['etag']
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(InventoryReadViewSet, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(InventoryReadViewSet, self).retrieve(request, *args, **kwargs))
+
+
+class DeviceViewSet(InventoryReadViewSet):
+    queryset = Device.objects.all()
+    serializer_classes = {'v1': DeviceSerializer}
+    keyset_ordering = ('device_id',)
+    lookup_value_regex = '[^/]+'
+    filterset_fields = ['status', 'device_condition', 'device_type', 'location', 'vendor', 'is_critical']
+    search_fields = ['device_id', 'device_name', 'asset_tag', 'serial_number']
+    cache_tags = [TAG_DEVICES, TAG_ASSIGNMENTS, TAG_LOCATIONS, TAG_STAFF, TAG_VENDORS]
+
+
+class AssignmentViewSet(InventoryReadViewSet):
+    queryset = Assignment.objects.all()
+    serializer_classes = {'v1': AssignmentSerializer}
+    keyset_ordering = ('assignment_id',)
+    filterset_fields = ['device', 'assigned_to_staff', 'assigned_to_department', 'assignment_type', 'is_active']
+    search_fields = ['device__device_id', 'device__device_name', 'purpose']
+    cache_tags = [TAG_ASSIGNMENTS, TAG_DEVICES, TAG_STAFF, TAG_LOCATIONS]
+
+
+class StaffViewSet(InventoryReadViewSet):
+    queryset = Staff.objects.all()
+    serializer_classes = {'v1': StaffSerializer}
+    keyset_ordering = ('id',)
+    filterset_fields = ['department', 'employment_type', 'is_active']
+    search_fields = ['employee_id', 'user__username', 'user__first_name', 'user__last_name']
+    cache_tags = [TAG_STAFF, TAG_USERS, TAG_ASSIGNMENTS]
+
+
+class LocationViewSet(InventoryReadViewSet):
+    queryset = Location.objects.all()
+    serializer_classes = {'v1': LocationSerializer}
+    keyset_ordering = ('id',)
+    filterset_fields = ['building', 'block', 'floor', 'department', 'room', 'is_active']
+    cache_tags = [TAG_LOCATIONS]
+
+
+class ChangeFeedView(APIView):
+    """
+    Writes to devices, assignments, staff and locations in commit order.
+
+        after=<cursor>        sequence of the last entry already processed
+                              (0 or absent to start from the beginning)
+        limit=N               entries per response
+        models=device,staff   only entries of these models
+
+    Each entry has the object's current representation (null for deletes).
+    Store next_cursor and call again with it; has_more says whether to call
+    right away.
+    """
+
+    renderer_classes = [JSONRenderer]
+    viewsets = {
+        'device': DeviceViewSet,
+        'assignment': AssignmentViewSet,
+        'staff': StaffViewSet,
+        'location': LocationViewSet,
+    }
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            after = int(params.get('after') or 0)
+            limit = int(params.get('limit') or get_api_setting('PAGE_SIZE'))
+        except ValueError:
+            raise ValidationError({'after': 'after and limit must be integers.'})
+        limit = min(max(limit, 1), get_api_setting('MAX_PAGE_SIZE'))
+
+        model_names = [name.strip() for name in params.get('models', '').split(',') if name.strip()]
+        unknown = [name for name in model_names if name not in self.viewsets]
+        if unknown:
+            raise ValidationError({'models': f"Unknown models: {', '.join(unknown)}"})
+
+        entries, cursor, has_more = change_feed.read_changes(after, limit, model_names)
+        objects = self.current_representations(request, entries)
+        results = [{
+            'sequence': entry.sequence,
+            'model': entry.model_name,
+            'id': entry.object_id,
+            'action': entry.action.lower(),
+            'recorded_at': entry.recorded_at,
+            # An object deleted after an update has a later tombstone
+            'data': objects.get((entry.model_name, entry.object_id)) if entry.action == 'UPSERT' else None,
+        } for entry in entries]
+
+        response = Response({
+            'next_cursor': cursor,
+            'has_more': has_more,
+            'count': len(results),
+            'results': results,
+        })
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def current_representations(self, request, entries):
+        """{(model name, object id): serialized object}, one query per model"""
+        ids = {}
+        for entry in entries:
+            if entry.action == 'UPSERT':
+                ids.setdefault(entry.model_name, set()).add(entry.object_id)
+
+        objects = {}
+        for model_name, object_ids in ids.items():
+            viewset = self.viewsets[model_name]
+            serializer_class = viewset.serializer_classes[request.version]
+            fields = serializer_class.available_fields()
+            pk_field = viewset.queryset.model._meta.pk
+            queryset = serializer_class.optimize_queryset(viewset.queryset.all(), fields).filter(
+                pk__in=[pk_field.to_python(object_id) for object_id in object_ids]
+            )
+            for obj in queryset:
+                objects[(model_name, str(obj.pk))] = serializer_class(
+                    obj, fields=fields, context={'request': request},
+                ).data
+        return objects
@@ -9,6 +9,9 @@ from django import forms
 from .models import UserRole, UserRoleAssignment, UserProfile, UserSession
 from django.urls import reverse
 from django.utils import timezone
+from django.db.models import Prefetch
+
+from bps_inventory.admin_mixins import CountAnnotationMixin, CountColumn
 
 # ================================
 # CUSTOM FORMS
@@ -68,7 +71,7 @@ class UserRoleAssignmentForm(forms.ModelForm):
 # ================================
 
 @admin.register(UserRole)
-class UserRoleAdmin(admin.ModelAdmin):
+class UserRoleAdmin(CountAnnotationMixin, admin.ModelAdmin):
     list_display = (
         'name', 'display_name', 'permission_summary', 
         'user_count', 'is_active', 'created_at'
@@ -78,6 +81,12 @@ class UserRoleAdmin(admin.ModelAdmin):
         'can_view_all_devices', 'created_at'
     )
     search_fields = ('name', 'display_name', 'description')
+    count_columns = {
+        'user_count': CountColumn(
+            'user_assignments', 'Users',
+            changelist='admin:authentication_userroleassignment_changelist', filter_param='role__id__exact',
+        ),
+    }
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -122,17 +131,6 @@ class UserRoleAdmin(admin.ModelAdmin):
             permissions.append("All Devices")
         return ", ".join(permissions) if permissions else "Basic Access"
     permission_summary.short_description = 'Key Permissions'
-    
-    def user_count(self, obj):
-        count = obj.user_assignments.count()
-        if count > 0:
-            url = reverse('admin:authentication_userroleassignment_changelist')
-            return format_html(
-                '<a href="{}?role__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    user_count.short_description = 'Users'
 
 @admin.register(UserRoleAssignment)
 class UserRoleAssignmentAdmin(admin.ModelAdmin):
@@ -148,6 +146,7 @@ class UserRoleAssignmentAdmin(admin.ModelAdmin):
         'user__username', 'user__first_name', 'user__last_name',
         'user__email', 'role__display_name'
     )
+    list_select_related = ('user', 'role', 'department', 'assigned_by')
     readonly_fields = ('assigned_at',)
     
     fieldsets = (
@@ -237,6 +236,7 @@ class UserProfileAdmin(admin.ModelAdmin):
         'user__username', 'user__first_name', 'user__last_name',
         'user__email'
     )
+    list_select_related = ('user__staff_profile__department', 'default_department')
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -306,6 +306,7 @@ class UserSessionAdmin(admin.ModelAdmin):
     search_fields = (
         'user__username', 'ip_address', 'session_key'
     )
+    list_select_related = ('user',)
     readonly_fields = (
         'session_key', 'login_time', 'last_activity', 'logout_time'
     )
@@ -360,9 +361,19 @@ class ExtendedUserAdmin(BaseUserAdmin):
         return 'No Department'
     get_department.short_description = 'Department'
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'user_profile__default_department', 'staff_profile__department'
+        ).prefetch_related(
+            Prefetch(
+                'role_assignments',
+                queryset=UserRoleAssignment.objects.filter(is_active=True).select_related('role'),
+                to_attr='active_role_assignments',
+            )
+        )
+    
     def get_roles(self, obj):
-        roles = UserRoleAssignment.objects.filter(user=obj, is_active=True)
-        return ', '.join([assignment.role.display_name for assignment in roles])
+        return ', '.join([assignment.role.display_name for assignment in obj.active_role_assignments])
     get_roles.short_description = 'Active Roles'
 
 # Unregister the default User admin and register our extended one
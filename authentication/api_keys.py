@@ -0,0 +1,280 @@
+# authentication/api_keys.py - API Key Resolution, Rate Limiting and Usage
+"""
+Request-path support for ApiKey authentication (see
+authentication.middleware.ApiKeyAuthenticationMiddleware).
+
+- Keys are resolved through the shared cache, keyed by a SHA-256 hash of the
+  presented key, so a valid key costs no database read after the first
+  request and the raw key never appears in cache keys. Changing or deleting
+  an ApiKey drops its entry.
+- Rate limits are token buckets (per key and per client IP) kept in the
+  shared cache. On Redis each take is a single atomic Lua script; other
+  backends fall back to a best-effort read/write under a process lock.
+- Usage is counted in memory and written to ApiKey in periodic batches,
+  one UPDATE per key with F() increments, instead of a save() per request.
+"""
+
+import atexit
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.db.models import Case, F, Value, When
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_KEY_AUTH = {
+    'HEADER': 'X-API-Key',
+    'CACHE_TIMEOUT': 300,
+    'INVALID_CACHE_TIMEOUT': 30,
+    'BURST_SECONDS': 300,
+    'IP_RATE_LIMIT_PER_HOUR': 20000,
+    'USAGE_FLUSH_INTERVAL_SECONDS': 60,
+}
+
+INVALID = 'invalid'
+
+
+def get_api_key_setting(name):
+    return getattr(settings, 'API_KEY_AUTH', {}).get(name, DEFAULT_API_KEY_AUTH[name])
+
+
+def hash_key(raw_key):
+    return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+
+def _cache_key(raw_key):
+    return f'api_key_{hash_key(raw_key)}'
+
+
+# ================================
+# KEY RESOLUTION
+# ================================
+
+def _snapshot(api_key):
+    return {
+        'id': api_key.pk,
+        'user_id': api_key.user_id,
+        'name': api_key.name,
+        'key_type': api_key.key_type,
+        'is_active': api_key.is_active,
+        'expires_at': api_key.expires_at,
+        'allowed_ips': list(api_key.allowed_ips or []),
+        'permissions': list(api_key.permissions or []),
+        'rate_limit_per_hour': api_key.rate_limit_per_hour,
+    }
+
+
+def resolve_api_key(raw_key):
+    """
+    Cached snapshot (a dict) of the active, unexpired ApiKey matching
+    raw_key, or None. Unknown keys are cached briefly as well.
+    """
+    from .models import ApiKey
+
+    if not raw_key or len(raw_key) > 128:
+        return None
+
+    shared = caches['shared']
+    key = _cache_key(raw_key)
+    snapshot = shared.get(key)
+    if snapshot is None:
+        api_key = ApiKey.objects.filter(key=raw_key).first()
+        if api_key is None:
+            shared.set(key, INVALID, get_api_key_setting('INVALID_CACHE_TIMEOUT'))
+            return None
+        snapshot = _snapshot(api_key)
+        shared.set(key, snapshot, get_api_key_setting('CACHE_TIMEOUT'))
+
+    if snapshot == INVALID or not snapshot['is_active']:
+        return None
+    if snapshot['expires_at'] and timezone.now() > snapshot['expires_at']:
+        return None
+    return snapshot
+
+
+def _remember_old_key(sender, instance, raw=False, **kwargs):
+    # A rotated key must stop resolving immediately, not when its entry expires
+    if raw or instance.pk is None:
+        return
+    instance._previous_key = sender.objects.filter(pk=instance.pk).values_list('key', flat=True).first()
+
+
+def _on_api_key_change(sender, instance, **kwargs):
+    keys = {instance.key, getattr(instance, '_previous_key', None)} - {None, ''}
+    try:
+        caches['shared'].delete_many([_cache_key(key) for key in keys])
+    except Exception as e:
+        logger.warning(f"Failed to drop cached API key {instance.pk}: {e}")
+
+
+# ================================
+# TOKEN BUCKETS
+# ================================
+
+# KEYS[1] bucket hash; ARGV capacity, refill per second, now, ttl.
+# Returns {allowed, seconds until a token is available}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {allowed, tostring(wait)}
+"""
+
+_bucket_lock = threading.Lock()
+
+
+def _take_redis(shared, key, capacity, rate, ttl):
+    client = shared._cache.get_client(key, write=True)
+    allowed, wait = client.eval(
+        TOKEN_BUCKET_SCRIPT, 1, shared.make_and_validate_key(key), capacity, rate, time.time(), ttl
+    )
+    return bool(int(allowed)), float(wait)
+
+
+def _take_generic(shared, key, capacity, rate, ttl):
+    with _bucket_lock:
+        now = time.time()
+        tokens, ts = shared.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + max(0, now - ts) * rate)
+        if tokens >= 1:
+            shared.set(key, (tokens - 1, now), ttl)
+            return True, 0.0
+        shared.set(key, (tokens, now), ttl)
+        return False, (1 - tokens) / rate
+
+
+def take_token(bucket, limit_per_hour):
+    """
+    Take one request from the named bucket, refilled at limit_per_hour and
+    holding BURST_SECONDS worth of requests. Returns the seconds to wait
+    when the bucket is empty, else 0. Fails open if the cache is down.
+    """
+    if not limit_per_hour:
+        return 0
+
+    rate = limit_per_hour / 3600
+    capacity = max(1, math.ceil(rate * get_api_key_setting('BURST_SECONDS')))
+    ttl = math.ceil(capacity / rate) + 1
+    key = f'api_bucket_{bucket}'
+    shared = caches['shared']
+    try:
+        if isinstance(shared, RedisCache):
+            allowed, wait = _take_redis(shared, key, capacity, rate, ttl)
+        else:
+            allowed, wait = _take_generic(shared, key, capacity, rate, ttl)
+    except Exception as e:
+        logger.warning(f"API rate limit check failed: {e}")
+        return 0
+    return 0 if allowed else max(1, math.ceil(wait))
+
+
+# ================================
+# BATCHED USAGE COUNTERS
+# ================================
+
+class UsageRecorder:
+    """Per-process usage counts per ApiKey, written in periodic batches"""
+
+    def __init__(self, flush_interval=None):
+        self.flush_interval = flush_interval or get_api_key_setting('USAGE_FLUSH_INTERVAL_SECONDS')
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._flushed_at = time.monotonic()
+
+    def record(self, key_id, ip_address=None):
+        now = timezone.now()
+        with self._lock:
+            entry = self._pending.setdefault(key_id, {'count': 0, 'last_used': now, 'last_used_ip': None})
+            entry['count'] += 1
+            entry['last_used'] = now
+            if ip_address:
+                entry['last_used_ip'] = ip_address
+            due = time.monotonic() - self._flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Add the pending counts to ApiKey rows; returns the keys updated"""
+        from .models import ApiKey
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+
+        now = timezone.now()
+        for key_id, entry in pending.items():
+            count = entry['count']
+            fields = {
+                'usage_count': F('usage_count') + count,
+                'last_used': entry['last_used'],
+                # Hourly counter shown in the admin; the bucket enforces limits
+                'current_hour_usage': Case(
+                    When(rate_limit_reset__gt=now, then=F('current_hour_usage') + count),
+                    default=Value(count),
+                ),
+                'rate_limit_reset': Case(
+                    When(rate_limit_reset__gt=now, then=F('rate_limit_reset')),
+                    default=Value(now + timedelta(hours=1)),
+                ),
+            }
+            if entry['last_used_ip']:
+                fields['last_used_ip'] = entry['last_used_ip']
+            try:
+                ApiKey.objects.filter(pk=key_id).update(**fields)
+            except Exception as e:
+                logger.error(f"Failed to record usage for API key {key_id}: {e}")
+        return len(pending)
+
+
+usage_recorder = UsageRecorder()
+atexit.register(usage_recorder.flush)
+
+
+def record_usage(key_id, ip_address=None):
+    """Count one request for an ApiKey (see UsageRecorder)"""
+    usage_recorder.record(key_id, ip_address)
+
+
+class ApiKeyAuthentication(BaseAuthentication):
+    """DRF authentication for requests the API key middleware authenticated"""
+
+    def authenticate(self, request):
+        api_key = getattr(request._request, 'api_key', None)
+        if api_key is None:
+            return None
+        return (request._request.user, api_key)
+
+    def authenticate_header(self, request):
+        return get_api_key_setting('HEADER')
+
+
+def connect_signals():
+    from .models import ApiKey
+
+    pre_save.connect(_remember_old_key, sender=ApiKey, dispatch_uid='api_key_remember_old')
+    post_save.connect(_on_api_key_change, sender=ApiKey, dispatch_uid='api_key_cache_save')
+    post_delete.connect(_on_api_key_change, sender=ApiKey, dispatch_uid='api_key_cache_delete')
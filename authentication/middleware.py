@@ -29,6 +29,8 @@ class AuthenticationManagementMiddleware(MiddlewareMixin):
             '/static/',
             '/media/',
             '/favicon.ico',
+            '/verify/',
+            '/metrics/',  # checks staff or METRICS_TOKEN itself
         ]
         
         # URLs that require staff access
@@ -153,7 +155,7 @@ class SessionSecurityMiddleware(MiddlewareMixin):
     def process_request(self, request):
         """Check session validity and timeout"""
         
-        if not request.user.is_authenticated:
+        if not request.user.is_authenticated or getattr(request, 'api_key', None):
             return None
         
         # Check session timeout
@@ -265,4 +267,60 @@ class DeviceAccessControlMiddleware(MiddlewareMixin):
             request.can_view_all_devices = False
             request.user_departments = []
         
-        return None
\ No newline at end of file
+        return None
+
+class ApiKeyAuthenticationMiddleware(MiddlewareMixin):
+    """
+    Authenticate /api/ requests carrying an API key header (see
+    authentication.api_keys): rate limit per client IP and per key, then
+    act as the key's user for the rest of the request. Runs before
+    AuthenticationManagementMiddleware, which rejects anonymous API calls.
+    """
+
+    def process_request(self, request):
+        from django.contrib.auth.models import User
+        from .api_keys import get_api_key_setting, record_usage, resolve_api_key, take_token
+
+        if not request.path.startswith('/api/'):
+            return None
+        raw_key = request.headers.get(get_api_key_setting('HEADER'))
+        if not raw_key:
+            return None
+
+        ip_address = self.get_client_ip(request)
+        retry_after = take_token(f'ip:{ip_address}', get_api_key_setting('IP_RATE_LIMIT_PER_HOUR'))
+        if retry_after:
+            return self.rate_limited(retry_after)
+
+        api_key = resolve_api_key(raw_key)
+        if api_key is None:
+            return JsonResponse({'error': 'Invalid API key'}, status=401)
+        if api_key['allowed_ips'] and ip_address not in api_key['allowed_ips']:
+            return JsonResponse({'error': 'API key not allowed from this address'}, status=403)
+
+        retry_after = take_token(f"key:{api_key['id']}", api_key['rate_limit_per_hour'])
+        if retry_after:
+            return self.rate_limited(retry_after)
+
+        user = User.objects.filter(pk=api_key['user_id'], is_active=True).first()
+        if user is None:
+            return JsonResponse({'error': 'Invalid API key'}, status=401)
+
+        request.user = user
+        request.api_key = api_key
+        # Keys are sent explicitly, never by the browser, so CSRF does not apply
+        request._dont_enforce_csrf_checks = True
+        record_usage(api_key['id'], ip_address)
+        return None
+
+    def get_client_ip(self, request):
+        # Forwarded addresses only count behind TRUSTED_PROXIES: allowed_ips
+        # and the per-IP bucket must not be chosen by the caller
+        from inventory.utils import get_trusted_client_ip
+
+        return get_trusted_client_ip(request)
+
+    def rate_limited(self, retry_after):
+        response = JsonResponse({'error': 'Rate limit exceeded', 'retry_after': retry_after}, status=429)
+        response['Retry-After'] = str(retry_after)
+        return response
@@ -717,15 +717,23 @@ class UserActivity(models.Model):
             summary += f" on {self.object_type} ({self.object_id})"
         return summary
 
+    # Written immediately (strict) unless the caller says otherwise
+    SECURITY_ACTIVITY_TYPES = ('LOGIN', 'LOGOUT', 'SECURITY')
+
     @classmethod
-    def log_activity(cls, user, activity_type, description, **kwargs):
-        """Convenience method to log an activity"""
-        return cls.objects.create(
+    def log_activity(cls, user, activity_type, description, strict=None, background=False, **kwargs):
+        """Convenience method to log an activity through the audit buffer (inventory.audit)"""
+        from inventory.audit import record
+
+        if strict is None:
+            strict = activity_type in cls.SECURITY_ACTIVITY_TYPES
+        activity = cls(
             user=user,
             activity_type=activity_type,
             description=description,
             **kwargs
         )
+        return record(activity, strict=strict, background=background)
 
 # ================================
 # ApiKey Models
@@ -844,35 +852,15 @@ class ApiKey(models.Model):
 
     @property
     def is_rate_limited(self):
-        """Check if the API key has exceeded rate limits"""
-        if not self.rate_limit_reset:
-            return False
-        
-        # Reset counter if hour has passed
-        if timezone.now() > self.rate_limit_reset:
-            self.current_hour_usage = 0
-            self.rate_limit_reset = timezone.now() + timedelta(hours=1)
-            self.save(update_fields=['current_hour_usage', 'rate_limit_reset'])
+        """Whether the recorded usage for the current hour has reached the limit"""
+        if not self.rate_limit_reset or timezone.now() > self.rate_limit_reset:
             return False
-        
         return self.current_hour_usage >= self.rate_limit_per_hour
 
     def record_usage(self, ip_address=None):
-        """Record API key usage"""
-        self.usage_count += 1
-        self.current_hour_usage += 1
-        self.last_used = timezone.now()
-        if ip_address:
-            self.last_used_ip = ip_address
-        
-        # Set rate limit reset if not set
-        if not self.rate_limit_reset:
-            self.rate_limit_reset = timezone.now() + timedelta(hours=1)
-        
-        self.save(update_fields=[
-            'usage_count', 'current_hour_usage', 'last_used', 
-            'last_used_ip', 'rate_limit_reset'
-        ])
+        """Record API key usage (buffered, see authentication.api_keys)"""
+        from .api_keys import record_usage
+        record_usage(self.pk, ip_address)
 
     def can_access_ip(self, ip_address):
         """Check if the given IP address is allowed"""
@@ -1,3 +1,70 @@
-from django.test import TestCase
+# authentication/tests.py - Authentication Tests
+"""
+API key rate limiting: token buckets kept in the shared cache must hand out
+exactly their capacity, refill over time, and never over-grant when several
+threads take from the same bucket at once.
+"""
 
-# Create your tests here.
+import threading
+from unittest import mock
+
+from . import api_keys
+from .api_keys import take_token
+
+
+def test_bucket_grants_its_burst_then_waits(settings):
+    settings.API_KEY_AUTH = {'BURST_SECONDS': 5}
+
+    # 3600/hour refills one token per second, so the bucket holds 5
+    assert [take_token('burst', 3600) for _ in range(5)] == [0] * 5
+    assert take_token('burst', 3600) == 1
+
+
+def test_buckets_are_independent(settings):
+    settings.API_KEY_AUTH = {'BURST_SECONDS': 1}
+
+    assert take_token('key:1', 3600) == 0
+    assert take_token('key:1', 3600) > 0
+    assert take_token('key:2', 3600) == 0
+
+
+def test_bucket_refills_over_time(settings):
+    settings.API_KEY_AUTH = {'BURST_SECONDS': 2}
+
+    with mock.patch.object(api_keys.time, 'time', return_value=1000.0) as clock:
+        assert take_token('refill', 3600) == 0
+        assert take_token('refill', 3600) == 0
+        assert take_token('refill', 3600) == 1
+        clock.return_value = 1001.5
+        assert take_token('refill', 3600) == 0
+        assert take_token('refill', 3600) == 1
+
+
+def test_concurrent_takes_never_exceed_the_capacity(settings):
+    settings.API_KEY_AUTH = {'BURST_SECONDS': 10}
+    start = threading.Barrier(20)
+    results = []
+
+    def take():
+        start.wait()
+        results.append(take_token('contended', 3600))
+
+    threads = [threading.Thread(target=take) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(0) == 10
+    assert len(results) == 20
+
+
+def test_no_limit_skips_the_bucket():
+    with mock.patch.object(api_keys, '_take_generic') as take:
+        assert take_token('unlimited', 0) == 0
+    take.assert_not_called()
+
+
+def test_cache_failure_fails_open():
+    with mock.patch.object(api_keys, '_take_generic', side_effect=ConnectionError('cache down')):
+        assert take_token('down', 1) == 0
@@ -241,15 +241,16 @@ def change_password_view(request):
             
             # Log the activity
             try:
-                from inventory.models import AuditLog
-                AuditLog.objects.create(
+                from inventory.audit import record_action
+                record_action(
                     user=request.user,
                     action='UPDATE',
                     model_name='User',
                     object_id=request.user.id,
                     object_repr=str(request.user),
                     changes={'action': 'password_changed'},
-                    ip_address=request.META.get('REMOTE_ADDR')
+                    ip_address=request.META.get('REMOTE_ADDR'),
+                    strict=True
                 )
             except Exception:
                 pass
@@ -582,8 +583,8 @@ def create_staff_user(request):
                 
                 # Log the activity
                 try:
-                    from inventory.models import AuditLog
-                    AuditLog.objects.create(
+                    from inventory.audit import record_action
+                    record_action(
                         user=request.user,
                         action='CREATE',
                         model_name='User',
@@ -596,7 +597,8 @@ def create_staff_user(request):
                             'department': department_id,
                             'is_staff': is_staff
                         },
-                        ip_address=request.META.get('REMOTE_ADDR')
+                        ip_address=request.META.get('REMOTE_ADDR'),
+                        strict=True
                     )
                 except Exception:
                     pass
@@ -684,15 +686,16 @@ def edit_user_roles(request, user_id):
                 
                 # Log the activity
                 try:
-                    from inventory.models import AuditLog
-                    AuditLog.objects.create(
+                    from inventory.audit import record_action
+                    record_action(
                         user=request.user,
                         action='UPDATE',
                         model_name='UserRoleAssignment',
                         object_id=user.id,
                         object_repr=f"Roles for {user.username}",
                         changes={'new_roles': new_roles},
-                        ip_address=request.META.get('REMOTE_ADDR')
+                        ip_address=request.META.get('REMOTE_ADDR'),
+                        strict=True
                     )
                 except Exception:
                     pass
@@ -766,8 +769,8 @@ def toggle_user_status(request, user_id):
             
             # Log the activity
             try:
-                from inventory.models import AuditLog
-                AuditLog.objects.create(
+                from inventory.audit import record_action
+                record_action(
                     user=request.user,
                     action='UPDATE',
                     model_name='User',
@@ -777,7 +780,8 @@ def toggle_user_status(request, user_id):
                         'is_active': user.is_active,
                         'action': 'activated' if user.is_active else 'deactivated'
                     },
-                    ip_address=request.META.get('REMOTE_ADDR')
+                    ip_address=request.META.get('REMOTE_ADDR'),
+                    strict=True
                 )
             except Exception:
                 pass
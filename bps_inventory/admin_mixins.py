@@ -0,0 +1,119 @@
+# bps_inventory/admin_mixins.py - Shared ModelAdmin Mixins
+"""
+Reusable ModelAdmin building blocks.
+
+CountAnnotationMixin turns declared related-object counts into queryset
+annotations, so a changelist computes every count column in its one SELECT
+instead of running a .count() query per row and column. Count columns are
+sortable.
+
+LargeTableAdminMixin switches huge, append-only tables to the estimated
+count paginator and skips the admin's extra unfiltered COUNT(*). A capped
+count shows as "10,000+" (templates/admin/pagination.html and
+search_form.html) and grows as deeper pages are requested.
+"""
+
+from django.contrib.admin.views.main import PAGE_VAR
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils.html import format_html
+
+from .pagination import EstimatedCountPaginator
+
+
+class CountColumn:
+    """
+    A changelist column showing how many related rows point at each object.
+
+    ``relation`` is a path of reverse relations from the admin's model, e.g.
+    'blocks' or 'floors__departments'. ``changelist``/``filter_param`` turn
+    non-zero counts into a link to the related changelist filtered to the
+    object.
+    """
+
+    def __init__(self, relation, description, filter=None, changelist=None, filter_param=None):
+        self.relation = relation
+        self.description = description
+        self.filter = filter
+        self.changelist = changelist
+        self.filter_param = filter_param
+
+    def resolve(self, model):
+        """Return (related_model, lookup from the related model back to model)"""
+        lookups = []
+        for name in self.relation.split('__'):
+            field = model._meta.get_field(name)
+            model = field.related_model
+            lookups.insert(0, field.remote_field.name)
+        return model, '__'.join(lookups)
+
+    def expression(self, model):
+        # A correlated subquery per column: joining several reverse relations
+        # in one GROUP BY would multiply the rows and inflate every count
+        related_model, lookup = self.resolve(model)
+        related = related_model._default_manager.filter(**{lookup: OuterRef('pk')})
+        if self.filter is not None:
+            related = related.filter(self.filter)
+        counts = related.order_by().values(lookup).annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    def display_method(self, alias):
+        column = self
+
+        def display(admin_instance, obj):
+            count = getattr(obj, alias, 0)
+            if count > 0 and column.changelist:
+                return format_html(
+                    '<a href="{}?{}={}">{}</a>',
+                    reverse(column.changelist), column.filter_param, obj.pk, count
+                )
+            return count
+        display.short_description = self.description
+        display.admin_order_field = alias
+        return display
+
+
+class CountAnnotationMixin:
+    """
+    Declare count columns once on a ModelAdmin:
+
+        count_columns = {
+            'get_blocks_count': CountColumn('blocks', 'Blocks', ...),
+        }
+
+    and list the keys in list_display. get_queryset() annotates every count.
+    """
+
+    count_columns = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, column in cls.count_columns.items():
+            if name not in cls.__dict__:
+                setattr(cls, name, column.display_method(cls._count_alias(name)))
+
+    @staticmethod
+    def _count_alias(name):
+        return f'_{name}'
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return queryset.annotate(**{
+            self._count_alias(name): column.expression(self.model)
+            for name, column in self.count_columns.items()
+        })
+
+
+class LargeTableAdminMixin:
+    """Changelist settings for tables too large for exact counts"""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        try:
+            current_page = max(int(request.GET.get(PAGE_VAR, 1)), 1)
+        except ValueError:
+            current_page = 1
+        return self.paginator(queryset, per_page, orphans, allow_empty_first_page, current_page=current_page)
@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bps_inventory.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after setup: the live update stream needs the app registry
+from bps_inventory.sse import EventStreamRouter  # noqa: E402
+
+application = EventStreamRouter(django_application)
@@ -0,0 +1,107 @@
+# bps_inventory/batch_writer.py - Background Batch Writer
+"""
+Queue drained by a daemon thread that writes its items in batches.
+
+High-volume, fire-and-forget records (QR scans, audit entries) are queued
+by the request and written by the thread with one bulk insert per batch,
+so a burst of requests costs a handful of inserts instead of one each.
+When the queue is full the oldest pending items are dropped rather than
+blocking the request.
+"""
+
+import logging
+import queue
+import threading
+import time
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """
+    Subclasses implement write_batch(items) and set thread_name and
+    item_name (used in log messages).
+    """
+
+    thread_name = 'batch-writer'
+    item_name = 'items'
+
+    def __init__(self, batch_size, flush_interval, queue_size):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._thread = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def write_batch(self, batch):
+        raise NotImplementedError
+
+    def put(self, item):
+        """Queue an item for writing; never blocks the caller"""
+        self._ensure_thread()
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                self._thread.start()
+
+    def _take_batch(self, timeout):
+        batch = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch(self.flush_interval)
+            if batch:
+                close_old_connections()
+                self._write(batch)
+                close_old_connections()
+
+    def _write(self, batch):
+        with self._write_lock:
+            try:
+                self.write_batch(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} {self.item_name}: {e}")
+
+        if self.dropped:
+            logger.warning(f"{self.thread_name} queue overflowed; dropped {self.dropped} {self.item_name}")
+            self.dropped = 0
+
+    def flush(self):
+        """Write every queued item now, in the calling thread"""
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+        return len(batch)
@@ -0,0 +1,262 @@
+# bps_inventory/cache.py - Two-Tier Cache Backend
+"""
+Cache backend with a small in-process LRU (L1) in front of a cache shared by
+all workers (L2: Redis, file-based, or LocMem as a local fake for tests).
+
+L1 entries live for a few seconds only (OPTIONS['L1_TIMEOUT']), which bounds
+how stale one worker can be after another worker writes. Entries may be
+stored with tags; invalidate_tags() bumps the tag version in L2 so every
+worker treats entries carrying an older version as a miss. Hit/miss counters
+are accumulated per process and periodically added to L2, so
+get_cache_stats() reports totals across all workers.
+
+Configured in settings.CACHES:
+
+    'default': {
+        'BACKEND': 'bps_inventory.cache.TwoTierCache',
+        'OPTIONS': {'L2': 'shared', 'L1_MAX_ENTRIES': 1000, 'L1_TIMEOUT': 5},
+    }
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from .instrumentation import note_cache_event
+
+logger = logging.getLogger(__name__)
+
+TAG_KEY_PREFIX = 'twotier:tag:'
+STATS_KEY_PREFIX = 'twotier:stats:'
+STAT_NAMES = ['l1_hits', 'l2_hits', 'misses', 'sets', 'invalidations']
+
+# Backend instances are created per thread; like LocMemCache, the L1 store,
+# its lock and the pending counters are shared per process by LOCATION.
+_l1_stores = {}
+_l1_locks = {}
+_l1_stats = {}
+
+
+class TwoTierCache(BaseCache):
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = options.get('L2', 'shared')
+        self._l1_max_entries = options.get('L1_MAX_ENTRIES', 1000)
+        self._l1_timeout = options.get('L1_TIMEOUT', 5)
+        self._stats_flush_interval = options.get('STATS_FLUSH_INTERVAL', 30)
+
+        # key -> (expires_at, tags, value), least recently used first
+        self._l1 = _l1_stores.setdefault(location, OrderedDict())
+        self._lock = _l1_locks.setdefault(location, threading.Lock())
+        self._stats = _l1_stats.setdefault(location, {'pending': Counter(), 'flushed_at': time.monotonic()})
+
+    @property
+    def l2(self):
+        return caches[self._l2_alias]
+
+    # ================================
+    # L1 (in-process LRU)
+    # ================================
+
+    def _l1_get(self, l1_key):
+        with self._lock:
+            entry = self._l1.get(l1_key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._l1[l1_key]
+                return None
+            self._l1.move_to_end(l1_key)
+            return entry
+
+    def _l1_set(self, l1_key, value, tags, timeout):
+        ttl = self._l1_timeout if timeout is None else min(self._l1_timeout, timeout)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._l1[l1_key] = (time.monotonic() + ttl, tags, value)
+            self._l1.move_to_end(l1_key)
+            while len(self._l1) > self._l1_max_entries:
+                self._l1.popitem(last=False)
+
+    def _l1_delete(self, l1_key):
+        with self._lock:
+            self._l1.pop(l1_key, None)
+
+    # ================================
+    # TAGS
+    # ================================
+
+    def _tag_versions(self, tags, create=False):
+        """Current version per tag; missing tags are created when storing"""
+        if not tags:
+            return {}
+        keys = {TAG_KEY_PREFIX + tag: tag for tag in tags}
+        found = self.l2.get_many(keys.keys())
+        versions = {keys[key]: value for key, value in found.items()}
+        if create:
+            for tag in tags:
+                if tag not in versions:
+                    version = time.time_ns()
+                    self.l2.add(TAG_KEY_PREFIX + tag, version, None)
+                    versions[tag] = self.l2.get(TAG_KEY_PREFIX + tag, version)
+        return versions
+
+    def invalidate_tags(self, tags):
+        """Expire every entry stored with any of the given tags, in all workers"""
+        tags = set(tags)
+        if not tags:
+            return
+        # A fresh timestamp rather than incr: an evicted tag key can never
+        # come back with a version that old entries still match
+        self.l2.set_many({TAG_KEY_PREFIX + tag: time.time_ns() for tag in tags}, None)
+        with self._lock:
+            for l1_key in [k for k, entry in self._l1.items() if tags & set(entry[1])]:
+                del self._l1[l1_key]
+        self._record('invalidations', len(tags))
+
+    # ================================
+    # CACHE API
+    # ================================
+
+    def get(self, key, default=None, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        entry = self._l1_get(l1_key)
+        if entry is not None:
+            self._record('l1_hits')
+            return entry[2]
+
+        envelope = self.l2.get(key, version=version)
+        if not isinstance(envelope, tuple) or len(envelope) != 2:
+            # Missing, or written by a different backend
+            self._record('misses')
+            return default
+
+        value, tag_versions = envelope
+        if tag_versions and self._tag_versions(tag_versions.keys()) != tag_versions:
+            self._record('misses')
+            return default
+
+        self._record('l2_hits')
+        self._l1_set(l1_key, value, tuple(tag_versions), self._l1_timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, tags=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        timeout = self.get_backend_timeout(timeout)
+        tag_versions = self._tag_versions(tags, create=True)
+        self.l2.set(key, (value, tag_versions), self._l2_timeout(timeout), version=version)
+        self._l1_set(l1_key, value, tuple(tag_versions), self._seconds(timeout))
+        self._record('sets')
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, tags=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        timeout = self.get_backend_timeout(timeout)
+        tag_versions = self._tag_versions(tags, create=True)
+        added = self.l2.add(key, (value, tag_versions), self._l2_timeout(timeout), version=version)
+        if added:
+            self._l1_set(l1_key, value, tuple(tag_versions), self._seconds(timeout))
+            self._record('sets')
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, self._l2_timeout(self.get_backend_timeout(timeout)), version=version)
+
+    def delete(self, key, version=None):
+        self._l1_delete(self.make_and_validate_key(key, version=version))
+        return self.l2.delete(key, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+        self.l2.clear()
+
+    def _seconds(self, timeout):
+        """Backend timeouts are expiry timestamps; L1 wants seconds from now"""
+        return None if timeout is None else max(0, timeout - time.time())
+
+    def _l2_timeout(self, timeout):
+        return None if timeout is None else math.ceil(self._seconds(timeout))
+
+    # ================================
+    # STATISTICS
+    # ================================
+
+    def _record(self, name, amount=1):
+        note_cache_event(name, amount)
+        with self._lock:
+            self._stats['pending'][name] += amount
+            due = time.monotonic() - self._stats['flushed_at'] >= self._stats_flush_interval
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Add this worker's counters to the shared totals"""
+        with self._lock:
+            pending, self._stats['pending'] = self._stats['pending'], Counter()
+            self._stats['flushed_at'] = time.monotonic()
+        for name, amount in pending.items():
+            key = STATS_KEY_PREFIX + name
+            try:
+                if not self.l2.add(key, amount, None):
+                    self.l2.incr(key, amount)
+            except ValueError:
+                # Key expired between add and incr
+                self.l2.set(key, amount, None)
+            except Exception as e:
+                logger.warning(f"Failed to flush cache statistics: {e}")
+
+    def get_stats(self):
+        self.flush_stats()
+        totals = self.l2.get_many([STATS_KEY_PREFIX + name for name in STAT_NAMES])
+        stats = {name: totals.get(STATS_KEY_PREFIX + name, 0) for name in STAT_NAMES}
+        lookups = stats['l1_hits'] + stats['l2_hits'] + stats['misses']
+        stats['lookups'] = lookups
+        stats['hit_rate'] = round((stats['l1_hits'] + stats['l2_hits']) * 100 / lookups, 1) if lookups else 0
+        stats['l1_hit_rate'] = round(stats['l1_hits'] * 100 / lookups, 1) if lookups else 0
+        with self._lock:
+            stats['l1_entries'] = len(self._l1)
+        stats['l1_max_entries'] = self._l1_max_entries
+        stats['l2_backend'] = type(self.l2).__name__
+        return stats
+
+
+# ================================
+# HELPERS
+# ================================
+
+def set_tagged(key, value, timeout, tags):
+    """cache.set() with tags; tags are ignored by backends without tag support"""
+    backend = caches['default']
+    if isinstance(backend, TwoTierCache):
+        backend.set(key, value, timeout, tags=tags)
+    else:
+        backend.set(key, value, timeout)
+
+
+def invalidate_tags(tags):
+    backend = caches['default']
+    if isinstance(backend, TwoTierCache):
+        try:
+            backend.invalidate_tags(tags)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cache tags {sorted(tags)}: {e}")
+
+
+def get_cache_stats():
+    """Hit/miss counters across all workers, or None without the two-tier backend"""
+    backend = caches['default']
+    if not isinstance(backend, TwoTierCache):
+        return None
+    try:
+        return backend.get_stats()
+    except Exception as e:
+        logger.warning(f"Failed to read cache statistics: {e}")
+        return None
@@ -0,0 +1,226 @@
+# bps_inventory/db_router.py - Read Replica Routing
+"""
+Sends the reads of reporting and analytics views to a read replica so
+month-end reports do not compete with check-outs on the primary.
+
+Nothing is routed by default: reads go to the replica only inside
+read_replica(), which works as a context manager and as a view decorator,
+and ReplicaRoutingMiddleware enters it for GET/HEAD requests to the views
+named in READ_REPLICA['VIEWS'] ('reports:*' matches a whole namespace).
+Writes always go to the primary, and so do reads made
+- while the primary is inside a transaction (they must see its writes);
+- while the replica is unavailable or lags more than MAX_LAG_SECONDS
+  behind (checked at most every LAG_CHECK_SECONDS per worker);
+- after the same browser changed something (any unsafe request), so users
+  read their own writes. The pin lasts PIN_SECONDS, but never less than
+  the staleness the replica may still have while it counts as healthy:
+  MAX_LAG_SECONDS plus the LAG_CHECK_SECONDS a lag reading is reused. The
+  pin is a cookie, so it needs no session write or shared cache.
+
+Without a database under the ALIAS name the router does nothing. Locally
+two SQLite files work: copy the primary's file to the replica's after
+migrating (migrations only run on the primary).
+"""
+
+import fnmatch
+import functools
+import logging
+import threading
+import time
+from contextlib import ContextDecorator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READ_REPLICA = {
+    'ALIAS': 'replica',
+    # View names (namespace:name, wildcards allowed) served from the replica
+    'VIEWS': [],
+    'MAX_LAG_SECONDS': 30,
+    'LAG_CHECK_SECONDS': 10,
+    'PIN_SECONDS': 15,
+    'PIN_COOKIE': 'bps_primary_pin',
+}
+
+_local = threading.local()
+_lag_checks = {}
+_lag_lock = threading.Lock()
+
+
+def get_read_replica_setting(name):
+    return getattr(settings, 'READ_REPLICA', {}).get(name, DEFAULT_READ_REPLICA[name])
+
+
+def pin_seconds():
+    """How long a browser reads from the primary after a write"""
+    # A replica counted as healthy may be this far behind the primary
+    tolerated_lag = get_read_replica_setting('MAX_LAG_SECONDS') + get_read_replica_setting('LAG_CHECK_SECONDS')
+    return max(get_read_replica_setting('PIN_SECONDS'), tolerated_lag)
+
+
+def replica_alias():
+    """Alias of the configured replica, or None"""
+    alias = get_read_replica_setting('ALIAS')
+    return alias if alias in settings.DATABASES else None
+
+
+# ================================
+# REPLICATION LAG
+# ================================
+
+def _mysql_lag(cursor):
+    for statement, column in (
+        ('SHOW REPLICA STATUS', 'Seconds_Behind_Source'),
+        ('SHOW SLAVE STATUS', 'Seconds_Behind_Master'),
+    ):
+        try:
+            cursor.execute(statement)
+        except Exception:
+            continue
+        row = cursor.fetchone()
+        if row is None:
+            return 0  # Not a replica (e.g. a second primary in development)
+        status = dict(zip([column_info[0] for column_info in cursor.description], row))
+        # NULL while replication is stopped
+        return status.get(column)
+    return None
+
+
+def replication_lag(alias):
+    """Seconds the replica is behind the primary; 0 when unknown, None when unreachable"""
+    try:
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                return _mysql_lag(cursor)
+            cursor.execute('SELECT 1')
+            return 0
+    except Exception as e:
+        logger.warning(f"Read replica '{alias}' unavailable: {e}")
+        return None
+
+
+def replica_is_healthy(alias):
+    """Whether the replica is reachable and within MAX_LAG_SECONDS; cached per worker"""
+    now = time.monotonic()
+    checked = _lag_checks.get(alias)
+    if checked and now - checked[0] < get_read_replica_setting('LAG_CHECK_SECONDS'):
+        return checked[1]
+
+    with _lag_lock:
+        checked = _lag_checks.get(alias)
+        if checked and now - checked[0] < get_read_replica_setting('LAG_CHECK_SECONDS'):
+            return checked[1]
+        lag = replication_lag(alias)
+        healthy = lag is not None and lag <= get_read_replica_setting('MAX_LAG_SECONDS')
+        if lag is not None and not healthy:
+            logger.warning(f"Read replica '{alias}' is {lag} s behind; reading from the primary")
+        _lag_checks[alias] = (now, healthy)
+        return healthy
+
+
+# ================================
+# ROUTING STATE
+# ================================
+
+class read_replica(ContextDecorator):
+    """
+    Route reads to the replica inside the block or decorated view (when it
+    is configured, healthy and the request is not pinned to the primary).
+    """
+
+    def __enter__(self):
+        _local.depth = getattr(_local, 'depth', 0) + 1
+        return self
+
+    def __exit__(self, *exc):
+        _local.depth -= 1
+        return False
+
+
+def pinned_to_primary():
+    return getattr(_local, 'pinned', False)
+
+
+def use_replica():
+    """Alias reads should use right now, or None for the primary"""
+    if not getattr(_local, 'depth', 0) or pinned_to_primary():
+        return None
+    alias = replica_alias()
+    if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return None
+    return alias if replica_is_healthy(alias) else None
+
+
+class ReplicaRouter:
+    """Reads inside read_replica() go to the replica; everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        return use_replica()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica rows are copies of primary rows
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == get_read_replica_setting('ALIAS') and db != DEFAULT_DB_ALIAS:
+            return False
+        return None
+
+
+# ================================
+# MIDDLEWARE
+# ================================
+
+@functools.lru_cache(maxsize=1024)
+def _is_replica_view(view_name, patterns):
+    return any(fnmatch.fnmatchcase(view_name, pattern) for pattern in patterns)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serves the READ_REPLICA['VIEWS'] from the replica on safe requests and
+    pins a browser to the primary for PIN_SECONDS after it changes something.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        cookie = get_read_replica_setting('PIN_COOKIE')
+        try:
+            pinned_until = float(request.COOKIES.get(cookie, 0))
+        except ValueError:
+            pinned_until = 0
+        _local.pinned = pinned_until > time.time()
+        request._replica_routing = None
+
+        try:
+            response = self.get_response(request)
+        finally:
+            if request._replica_routing is not None:
+                request._replica_routing.__exit__(None, None, None)
+            _local.pinned = False
+
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            seconds = pin_seconds()
+            response.set_cookie(
+                cookie, str(int(time.time() + seconds)), max_age=seconds,
+                httponly=True, samesite='Lax', secure=request.is_secure(),
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in ('GET', 'HEAD') or replica_alias() is None:
+            return None
+        match = request.resolver_match
+        patterns = tuple(get_read_replica_setting('VIEWS'))
+        if match and patterns and _is_replica_view(match.view_name, patterns):
+            request._replica_routing = read_replica()
+            request._replica_routing.__enter__()
+        return None
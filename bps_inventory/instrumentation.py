@@ -0,0 +1,501 @@
+# bps_inventory/instrumentation.py - Request Instrumentation
+"""
+Per-view latency, SQL and cache metrics.
+
+RequestMetricsMiddleware wraps every request and
+- times it and attributes it to the resolved view name;
+- counts SQL statements and their time on every database connection
+  (execute_wrapper);
+- fingerprints the statements (literals and IN lists collapsed) and flags
+  requests that run one statement DUPLICATE_QUERY_THRESHOLD times or more,
+  the usual sign of an N+1 loop (logged once per view and statement);
+- counts two-tier cache hits and misses made while serving it;
+- checks the view's query budget (query_budget decorator, or
+  INSTRUMENTATION['BUDGETS'] by view name) and logs violations.
+
+Each request becomes one sample. Samples are added to this worker's
+per-view counters and latency histograms (prometheus_text(), served at
+/metrics/) and queued for a background writer that adds them to
+RequestMetric rows, one per view and BUCKET_MINUTES window, so summary()
+reports across all workers. Streaming responses are measured up to the
+point the response object is returned.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .batch_writer import BatchWriter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INSTRUMENTATION = {
+    'ENABLED': True,
+    # Upper bounds of the latency histogram buckets
+    'LATENCY_BUCKETS_MS': [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000],
+    'DUPLICATE_QUERY_THRESHOLD': 5,
+    'SLOW_REQUEST_MS': 2000,
+    # View name -> {'max_queries': n, 'max_query_ms': n, 'max_duplicates': n}
+    'BUDGETS': {},
+    'EXCLUDE_PATHS': ['/static/', '/media/', '/metrics/'],
+    'BUCKET_MINUTES': 5,
+    'RETENTION_DAYS': 7,
+    'BATCH_SIZE': 1000,
+    'FLUSH_INTERVAL_SECONDS': 30,
+    'QUEUE_SIZE': 20000,
+    # Bearer token accepted by /metrics/ besides staff sessions
+    'METRICS_TOKEN': '',
+}
+
+BUDGET_LIMITS = ['max_queries', 'max_query_ms', 'max_duplicates']
+
+
+def get_instrumentation_setting(name):
+    return getattr(settings, 'INSTRUMENTATION', {}).get(name, DEFAULT_INSTRUMENTATION[name])
+
+
+def query_budget(max_queries=None, max_query_ms=None, max_duplicates=None):
+    """
+    Declare the SQL a view should stay within; RequestMetricsMiddleware logs
+    and counts requests that exceed it. Settings BUDGETS take precedence.
+    """
+    limits = {'max_queries': max_queries, 'max_query_ms': max_query_ms, 'max_duplicates': max_duplicates}
+
+    def decorator(view):
+        view.query_budget = {name: value for name, value in limits.items() if value is not None}
+        return view
+    return decorator
+
+
+# ================================
+# SQL FINGERPRINTS
+# ================================
+
+_IN_LIST = re.compile(r'\bIN\s*\(\s*%s(?:\s*,\s*%s)*\s*\)', re.IGNORECASE)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Statement with parameters, literals and IN lists normalised"""
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _LITERALS.sub('?', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+def duplicate_statements(statements, threshold):
+    """{fingerprint: executions} of the statements run at least threshold times"""
+    counts = Counter()
+    for sql, executions in statements.items():
+        counts[fingerprint(sql)] += executions
+    return {sql: executions for sql, executions in counts.items() if executions >= threshold}
+
+
+class QueryCollector:
+    """execute_wrapper counting statements and their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+
+# ================================
+# CACHE EVENTS
+# ================================
+
+_local = threading.local()
+
+
+def note_cache_event(name, amount=1):
+    """Called by the two-tier cache for every hit or miss"""
+    events = getattr(_local, 'cache_events', None)
+    if events is not None:
+        events[name] += amount
+
+
+# ================================
+# AGGREGATION
+# ================================
+
+class RequestSample:
+    __slots__ = [
+        'view', 'status', 'latency_ms', 'queries', 'query_ms', 'duplicates',
+        'cache_hits', 'cache_misses', 'budget_violated', 'at',
+    ]
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+class ViewStats:
+    """Counters and latency histogram of one view"""
+
+    FIELDS = [
+        'requests', 'errors', 'latency_ms', 'queries', 'query_ms',
+        'duplicate_query_requests', 'budget_violations', 'cache_hits', 'cache_misses',
+    ]
+
+    def __init__(self, bucket_count):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+        # One count per LATENCY_BUCKETS_MS bound, plus the overflow bucket
+        self.latency_buckets = [0] * (bucket_count + 1)
+
+    def add(self, sample, bounds):
+        self.requests += 1
+        self.errors += sample.status >= 500
+        self.latency_ms += sample.latency_ms
+        self.queries += sample.queries
+        self.query_ms += sample.query_ms
+        self.duplicate_query_requests += bool(sample.duplicates)
+        self.budget_violations += sample.budget_violated
+        self.cache_hits += sample.cache_hits
+        self.cache_misses += sample.cache_misses
+        self.latency_buckets[_bucket_index(sample.latency_ms, bounds)] += 1
+
+
+def _bucket_index(latency_ms, bounds):
+    for index, bound in enumerate(bounds):
+        if latency_ms <= bound:
+            return index
+    return len(bounds)
+
+
+def percentile(buckets, bounds, fraction):
+    """Upper bound of the histogram bucket holding the given fraction of requests"""
+    total = sum(buckets)
+    if not total:
+        return None
+    target = total * fraction
+    running = 0
+    for index, count in enumerate(buckets):
+        running += count
+        if running >= target:
+            return bounds[index] if index < len(bounds) else float('inf')
+    return float('inf')
+
+
+class MetricsRegistry:
+    """This worker's per-view totals since it started"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.views = {}
+        self.started_at = time.time()
+
+    def add(self, sample):
+        bounds = get_instrumentation_setting('LATENCY_BUCKETS_MS')
+        with self._lock:
+            stats = self.views.get(sample.view)
+            if stats is None:
+                stats = self.views[sample.view] = ViewStats(len(bounds))
+            stats.add(sample, bounds)
+
+    def snapshot(self):
+        with self._lock:
+            return {view: _copy_stats(stats) for view, stats in self.views.items()}
+
+
+def _copy_stats(stats):
+    copy = ViewStats(len(stats.latency_buckets) - 1)
+    for name in ViewStats.FIELDS:
+        setattr(copy, name, getattr(stats, name))
+    copy.latency_buckets = list(stats.latency_buckets)
+    return copy
+
+
+registry = MetricsRegistry()
+
+
+class RequestMetricsWriter(BatchWriter):
+    """Adds queued samples to the RequestMetric row of their view and window"""
+
+    thread_name = 'request-metrics'
+    item_name = 'request samples'
+
+    def __init__(self):
+        super().__init__(
+            get_instrumentation_setting('BATCH_SIZE'),
+            get_instrumentation_setting('FLUSH_INTERVAL_SECONDS'),
+            get_instrumentation_setting('QUEUE_SIZE'),
+        )
+        self._pruned_at = 0
+
+    def write_batch(self, batch):
+        from inventory.models import RequestMetric
+
+        bounds = get_instrumentation_setting('LATENCY_BUCKETS_MS')
+        windows = {}
+        for sample in batch:
+            key = (window_start(sample.at), sample.view)
+            if key not in windows:
+                windows[key] = ViewStats(len(bounds))
+            windows[key].add(sample, bounds)
+
+        for (period, view), stats in windows.items():
+            with transaction.atomic():
+                row, _created = RequestMetric.objects.select_for_update().get_or_create(
+                    period=period, view_name=view[:200],
+                )
+                for name in ViewStats.FIELDS:
+                    setattr(row, name, getattr(row, name) + getattr(stats, name))
+                previous = row.latency_buckets or []
+                row.latency_buckets = [
+                    count + (previous[index] if index < len(previous) else 0)
+                    for index, count in enumerate(stats.latency_buckets)
+                ]
+                row.save()
+
+        if time.monotonic() - self._pruned_at > 3600:
+            self._pruned_at = time.monotonic()
+            cutoff = timezone.now() - timedelta(days=get_instrumentation_setting('RETENTION_DAYS'))
+            RequestMetric.objects.filter(period__lt=cutoff).delete()
+
+
+metrics_writer = RequestMetricsWriter()
+
+
+def window_start(moment):
+    minutes = get_instrumentation_setting('BUCKET_MINUTES')
+    return moment.replace(minute=moment.minute - moment.minute % minutes, second=0, microsecond=0)
+
+
+# ================================
+# MIDDLEWARE
+# ================================
+
+def _budget_problems(budget, sample, worst_duplicate):
+    problems = []
+    if 'max_queries' in budget and sample.queries > budget['max_queries']:
+        problems.append(f"{sample.queries} queries > {budget['max_queries']}")
+    if 'max_query_ms' in budget and sample.query_ms > budget['max_query_ms']:
+        problems.append(f"{sample.query_ms:.0f} ms of SQL > {budget['max_query_ms']} ms")
+    if 'max_duplicates' in budget and worst_duplicate > budget['max_duplicates']:
+        problems.append(f"statement repeated {worst_duplicate} times > {budget['max_duplicates']}")
+    return problems
+
+
+class RequestMetricsMiddleware:
+    """Record latency, SQL, duplicate queries, cache use and budget violations per request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._reported_duplicates = set()
+
+    def __call__(self, request):
+        if not get_instrumentation_setting('ENABLED') or request.path.startswith(
+            tuple(get_instrumentation_setting('EXCLUDE_PATHS'))
+        ):
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        _local.cache_events = Counter()
+        status = 500
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(collector))
+                response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            cache_events, _local.cache_events = _local.cache_events, None
+            try:
+                self.record(request, status, elapsed_ms, collector, cache_events)
+            except Exception as e:
+                logger.warning(f"Failed to record request metrics: {e}")
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = getattr(view_func, 'query_budget', None)
+
+    def record(self, request, status, elapsed_ms, collector, cache_events):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else None) or '<unresolved>'
+        duplicates = duplicate_statements(collector.statements, get_instrumentation_setting('DUPLICATE_QUERY_THRESHOLD'))
+
+        sample = RequestSample(
+            view=view,
+            status=status,
+            latency_ms=elapsed_ms,
+            queries=collector.count,
+            query_ms=collector.seconds * 1000,
+            duplicates=len(duplicates),
+            cache_hits=cache_events['l1_hits'] + cache_events['l2_hits'],
+            cache_misses=cache_events['misses'],
+            budget_violated=False,
+            at=timezone.now(),
+        )
+
+        budget = get_instrumentation_setting('BUDGETS').get(view) or getattr(request, 'query_budget', None)
+        if budget:
+            problems = _budget_problems(budget, sample, max(duplicates.values(), default=0))
+            if problems:
+                sample.budget_violated = True
+                logger.warning(f"Query budget exceeded by {view} ({request.path}): {'; '.join(problems)}")
+
+        for sql, executions in duplicates.items():
+            if (view, sql) not in self._reported_duplicates:
+                self._reported_duplicates.add((view, sql))
+                logger.warning(f"Possible N+1 in {view}: statement run {executions} times in one request: {sql[:300]}")
+
+        if elapsed_ms >= get_instrumentation_setting('SLOW_REQUEST_MS'):
+            logger.warning(
+                f"Slow request {request.method} {request.path} ({view}): "
+                f"{elapsed_ms:.0f} ms, {sample.queries} queries in {sample.query_ms:.0f} ms"
+            )
+
+        registry.add(sample)
+        metrics_writer.put(sample)
+
+
+# ================================
+# REPORTING
+# ================================
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    """This worker's totals in the Prometheus text exposition format"""
+    bounds = get_instrumentation_setting('LATENCY_BUCKETS_MS')
+    views = registry.snapshot()
+    counters = [
+        ('bps_http_requests_total', 'Requests handled', 'requests', 1),
+        ('bps_http_errors_total', 'Requests answered with a 5xx status', 'errors', 1),
+        ('bps_db_queries_total', 'SQL statements executed', 'queries', 1),
+        ('bps_db_query_seconds_total', 'Time spent executing SQL', 'query_ms', 0.001),
+        ('bps_duplicate_query_requests_total', 'Requests repeating one statement past the threshold',
+         'duplicate_query_requests', 1),
+        ('bps_query_budget_violations_total', 'Requests exceeding their query budget', 'budget_violations', 1),
+        ('bps_cache_hits_total', 'Cache hits while serving requests', 'cache_hits', 1),
+        ('bps_cache_misses_total', 'Cache misses while serving requests', 'cache_misses', 1),
+    ]
+
+    lines = []
+    for metric, description, field, scale in counters:
+        lines.append(f'# HELP {metric} {description}, by view')
+        lines.append(f'# TYPE {metric} counter')
+        for view, stats in sorted(views.items()):
+            lines.append(f'{metric}{{view="{_label(view)}"}} {getattr(stats, field) * scale:g}')
+
+    metric = 'bps_http_request_duration_seconds'
+    lines.append(f'# HELP {metric} Request latency, by view')
+    lines.append(f'# TYPE {metric} histogram')
+    for view, stats in sorted(views.items()):
+        label = _label(view)
+        running = 0
+        for bound, count in zip(bounds, stats.latency_buckets):
+            running += count
+            lines.append(f'{metric}_bucket{{view="{label}",le="{bound / 1000:g}"}} {running}')
+        lines.append(f'{metric}_bucket{{view="{label}",le="+Inf"}} {stats.requests}')
+        lines.append(f'{metric}_sum{{view="{label}"}} {stats.latency_ms / 1000:g}')
+        lines.append(f'{metric}_count{{view="{label}"}} {stats.requests}')
+
+    lines.append('# HELP bps_process_start_time_seconds Start time of this worker')
+    lines.append('# TYPE bps_process_start_time_seconds gauge')
+    lines.append(f'bps_process_start_time_seconds {registry.started_at:.0f}')
+    return '\n'.join(lines) + '\n'
+
+
+def _latency_label(value, bounds):
+    if value is None:
+        return '-'
+    if value > bounds[-1]:
+        return f'> {bounds[-1]}ms'
+    return f'\u2264 {value}ms'
+
+
+def _rates(totals):
+    requests = totals['requests'] or 0
+    lookups = (totals['cache_hits'] or 0) + (totals['cache_misses'] or 0)
+    return {
+        'avg_latency_ms': round(totals['latency_ms'] / requests, 1) if requests else 0,
+        'avg_queries': round(totals['queries'] / requests, 1) if requests else 0,
+        'avg_query_ms': round(totals['query_ms'] / requests, 1) if requests else 0,
+        'error_rate': round(totals['errors'] * 100 / requests, 2) if requests else 0,
+        'success_rate': round(100 - totals['errors'] * 100 / requests, 2) if requests else 100,
+        'cache_hit_rate': round(totals['cache_hits'] * 100 / lookups, 1) if lookups else 0,
+    }
+
+
+def process_summary():
+    """Overall figures of this worker since it started, without touching the database"""
+    totals = {name: 0 for name in ViewStats.FIELDS}
+    for stats in registry.snapshot().values():
+        for name in ViewStats.FIELDS:
+            totals[name] += getattr(stats, name)
+    return {**totals, **_rates(totals)}
+
+
+def summary(hours=1, limit=10):
+    """
+    Figures across all workers over the last hours, from RequestMetric
+    rows: totals and rates, requests and errors per hour, and the slowest
+    views by p95 latency
+    """
+    from inventory.models import RequestMetric
+
+    bounds = get_instrumentation_setting('LATENCY_BUCKETS_MS')
+    rows = RequestMetric.objects.filter(period__gte=timezone.now() - timedelta(hours=hours))
+    totals = rows.aggregate(**{name: Sum(name) for name in ViewStats.FIELDS})
+    totals = {name: value or 0 for name, value in totals.items()}
+
+    per_view = {}
+    for row in rows.values('view_name', 'latency_buckets', *ViewStats.FIELDS):
+        view = per_view.setdefault(row['view_name'], {
+            **{name: 0 for name in ViewStats.FIELDS}, 'latency_buckets': [0] * (len(bounds) + 1),
+        })
+        for name in ViewStats.FIELDS:
+            view[name] += row[name]
+        for index, count in enumerate((row['latency_buckets'] or [])[:len(bounds) + 1]):
+            view['latency_buckets'][index] += count
+
+    views = []
+    for name, view in per_view.items():
+        p50 = percentile(view['latency_buckets'], bounds, 0.5)
+        p95 = percentile(view['latency_buckets'], bounds, 0.95)
+        views.append({
+            'view': name,
+            'requests': view['requests'],
+            'errors': view['errors'],
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'p50': _latency_label(p50, bounds),
+            'p95': _latency_label(p95, bounds),
+            'duplicate_query_requests': view['duplicate_query_requests'],
+            'budget_violations': view['budget_violations'],
+            **_rates(view),
+        })
+    views.sort(key=lambda view: (view['p95_ms'] or 0, view['avg_latency_ms']), reverse=True)
+
+    return {
+        **totals,
+        **_rates(totals),
+        'hours': hours,
+        'requests_per_hour': round(totals['requests'] / hours, 1),
+        'errors_per_hour': round(totals['errors'] / hours, 1),
+        'views': views[:limit],
+    }
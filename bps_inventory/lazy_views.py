@@ -0,0 +1,66 @@
+# bps_inventory/lazy_views.py - Lazily Imported Views
+"""
+URLconf helpers that defer importing a view module until one of its views
+is requested.
+
+    views = LazyViewModule('inventory.views')
+    path('devices/', views.device_list, name='device_list')
+
+``views.device_list`` is a LazyView: loading the URLconf only records the
+module path and name, and the module is imported the first time the view is
+called or one of its other attributes (csrf_exempt ...) is read. Afterwards
+the resolved view is cached on the LazyView.
+
+Only function views can be wrapped: class-based views (as_view()) should be
+imported directly, since LazyView reports no view_class.
+"""
+
+from importlib import import_module
+
+
+class LazyView:
+    """Callable standing in for module_path.name until it is first needed"""
+
+    def __init__(self, module_path, name):
+        self.module_path = module_path
+        self.name = name
+        self._view = None
+        # Read by URL resolution and debug pages; answered without importing
+        self.__module__ = module_path
+        self.__name__ = self.__qualname__ = name
+
+    @property
+    def view(self):
+        if self._view is None:
+            self._view = getattr(import_module(self.module_path), self.name)
+        return self._view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+    def __getattr__(self, attr):
+        # Only reached for attributes not set in __init__ (decorator flags
+        # such as csrf_exempt ...); guard against lookups made before
+        # __init__ ran
+        if attr in ('module_path', 'name', '_view'):
+            raise AttributeError(attr)
+        if attr == 'view_class':
+            # Probed for every pattern when the URLconf is first reversed;
+            # LazyView is only used for function views
+            raise AttributeError(attr)
+        return getattr(self.view, attr)
+
+    def __repr__(self):
+        return f"<LazyView {self.module_path}.{self.name}>"
+
+
+class LazyViewModule:
+    """Stand-in for a views module whose attributes are LazyViews"""
+
+    def __init__(self, module_path):
+        self.module_path = module_path
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return LazyView(self.module_path, name)
@@ -0,0 +1,353 @@
+# bps_inventory/pagination.py - Pagination Helpers
+"""
+Pagination for very large tables (AuditLog, QRCodeScan, Device, ...).
+
+A plain Paginator runs an exact COUNT(*) on every page view, which is a full
+index scan on tables with millions of rows. EstimatedCountPaginator answers
+unfiltered listings from the database's table statistics and counts filtered
+listings only a few pages past the requested one, so the page count is
+approximate but cheap and every page stays reachable.
+
+KeysetPaginator goes further and drops OFFSET: each page is fetched with a
+WHERE clause on the ordering columns of the previous page's last row (e.g.
+``(timestamp, id) < (...)``), which walks an index regardless of depth and
+never skips or repeats rows when new rows are inserted meanwhile. Positions
+travel as opaque signed cursor tokens, so the same pages back template views
+(?cursor=...) and JSON endpoints (``next_cursor`` in the response).
+"""
+
+import datetime
+import decimal
+import logging
+import uuid
+from urllib.parse import urlencode
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+ESTIMATE_CACHE_TIMEOUT = 60
+
+
+def estimate_table_rows(model, using='default'):
+    """
+    Approximate row count of a model's table from the database statistics,
+    or None when the backend keeps no usable statistics (e.g. SQLite).
+    """
+    table = model._meta.db_table
+    cache_key = f'table_estimate_{using}_{table}'
+    estimate = cache.get(cache_key)
+    if estimate is not None:
+        return estimate
+
+    connection = connections[using]
+    if connection.vendor == 'mysql':
+        sql = (
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+        )
+    elif connection.vendor == 'postgresql':
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s"
+    else:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except Exception as e:
+        logger.warning(f"Failed to read table statistics for {table}: {e}")
+        return None
+
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    estimate = int(row[0])
+    cache.set(cache_key, estimate, ESTIMATE_CACHE_TIMEOUT)
+    return estimate
+
+
+def approximate_count(queryset, estimate_threshold=10000, count_cap=10000):
+    """
+    Row count of queryset that is exact for small results, taken from table
+    statistics for large unfiltered tables and capped at count_cap otherwise.
+    """
+    if not queryset.query.where:
+        estimate = estimate_table_rows(queryset.model, using=queryset.db)
+        if estimate is not None and estimate >= estimate_threshold:
+            return estimate
+
+    # COUNT over a LIMITed subquery stops scanning after count_cap rows
+    return queryset.order_by()[:count_cap].count()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose count comes from table statistics for unfiltered
+    querysets above estimate_threshold rows. Filtered ones are counted up to
+    count_cap rows or pages_ahead pages past current_page, whichever is
+    further; count_is_capped tells that more rows exist than counted.
+    """
+
+    estimate_threshold = 10000
+    count_cap = 10000
+    pages_ahead = 10
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, current_page=1):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.current_page = current_page
+        self.count_is_capped = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        if not queryset.query.where:
+            estimate = estimate_table_rows(queryset.model, using=queryset.db)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+
+        limit = max(self.count_cap, (self.current_page + self.pages_ahead) * self.per_page)
+        # One row past the limit tells whether there are more
+        count = queryset.order_by()[:limit + 1].count()
+        self.count_is_capped = count > limit
+        return min(count, limit)
+
+
+# ================================
+# KEYSET (CURSOR) PAGINATION
+# ================================
+
+CURSOR_SALT = 'bps_inventory.pagination.cursor'
+
+
+class InvalidCursor(ValueError):
+    """Raised for cursor tokens that are malformed, tampered with or stale"""
+
+
+def _cursor_value(value):
+    # Full-precision text for types JSON cannot carry; microseconds matter
+    # for (timestamp, id) keys
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+class KeysetPaginator:
+    """
+    Paginate queryset by ``ordering``, a sequence of non-null fields that is
+    unique as a whole (end it with the primary key), e.g. ('-timestamp', '-id')
+    or ('device_id',). The columns should be covered by an index.
+
+    Pass total_count when the caller already knows the exact row count.
+    """
+
+    def __init__(self, queryset, ordering, per_page=25, total_count=None,
+                 estimate_threshold=10000, count_cap=10000):
+        self.queryset = queryset
+        self.known_count = total_count
+        self.ordering = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+        self.per_page = per_page
+        self.estimate_threshold = estimate_threshold
+        self.count_cap = count_cap
+        self._key_fields = [self._resolve_field(name) for name, _descending in self.ordering]
+
+    def _resolve_field(self, name):
+        model = self.queryset.model
+        parts = name.split('__')
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        field = model._meta.get_field(parts[-1])
+        return model._meta.pk if field.is_relation else field
+
+    @property
+    def signature(self):
+        """Identifies the listing a cursor belongs to"""
+        table = self.queryset.model._meta.db_table
+        return f"{table}:{','.join(('-' if desc else '') + name for name, desc in self.ordering)}"
+
+    # Cursor tokens
+
+    def encode_cursor(self, key, direction):
+        return signing.dumps(
+            {'s': self.signature, 'k': [_cursor_value(value) for value in key], 'd': direction},
+            salt=CURSOR_SALT, compress=True,
+        )
+
+    def decode_cursor(self, token):
+        try:
+            payload = signing.loads(token, salt=CURSOR_SALT)
+            if payload['s'] != self.signature or payload['d'] not in ('n', 'p'):
+                raise InvalidCursor('Cursor does not belong to this listing')
+            key = [field.to_python(value) for field, value in zip(self._key_fields, payload['k'], strict=True)]
+        except (signing.BadSignature, KeyError, TypeError, ValueError) as e:
+            if isinstance(e, InvalidCursor):
+                raise
+            raise InvalidCursor('Invalid pagination cursor') from e
+        return key, payload['d']
+
+    # Queries
+
+    def _order_by(self, reverse=False):
+        return [
+            ('-' if descending != reverse else '') + name
+            for name, descending in self.ordering
+        ]
+
+    def _seek(self, key, forward):
+        """Q selecting rows after (forward) or before key in the ordering"""
+        condition = Q()
+        for index, (name, descending) in enumerate(self.ordering):
+            lookup = 'lt' if descending == forward else 'gt'
+            step = Q(**{f'{name}__{lookup}': key[index]})
+            for prior, (prior_name, _descending) in enumerate(self.ordering[:index]):
+                step &= Q(**{prior_name: key[prior]})
+            condition |= step
+        return condition
+
+    def _key_of(self, row):
+        if isinstance(row, dict):
+            return [row[f'_keyset_{index}'] for index in range(len(self.ordering))]
+        return [getattr(row, f'_keyset_{index}') for index in range(len(self.ordering))]
+
+    def page(self, cursor=None):
+        """Return the CursorPage at cursor; raises InvalidCursor"""
+        queryset = self.queryset.annotate(**{
+            f'_keyset_{index}': F(name) for index, (name, _descending) in enumerate(self.ordering)
+        })
+        forward = True
+        if cursor:
+            key, direction = self.decode_cursor(cursor)
+            forward = direction == 'n'
+            queryset = queryset.filter(self._seek(key, forward))
+
+        rows = list(queryset.order_by(*self._order_by(reverse=not forward))[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        return CursorPage(
+            rows, self,
+            has_next=has_more if forward else True,
+            has_previous=bool(cursor) if forward else has_more,
+        )
+
+    def get_page(self, cursor=None):
+        """Like page(), but falls back to the first page on a bad cursor"""
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page(None)
+
+    @cached_property
+    def total_count(self):
+        """Approximate number of rows in the listing (see approximate_count)"""
+        if self.known_count is not None:
+            return self.known_count
+        return approximate_count(self.queryset, self.estimate_threshold, self.count_cap)
+
+
+class CursorPage:
+    """One page of a KeysetPaginator, iterable like a Django Page"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.query_params = {}
+        self.cursor_param = 'cursor'
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @cached_property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.encode_cursor(self.paginator._key_of(self.object_list[-1]), 'n')
+
+    @cached_property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.encode_cursor(self.paginator._key_of(self.object_list[0]), 'p')
+
+    @property
+    def total_count(self):
+        return self.paginator.total_count
+
+    @property
+    def total_is_exact(self):
+        return self.paginator.known_count is not None or self.total_count < self.paginator.count_cap
+
+    # Query strings for template links, keeping the other GET parameters
+
+    def _query(self, cursor):
+        params = {key: value for key, value in self.query_params.items() if key != self.cursor_param}
+        if cursor:
+            params[self.cursor_param] = cursor
+        return urlencode(params, doseq=True)
+
+    @property
+    def first_query(self):
+        return self._query(None)
+
+    @property
+    def next_query(self):
+        return self._query(self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self._query(self.previous_cursor)
+
+    def to_dict(self, include_total=False):
+        """Pagination metadata for JSON responses"""
+        data = {
+            'next_cursor': self.next_cursor,
+            'previous_cursor': self.previous_cursor,
+            'has_next': self.has_next(),
+            'has_previous': self.has_previous(),
+            'count': len(self.object_list),
+        }
+        if include_total:
+            data['approximate_total'] = self.total_count
+        return data
+
+
+def paginate_keyset(request, queryset, ordering, per_page=25, cursor_param='cursor', strict=False,
+                    total_count=None):
+    """
+    Keyset-paginate queryset for a request, reading the cursor from
+    request.GET[cursor_param]. With strict=True a bad cursor raises
+    InvalidCursor (for APIs); otherwise it restarts at the first page.
+    """
+    paginator = KeysetPaginator(queryset, ordering, per_page=per_page, total_count=total_count)
+    cursor = request.GET.get(cursor_param)
+    page = paginator.page(cursor) if strict else paginator.get_page(cursor)
+    page.query_params = {key: request.GET.getlist(key) for key in request.GET}
+    page.cursor_param = cursor_param
+    return page
@@ -0,0 +1,151 @@
+# bps_inventory/public_verify.py - Public QR Verification Fast Path
+"""
+Data behind the unauthenticated /verify/<device_id>/ page that every printed
+QR sticker points to.
+
+Each device's public details are reduced to a small verification snapshot,
+cached under the device's cache tag so a device or assignment change expires
+it (see inventory.cache_tags). The snapshot carries its own ETag and
+Last-Modified so browsers and edge caches can revalidate without a body.
+Unknown ids are cached too, so probing random ids does not reach the
+database. Requests are rate limited per client IP in the shared cache.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils import timezone
+
+from .cache import set_tagged
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PUBLIC_VERIFY = {
+    'SNAPSHOT_TIMEOUT': 3600,
+    'MISSING_TIMEOUT': 60,
+    'MAX_AGE': 60,
+    'RATE_LIMIT': 60,
+    'RATE_WINDOW_SECONDS': 60,
+}
+
+MAX_DEVICE_ID_LENGTH = 50
+MISSING = 'missing'
+
+
+def get_public_verify_setting(name):
+    return getattr(settings, 'PUBLIC_VERIFY', {}).get(name, DEFAULT_PUBLIC_VERIFY[name])
+
+
+def _cache_key(device_id):
+    digest = hashlib.md5(device_id.encode('utf-8')).hexdigest()
+    return f'public_verify_{digest}'
+
+
+def build_verification_snapshot(device_id):
+    """Public details of a device and its active assignment, or None"""
+    from inventory.models import Assignment, Device
+
+    device = Device.objects.select_related(
+        'device_type__subcategory__category',
+        'location__building', 'location__block', 'location__floor',
+        'location__department', 'location__room',
+    ).filter(device_id=device_id).first()
+    if device is None:
+        return None
+
+    assignment = Assignment.objects.filter(device=device, is_active=True).select_related(
+        'assigned_to_staff__user', 'assigned_to_department',
+    ).order_by('-start_date').first()
+
+    category = None
+    if device.device_type and device.device_type.subcategory:
+        category = device.device_type.subcategory.category.name
+
+    today = timezone.now().date()
+    public = {
+        'device_id': device.device_id,
+        'asset_tag': device.asset_tag,
+        'device_name': device.device_name,
+        'brand': device.brand,
+        'model': device.model,
+        'category': category,
+        'status': device.status,
+        'status_display': device.get_status_display(),
+        'condition': device.get_device_condition_display(),
+        'location': str(device.location) if device.location else None,
+        'warranty_end_date': device.warranty_end_date.isoformat() if device.warranty_end_date else None,
+        'warranty_active': bool(device.warranty_end_date and device.warranty_end_date >= today),
+        'assigned_to': None,
+        'assigned_department': None,
+        'assignment_type': None,
+    }
+    last_modified = device.updated_at
+    staff_id = None
+    if assignment:
+        staff = assignment.assigned_to_staff
+        staff_id = staff.pk if staff else None
+        public['assigned_to'] = staff.full_name if staff else None
+        public['assigned_department'] = (
+            assignment.assigned_to_department.name if assignment.assigned_to_department else None
+        )
+        public['assignment_type'] = assignment.get_assignment_type_display()
+        last_modified = max(last_modified, assignment.updated_at)
+
+    body = json.dumps(public, sort_keys=True)
+    return {
+        'public': public,
+        'etag': '"%s"' % hashlib.sha1(body.encode('utf-8')).hexdigest(),
+        'last_modified': last_modified,
+        # Recorded with each scan, not shown publicly
+        'location_id': device.location_id,
+        'staff_id': staff_id,
+    }
+
+
+def get_verification_snapshot(device_id):
+    """Cached verification snapshot for device_id, or None if unknown"""
+    from inventory.cache_tags import device_tag
+
+    if not device_id or len(device_id) > MAX_DEVICE_ID_LENGTH:
+        return None
+
+    key = _cache_key(device_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_verification_snapshot(device_id)
+        if snapshot is None:
+            set_tagged(key, MISSING, get_public_verify_setting('MISSING_TIMEOUT'), [device_tag(device_id)])
+        else:
+            set_tagged(key, snapshot, get_public_verify_setting('SNAPSHOT_TIMEOUT'), [device_tag(device_id)])
+    return None if snapshot == MISSING else snapshot
+
+
+def is_rate_limited(ip_address):
+    """
+    Count a request from ip_address against a fixed window in the shared
+    cache; return the seconds to wait when over the limit, else 0.
+    """
+    limit = get_public_verify_setting('RATE_LIMIT')
+    if not limit or not ip_address:
+        return 0
+
+    window = get_public_verify_setting('RATE_WINDOW_SECONDS')
+    now = int(timezone.now().timestamp())
+    key = f'public_verify_rate_{ip_address}_{now // window}'
+    shared = caches['shared']
+    try:
+        shared.add(key, 0, window)
+        count = shared.incr(key)
+    except ValueError:
+        # The window expired between add() and incr()
+        return 0
+    except Exception as e:
+        logger.warning(f"Public verification rate limit check failed: {e}")
+        return 0
+
+    if count > limit:
+        return window - now % window
+    return 0
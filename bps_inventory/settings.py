@@ -6,6 +6,7 @@ Enhanced with Phase 3 functionality and all necessary configurations.
 
 from pathlib import Path
 import os
+import tempfile
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,9 +43,12 @@ INSTALLED_APPS = [
     'authentication',
     'reports',
     'qr_management',
+    'api',
 ]
 
 MIDDLEWARE = [
+    'bps_inventory.instrumentation.RequestMetricsMiddleware',
+    'bps_inventory.db_router.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -52,8 +56,10 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'inventory.audit.AuditBufferMiddleware',
     
     # Custom Authentication Middleware (moved after MessageMiddleware)
+    'authentication.middleware.ApiKeyAuthenticationMiddleware',
     'authentication.middleware.AuthenticationManagementMiddleware',
     'authentication.middleware.SessionSecurityMiddleware',
     'authentication.middleware.RoleBasedAccessMiddleware',
@@ -115,17 +121,10 @@ TEMPLATES = [
                 'django.template.context_processors.static',
                 'django.template.context_processors.tz',
                 
-                # BPS Custom Context Processors (Main)
-                'bps_inventory.context_processors.bps_settings',
-                'bps_inventory.context_processors.user_context',
-                'bps_inventory.context_processors.navigation_context',
-                'bps_inventory.context_processors.notification_context',
-                'bps_inventory.context_processors.system_stats_context',
-                
-                # Legacy inventory context processors (for backward compatibility)
-                'inventory.context_processors.bps_settings',
-                'inventory.context_processors.notification_context',
-                'inventory.context_processors.quick_stats',           
+                # BPS unified context processor: settings, user, navigation,
+                # notifications and stats (including the legacy quick_stats),
+                # lazily evaluated and memoized per request
+                'bps_inventory.context_processors.bps_context',
             ],
         },
     },
@@ -149,6 +148,38 @@ DATABASES = {
     }
 }
 
+# Optional read replica for reports and analytics (bps_inventory.db_router);
+# without DB_REPLICA_HOST every query uses the primary
+if config('DB_REPLICA_HOST', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': config('DB_REPLICA_HOST'),
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['bps_inventory.db_router.ReplicaRouter']
+
+# Views read from the replica on GET (namespace:name, wildcards allowed),
+# tolerated replication lag and how long a browser reads from the primary
+# after changing something
+READ_REPLICA = {
+    'ALIAS': 'replica',
+    'VIEWS': [
+        'reports:*',
+        'inventory:system_statistics',
+        'inventory:audit_log_list',
+        'qr_management:qr_analytics',
+    ],
+    'MAX_LAG_SECONDS': config('DB_REPLICA_MAX_LAG_SECONDS', default=30, cast=int),
+    'LAG_CHECK_SECONDS': 10,
+    # Raised to MAX_LAG_SECONDS + LAG_CHECK_SECONDS when shorter (see db_router.pin_seconds)
+    'PIN_SECONDS': 15,
+    'PIN_COOKIE': 'bps_primary_pin',
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -188,6 +219,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'authentication.api_keys.ApiKeyAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.TokenAuthentication',
     ],
@@ -202,6 +234,30 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.URLPathVersioning',
+    'DEFAULT_VERSION': 'v1',
+    'ALLOWED_VERSIONS': ['v1'],
+}
+
+# Reverse proxies (addresses or networks) whose X-Forwarded-For is trusted
+# for access control and rate limiting (see inventory.utils.get_trusted_client_ip)
+TRUSTED_PROXIES = config('TRUSTED_PROXIES', default='', cast=lambda v: [s.strip() for s in v.split(',') if s.strip()])
+
+# API key authentication for /api/ (see authentication.api_keys)
+API_KEY_AUTH = {
+    'HEADER': 'X-API-Key',
+    'CACHE_TIMEOUT': 300,
+    'BURST_SECONDS': 300,
+    'IP_RATE_LIMIT_PER_HOUR': config('API_IP_RATE_LIMIT_PER_HOUR', default=20000, cast=int),
+    'USAGE_FLUSH_INTERVAL_SECONDS': 60,
+}
+
+# Versioned REST API (see api.views)
+INVENTORY_API = {
+    'PAGE_SIZE': 100,
+    'MAX_PAGE_SIZE': 1000,
+    'MAX_BATCH_IDS': 500,
+    'CACHE_TIMEOUT': 300,
 }
 
 # DRF Spectacular Settings
@@ -281,16 +337,39 @@ LOGGING = {
 os.makedirs(BASE_DIR / 'logs', exist_ok=True)
 
 # Cache Configuration
+# 'default' is a two-tier cache: a short-lived per-process LRU in front of the
+# 'shared' cache used by all workers. CACHE_L2 selects the shared store:
+# redis (CACHE_REDIS_URL), file (single host, CACHE_FILE_DIR outside the
+# source tree) or locmem (per process; the default for development and tests).
+CACHE_L2 = config('CACHE_L2', default='locmem')
+CACHE_L2_BACKENDS = {
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_REDIS_URL', default='redis://localhost:6379/1'),
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('CACHE_FILE_DIR', default=os.path.join(tempfile.gettempdir(), 'bps_inventory_cache')),
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bps-shared-fake',
+    },
+}
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+        'BACKEND': 'bps_inventory.cache.TwoTierCache',
+        'LOCATION': 'bps-l1',
         'TIMEOUT': 300,
         'OPTIONS': {
-            'MAX_ENTRIES': 1000,
-            'CULL_FREQUENCY': 3,
+            'L2': 'shared',
+            'L1_MAX_ENTRIES': 1000,
+            'L1_TIMEOUT': config('CACHE_L1_TIMEOUT', default=5, cast=int),
+            'STATS_FLUSH_INTERVAL': 30,
         }
-    }
+    },
+    'shared': dict(CACHE_L2_BACKENDS[CACHE_L2], TIMEOUT=300, KEY_PREFIX='bps'),
 }
 
 # Session Configuration
@@ -344,6 +423,108 @@ MAX_DEVICES_PER_STAFF = config('MAX_DEVICES_PER_STAFF', default=5, cast=int)
 ASSIGNMENT_NOTIFICATION_DAYS = config('ASSIGNMENT_NOTIFICATION_DAYS', default=7, cast=int)
 WARRANTY_ALERT_DAYS = config('WARRANTY_ALERT_DAYS', default=30, cast=int)
 
+# Maintenance Calendar Settings
+MAINTENANCE_CALENDAR_HORIZON_DAYS = config('MAINTENANCE_CALENDAR_HORIZON_DAYS', default=365, cast=int)
+
+# Live Update (Server-Sent Events) Settings
+# LocalBroker serves a single ASGI process; use RedisBroker when running several
+# nodes or when events are raised by management commands (cron jobs)
+EVENT_STREAM = {
+    'BROKER': config('EVENT_STREAM_BROKER', default='inventory.event_stream.LocalBroker'),
+    'OPTIONS': {'url': config('EVENT_STREAM_REDIS_URL', default='redis://localhost:6379/0')},
+    'PATH': '/events/stream/',
+    'HEARTBEAT_SECONDS': 15,
+    'RETRY_MILLISECONDS': 5000,
+    'QUEUE_SIZE': 100,
+    'STATS_DEBOUNCE_SECONDS': 2,
+}
+
+# Public QR verification (/verify/<device_id>/): snapshot cache lifetimes,
+# browser/edge max-age and the per-IP request limit per window
+PUBLIC_VERIFY = {
+    'SNAPSHOT_TIMEOUT': 3600,
+    'MISSING_TIMEOUT': 60,
+    'MAX_AGE': 60,
+    'RATE_LIMIT': config('PUBLIC_VERIFY_RATE_LIMIT', default=60, cast=int),
+    'RATE_WINDOW_SECONDS': 60,
+}
+
+# QR code payloads (qr_management.payload): signature length, optional
+# verification URL prefix and whether unsigned legacy codes still scan
+QR_PAYLOAD = {
+    'SIGNATURE_BYTES': 10,
+    'URL_PREFIX': config('QR_PAYLOAD_URL_PREFIX', default=''),
+    'ACCEPT_LEGACY': config('QR_PAYLOAD_ACCEPT_LEGACY', default=True, cast=bool),
+}
+
+# Stock-take reconciliation of QR campaigns (see qr_management/reconciliation.py)
+QR_RECONCILIATION = {
+    'EXCLUDED_STATUSES': ['RETIRED', 'LOST', 'DISPOSED'],
+    'BATCH_SIZE': 1000,
+    'PAGE_SIZE': 200,
+}
+
+# Change feed of device, assignment, staff and location writes (see inventory/change_feed.py)
+CHANGE_FEED = {
+    'SETTLE_SECONDS': 30,
+    'COMPACT_AFTER_HOURS': 24,
+    'COMPACT_BATCH_SIZE': 1000,
+}
+
+# Offline scanning catalogue and delta sync (see qr_management/offline_sync.py)
+QR_OFFLINE_SYNC = {
+    'EXCLUDED_STATUSES': ['DISPOSED'],
+    'OVERLAP_SECONDS': 120,
+    'MAX_DELTA_AGE_HOURS': 24 * 7,
+    'MAX_UPLOAD_SCANS': 500,
+    'COMPRESS_LEVEL': 6,
+}
+
+# Background QR scan log writer
+QR_SCAN_LOG = {
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL_SECONDS': 2,
+    'QUEUE_SIZE': 10000,
+}
+
+# Audit log buffering (inventory.audit): rows per INSERT and the background
+# drain queue used by high-volume sources
+AUDIT_LOG = {
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL_SECONDS': 2,
+    'QUEUE_SIZE': 20000,
+}
+
+# Warranty and lifecycle analytics (inventory/lifecycle.py) and the
+# month-end depreciation ledger (inventory/depreciation.py)
+LIFECYCLE_ANALYTICS = {
+    'DEFAULT_LIFE_YEARS': 5,
+    'SALVAGE_RATE': 0.1,
+    'FORECAST_YEARS': 5,
+    'TIMELINE_MONTHS': 12,
+    'CHUNK_SIZE': 5000,
+    'DEPRECIATION_METHOD': 'STRAIGHT_LINE',  # or 'DECLINING_BALANCE'
+    'LEDGER_BATCH_SIZE': 1000,
+}
+
+# Request instrumentation (bps_inventory/instrumentation.py): latency
+# histogram bounds, N+1 threshold, per-view query budgets and the
+# RequestMetric rollup; /metrics/ also accepts METRICS_TOKEN as a bearer token
+INSTRUMENTATION = {
+    'ENABLED': config('INSTRUMENTATION_ENABLED', default=True, cast=bool),
+    'LATENCY_BUCKETS_MS': [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000],
+    'DUPLICATE_QUERY_THRESHOLD': 5,
+    'SLOW_REQUEST_MS': 2000,
+    'BUDGETS': {},
+    'EXCLUDE_PATHS': ['/static/', '/media/', '/metrics/'],
+    'BUCKET_MINUTES': 5,
+    'RETENTION_DAYS': 7,
+    'BATCH_SIZE': 1000,
+    'FLUSH_INTERVAL_SECONDS': 30,
+    'QUEUE_SIZE': 20000,
+    'METRICS_TOKEN': config('METRICS_TOKEN', default=''),
+}
+
 # Backup Settings
 DBBACKUP_STORAGE = 'django.core.files.storage.FileSystemStorage'
 DBBACKUP_STORAGE_OPTIONS = {'location': BASE_DIR / 'backups'}
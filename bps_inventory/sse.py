@@ -0,0 +1,149 @@
+# bps_inventory/sse.py - Server-Sent Events Endpoint
+"""
+ASGI application streaming live updates to logged-in browsers over a single
+long-lived HTTP response (text/event-stream). It replaces periodic polling of
+the dashboard stats, notification list and session status endpoints.
+
+Events come from inventory.event_stream; the connection is authenticated from
+the regular Django session cookie. Everything outside
+settings.EVENT_STREAM['PATH'] is handed to the Django ASGI application.
+"""
+
+import asyncio
+import json
+import logging
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, load_backend
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from inventory.event_stream import get_broker, get_event_stream_setting, stats_publisher
+
+logger = logging.getLogger(__name__)
+
+
+def _get_cookie(scope, name):
+    for header, value in scope.get('headers', []):
+        if header == b'cookie':
+            for part in value.decode('latin-1').split(';'):
+                key, _, morsel = part.strip().partition('=')
+                if key == name:
+                    return morsel
+    return None
+
+
+def _load_session_user(session_key):
+    """Return (user, session) for a valid authenticated session, else (None, None)"""
+    if not session_key:
+        return None, None
+    session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    try:
+        user_id = session[SESSION_KEY]
+        backend = load_backend(session[BACKEND_SESSION_KEY])
+    except (KeyError, ImportError):
+        return None, None
+
+    user = backend.get_user(user_id)
+    if user is None or not user.is_active:
+        return None, None
+    # Same check as django.contrib.auth.get_user: a password change logs out
+    if not constant_time_compare(session.get(HASH_SESSION_KEY, ''), user.get_session_auth_hash()):
+        return None, None
+    return user, session
+
+
+def _initial_events(user, session):
+    """Snapshot sent on connect so the page never needs an initial poll"""
+    from inventory.notification_engine import get_unread_count
+
+    expires_at = session.get_expiry_date()
+    return [
+        ('stats', stats_publisher.snapshot()),
+        ('notifications', {'unread': get_unread_count(user)}),
+        ('session', {
+            'username': user.username,
+            'expires_at': expires_at.isoformat(),
+            'time_remaining_seconds': max(0, int((expires_at - timezone.now()).total_seconds())),
+        }),
+    ]
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode('utf-8')
+
+
+async def event_stream_application(scope, receive, send):
+    user, session = await sync_to_async(_load_session_user)(
+        _get_cookie(scope, settings.SESSION_COOKIE_NAME)
+    )
+    if user is None:
+        await send({
+            'type': 'http.response.start',
+            'status': 401,
+            'headers': [(b'content-type', b'application/json')],
+        })
+        await send({'type': 'http.response.body', 'body': b'{"error": "Authentication required"}'})
+        return
+
+    broker = get_broker()
+    subscription = broker.subscribe(asyncio.get_running_loop(), user_id=user.id)
+    heartbeat = get_event_stream_setting('HEARTBEAT_SECONDS')
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                # Disable proxy buffering (nginx) so events are flushed immediately
+                (b'x-accel-buffering', b'no'),
+            ],
+        })
+        retry = get_event_stream_setting('RETRY_MILLISECONDS')
+        await send({'type': 'http.response.body', 'body': f"retry: {retry}\n\n".encode(), 'more_body': True})
+
+        for event, data in await sync_to_async(_initial_events)(user, session):
+            await send({'type': 'http.response.body', 'body': format_event(event, data), 'more_body': True})
+
+        while not disconnected.done():
+            message = asyncio.ensure_future(subscription.queue.get())
+            done, _ = await asyncio.wait({message, disconnected}, timeout=heartbeat, return_when=asyncio.FIRST_COMPLETED)
+            if message in done:
+                body = format_event(message.result()['event'], message.result()['data'])
+            else:
+                message.cancel()
+                if disconnected in done:
+                    break
+                # Comment line keeps proxies and the browser from timing out
+                body = b": heartbeat\n\n"
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+    except OSError:
+        pass
+    finally:
+        broker.unsubscribe(subscription)
+        disconnected.cancel()
+
+
+async def _wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+class EventStreamRouter:
+    """Send the event stream path to the SSE app, everything else to Django"""
+
+    def __init__(self, django_application):
+        self.django_application = django_application
+        self.path = get_event_stream_setting('PATH')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == self.path:
+            return await event_stream_application(scope, receive, send)
+        return await self.django_application(scope, receive, send)
@@ -1,7 +1,7 @@
 
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from . import views
@@ -18,6 +18,7 @@ urlpatterns = [
     # System utilities - ALL CONFIRMED TO EXIST
     path('health/', views.system_health_check, name='system_health'),
     path('status/', views.system_status, name='system_status'),
+    path('metrics/', views.metrics, name='metrics'),
     path('api/docs/', views.api_documentation, name='api_docs'),
     
     # ================================
@@ -46,9 +47,9 @@ urlpatterns = [
     path('verify/<str:device_id>/', views.public_qr_verify, name='public_qr_verify'),
     
     # ================================
-    # FUTURE API ENDPOINTS
+    # REST API (versioned, see api.views)
     # ================================
-    # path('api/v1/', include('api.urls')),  # For future mobile app API
+    re_path(r'^api/(?P<version>v1)/', include('api.urls')),
 ]
 
 # ================================
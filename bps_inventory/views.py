@@ -1,10 +1,20 @@
 from django.shortcuts import render, get_object_or_404
+from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from django.http import JsonResponse, HttpResponse, Http404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from inventory.models import Device
+from inventory.utils import get_trusted_client_ip
+from qr_management.payload import InvalidQRPayload, decode as decode_qr_payload
+from qr_management.scan_log import log_scan
+
+from .cache import get_cache_stats
+from .instrumentation import get_instrumentation_setting, prometheus_text, query_budget, summary as request_summary
+from .public_verify import get_public_verify_setting, get_verification_snapshot, is_rate_limited
 
 def home_view(request):
     """Home page view for BPS Inventory Management System"""
@@ -47,50 +57,78 @@ def home_view(request):
         
         return render(request, 'home.html', context)
 
+def _public_verify_response(context, status, as_json):
+    if as_json:
+        return JsonResponse(context, status=status)
+    context['system_name'] = 'BPS IT Inventory Management System'
+    return HttpResponse(render_to_string('public/qr_verify.html', context), status=status)
+
+
+@query_budget(max_queries=10)
 def public_qr_verify(request, device_id):
-    """Public QR verification view (no login required)"""
+    """
+    Public QR verification view (no login required).
+
+    Serves the cached verification snapshot with ETag/Last-Modified and
+    public Cache-Control so edge caches can absorb scan bursts; ?format=json
+    returns the same data for scanner apps. The scan itself is queued for the
+    background scan log writer instead of being inserted here. The URL may
+    carry a bare device ID (older stickers) or a compact signed QR payload.
+    """
+    as_json = request.GET.get('format') == 'json'
+
+    # A client-sent X-Forwarded-For must not pick the rate limit bucket
+    ip_address = get_trusted_client_ip(request)
+    retry_after = is_rate_limited(ip_address)
+    if retry_after:
+        response = _public_verify_response(
+            {'error': 'Too many verification requests, please try again shortly'}, 429, as_json
+        )
+        response['Retry-After'] = str(retry_after)
+        return response
+
     try:
-        device = get_object_or_404(Device, device_id=device_id)
-        
-        # Get current assignment info
-        current_assignment = None
-        try:
-            from inventory.models import Assignment
-            current_assignment = Assignment.objects.filter(
-                device=device, is_active=True
-            ).select_related('assigned_to_staff__user', 'assigned_to_department').first()
-        except:
-            pass
-        
-        # Create verification context
-        context = {
-            'device': device,
-            'current_assignment': current_assignment,
-            'verification_time': timezone.now(),
-            'system_name': 'BPS IT Inventory Management System',
-        }
-        
-        # Log QR scan if model exists
-        try:
-            from qr_management.models import QRCodeScan
-            QRCodeScan.objects.create(
-                device=device,
-                scanned_at=timezone.now(),
-                ip_address=request.META.get('REMOTE_ADDR'),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')[:200]
-            )
-        except:
-            pass
-        
-        return render(request, 'public/qr_verify.html', context)
-        
-    except Exception as e:
+        payload = decode_qr_payload(device_id)
+    except InvalidQRPayload:
+        payload = None
+    snapshot = get_verification_snapshot(payload.device_id) if payload else None
+    if snapshot is None:
+        response = _public_verify_response(
+            {'error': 'Device not found or invalid QR code', 'device_id': device_id}, 404, as_json
+        )
+        patch_cache_control(response, public=True, max_age=get_public_verify_setting('MISSING_TIMEOUT'))
+        return response
+
+    log_scan(
+        device_id=snapshot['public']['device_id'],
+        scan_type='VERIFICATION',
+        scanned_by_id=request.user.pk if request.user.is_authenticated else None,
+        device_status_at_scan=snapshot['public']['status'],
+        device_location_at_scan_id=snapshot['location_id'],
+        assigned_staff_at_scan_id=snapshot['staff_id'],
+        ip_address=ip_address,
+        user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
+        device_info={
+            'source': 'public_verify',
+            'format': 'json' if as_json else 'html',
+            'payload_version': payload.version,
+        },
+    )
+
+    last_modified = int(snapshot['last_modified'].timestamp())
+    response = get_conditional_response(request, etag=snapshot['etag'], last_modified=last_modified)
+    if response is None:
         context = {
-            'error': 'Device not found or invalid QR code',
-            'device_id': device_id,
-            'system_name': 'BPS IT Inventory Management System',
+            'verified': True,
+            'device': snapshot['public'],
+            'last_updated': snapshot['last_modified'].isoformat(),
         }
-        return render(request, 'public/qr_verify.html', context, status=404)
+        response = _public_verify_response(context, 200, as_json)
+
+    response['ETag'] = snapshot['etag']
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=get_public_verify_setting('MAX_AGE'))
+    return response
 
 
 def system_health_check(request):
@@ -206,10 +244,18 @@ def system_status(request):
             'debug_mode': settings.DEBUG,
         }
         
+        performance = None
+        try:
+            performance = request_summary(hours=1)
+        except Exception:
+            pass
+
         context = {
             'stats': stats,
             'recent_activities': recent_activities,
             'uptime_data': uptime_data,
+            'cache_stats': get_cache_stats(),
+            'performance': performance,
             'title': 'System Status Dashboard'
         }
         
@@ -222,6 +268,17 @@ def system_status(request):
         }
         return render(request, 'system/status.html', context)
 
+def metrics(request):
+    """Request metrics of this worker in the Prometheus text format (staff or METRICS_TOKEN)"""
+    token = get_instrumentation_setting('METRICS_TOKEN')
+    authorized = request.user.is_authenticated and request.user.is_staff
+    if token and request.headers.get('Authorization') == f'Bearer {token}':
+        authorized = True
+    if not authorized:
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    return HttpResponse(prometheus_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @login_required
 def api_documentation(request):
     """API documentation view"""
@@ -0,0 +1,20 @@
+# conftest.py - Shared Test Fixtures
+"""
+Every test starts with an empty, process-local cache whatever CACHE_L2 the
+environment selects, so tagged entries never leak between tests or runs.
+"""
+
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        'shared': dict(settings.CACHE_L2_BACKENDS['locmem'], TIMEOUT=300, KEY_PREFIX='bps'),
+    }
+    # Changing CACHES rebuilds the cache handlers; LocMem stores outlive them
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    yield
@@ -2,9 +2,9 @@
 # Updated admin configuration with Block support and fixed errors
 
 from django.contrib import admin
-from django.utils.html import format_html
-from django.urls import reverse
-from django.db.models import Count
+from django.db.models import Q
+
+from bps_inventory.admin_mixins import CountAnnotationMixin, CountColumn, LargeTableAdminMixin
 from .models import (
     Building, Block, Floor, Department, Room, Location,
     Device, DeviceCategory, DeviceSubCategory, DeviceType,
@@ -16,10 +16,24 @@ from .models import (
 # ================================
 
 @admin.register(Building)
-class BuildingAdmin(admin.ModelAdmin):
+class BuildingAdmin(CountAnnotationMixin, admin.ModelAdmin):
     list_display = ('name', 'code', 'get_blocks_count', 'get_floors_count', 'get_departments_count', 'is_active', 'created_at')
     list_filter = ('is_active', 'created_at')
     search_fields = ('name', 'code', 'address')
+    count_columns = {
+        'get_blocks_count': CountColumn(
+            'blocks', 'Blocks',
+            changelist='admin:inventory_block_changelist', filter_param='building__id__exact',
+        ),
+        'get_floors_count': CountColumn(
+            'floors', 'Floors',
+            changelist='admin:inventory_floor_changelist', filter_param='building__id__exact',
+        ),
+        'get_departments_count': CountColumn(
+            'floors__departments', 'Departments',
+            changelist='admin:inventory_department_changelist', filter_param='floor__building__id__exact',
+        ),
+    }
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -34,46 +48,23 @@ class BuildingAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
-    
-    def get_blocks_count(self, obj):
-        count = obj.blocks.count()
-        if count > 0:
-            url = reverse('admin:inventory_block_changelist')
-            return format_html(
-                '<a href="{}?building__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_blocks_count.short_description = 'Blocks'
-    
-    def get_floors_count(self, obj):
-        count = obj.floors.count()
-        if count > 0:
-            url = reverse('admin:inventory_floor_changelist')
-            return format_html(
-                '<a href="{}?building__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_floors_count.short_description = 'Floors'
-    
-    def get_departments_count(self, obj):
-        count = obj.departments.count()
-        if count > 0:
-            url = reverse('admin:inventory_department_changelist')
-            return format_html(
-                '<a href="{}?floor__building__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_departments_count.short_description = 'Departments'
 
 @admin.register(Block)
-class BlockAdmin(admin.ModelAdmin):
+class BlockAdmin(CountAnnotationMixin, admin.ModelAdmin):
     list_display = ('name', 'code', 'building', 'get_floors_count', 'get_departments_count', 'is_active', 'created_at')
     list_filter = ('building', 'is_active', 'created_at')
     search_fields = ('name', 'code', 'building__name', 'description')
     list_select_related = ('building',)
+    count_columns = {
+        'get_floors_count': CountColumn(
+            'floors', 'Floors',
+            changelist='admin:inventory_floor_changelist', filter_param='block__id__exact',
+        ),
+        'get_departments_count': CountColumn(
+            'floors__departments', 'Departments',
+            changelist='admin:inventory_department_changelist', filter_param='floor__block__id__exact',
+        ),
+    }
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -88,35 +79,23 @@ class BlockAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
-    
-    def get_floors_count(self, obj):
-        count = obj.floors.count()
-        if count > 0:
-            url = reverse('admin:inventory_floor_changelist')
-            return format_html(
-                '<a href="{}?block__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_floors_count.short_description = 'Floors'
-    
-    def get_departments_count(self, obj):
-        count = obj.floors.aggregate(dept_count=Count('departments'))['dept_count'] or 0
-        if count > 0:
-            url = reverse('admin:inventory_department_changelist')
-            return format_html(
-                '<a href="{}?floor__block__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_departments_count.short_description = 'Departments'
 
 @admin.register(Floor)
-class FloorAdmin(admin.ModelAdmin):
+class FloorAdmin(CountAnnotationMixin, admin.ModelAdmin):
     list_display = ('name', 'building', 'block', 'floor_number', 'get_departments_count', 'get_rooms_count', 'is_active')
     list_filter = ('building', 'block', 'is_active', 'created_at')
     search_fields = ('name', 'building__name', 'block__name')
     list_select_related = ('building', 'block')
+    count_columns = {
+        'get_departments_count': CountColumn(
+            'departments', 'Departments',
+            changelist='admin:inventory_department_changelist', filter_param='floor__id__exact',
+        ),
+        'get_rooms_count': CountColumn(
+            'departments__rooms', 'Rooms',
+            changelist='admin:inventory_room_changelist', filter_param='department__floor__id__exact',
+        ),
+    }
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -134,35 +113,23 @@ class FloorAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
-    
-    def get_departments_count(self, obj):
-        count = obj.departments.count()
-        if count > 0:
-            url = reverse('admin:inventory_department_changelist')
-            return format_html(
-                '<a href="{}?floor__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_departments_count.short_description = 'Departments'
-    
-    def get_rooms_count(self, obj):
-        count = obj.departments.aggregate(room_count=Count('rooms'))['room_count'] or 0
-        if count > 0:
-            url = reverse('admin:inventory_room_changelist')
-            return format_html(
-                '<a href="{}?department__floor__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_rooms_count.short_description = 'Rooms'
 
 @admin.register(Department)
-class DepartmentAdmin(admin.ModelAdmin):
+class DepartmentAdmin(CountAnnotationMixin, admin.ModelAdmin):
     list_display = ('name', 'code', 'get_hierarchy_path', 'head_of_department', 'get_staff_count', 'get_rooms_count', 'is_active')
     list_filter = ('floor__building', 'floor__block', 'is_active', 'created_at')
     search_fields = ('name', 'code', 'head_of_department', 'floor__building__name', 'floor__block__name')
     list_select_related = ('floor__building', 'floor__block')
+    count_columns = {
+        'get_staff_count': CountColumn(
+            'staff_members', 'Staff',
+            changelist='admin:inventory_staff_changelist', filter_param='department__id__exact',
+        ),
+        'get_rooms_count': CountColumn(
+            'rooms', 'Rooms',
+            changelist='admin:inventory_room_changelist', filter_param='department__id__exact',
+        ),
+    }
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -187,35 +154,19 @@ class DepartmentAdmin(admin.ModelAdmin):
     def get_hierarchy_path(self, obj):
         return f"{obj.floor.building.name} → {obj.floor.block.name} → {obj.floor.name}"
     get_hierarchy_path.short_description = 'Location Path'
-    
-    def get_staff_count(self, obj):
-        count = obj.staff_members.count()
-        if count > 0:
-            url = reverse('admin:inventory_staff_changelist')
-            return format_html(
-                '<a href="{}?department__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_staff_count.short_description = 'Staff'
-    
-    def get_rooms_count(self, obj):
-        count = obj.rooms.count()
-        if count > 0:
-            url = reverse('admin:inventory_room_changelist')
-            return format_html(
-                '<a href="{}?department__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_rooms_count.short_description = 'Rooms'
 
 @admin.register(Room)
-class RoomAdmin(admin.ModelAdmin):
+class RoomAdmin(CountAnnotationMixin, admin.ModelAdmin):
     list_display = ('room_number', 'room_name', 'get_hierarchy_path', 'capacity', 'get_locations_count', 'is_active')
     list_filter = ('department__floor__building', 'department__floor__block', 'department', 'is_active', 'created_at')
     search_fields = ('room_number', 'room_name', 'department__name', 'department__floor__building__name')
     list_select_related = ('department__floor__building', 'department__floor__block', 'department')
+    count_columns = {
+        'get_locations_count': CountColumn(
+            'locations', 'Locations',
+            changelist='admin:inventory_location_changelist', filter_param='room__id__exact',
+        ),
+    }
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -237,24 +188,19 @@ class RoomAdmin(admin.ModelAdmin):
     def get_hierarchy_path(self, obj):
         return f"{obj.department.floor.building.name} → {obj.department.floor.block.name} → {obj.department.floor.name} → {obj.department.name}"
     get_hierarchy_path.short_description = 'Location Path'
-    
-    def get_locations_count(self, obj):
-        count = obj.locations.count()
-        if count > 0:
-            url = reverse('admin:inventory_location_changelist')
-            return format_html(
-                '<a href="{}?room__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_locations_count.short_description = 'Locations'
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(CountAnnotationMixin, admin.ModelAdmin):
     list_display = ('get_location_name', 'get_location_code', 'get_hierarchy_path', 'get_assignments_count', 'is_active')
     list_filter = ('building', 'block', 'floor', 'department', 'is_active')
     search_fields = ('building__name', 'block__name', 'floor__name', 'department__name', 'room__room_number', 'description')
     list_select_related = ('building', 'block', 'floor', 'department', 'room')
+    count_columns = {
+        'get_assignments_count': CountColumn(
+            'device_assignments', 'Active Assignments', filter=Q(assignment_type='PERMANENT'),
+            changelist='admin:inventory_assignment_changelist', filter_param='assigned_to_location__id__exact',
+        ),
+    }
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -293,29 +239,23 @@ class LocationAdmin(admin.ModelAdmin):
             path += f" → {obj.room.room_number}"
         return path
     get_hierarchy_path.short_description = 'Hierarchy Path'
-    
-    def get_assignments_count(self, obj):
-        """Show count of assignments at this location"""
-        count = obj.device_assignments.filter(assignment_type='PERMANENT').count()
-        if count > 0:
-            url = reverse('admin:inventory_assignment_changelist')
-            return format_html(
-                '<a href="{}?assigned_to_location__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_assignments_count.short_description = 'Active Assignments'
 
 # ================================
 # STAFF ADMIN WITH DEPARTMENT HIERARCHY
 # ================================
 
 @admin.register(Staff)
-class StaffAdmin(admin.ModelAdmin):
+class StaffAdmin(CountAnnotationMixin, admin.ModelAdmin):
     list_display = ('get_full_name', 'employee_id', 'designation', 'get_department_hierarchy', 'get_assignments_count', 'is_active')
     list_filter = ('department__floor__building', 'department__floor__block', 'department', 'is_active', 'joining_date')
     search_fields = ('user__first_name', 'user__last_name', 'employee_id', 'designation', 'department__name')
     list_select_related = ('user', 'department__floor__building', 'department__floor__block')
+    count_columns = {
+        'get_assignments_count': CountColumn(
+            'device_assignments', 'Active Assignments', filter=Q(assignment_type='PERMANENT'),
+            changelist='admin:inventory_assignment_changelist', filter_param='assigned_to_staff__id__exact',
+        ),
+    }
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -343,17 +283,6 @@ class StaffAdmin(admin.ModelAdmin):
             return f"{obj.department.floor.building.name} → {obj.department.floor.block.name} → {obj.department.name}"
         return "-"
     get_department_hierarchy.short_description = 'Department Hierarchy'
-    
-    def get_assignments_count(self, obj):
-        count = obj.device_assignments.filter(assignment_type='PERMANENT').count()
-        if count > 0:
-            url = reverse('admin:inventory_assignment_changelist')
-            return format_html(
-                '<a href="{}?assigned_to_staff__id__exact={}">{}</a>',
-                url, obj.pk, count
-            )
-        return 0
-    get_assignments_count.short_description = 'Active Assignments'
 
 # ================================
 # DEVICE ADMIN (Updated with Location Hierarchy)
@@ -440,8 +369,9 @@ class MaintenanceScheduleAdmin(admin.ModelAdmin):
     search_fields = ('device__asset_tag', 'device__serial_number', 'vendor__name')
 
 @admin.register(AuditLog)
-class AuditLogAdmin(admin.ModelAdmin):
+class AuditLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('timestamp', 'user', 'action', 'model_name', 'object_id', 'get_changes_summary')
+    list_select_related = ('user',)
     list_filter = ('action', 'model_name', 'timestamp')
     search_fields = ('user__username', 'model_name', 'object_id')
     readonly_fields = ('timestamp', 'user', 'action', 'model_name', 'object_id', 'changes')
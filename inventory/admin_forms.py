@@ -7,6 +7,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.db import models
 
+from .utils import generate_device_id
 from .models import (
     Device, Assignment, Staff, Department, Location, Vendor,
     DeviceCategory, DeviceType, DeviceSubCategory, MaintenanceSchedule,
@@ -55,14 +56,7 @@ class DeviceAdminForm(forms.ModelForm):
         
         # Auto-generate device_id if not provided
         if not cleaned_data.get('device_id'):
-            device_type = cleaned_data.get('device_type')
-            if device_type:
-                # Generate ID based on device type and building
-                location = cleaned_data.get('location')
-                building_code = location.building.code if location and location.building else 'BPS'
-                block_code = location.block.code if location and location.block else 'MAIN'
-                count = Device.objects.filter(device_type=device_type).count() + 1
-                cleaned_data['device_id'] = f"{building_code}-{block_code}-{device_type.code}-{count:03d}"
+            cleaned_data['device_id'] = generate_device_id()
         
         # Validate warranty dates
         warranty_start = cleaned_data.get('warranty_start_date')
@@ -6,11 +6,13 @@ from django.db.models import Q
 import json
 import re
 
+from .utils import generate_device_id
 from .models import (
     Device, Assignment, Staff, Department, Location, Vendor,
     DeviceCategory, DeviceType, DeviceSubCategory, MaintenanceSchedule,
     Building, Block, Floor, Room
 )
+from qr_management.payload import InvalidQRPayload, decode as decode_qr_payload
 
 
 # ================================
@@ -125,14 +127,7 @@ class APIDeviceForm(forms.ModelForm):
         
         # Auto-generate device_id if not provided
         if not cleaned_data.get('device_id'):
-            device_type = cleaned_data.get('device_type')
-            location = cleaned_data.get('location')
-            
-            if device_type:
-                building_code = location.building.code if location and location.building else 'BPS'
-                block_code = location.block.code if location and location.block else 'MAIN'
-                count = Device.objects.filter(device_type=device_type).count() + 1
-                cleaned_data['device_id'] = f"{building_code}-{block_code}-{device_type.code}-{count:03d}"
+            cleaned_data['device_id'] = generate_device_id()
         
         # Validate dates
         purchase_date = cleaned_data.get('purchase_date')
@@ -764,20 +759,13 @@ class QRCodeScanForm(forms.Form):
     def clean_qr_data(self):
         qr_data = self.cleaned_data.get('qr_data')
         
-        # Try to parse as JSON for structured QR codes
-        try:
-            data = json.loads(qr_data)
-            if 'device_id' in data:
-                return data
-        except (json.JSONDecodeError, TypeError):
-            pass
-        
-        # Treat as simple device ID
+        # Signed compact codes, legacy JSON codes or a bare device ID
         try:
-            device = Device.objects.get(device_id=qr_data)
-            return {'device_id': qr_data, 'device': device}
-        except Device.DoesNotExist:
+            payload = decode_qr_payload(qr_data)
+            device = Device.objects.get(device_id=payload.device_id)
+        except (InvalidQRPayload, Device.DoesNotExist):
             raise ValidationError("Invalid QR code - device not found")
+        return {'device_id': payload.device_id, 'device': device, 'payload_version': payload.version}
     
     def clean_scan_timestamp(self):
         timestamp = self.cleaned_data.get('scan_timestamp')
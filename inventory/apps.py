@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class InventoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'inventory'
+
+    def ready(self):
+        # Register signal receivers of the engine modules
+        from . import maintenance_calendar  # noqa: F401
+        from . import cache_tags, change_feed, event_stream, hierarchy_rollup
+        cache_tags.connect_signals()
+        change_feed.connect_signals()
+        event_stream.connect_signals()
+        hierarchy_rollup.connect_signals()
@@ -0,0 +1,219 @@
+# inventory/audit.py - Buffered Audit Logging
+"""
+Audit entries (AuditLog, UserActivity) are written in batches rather than
+with one INSERT per event inside the caller's transaction.
+
+- Entries recorded inside a transaction wait for it to commit and are
+  dropped if it rolls back, like the change they describe.
+- Committed entries go to the per-request buffer (AuditBufferMiddleware, or
+  buffered() in commands) and are written with one bulk_create when the
+  request finishes. Outside a buffer they are written at commit.
+- background=True hands entries to a daemon thread that writes them in
+  batches, for high-volume sources that must not wait on the database.
+- strict=True writes the entry immediately in the caller's transaction and
+  lets errors propagate, for security events that must not be lost.
+
+Rows written in a batch take their timestamp from the time of the write.
+"""
+
+import atexit
+import ipaddress
+import json
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from bps_inventory.batch_writer import BatchWriter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIT_LOG = {
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL_SECONDS': 2,
+    'QUEUE_SIZE': 20000,
+}
+
+
+def get_audit_log_setting(name):
+    return getattr(settings, 'AUDIT_LOG', {}).get(name, DEFAULT_AUDIT_LOG[name])
+
+
+# ================================
+# ENTRIES
+# ================================
+
+class _AuditEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+def _json_safe(value):
+    # One unserializable value would otherwise fail the whole batch
+    return json.loads(json.dumps(value or {}, cls=_AuditEncoder))
+
+
+def _valid_ip(value):
+    try:
+        return str(ipaddress.ip_address(str(value).strip()))
+    except ValueError:
+        return None
+
+
+def request_ip(request):
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    return forwarded.split(',')[0] if forwarded else request.META.get('REMOTE_ADDR')
+
+
+def make_entry(user, action, model_name, object_id='', object_repr='', changes=None,
+               request=None, ip_address=None, user_agent=None):
+    """Unsaved AuditLog; user, IP and user agent default to the request's"""
+    from .models import AuditLog
+
+    if request is not None:
+        if user is None and request.user.is_authenticated:
+            user = request.user
+        ip_address = ip_address or request_ip(request)
+        user_agent = user_agent if user_agent is not None else request.META.get('HTTP_USER_AGENT', '')
+
+    return AuditLog(
+        user=user if user is not None and user.is_authenticated else None,
+        action=action[:20],
+        model_name=model_name[:50],
+        object_id=str(object_id if object_id is not None else '')[:50],
+        object_repr=str(object_repr or '')[:200],
+        changes=_json_safe(changes),
+        ip_address=_valid_ip(ip_address) if ip_address else None,
+        user_agent=user_agent or '',
+    )
+
+
+# ================================
+# WRITING
+# ================================
+
+def write_entries(entries):
+    """Insert entries with one bulk_create per model"""
+    by_model = {}
+    for entry in entries:
+        by_model.setdefault(type(entry), []).append(entry)
+    for model, rows in by_model.items():
+        model.objects.bulk_create(rows, batch_size=get_audit_log_setting('BATCH_SIZE'))
+
+
+def _write_safely(entries):
+    try:
+        write_entries(entries)
+    except Exception as e:
+        logger.error(f"Failed to write {len(entries)} audit entries: {e}")
+
+
+class AuditLogWriter(BatchWriter):
+    """Queue of audit entries drained in batches by a daemon thread"""
+
+    thread_name = 'audit-log'
+    item_name = 'audit entries'
+
+    def __init__(self):
+        super().__init__(
+            get_audit_log_setting('BATCH_SIZE'),
+            get_audit_log_setting('FLUSH_INTERVAL_SECONDS'),
+            get_audit_log_setting('QUEUE_SIZE'),
+        )
+
+    def write_batch(self, batch):
+        write_entries(batch)
+
+
+audit_log_writer = AuditLogWriter()
+atexit.register(audit_log_writer.flush)
+
+
+# ================================
+# BUFFERING
+# ================================
+
+_local = threading.local()
+
+
+def _deliver(entries):
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is not None:
+        buffer.extend(entries)
+    else:
+        _write_safely(entries)
+
+
+def _flush_pending_entries():
+    entries, _local.pending = _local.pending, None
+    if entries:
+        _deliver(entries)
+
+
+def _flush_is_queued():
+    # A rollback discards queued callbacks together with the pending entries
+    return any(callback[1] is _flush_pending_entries for callback in connection.run_on_commit)
+
+
+def record(entry, strict=False, background=False):
+    """
+    Record an unsaved audit model instance (see the module docstring for
+    strict and background). Returns the entry.
+    """
+    if strict:
+        entry.save(force_insert=True)
+        return entry
+    if background:
+        audit_log_writer.put(entry)
+        return entry
+
+    if not connection.in_atomic_block:
+        _deliver([entry])
+    elif getattr(_local, 'pending', None) is not None and _flush_is_queued():
+        _local.pending.append(entry)
+    else:
+        _local.pending = [entry]
+        transaction.on_commit(_flush_pending_entries)
+    return entry
+
+
+def record_action(user, action, model_name, object_id='', object_repr='', changes=None,
+                  request=None, ip_address=None, user_agent=None, strict=False, background=False):
+    """Record an AuditLog entry (see make_entry and record)"""
+    entry = make_entry(
+        user, action, model_name, object_id, object_repr, changes,
+        request=request, ip_address=ip_address, user_agent=user_agent,
+    )
+    return record(entry, strict=strict, background=background)
+
+
+@contextmanager
+def buffered():
+    """Write the entries committed inside the block with one bulk insert at exit"""
+    if getattr(_local, 'buffer', None) is not None:
+        yield
+        return
+    _local.buffer = []
+    try:
+        yield
+    finally:
+        entries, _local.buffer = _local.buffer, None
+        if entries:
+            _write_safely(entries)
+
+
+class AuditBufferMiddleware:
+    """Collect each request's audit entries and write them once it finishes"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered():
+            return self.get_response(request)
@@ -0,0 +1,280 @@
+# inventory/benchmarks.py - Hot Path Benchmarks
+"""
+Timing and query-count suite for the views on the hot paths, run with the
+run_benchmarks management command against a database filled by
+generate_dataset.
+
+Each benchmark calls one view function directly with a RequestFactory
+request from a superuser (no middleware, so the figures are the view's own
+cost) and, for every round,
+- times the call including rendering and consuming streamed content;
+- counts SQL statements and repeated statements (see
+  bps_inventory.instrumentation);
+- rolls back anything the view wrote, so imports can be repeated.
+
+A benchmark fails when the response status is not the expected one, when
+the view reports an error message (most views catch their exceptions and
+still answer 200 with an error page), when the rendered template lacks the
+expect_context variables or the JSON the expect_json keys, when it runs
+more queries than max_queries, or when a statement repeats more than
+max_duplicates times (an N+1 loop). The budgets do not depend on the
+number of devices, so they hold from 10k to 1M; time regressions are
+checked against a saved baseline instead (run_benchmarks --compare).
+"""
+
+import json
+import math
+import statistics
+import time
+from contextlib import ExitStack
+from importlib import import_module
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.messages import constants as message_constants
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections, transaction
+from django.template import Template
+from django.test import RequestFactory
+from django.test.signals import template_rendered
+from django.test.utils import instrumented_test_render
+
+from bps_inventory.instrumentation import QueryCollector, duplicate_statements
+
+from .models import Department, Device, DeviceType
+
+# Repeats of one statement reported by a round (and checked against max_duplicates)
+DUPLICATE_THRESHOLD = 2
+
+IMPORT_ROWS = 50
+
+# iterator() chunk size used by export_devices_csv
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _export_chunks():
+    return math.ceil(Device.objects.count() / EXPORT_CHUNK_SIZE)
+
+
+def _device_type_name():
+    # The import looks device types up with name__icontains
+    names = list(DeviceType.objects.values_list('name', flat=True))
+    for name in names:
+        if sum(name.lower() in other.lower() for other in names) == 1:
+            return name
+    return names[0] if names else 'Laptop'
+
+
+def _import_csv():
+    device_type = _device_type_name()
+    rows = ['device_name,brand,model,serial_number,device_type,purchase_date,purchase_price,status,condition']
+    for i in range(IMPORT_ROWS):
+        rows.append(f'Benchmark Device {i},Dell,Latitude 5440,BENCH{i:06d},{device_type},2024-01-15,1250.00,AVAILABLE,GOOD')
+    return '\n'.join(rows).encode('utf-8')
+
+
+def _import_request(factory):
+    upload = SimpleUploadedFile('benchmark.csv', _import_csv(), content_type='text/csv')
+    return factory.post('/inventory/import/devices/', {
+        'import_type': 'devices', 'csv_file': upload, 'batch_size': 100, 'encoding': 'utf-8', 'delimiter': ',',
+    })
+
+
+BENCHMARKS = [
+    {
+        'name': 'dashboard',
+        'view': 'inventory.views.dashboard',
+        'request': lambda factory: factory.get('/inventory/'),
+        'expect_context': ['summary', 'recent_assignments', 'assignment_trends', 'recent_maintenance'],
+        'max_queries': 12,
+    },
+    {
+        'name': 'device_list',
+        'view': 'inventory.views.device_list',
+        'request': lambda factory: factory.get('/inventory/devices/'),
+        'expect_context': ['page_obj', 'stats'],
+        'max_queries': 15,
+    },
+    {
+        'name': 'device_list_filtered',
+        'view': 'inventory.views.device_list',
+        'request': lambda factory: factory.get('/inventory/devices/', {'search': 'Latitude', 'status': 'ASSIGNED'}),
+        'expect_context': ['page_obj', 'stats'],
+        'max_queries': 15,
+    },
+    {
+        'name': 'global_search_api',
+        'view': 'inventory.views.global_search_api',
+        'request': lambda factory: factory.get('/inventory/search/api/', {'q': 'Latitude'}),
+        'expect_json': ['results', 'total'],
+        'max_queries': 10,
+    },
+    {
+        'name': 'export_devices_csv',
+        'view': 'inventory.views.export_devices_csv',
+        'request': lambda factory: factory.get('/inventory/export/devices/'),
+        # One prefetch of active assignments per chunk of devices
+        'max_queries': lambda: 5 + _export_chunks(),
+        'max_duplicates': lambda: max(3, _export_chunks()),
+    },
+    {
+        'name': 'import_devices_csv',
+        'view': 'inventory.views.import_devices_csv',
+        'request': _import_request,
+        'expect_status': 302,
+        # Rows are still saved one at a time, each with its change feed entry
+        'max_queries': 10 + 4 * IMPORT_ROWS,
+        'max_duplicates': IMPORT_ROWS + 2,
+    },
+    {
+        'name': 'department_utilization_report',
+        'view': 'reports.views.department_utilization_report',
+        'request': lambda factory: factory.get('/reports/department-utilization/'),
+        'expect_context': ['dept_stats'],
+        # Still a handful of counts per department
+        'max_queries': lambda: 10 + 5 * Department.objects.count(),
+        # The department list is read twice (stats loop and filter dropdown)
+        'max_duplicates': lambda: max(3, Department.objects.count()),
+    },
+    {
+        'name': 'qr_analytics',
+        'view': 'qr_management.views.qr_analytics',
+        'request': lambda factory: factory.get('/qr/analytics/'),
+        'expect_context': ['total_scans', 'daily_trends'],
+        'max_queries': 25,
+        # Success rate counts per scan type
+        'max_duplicates': 6,
+    },
+]
+
+
+def _budget(value):
+    # Budgets that depend on reference data (not on the device count) are callables
+    return value() if callable(value) else value
+
+
+def get_view(path):
+    module_path, name = path.rsplit('.', 1)
+    return getattr(import_module(module_path), name)
+
+
+def _prepare(request, user):
+    request.user = user
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    request._messages = FallbackStorage(request)
+    return request
+
+
+def _consume(response):
+    if getattr(response, 'streaming', False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+        response.render()
+    return len(response.content)
+
+
+def _problems(benchmark, request, response, context_keys):
+    """Signs that the view answered with its error path instead of its content"""
+    problems = [
+        f"error message: {message}" for message in request._messages
+        if message.level >= message_constants.ERROR
+    ]
+    missing = [key for key in benchmark.get('expect_context', []) if key not in context_keys]
+    if missing:
+        problems.append(f"context lacks {', '.join(missing)}")
+    if benchmark.get('expect_json'):
+        try:
+            data = json.loads(response.content)
+        except ValueError:
+            data = None
+        missing = [key for key in benchmark['expect_json'] if not isinstance(data, dict) or key not in data]
+        if missing:
+            problems.append(f"JSON lacks {', '.join(missing)}")
+    return problems
+
+
+def run_once(benchmark, view, user, factory):
+    """One timed call; returns (seconds, status, bytes, QueryCollector, problems)"""
+    request = _prepare(benchmark['request'](factory), user)
+    collector = QueryCollector()
+    context_keys = set()
+
+    def record_context(sender, context, **kwargs):
+        context_keys.update(context.flatten())
+
+    with transaction.atomic():
+        with ExitStack() as stack:
+            # Template contexts are reported the way the test client sees them
+            stack.enter_context(mock.patch.object(Template, '_render', instrumented_test_render))
+            template_rendered.connect(record_context)
+            stack.callback(template_rendered.disconnect, record_context)
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            start = time.perf_counter()
+            response = view(request)
+            size = _consume(response)
+            elapsed = time.perf_counter() - start
+        # Leave the database as it was, whatever the view wrote
+        transaction.set_rollback(True)
+    return elapsed, response.status_code, size, collector, _problems(benchmark, request, response, context_keys)
+
+
+def run_benchmark(benchmark, user, rounds=5, warmup=1):
+    """Timing statistics, query counts and budget failures of one benchmark"""
+    view = get_view(benchmark['view'])
+    factory = RequestFactory()
+    for _round in range(warmup):
+        run_once(benchmark, view, user, factory)
+
+    timings, queries, repeats, statuses, sizes, problems = [], [], [], set(), [], []
+    for _round in range(rounds):
+        elapsed, status, size, collector, round_problems = run_once(benchmark, view, user, factory)
+        problems.extend(problem for problem in round_problems if problem not in problems)
+        timings.append(elapsed)
+        queries.append(collector.count)
+        duplicates = duplicate_statements(collector.statements, DUPLICATE_THRESHOLD)
+        repeats.append(max(duplicates.values(), default=1))
+        statuses.add(status)
+        sizes.append(size)
+
+    result = {
+        'name': benchmark['name'],
+        'rounds': rounds,
+        'min': min(timings),
+        'max': max(timings),
+        'mean': statistics.mean(timings),
+        'median': statistics.median(timings),
+        'stddev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'queries': max(queries),
+        'max_repeats': max(repeats),
+        'bytes': max(sizes),
+        'statuses': sorted(statuses),
+        'failures': [],
+    }
+
+    expected = benchmark.get('expect_status', 200)
+    if statuses != {expected}:
+        result['failures'].append(f"status {', '.join(map(str, sorted(statuses)))} (expected {expected})")
+    result['failures'].extend(problems)
+    max_queries = _budget(benchmark['max_queries'])
+    if result['queries'] > max_queries:
+        result['failures'].append(f"{result['queries']} queries (budget {max_queries})")
+    max_duplicates = _budget(benchmark.get('max_duplicates', 3))
+    if result['max_repeats'] > max_duplicates:
+        result['failures'].append(f"statement repeated {result['max_repeats']} times (budget {max_duplicates})")
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Messages for benchmarks whose median is more than tolerance slower than in baseline"""
+    previous = {result['name']: result for result in baseline.get('results', [])}
+    regressions = {}
+    for result in results:
+        before = previous.get(result['name'])
+        if before and before['median'] > 0 and result['median'] > before['median'] * (1 + tolerance):
+            regressions[result['name']] = (
+                f"median {result['median'] * 1000:.1f} ms vs {before['median'] * 1000:.1f} ms "
+                f"(+{(result['median'] / before['median'] - 1) * 100:.0f}%)"
+            )
+    return regressions
@@ -0,0 +1,95 @@
+# inventory/cache_tags.py - Cache Tag Invalidation
+"""
+Maps inventory models to the cache tags whose entries they feed and expires
+those tags (in every worker, see bps_inventory.cache) when rows change.
+
+Tags touched inside a transaction are collected and invalidated once, after
+commit, so a bulk import costs one round trip to the shared cache rather than
+one per saved row.
+"""
+
+import threading
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+
+from bps_inventory.cache import invalidate_tags
+
+# Cache tags used by template context and dashboard stats
+TAG_DEVICES = 'devices'
+TAG_ASSIGNMENTS = 'assignments'
+TAG_MAINTENANCE = 'maintenance'
+TAG_STAFF = 'staff'
+TAG_LOCATIONS = 'locations'
+TAG_VENDORS = 'vendors'
+TAG_USERS = 'users'
+
+MODEL_TAGS = {
+    'Device': [TAG_DEVICES],
+    'Assignment': [TAG_ASSIGNMENTS, TAG_DEVICES],
+    'MaintenanceSchedule': [TAG_MAINTENANCE],
+    'MaintenanceOccurrence': [TAG_MAINTENANCE],
+    'Staff': [TAG_STAFF],
+    'Location': [TAG_LOCATIONS],
+    'Building': [TAG_LOCATIONS],
+    'Block': [TAG_LOCATIONS],
+    'Floor': [TAG_LOCATIONS],
+    'Department': [TAG_LOCATIONS],
+    'Room': [TAG_LOCATIONS],
+    'Vendor': [TAG_VENDORS],
+}
+
+# Models whose rows feed per-device entries, with the attribute holding the
+# device's primary key
+DEVICE_SCOPED_MODELS = {
+    'Device': 'pk',
+    'Assignment': 'device_id',
+}
+
+
+def device_tag(device_id):
+    """Tag for cache entries describing one device (e.g. QR verification)"""
+    return f'device:{device_id}'
+
+_pending = threading.local()
+
+
+def _flush_pending_tags():
+    tags, _pending.tags = _pending.tags, None
+    if tags:
+        invalidate_tags(tags)
+
+
+def _flush_is_queued():
+    # A rollback discards queued callbacks together with the pending tags
+    return any(callback[1] is _flush_pending_tags for callback in connection.run_on_commit)
+
+
+def schedule_invalidation(tags):
+    """Invalidate tags once the current transaction commits"""
+    if getattr(_pending, 'tags', None) and _flush_is_queued():
+        _pending.tags.update(tags)
+        return
+    _pending.tags = set(tags)
+    transaction.on_commit(_flush_pending_tags)
+
+
+def _on_model_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    tags = MODEL_TAGS.get(sender.__name__) or ([TAG_USERS] if sender is User else None)
+    device_attr = DEVICE_SCOPED_MODELS.get(sender.__name__)
+    if device_attr:
+        tags = [*tags, device_tag(getattr(instance, device_attr))]
+    if tags:
+        schedule_invalidation(tags)
+
+
+def connect_signals():
+    from django.apps import apps
+
+    senders = [apps.get_model('inventory', name) for name in MODEL_TAGS] + [User]
+    for model in senders:
+        post_save.connect(_on_model_change, sender=model, dispatch_uid=f'cache_tags_save_{model.__name__}')
+        post_delete.connect(_on_model_change, sender=model, dispatch_uid=f'cache_tags_delete_{model.__name__}')
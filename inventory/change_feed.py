@@ -0,0 +1,172 @@
+# inventory/change_feed.py - Change Feed
+"""
+Ordered log of the writes to Device, Assignment, Staff and Location rows,
+so integrations can ask "what changed since my cursor" instead of
+downloading every row again.
+
+Recording: post_save and post_delete receivers insert an entry in the
+transaction that made the write, so the entry commits or rolls back with
+it (savepoints included) and a failed insert fails the write. Deletes
+are recorded as DELETE tombstones. QuerySet.delete() sends post_delete for every row, but
+bulk_create and QuerySet.update() send no signals, so code using them on a
+feed model calls record_changes() itself (as synthetic.generate() does).
+
+Reading: entries carry a BigAutoField sequence. Sequences are allocated
+when a row is inserted but become visible when its transaction commits,
+so a gap right behind the newest entries may be an insert still in
+flight. read_changes() therefore stops before any gap younger than
+SETTLE_SECONDS, which must exceed the longest transaction writing feed
+models; older gaps are rolled-back inserts or compacted entries and are
+skipped.
+
+Compaction: compact() deletes entries older than COMPACT_AFTER_HOURS that
+are superseded by a later entry for the same object. A consumer that falls
+behind still receives the latest action for every object it missed, just
+not every intermediate one. Tombstones are kept.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import Assignment, ChangeFeedEntry, Device, Location, Staff
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANGE_FEED = {
+    'SETTLE_SECONDS': 30,
+    'COMPACT_AFTER_HOURS': 24,
+    'COMPACT_BATCH_SIZE': 1000,
+}
+
+# Feed name of every recorded model
+FEED_MODELS = {
+    'device': Device,
+    'assignment': Assignment,
+    'staff': Staff,
+    'location': Location,
+}
+MODEL_NAMES = {model: name for name, model in FEED_MODELS.items()}
+
+
+def get_change_feed_setting(name):
+    return getattr(settings, 'CHANGE_FEED', {}).get(name, DEFAULT_CHANGE_FEED[name])
+
+
+# ================================
+# RECORDING
+# ================================
+
+def record_changes(model, object_ids, action='UPSERT'):
+    """Record writes to objects of a feed model in the transaction making them"""
+    model_name = MODEL_NAMES[model]
+    now = timezone.now()
+    # Repeated writes in one transaction are left to compact()
+    ChangeFeedEntry.objects.bulk_create([
+        ChangeFeedEntry(model_name=model_name, object_id=object_id, action=action, recorded_at=now)
+        for object_id in dict.fromkeys(str(object_id) for object_id in object_ids)
+    ])
+
+
+def _on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_changes(sender, [instance.pk])
+
+
+def _on_delete(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], action='DELETE')
+
+
+def connect_signals():
+    for model in FEED_MODELS.values():
+        name = model.__name__
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'change_feed_save_{name}')
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f'change_feed_delete_{name}')
+
+
+# ================================
+# READING
+# ================================
+
+def visible_horizon(after):
+    """Last sequence that is safe to read past cursor after, or None when all are"""
+    settled = timezone.now() - timedelta(seconds=get_change_feed_setting('SETTLE_SECONDS'))
+    # Few rows, read through the recorded_at index
+    recent = sorted(
+        sequence for sequence in ChangeFeedEntry.objects.filter(recorded_at__gt=settled)
+        .order_by().values_list('sequence', flat=True)
+        if sequence > after
+    )
+    if not recent:
+        return None
+    previous = recent[0] - 1
+    if previous > after and not ChangeFeedEntry.objects.filter(sequence=previous).exists():
+        return previous
+    for sequence, following in zip(recent, recent[1:]):
+        if following != sequence + 1:
+            return sequence
+    return None
+
+
+def read_changes(after=0, limit=100, model_names=None):
+    """
+    (entries, next cursor, has more) for up to limit entries after a cursor,
+    optionally only for some FEED_MODELS.
+    """
+    horizon = visible_horizon(after)
+    entries = ChangeFeedEntry.objects.filter(sequence__gt=after)
+    if horizon is not None:
+        entries = entries.filter(sequence__lte=horizon)
+    if model_names:
+        entries = entries.filter(model_name__in=model_names)
+    entries = list(entries.order_by('sequence')[:limit + 1])
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if entries:
+        cursor = entries[-1].sequence
+    else:
+        cursor = after
+    if not has_more and model_names:
+        # Skip past the entries of other models up to what was readable
+        end = horizon if horizon is not None else latest_sequence()
+        cursor = max(cursor, end)
+    return entries, cursor, has_more
+
+
+def latest_sequence():
+    return ChangeFeedEntry.objects.order_by('-sequence').values_list('sequence', flat=True).first() or 0
+
+
+# ================================
+# COMPACTION
+# ================================
+
+def compact(older_than=None):
+    """Delete superseded entries older than COMPACT_AFTER_HOURS; returns the number deleted"""
+    if older_than is None:
+        older_than = timedelta(hours=get_change_feed_setting('COMPACT_AFTER_HOURS'))
+    cutoff = timezone.now() - older_than
+    superseded = ChangeFeedEntry.objects.filter(recorded_at__lt=cutoff).filter(Exists(
+        ChangeFeedEntry.objects.filter(
+            model_name=OuterRef('model_name'),
+            object_id=OuterRef('object_id'),
+            sequence__gt=OuterRef('sequence'),
+        )
+    ))
+    batch_size = get_change_feed_setting('COMPACT_BATCH_SIZE')
+
+    deleted = 0
+    while True:
+        # Selected first: MySQL cannot DELETE from a table its subquery reads
+        sequences = list(superseded.order_by().values_list('sequence', flat=True)[:batch_size])
+        if not sequences:
+            break
+        deleted += ChangeFeedEntry.objects.filter(sequence__in=sequences).delete()[0]
+    if deleted:
+        logger.info(f"Compacted {deleted} change feed entries")
+    return deleted
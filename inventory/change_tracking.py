@@ -0,0 +1,102 @@
+# inventory/change_tracking.py - Dirty Field Tracking
+"""
+Model mixin that remembers the column values an instance was loaded with,
+so code holding the instance can tell what changed without reading the row
+again.
+
+- from_db() snapshots every loaded column (deferred columns are left out);
+- get_changed_fields() / changed_fields / has_changed() compare the current
+  attribute values with that snapshot;
+- save() on a loaded instance writes only the changed columns (plus
+  auto_now timestamps) through update_fields, and skips the UPDATE when
+  nothing changed. An explicit update_fields, force_insert, new instances
+  and primary key changes keep Django's normal behaviour;
+- the diff of the last save is left in _field_changes for post_save
+  receivers (audit logging), and the snapshot is then moved forward.
+
+Signal receivers can use loaded_value() instead of fetching the old row in
+pre_save.
+"""
+
+import copy
+
+_MISSING = object()
+
+
+class ChangeTrackingMixin:
+    """Tracks which concrete fields changed since the instance was loaded or saved"""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._take_snapshot()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._take_snapshot(fields)
+
+    def _take_snapshot(self, names=None):
+        snapshot = getattr(self, '_loaded_values', None)
+        if snapshot is None or names is None:
+            snapshot = self._loaded_values = {}
+        loaded = self.__dict__
+        for field in self._meta.concrete_fields:
+            if names is not None and field.name not in names and field.attname not in names:
+                continue
+            if field.attname in loaded:
+                value = loaded[field.attname]
+                # Copy JSON values so in-place changes to them show up as changes
+                snapshot[field.attname] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    @property
+    def is_tracked(self):
+        """True once the instance has been loaded from or saved to the database"""
+        return getattr(self, '_loaded_values', None) is not None and not self._state.adding
+
+    def loaded_value(self, attname, default=None):
+        """Value of a column (attname, e.g. 'location_id') as last loaded or saved"""
+        return getattr(self, '_loaded_values', {}).get(attname, default)
+
+    def get_changed_fields(self):
+        """{field name: (old value, new value)} for columns changed since loading"""
+        if not self.is_tracked:
+            return {}
+        changes = {}
+        loaded = self.__dict__
+        for field in self._meta.concrete_fields:
+            if field.attname not in loaded:
+                continue  # deferred and never touched
+            old = self._loaded_values.get(field.attname, _MISSING)
+            new = loaded[field.attname]
+            if old is _MISSING or old != new:
+                changes[field.name] = (None if old is _MISSING else old, new)
+        return changes
+
+    @property
+    def changed_fields(self):
+        return set(self.get_changed_fields())
+
+    def has_changed(self, *names):
+        """True when any of the named fields (or, without names, any field) changed"""
+        changed = self.changed_fields
+        return bool(changed & set(names)) if names else bool(changed)
+
+    def save(self, *args, **kwargs):
+        changes = self.get_changed_fields()
+        if (self.is_tracked and kwargs.get('update_fields') is None and not args
+                and not kwargs.get('force_insert') and self._meta.pk.name not in changes):
+            auto_now = [
+                field.name for field in self._meta.concrete_fields
+                if getattr(field, 'auto_now', False)
+            ]
+            # An empty list makes Django skip the UPDATE altogether
+            kwargs['update_fields'] = [*changes, *auto_now] if changes else []
+
+        self._field_changes = {
+            name: {'old': old, 'new': new} for name, (old, new) in changes.items()
+        }
+        super().save(*args, **kwargs)
+        self._take_snapshot(kwargs.get('update_fields'))
+
+    save.alters_data = True
@@ -0,0 +1,297 @@
+# inventory/depreciation.py - Depreciation and TCO Ledger
+"""
+Month-end book values and total cost of ownership, posted in batch instead
+of summed from Device and MaintenanceRecord on every report.
+
+post_period() values every device on the books at a month end with one
+streamed query for the devices and one grouped query for their maintenance
+costs, computes the book values as array expressions and stores:
+
+- one DepreciationEntry per device (purchase value, opening and closing
+  book value, the month's depreciation and maintenance, maintenance to
+  date), with the device's department, category and vendor at that time;
+- one DepreciationSummary per department, category and vendor plus an ALL
+  row, so month-end valuations and TCO are an indexed lookup on
+  (period, dimension, group_id).
+
+Posting a period again replaces its rows, so corrections to purchase data
+or maintenance costs are picked up by re-running it (post_depreciation
+management command).
+
+Conventions:
+    on the books        purchased on or before the period end, with a
+                        purchase price, and not disposed by then
+    elapsed months      calendar months since the purchase month, so a
+                        device is first depreciated the month after purchase
+    STRAIGHT_LINE       price - (price - salvage) * elapsed / life months
+    DECLINING_BALANCE   price * (1 - 2 / life months) ** elapsed (double
+                        declining balance)
+    both are floored at SALVAGE_RATE of the price; the life is
+    expected_life_years or DEFAULT_LIFE_YEARS (LIFECYCLE_ANALYTICS)
+    TCO                 purchase value + completed maintenance costs to date
+"""
+
+import logging
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.db.models import Max, Q, Sum
+from django.utils import timezone
+
+from .lifecycle import get_lifecycle_setting
+from .models import (
+    DepreciationEntry, DepreciationSummary, Department, Device, DeviceCategory,
+    MaintenanceRecord, Vendor,
+)
+
+logger = logging.getLogger(__name__)
+
+METHODS = ['STRAIGHT_LINE', 'DECLINING_BALANCE']
+
+LEDGER_COLUMNS = [
+    'device_id', 'purchase_date', 'purchase_price', 'expected_life_years',
+    'location__department_id', 'device_type__subcategory__category_id', 'vendor_id',
+]
+FRAME_COLUMNS = [
+    'device_id', 'purchase_date', 'purchase_price', 'expected_life_years',
+    'department_id', 'category_id', 'vendor_id',
+]
+
+# Summary dimension -> (frame column, model of the group)
+DIMENSIONS = {
+    'DEPARTMENT': ('department_id', Department),
+    'CATEGORY': ('category_id', DeviceCategory),
+    'VENDOR': ('vendor_id', Vendor),
+}
+
+AMOUNT_FIELDS = ['purchase_value', 'depreciation', 'book_value', 'maintenance_cost', 'cumulative_maintenance']
+
+
+# ================================
+# PERIODS
+# ================================
+
+def month_end(day):
+    """Last day of day's month"""
+    next_month = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return next_month - timedelta(days=1)
+
+
+def last_closed_period(today=None):
+    """End of the month before today's"""
+    today = today or timezone.localdate()
+    return today.replace(day=1) - timedelta(days=1)
+
+
+def periods_between(start, end):
+    """Month ends from start's month through end's month"""
+    periods = []
+    period, end = month_end(start), month_end(end)
+    while period <= end:
+        periods.append(period)
+        period = month_end(period + timedelta(days=1))
+    return periods
+
+
+def latest_period():
+    """Most recent posted period, or None"""
+    return DepreciationSummary.objects.aggregate(latest=Max('period'))['latest']
+
+
+# ================================
+# COMPUTATION
+# ================================
+
+def _devices_on_books(period):
+    queryset = Device.objects.filter(
+        Q(disposal_date__isnull=True) | Q(disposal_date__gt=period),
+        purchase_date__lte=period,
+        purchase_price__isnull=False,
+    ).order_by()
+    rows = queryset.values_list(*LEDGER_COLUMNS).iterator(chunk_size=get_lifecycle_setting('CHUNK_SIZE'))
+    frame = pd.DataFrame.from_records(rows, columns=FRAME_COLUMNS)
+    frame['purchase_price'] = pd.to_numeric(frame['purchase_price'], errors='coerce').astype(float)
+    frame['expected_life_years'] = pd.to_numeric(frame['expected_life_years'], errors='coerce').astype(float)
+    return frame
+
+
+def _maintenance_costs(period):
+    """Completed maintenance cost per device: (in the period's month, to date)"""
+    rows = MaintenanceRecord.objects.filter(
+        status='COMPLETED', completed_date__lte=period, cost__isnull=False,
+    ).order_by().values('device_id').annotate(
+        month=Sum('cost', filter=Q(completed_date__gte=period.replace(day=1))),
+        to_date=Sum('cost'),
+    )
+    month, to_date = {}, {}
+    for row in rows:
+        month[row['device_id']] = float(row['month'] or 0)
+        to_date[row['device_id']] = float(row['to_date'] or 0)
+    return month, to_date
+
+
+def elapsed_months(frame, period):
+    purchase = pd.to_datetime(frame['purchase_date'])
+    months = (period.year * 12 + period.month) - (purchase.dt.year * 12 + purchase.dt.month)
+    return months.to_numpy(dtype=float)
+
+
+def book_values(prices, life_months, months, method):
+    """Book value of each device after months elapsed months"""
+    salvage = prices * get_lifecycle_setting('SALVAGE_RATE')
+    months = np.clip(months, 0, None)
+    if method == 'DECLINING_BALANCE':
+        rate = np.minimum(2.0 / life_months, 1.0)
+        values = prices * (1.0 - rate) ** months
+    else:
+        values = prices - (prices - salvage) * np.minimum(months / life_months, 1.0)
+    return np.maximum(values, salvage)
+
+
+def compute_ledger(period, method=None):
+    """DataFrame with one ledger row per device on the books at period"""
+    method = method or get_lifecycle_setting('DEPRECIATION_METHOD')
+    if method not in METHODS:
+        raise ValueError(f"Unknown depreciation method: {method}")
+
+    frame = _devices_on_books(period)
+    prices = frame['purchase_price'].fillna(0).to_numpy()
+    life = frame['expected_life_years'].to_numpy()
+    life = np.where(np.isnan(life) | (life <= 0), get_lifecycle_setting('DEFAULT_LIFE_YEARS'), life)
+    months = elapsed_months(frame, period)
+
+    frame['purchase_value'] = prices
+    frame['opening_value'] = book_values(prices, life * 12, months - 1, method)
+    frame['book_value'] = book_values(prices, life * 12, months, method)
+    frame['depreciation'] = frame['opening_value'] - frame['book_value']
+
+    month_costs, costs_to_date = _maintenance_costs(period)
+    frame['maintenance_cost'] = frame['device_id'].map(month_costs).fillna(0.0).astype(float)
+    frame['cumulative_maintenance'] = frame['device_id'].map(costs_to_date).fillna(0.0).astype(float)
+    frame['method'] = method
+    return frame
+
+
+def _money(value):
+    return Decimal(f'{value:.2f}')
+
+
+def _optional_id(value):
+    return None if pd.isna(value) else int(value)
+
+
+def _summaries(frame, period, method):
+    amounts = frame[AMOUNT_FIELDS]
+    groups = [('ALL', 0, len(frame), amounts.sum())]
+    for dimension, (column, _model) in DIMENSIONS.items():
+        keys = frame[column].fillna(0).astype('int64')
+        totals = amounts.groupby(keys).sum()
+        counts = keys.value_counts()
+        groups.extend((dimension, int(key), int(counts[key]), row) for key, row in totals.iterrows())
+
+    return [
+        DepreciationSummary(
+            period=period,
+            dimension=dimension,
+            group_id=group_id,
+            method=method,
+            devices=count,
+            **{field: _money(row[field]) for field in AMOUNT_FIELDS},
+        )
+        for dimension, group_id, count, row in groups
+    ]
+
+
+# ================================
+# POSTING
+# ================================
+
+def post_period(period=None, method=None, batch_size=None):
+    """
+    Compute and store the ledger and summaries for the month ending at (or
+    containing) period, replacing any earlier posting. Returns the ALL
+    totals of the period.
+    """
+    period = month_end(period) if period else last_closed_period()
+    method = method or get_lifecycle_setting('DEPRECIATION_METHOD')
+    batch_size = batch_size or get_lifecycle_setting('LEDGER_BATCH_SIZE')
+
+    frame = compute_ledger(period, method)
+    entries = [
+        DepreciationEntry(
+            device_id=row.device_id,
+            period=period,
+            method=method,
+            department_key=_optional_id(row.department_id),
+            category_key=_optional_id(row.category_id),
+            vendor_key=_optional_id(row.vendor_id),
+            purchase_value=_money(row.purchase_value),
+            opening_value=_money(row.opening_value),
+            depreciation=_money(row.depreciation),
+            book_value=_money(row.book_value),
+            maintenance_cost=_money(row.maintenance_cost),
+            cumulative_maintenance=_money(row.cumulative_maintenance),
+        )
+        for row in frame.itertuples(index=False)
+    ]
+    summaries = _summaries(frame, period, method)
+
+    with transaction.atomic():
+        DepreciationEntry.objects.filter(period=period).delete()
+        DepreciationSummary.objects.filter(period=period).delete()
+        DepreciationEntry.objects.bulk_create(entries, batch_size=batch_size)
+        DepreciationSummary.objects.bulk_create(summaries, batch_size=batch_size)
+
+    total = summaries[0]
+    logger.info(f"Posted depreciation for {period}: {total.devices} devices, book value {total.book_value}")
+    return {
+        'period': period,
+        'method': method,
+        'devices': total.devices,
+        **{field: getattr(total, field) for field in AMOUNT_FIELDS},
+    }
+
+
+def post_periods(start, end=None, method=None, batch_size=None):
+    """post_period() for every month from start's through end's (default: last closed month)"""
+    end = end or last_closed_period()
+    return [post_period(period, method=method, batch_size=batch_size) for period in periods_between(start, end)]
+
+
+# ================================
+# LOOKUPS
+# ================================
+
+def valuation(period=None, dimension='ALL'):
+    """
+    Posted summaries of one dimension at period (default: the latest posted
+    period) as dicts with the group name, accumulated depreciation and TCO
+    """
+    period = month_end(period) if period else latest_period()
+    if period is None:
+        return []
+
+    summaries = list(DepreciationSummary.objects.filter(period=period, dimension=dimension).order_by('group_id'))
+    names = {}
+    if dimension in DIMENSIONS:
+        model = DIMENSIONS[dimension][1]
+        names = {pk: str(obj) for pk, obj in model.objects.in_bulk([s.group_id for s in summaries if s.group_id]).items()}
+
+    rows = []
+    for summary in summaries:
+        row = {
+            'period': summary.period,
+            'dimension': summary.dimension,
+            'group_id': summary.group_id,
+            'name': 'All devices' if dimension == 'ALL' else names.get(summary.group_id, 'Unassigned'),
+            'method': summary.method,
+            'devices': summary.devices,
+            'accumulated_depreciation': summary.accumulated_depreciation,
+            'total_cost_of_ownership': summary.total_cost_of_ownership,
+        }
+        row.update({field: getattr(summary, field) for field in AMOUNT_FIELDS})
+        rows.append(row)
+    return sorted(rows, key=lambda row: -row['book_value'])
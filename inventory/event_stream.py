@@ -0,0 +1,301 @@
+# inventory/event_stream.py - Live Update Pub/Sub
+"""
+In-process publish/subscribe used by the server-sent-events endpoint
+(bps_inventory/sse.py) to push dashboard stat deltas and notification
+counts to connected browsers instead of having every open page poll.
+
+Model signals feed the broker. LocalBroker fans events out to subscribers of
+the current process (single node); RedisBroker relays them over a Redis
+channel so every node receives every event (multi node). The broker class is
+configured with settings.EVENT_STREAM['BROKER'].
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENT_STREAM = {
+    'BROKER': 'inventory.event_stream.LocalBroker',
+    'OPTIONS': {},
+    'PATH': '/events/stream/',
+    'HEARTBEAT_SECONDS': 15,
+    'RETRY_MILLISECONDS': 5000,
+    'QUEUE_SIZE': 100,
+    'STATS_DEBOUNCE_SECONDS': 2,
+}
+
+
+def get_event_stream_setting(name):
+    return getattr(settings, 'EVENT_STREAM', {}).get(name, DEFAULT_EVENT_STREAM[name])
+
+
+# ================================
+# BROKERS
+# ================================
+
+class Subscription:
+    """A connected client: a bounded asyncio queue bound to its event loop"""
+
+    def __init__(self, loop, user_id=None, maxsize=100):
+        self.loop = loop
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def push(self, message):
+        # Called from any thread; the queue is only touched on its own loop
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        if self.queue.full():
+            # Slow client: drop the oldest event rather than block publishers
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+class LocalBroker:
+    """Single-node broker delivering events to subscribers of this process"""
+
+    def __init__(self, **options):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, loop, user_id=None):
+        subscription = Subscription(loop, user_id, maxsize=get_event_stream_setting('QUEUE_SIZE'))
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def subscribed_user_ids(self):
+        """User ids with a live connection, or None when not knowable locally"""
+        with self._lock:
+            return {s.user_id for s in self._subscribers if s.user_id is not None}
+
+    def publish(self, message):
+        self.deliver(message)
+
+    def deliver(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        user_id = message.get('user_id')
+        for subscription in subscribers:
+            if user_id is None or subscription.user_id == user_id:
+                try:
+                    subscription.push(message)
+                except RuntimeError:
+                    # Event loop already closed; the connection is gone
+                    self.unsubscribe(subscription)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Multi-node broker: events are published to a Redis channel and a
+    listener thread per process delivers them to local subscribers.
+    """
+
+    def __init__(self, url='redis://localhost:6379/0', channel='bps_inventory:events', **options):
+        super().__init__(**options)
+        self.url = url
+        self.channel = channel
+        self._client = None
+        self._listener = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def subscribe(self, loop, user_id=None):
+        self._ensure_listener()
+        return super().subscribe(loop, user_id)
+
+    def has_subscribers(self):
+        # Other nodes may have clients connected
+        return True
+
+    def subscribed_user_ids(self):
+        return None
+
+    def publish(self, message):
+        try:
+            self._get_client().publish(self.channel, json.dumps(message, default=str))
+        except Exception as e:
+            logger.warning(f"Failed to publish live event to Redis: {e}")
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen, name='event-stream-redis', daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        pubsub = self._get_client().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        for item in pubsub.listen():
+            try:
+                self.deliver(json.loads(item['data']))
+            except Exception as e:
+                logger.warning(f"Dropped malformed live event: {e}")
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_class = import_string(get_event_stream_setting('BROKER'))
+                _broker = broker_class(**get_event_stream_setting('OPTIONS'))
+    return _broker
+
+
+def publish(event, data, user_id=None):
+    """Publish an event to all clients, or only to the given user's clients"""
+    try:
+        get_broker().publish({'event': event, 'data': data, 'user_id': user_id})
+    except Exception as e:
+        logger.warning(f"Failed to publish live event '{event}': {e}")
+
+
+# ================================
+# DASHBOARD STATS
+# ================================
+
+def get_live_dashboard_stats():
+    """Dashboard counters in three aggregate queries"""
+    from .models import Assignment, Device, MaintenanceOccurrence
+
+    today = timezone.now().date()
+    warranty_days = getattr(settings, 'WARRANTY_ALERT_DAYS', 30)
+
+    stats = Device.objects.aggregate(
+        total_devices=Count('device_id'),
+        available_devices=Count('device_id', filter=Q(status='AVAILABLE')),
+        assigned_devices=Count('device_id', filter=Q(status='ASSIGNED')),
+        maintenance_devices=Count('device_id', filter=Q(status='MAINTENANCE')),
+        warranty_expiring=Count('device_id', filter=Q(
+            warranty_end_date__gte=today,
+            warranty_end_date__lte=today + timezone.timedelta(days=warranty_days),
+        )),
+    )
+    stats.update(Assignment.objects.filter(is_active=True).aggregate(
+        total_assignments=Count('assignment_id'),
+        overdue_assignments=Count('assignment_id', filter=Q(
+            is_temporary=True, expected_return_date__lt=today, actual_return_date__isnull=True
+        )),
+    ))
+    stats.update(MaintenanceOccurrence.objects.filter(status='SCHEDULED').aggregate(
+        pending_maintenance=Count('id'),
+        overdue_maintenance=Count('id', filter=Q(due_date__lt=today)),
+    ))
+    return stats
+
+
+class StatsPublisher:
+    """
+    Recomputes the dashboard stats once per burst of model changes
+    (debounced) and publishes only the counters that changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer = None
+        self._last_snapshot = {}
+
+    def snapshot(self):
+        with self._lock:
+            if self._last_snapshot:
+                return dict(self._last_snapshot)
+        stats = get_live_dashboard_stats()
+        with self._lock:
+            self._last_snapshot = dict(stats)
+        return stats
+
+    def schedule(self):
+        if not get_broker().has_subscribers():
+            # Nobody is listening; next connect computes a fresh snapshot
+            with self._lock:
+                self._last_snapshot = {}
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(get_event_stream_setting('STATS_DEBOUNCE_SECONDS'), self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._timer = None
+            previous = self._last_snapshot
+        try:
+            stats = get_live_dashboard_stats()
+            delta = {key: value for key, value in stats.items() if previous.get(key) != value}
+            with self._lock:
+                self._last_snapshot = dict(stats)
+            if delta:
+                publish('stats', delta)
+        except Exception as e:
+            logger.warning(f"Failed to publish dashboard stats: {e}")
+        finally:
+            # Timer threads own their DB connection
+            close_old_connections()
+
+
+stats_publisher = StatsPublisher()
+
+
+def publish_unread_counts(user_ids):
+    """Push fresh unread notification counts to connected users"""
+    from .notification_engine import get_unread_count
+    from django.contrib.auth.models import User
+
+    broker = get_broker()
+    if not user_ids or not broker.has_subscribers():
+        return
+    connected = broker.subscribed_user_ids()
+    if connected is not None:
+        user_ids = set(user_ids) & connected
+
+    for user in User.objects.filter(id__in=user_ids):
+        publish('notifications', {'unread': get_unread_count(user)}, user_id=user.id)
+
+
+# ================================
+# SIGNAL RECEIVERS
+# ================================
+
+def _on_model_change(sender, **kwargs):
+    if kwargs.get('raw'):
+        return
+    transaction.on_commit(stats_publisher.schedule)
+
+
+def connect_signals():
+    """Feed the broker from the models behind the dashboard counters"""
+    from .models import Assignment, Device, MaintenanceOccurrence, MaintenanceSchedule
+
+    for model in (Device, Assignment, MaintenanceSchedule, MaintenanceOccurrence):
+        post_save.connect(_on_model_change, sender=model, dispatch_uid=f'event_stream_save_{model.__name__}')
+        post_delete.connect(_on_model_change, sender=model, dispatch_uid=f'event_stream_delete_{model.__name__}')
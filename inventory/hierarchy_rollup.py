@@ -0,0 +1,409 @@
+# inventory/hierarchy_rollup.py - Location Hierarchy Rollups
+"""
+Keeps one HierarchyRollup row per node of the location hierarchy (the system
+as a whole, each building, block, floor, department and room) holding the
+counts of its active child nodes, the devices located below it, their active
+assignments and asset value, and the active staff based there.
+
+Hierarchy statistics are then a single indexed lookup on
+(node_type, node_id) instead of a handful of COUNT queries per node.
+
+Rows are kept current by the signal receivers below: a save or delete marks
+the affected nodes and the statistics groups it can change, and after the
+transaction commits only those nodes and groups are recomputed, with one
+grouped query per node type and group. The ``rebuild_hierarchy_rollups``
+management command recomputes every row.
+"""
+
+import logging
+import threading
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .models import (
+    Assignment, Block, Building, Department, Device, Floor, HierarchyRollup,
+    Location, Room, Staff,
+)
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_NODE_ID = 0
+
+NODE_MODELS = {
+    'BUILDING': Building,
+    'BLOCK': Block,
+    'FLOOR': Floor,
+    'DEPARTMENT': Department,
+    'ROOM': Room,
+}
+NODE_TYPES = ['SYSTEM', *NODE_MODELS]
+
+# Field on Location pointing at each node type
+LOCATION_FIELDS = {
+    'BUILDING': 'building',
+    'BLOCK': 'block',
+    'FLOOR': 'floor',
+    'DEPARTMENT': 'department',
+    'ROOM': 'room',
+}
+
+# Child node counters of each node type: field -> (model, lookup to the node)
+CHILD_COUNTERS = {
+    'SYSTEM': {
+        'buildings': (Building, None),
+        'blocks': (Block, None),
+        'floors': (Floor, None),
+        'departments': (Department, None),
+        'rooms': (Room, None),
+        'locations': (Location, None),
+    },
+    'BUILDING': {
+        'blocks': (Block, 'building'),
+        'floors': (Floor, 'building'),
+        'departments': (Department, 'floor__building'),
+        'rooms': (Room, 'department__floor__building'),
+        'locations': (Location, 'building'),
+    },
+    'BLOCK': {
+        'floors': (Floor, 'block'),
+        'departments': (Department, 'floor__block'),
+        'rooms': (Room, 'department__floor__block'),
+        'locations': (Location, 'block'),
+    },
+    'FLOOR': {
+        'departments': (Department, 'floor'),
+        'rooms': (Room, 'department__floor'),
+        'locations': (Location, 'floor'),
+    },
+    'DEPARTMENT': {
+        'rooms': (Room, 'department'),
+        'locations': (Location, 'department'),
+    },
+    'ROOM': {
+        'locations': (Location, 'room'),
+    },
+}
+
+# Statistics groups and the rollup fields each one fills
+GROUP_FIELDS = {
+    'nodes': ['buildings', 'blocks', 'floors', 'departments', 'rooms', 'locations'],
+    'devices': ['devices', 'asset_value'],
+    'assignments': ['active_assignments'],
+    'staff': ['staff'],
+}
+ALL_GROUPS = frozenset(GROUP_FIELDS)
+
+# Devices that no longer count as assets
+EXCLUDED_DEVICE_STATUSES = ['DISPOSED']
+
+
+# ================================
+# COMPUTATION
+# ================================
+
+def _grouped(queryset, lookup, node_ids, **aggregates):
+    """Aggregate queryset per node (lookup) or, for SYSTEM, as a whole"""
+    if lookup is None:
+        return {SYSTEM_NODE_ID: queryset.aggregate(**aggregates)}
+    queryset = queryset.order_by()
+    if node_ids is not None:
+        queryset = queryset.filter(**{f'{lookup}__in': node_ids})
+    return {row[lookup]: row for row in queryset.values(lookup).annotate(**aggregates)}
+
+
+def _location_lookup(node_type, prefix):
+    if node_type == 'SYSTEM':
+        return None
+    return f'{prefix}{LOCATION_FIELDS[node_type]}'
+
+
+def compute_rollups(node_type, node_ids=None, groups=ALL_GROUPS):
+    """
+    Compute the given statistics groups for node_ids of node_type (all nodes
+    when None). Returns {node_id: {field: value}} for nodes that exist.
+    """
+    if node_type == 'SYSTEM':
+        existing = [SYSTEM_NODE_ID]
+    else:
+        nodes = NODE_MODELS[node_type].objects.order_by()
+        if node_ids is not None:
+            nodes = nodes.filter(pk__in=node_ids)
+        existing = list(nodes.values_list('pk', flat=True))
+        if not existing:
+            return {}
+
+    fields = [field for group in groups for field in GROUP_FIELDS[group]]
+    rollups = {
+        node_id: {field: Decimal('0') if field == 'asset_value' else 0 for field in fields}
+        for node_id in existing
+    }
+
+    def merge(results, mapping):
+        for node_id, row in results.items():
+            if node_id in rollups:
+                for field, key in mapping.items():
+                    rollups[node_id][field] = row[key] or rollups[node_id][field]
+
+    if 'nodes' in groups:
+        for field, (model, lookup) in CHILD_COUNTERS[node_type].items():
+            merge(_grouped(model.objects.filter(is_active=True), lookup, node_ids,
+                           total=Count('pk')), {field: 'total'})
+
+    if 'devices' in groups:
+        devices = Device.objects.exclude(status__in=EXCLUDED_DEVICE_STATUSES)
+        merge(_grouped(devices, _location_lookup(node_type, 'location__'), node_ids,
+                       total=Count('pk'), value=Sum('purchase_price')),
+              {'devices': 'total', 'asset_value': 'value'})
+
+    if 'assignments' in groups:
+        assignments = Assignment.objects.filter(is_active=True)
+        merge(_grouped(assignments, _location_lookup(node_type, 'device__location__'), node_ids,
+                       total=Count('pk')), {'active_assignments': 'total'})
+
+    if 'staff' in groups:
+        staff = Staff.objects.filter(is_active=True)
+        merge(_grouped(staff, _location_lookup(node_type, 'office_location__'), node_ids,
+                       total=Count('pk')), {'staff': 'total'})
+
+    return rollups
+
+
+def save_rollups(node_type, rollups, groups=ALL_GROUPS):
+    """Upsert computed rollups, updating only the fields of groups"""
+    if not rollups:
+        return
+    fields = [field for group in groups for field in GROUP_FIELDS[group]]
+    rows = [
+        HierarchyRollup(node_type=node_type, node_id=node_id, **values)
+        for node_id, values in rollups.items()
+    ]
+    options = {}
+    if connection.features.supports_update_conflicts_with_target:
+        options['unique_fields'] = ['node_type', 'node_id']
+    HierarchyRollup.objects.bulk_create(
+        rows, batch_size=500, update_conflicts=True,
+        update_fields=[*fields, 'updated_at'], **options
+    )
+
+
+def refresh_nodes(node_type, node_ids, groups=ALL_GROUPS):
+    """Recompute groups for the given nodes and drop rows of deleted nodes"""
+    node_ids = set(node_ids)
+    existing_rows = set(HierarchyRollup.objects.filter(
+        node_type=node_type, node_id__in=node_ids
+    ).values_list('node_id', flat=True))
+
+    # Nodes without a row yet need every group, not just the changed ones
+    partial = existing_rows if groups != ALL_GROUPS else set()
+    for ids, node_groups in ((partial, groups), (node_ids - partial, ALL_GROUPS)):
+        if ids:
+            rollups = compute_rollups(node_type, ids, node_groups)
+            save_rollups(node_type, rollups, node_groups)
+            node_ids -= set(rollups)
+
+    if node_ids:
+        HierarchyRollup.objects.filter(node_type=node_type, node_id__in=node_ids).delete()
+
+
+def rebuild_rollups():
+    """Recompute every rollup row; returns the number of rows per node type"""
+    stats = {}
+    with transaction.atomic():
+        for node_type in NODE_TYPES:
+            rollups = compute_rollups(node_type)
+            save_rollups(node_type, rollups)
+            HierarchyRollup.objects.filter(node_type=node_type).exclude(
+                node_id__in=list(rollups)
+            ).delete()
+            stats[node_type] = len(rollups)
+    return stats
+
+
+# ================================
+# LOOKUPS
+# ================================
+
+def get_rollup(node_type, node_id=SYSTEM_NODE_ID):
+    """Rollup of one node, computed on the spot if it has no row yet"""
+    return get_rollups(node_type, [node_id]).get(node_id)
+
+
+def get_rollups(node_type, node_ids):
+    """{node_id: HierarchyRollup} for node_ids, in one indexed query"""
+    node_ids = list(node_ids)
+    rollups = {
+        rollup.node_id: rollup
+        for rollup in HierarchyRollup.objects.filter(node_type=node_type, node_id__in=node_ids)
+    }
+    missing = set(node_ids) - set(rollups)
+    if missing:
+        refresh_nodes(node_type, missing)
+        rollups.update({
+            rollup.node_id: rollup
+            for rollup in HierarchyRollup.objects.filter(node_type=node_type, node_id__in=missing)
+        })
+    return rollups
+
+
+def attach_rollups(objects, node_type):
+    """Set obj.rollup on each Building/Block/Floor/Department/Room in objects"""
+    objects = list(objects)
+    rollups = get_rollups(node_type, [obj.pk for obj in objects])
+    for obj in objects:
+        obj.rollup = rollups.get(obj.pk) or HierarchyRollup(node_type=node_type, node_id=obj.pk)
+    return objects
+
+
+# ================================
+# INCREMENTAL MAINTENANCE
+# ================================
+
+# Source kind of each tracked model: its parent fields (attribute -> kind),
+# the statistics groups it affects and, when saved with update_fields, the
+# fields that make a save relevant
+TRACKED_MODELS = {
+    Building: ('BUILDING', {}, ALL_GROUPS, None),
+    Block: ('BLOCK', {'building_id': 'BUILDING'}, ALL_GROUPS, None),
+    Floor: ('FLOOR', {'building_id': 'BUILDING', 'block_id': 'BLOCK'}, ALL_GROUPS, None),
+    Department: ('DEPARTMENT', {'floor_id': 'FLOOR'}, ALL_GROUPS, None),
+    Room: ('ROOM', {'department_id': 'DEPARTMENT'}, ALL_GROUPS, None),
+    Location: ('LOCATION', {
+        'building_id': 'BUILDING', 'block_id': 'BLOCK', 'floor_id': 'FLOOR',
+        'department_id': 'DEPARTMENT', 'room_id': 'ROOM',
+    }, ALL_GROUPS, None),
+    Device: ('DEVICE', {'location_id': 'LOCATION'}, frozenset({'devices', 'assignments'}),
+             {'location', 'status', 'purchase_price'}),
+    Assignment: ('ASSIGNMENT', {'device_id': 'DEVICE'}, frozenset({'assignments'}),
+                 {'device', 'is_active'}),
+    Staff: ('STAFF', {'office_location_id': 'LOCATION'}, frozenset({'staff'}),
+            {'office_location', 'is_active'}),
+}
+KIND_MODELS = {kind: model for model, (kind, *_rest) in TRACKED_MODELS.items()}
+KIND_PARENTS = {kind: parents for _model, (kind, parents, *_rest) in TRACKED_MODELS.items()}
+
+_pending = threading.local()
+
+
+def _parent_keys(kind, values):
+    return {(parent_kind, values[attr]) for attr, parent_kind in KIND_PARENTS[kind].items() if values.get(attr)}
+
+
+def resolve_nodes(sources):
+    """
+    Expand {(kind, pk): groups} into {(node_type, node_id): groups} covering
+    every hierarchy node above each source, plus the SYSTEM node.
+    """
+    nodes = {}
+    frontier = dict(sources)
+    resolved = set()
+
+    def add(target, key, groups):
+        target[key] = target.get(key, frozenset()) | groups
+
+    while frontier:
+        next_frontier = {}
+        by_kind = {}
+        for (kind, pk), groups in frontier.items():
+            if kind == 'SYSTEM':
+                continue
+            if kind in NODE_MODELS:
+                add(nodes, (kind, pk), groups)
+            if (kind, pk) not in resolved and KIND_PARENTS[kind]:
+                by_kind.setdefault(kind, {})[pk] = groups
+            resolved.add((kind, pk))
+
+        for kind, pks in by_kind.items():
+            attrs = list(KIND_PARENTS[kind])
+            rows = KIND_MODELS[kind].objects.filter(pk__in=list(pks)).values('pk', *attrs)
+            for row in rows:
+                parents = _parent_keys(kind, row)
+                # A location row names every ancestor, so none of them needs its own lookup
+                if kind == 'LOCATION':
+                    resolved.update(parents)
+                for key in parents:
+                    add(next_frontier, key, pks[row['pk']])
+        frontier = next_frontier
+
+    if sources:
+        nodes[('SYSTEM', SYSTEM_NODE_ID)] = frozenset().union(*sources.values())
+    return nodes
+
+
+def refresh_sources(sources):
+    """Recompute the rollups affected by changes to sources"""
+    nodes = resolve_nodes(sources)
+    batches = {}
+    for (node_type, node_id), groups in nodes.items():
+        batches.setdefault((node_type, groups), set()).add(node_id)
+    for (node_type, groups), node_ids in batches.items():
+        refresh_nodes(node_type, node_ids, groups)
+
+
+def _flush_pending_sources():
+    sources, _pending.sources = _pending.sources, None
+    if not sources:
+        return
+    try:
+        refresh_sources(sources)
+    except Exception as e:
+        logger.error(f"Failed to refresh hierarchy rollups: {e}")
+
+
+def _flush_is_queued():
+    # A rollback discards queued callbacks together with the pending sources
+    return any(callback[1] is _flush_pending_sources for callback in connection.run_on_commit)
+
+
+def schedule_refresh(sources):
+    """Refresh rollups for {(kind, pk): groups} once the transaction commits"""
+    pending = getattr(_pending, 'sources', None)
+    if pending is not None and _flush_is_queued():
+        for key, groups in sources.items():
+            pending[key] = pending.get(key, frozenset()) | groups
+        return
+    _pending.sources = dict(sources)
+    transaction.on_commit(_flush_pending_sources)
+
+
+def _is_relevant(sender, update_fields):
+    relevant_fields = TRACKED_MODELS[sender][3]
+    return not (update_fields and relevant_fields and not relevant_fields & set(update_fields))
+
+
+def _remember_old_parents(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding or not _is_relevant(sender, update_fields):
+        return
+    kind, parents, _groups, _fields = TRACKED_MODELS[sender]
+    if not parents:
+        return
+    # Change-tracked models remember the loaded values, so no read is needed
+    snapshot = getattr(instance, '_loaded_values', None)
+    if snapshot is not None and all(attr in snapshot for attr in parents):
+        instance._rollup_old_parents = {attr: snapshot[attr] for attr in parents}
+        return
+    instance._rollup_old_parents = sender.objects.filter(pk=instance.pk).values(*parents).first() or {}
+
+
+def _on_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _is_relevant(sender, update_fields):
+        return
+    kind, _parents, groups, _fields = TRACKED_MODELS[sender]
+    values = {attr: getattr(instance, attr) for attr in KIND_PARENTS[kind]}
+
+    keys = _parent_keys(kind, values) | _parent_keys(kind, getattr(instance, '_rollup_old_parents', {}))
+    if kind in NODE_MODELS:
+        keys.add((kind, instance.pk))
+    if not keys:
+        keys.add(('SYSTEM', SYSTEM_NODE_ID))
+    schedule_refresh({key: groups for key in keys})
+
+
+def connect_signals():
+    for model in TRACKED_MODELS:
+        name = model.__name__
+        pre_save.connect(_remember_old_parents, sender=model, dispatch_uid=f'hierarchy_rollup_pre_{name}')
+        post_save.connect(_on_change, sender=model, dispatch_uid=f'hierarchy_rollup_save_{name}')
+        post_delete.connect(_on_change, sender=model, dispatch_uid=f'hierarchy_rollup_delete_{name}')
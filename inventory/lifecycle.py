@@ -0,0 +1,283 @@
+# inventory/lifecycle.py - Warranty and Lifecycle Analytics
+"""
+Portfolio-wide warranty, age, depreciation and replacement figures computed
+on column arrays instead of per device.
+
+load_frame() pulls only the columns the figures need with values_list()
+into a pandas DataFrame, and every statistic below is a vectorized
+expression or group-by over it, so the cost is one streamed query plus a
+few array passes however many devices there are.
+
+portfolio_analytics() returns plain Python data and caches it until the end
+of the day (keyed by date and filters); pass refresh=True to recompute.
+
+Definitions:
+    warranty buckets    days until warranty_end_date: expired (< 0),
+                        expiring_30, expiring_90, active (> 90), no_warranty
+    age buckets         years since purchase: new (< 1), recent (1-3),
+                        mature (3-5), old (>= 5), unknown
+    depreciation        straight line over expected_life_years (default
+                        DEFAULT_LIFE_YEARS) down to SALVAGE_RATE of the price
+    replacement         purchase_date + expected life; devices that are
+                        retired, disposed or lost are not forecast
+"""
+
+import hashlib
+import logging
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Device
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIFECYCLE_ANALYTICS = {
+    'DEFAULT_LIFE_YEARS': 5,
+    'SALVAGE_RATE': 0.1,
+    'FORECAST_YEARS': 5,
+    'TIMELINE_MONTHS': 12,
+    'CHUNK_SIZE': 5000,
+    'DEPRECIATION_METHOD': 'STRAIGHT_LINE',
+    'LEDGER_BATCH_SIZE': 1000,
+}
+
+COLUMNS = [
+    'device_id', 'status', 'is_critical', 'purchase_date', 'purchase_price',
+    'warranty_end_date', 'expected_life_years', 'vendor_id', 'vendor__name',
+    'device_type__subcategory__category_id', 'device_type__subcategory__category__name',
+]
+FRAME_COLUMNS = [
+    'device_id', 'status', 'is_critical', 'purchase_date', 'purchase_price',
+    'warranty_end_date', 'expected_life_years', 'vendor_id', 'vendor_name',
+    'category_id', 'category_name',
+]
+
+INACTIVE_STATUSES = ['RETIRED', 'DISPOSED', 'LOST']
+
+WARRANTY_BUCKETS = ['expired', 'expiring_30', 'expiring_90', 'active', 'no_warranty']
+AGE_BUCKETS = ['new', 'recent', 'mature', 'old', 'unknown']
+
+
+def get_lifecycle_setting(name):
+    return getattr(settings, 'LIFECYCLE_ANALYTICS', {}).get(name, DEFAULT_LIFECYCLE_ANALYTICS[name])
+
+
+# ================================
+# LOADING
+# ================================
+
+def load_frame(queryset=None):
+    """One row per device with the columns in FRAME_COLUMNS"""
+    queryset = Device.objects.all() if queryset is None else queryset
+    rows = queryset.order_by().values_list(*COLUMNS).iterator(chunk_size=get_lifecycle_setting('CHUNK_SIZE'))
+    frame = pd.DataFrame.from_records(rows, columns=FRAME_COLUMNS)
+
+    for column in ('purchase_date', 'warranty_end_date'):
+        frame[column] = pd.to_datetime(frame[column])
+    frame['purchase_price'] = pd.to_numeric(frame['purchase_price'], errors='coerce').astype(float)
+    frame['expected_life_years'] = pd.to_numeric(frame['expected_life_years'], errors='coerce').astype(float)
+    frame['is_critical'] = frame['is_critical'].astype(bool)
+    return frame
+
+
+def _days_until(dates, today):
+    return ((dates - pd.Timestamp(today)) / np.timedelta64(1, 'D')).to_numpy()
+
+
+# ================================
+# VECTORIZED FIGURES
+# ================================
+
+def warranty_buckets(frame, today):
+    """Bucket name per device (see WARRANTY_BUCKETS)"""
+    days = _days_until(frame['warranty_end_date'], today)
+    with np.errstate(invalid='ignore'):
+        return np.select(
+            [np.isnan(days), days < 0, days <= 30, days <= 90],
+            ['no_warranty', 'expired', 'expiring_30', 'expiring_90'],
+            default='active',
+        )
+
+
+def age_years(frame, today):
+    return -_days_until(frame['purchase_date'], today) / 365.25
+
+
+def age_buckets(ages):
+    with np.errstate(invalid='ignore'):
+        return np.select(
+            [np.isnan(ages), ages < 1, ages < 3, ages < 5],
+            ['unknown', 'new', 'recent', 'mature'],
+            default='old',
+        )
+
+
+def life_years(frame):
+    life = frame['expected_life_years'].to_numpy()
+    return np.where(np.isnan(life) | (life <= 0), get_lifecycle_setting('DEFAULT_LIFE_YEARS'), life)
+
+
+def book_values(frame, ages):
+    """Straight-line value today, floored at the salvage value"""
+    price = frame['purchase_price'].fillna(0).to_numpy()
+    salvage = price * get_lifecycle_setting('SALVAGE_RATE')
+    elapsed = np.clip(np.nan_to_num(ages, nan=0.0), 0, None)
+    value = price - (price - salvage) * elapsed / life_years(frame)
+    return np.maximum(value, salvage)
+
+
+def replacement_dates(frame):
+    life_days = np.round(life_years(frame) * 365.25).astype('timedelta64[D]')
+    return frame['purchase_date'].to_numpy() + life_days
+
+
+def _counts(labels, names):
+    values, counts = np.unique(labels, return_counts=True)
+    found = dict(zip(values.tolist(), counts.tolist()))
+    return {name: found.get(name, 0) for name in names}
+
+
+def _sums(labels, amounts, names):
+    return {name: float(amounts[labels == name].sum()) for name in names}
+
+
+def _month_start(day, offset=0):
+    month = day.month - 1 + offset
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def warranty_timeline(frame, today, months):
+    """Devices (and their price) whose warranty ends in each of the next months"""
+    start = np.datetime64(_month_start(today), 'M')
+    end_dates = frame['warranty_end_date'].to_numpy()
+    valid = ~np.isnat(end_dates) & (end_dates >= np.datetime64(today))
+    index = (end_dates[valid].astype('datetime64[M]') - start).astype(int)
+    in_range = (index >= 0) & (index < months)
+    index = index[in_range]
+    prices = frame['purchase_price'].fillna(0).to_numpy()[valid][in_range]
+    counts = np.bincount(index, minlength=months)
+    values = np.bincount(index, weights=prices, minlength=months)
+    return [
+        {'month': _month_start(today, i), 'count': int(counts[i]), 'total_value': float(values[i])}
+        for i in range(months)
+    ]
+
+
+def replacement_forecast(frame, today, years):
+    """Devices due for replacement per calendar year, plus those already overdue"""
+    active = ~frame['status'].isin(INACTIVE_STATUSES).to_numpy()
+    due = replacement_dates(frame)[active]
+    prices = frame['purchase_price'].fillna(0).to_numpy()[active]
+    known = ~np.isnat(due)
+    due, prices = due[known], prices[known]
+
+    due_years = due.astype('datetime64[Y]').astype(int) + 1970
+    overdue = due < np.datetime64(today)
+    forecast = [{
+        'year': 'overdue',
+        'count': int(overdue.sum()),
+        'replacement_cost': float(prices[overdue].sum()),
+    }]
+    for year in range(today.year, today.year + years):
+        mask = ~overdue & (due_years == year)
+        forecast.append({'year': year, 'count': int(mask.sum()), 'replacement_cost': float(prices[mask].sum())})
+    return forecast
+
+
+def _group_breakdown(frame, key, name, buckets):
+    grouped = (
+        pd.DataFrame({'key': frame[key], 'name': frame[name], 'bucket': buckets})
+        .dropna(subset=['key'])
+        .groupby(['key', 'name', 'bucket'])
+        .size()
+        .unstack(fill_value=0)
+        .reindex(columns=WARRANTY_BUCKETS, fill_value=0)
+    )
+    rows = []
+    for (group_id, group_name), counts in grouped.iterrows():
+        row = {'id': int(group_id), 'name': group_name, 'total': int(counts.sum())}
+        row.update({bucket: int(counts[bucket]) for bucket in WARRANTY_BUCKETS})
+        row['active_count'] = row['active'] + row['expiring_30'] + row['expiring_90']
+        row['expiring_count'] = row['expiring_30'] + row['expiring_90']
+        row['expired_count'] = row['expired']
+        rows.append(row)
+    return sorted(rows, key=lambda row: -row['total'])
+
+
+def yearly_purchases(frame):
+    dated = frame.dropna(subset=['purchase_date'])
+    grouped = dated.groupby(dated['purchase_date'].dt.year)['purchase_price'].agg(['count', 'sum'])
+    return [
+        {'year': int(year), 'count': int(row['count']), 'total_cost': float(row['sum'])}
+        for year, row in grouped.sort_index(ascending=False).iterrows()
+    ]
+
+
+def compute_analytics(frame, today):
+    """Every portfolio figure for the devices in frame, as plain Python data"""
+    warranty = warranty_buckets(frame, today)
+    ages = age_years(frame, today)
+    age_bucket = age_buckets(ages)
+    values = book_values(frame, ages)
+    prices = frame['purchase_price'].fillna(0).to_numpy()
+
+    known_ages = ages[~np.isnan(ages)]
+    return {
+        'as_of': today,
+        'device_count': int(len(frame)),
+        'warranty': {
+            'counts': _counts(warranty, WARRANTY_BUCKETS),
+            'values': _sums(warranty, prices, WARRANTY_BUCKETS),
+            'timeline': warranty_timeline(frame, today, get_lifecycle_setting('TIMELINE_MONTHS')),
+            'by_vendor': _group_breakdown(frame, 'vendor_id', 'vendor_name', warranty),
+            'by_category': _group_breakdown(frame, 'category_id', 'category_name', warranty),
+        },
+        'age': {
+            'counts': _counts(age_bucket, AGE_BUCKETS),
+            'mean_years': float(known_ages.mean()) if len(known_ages) else None,
+            'median_years': float(np.median(known_ages)) if len(known_ages) else None,
+            'histogram': np.bincount(np.floor(known_ages).clip(0, 10).astype(int), minlength=11).tolist(),
+        },
+        'depreciation': {
+            'purchase_value': float(prices.sum()),
+            'book_value': float(values.sum()),
+            'accumulated': float(prices.sum() - values.sum()),
+        },
+        'replacement_forecast': replacement_forecast(frame, today, get_lifecycle_setting('FORECAST_YEARS')),
+        'yearly_purchases': yearly_purchases(frame),
+    }
+
+
+# ================================
+# CACHED ENTRY POINT
+# ================================
+
+def _seconds_until_tomorrow():
+    now = timezone.localtime()
+    midnight = timezone.make_aware(datetime.combine(now.date() + timedelta(days=1), time.min))
+    return max(60, int((midnight - now).total_seconds()))
+
+
+def portfolio_analytics(filters=None, refresh=False):
+    """
+    compute_analytics() over Device.objects.filter(**filters), cached until
+    the end of the day
+    """
+    filters = filters or {}
+    today = timezone.localdate()
+    digest = hashlib.md5(repr(sorted(filters.items())).encode('utf-8')).hexdigest()
+    key = f'lifecycle_analytics_{today.isoformat()}_{digest}'
+
+    result = None if refresh else cache.get(key)
+    if result is None:
+        result = compute_analytics(load_frame(Device.objects.filter(**filters)), today)
+        try:
+            cache.set(key, result, _seconds_until_tomorrow())
+        except Exception as e:
+            logger.warning(f"Failed to cache lifecycle analytics: {e}")
+    return result
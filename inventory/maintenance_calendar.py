@@ -0,0 +1,308 @@
+# inventory/maintenance_calendar.py - Maintenance Calendar Engine
+"""
+Expands recurring MaintenanceSchedule rules into MaintenanceOccurrence rows
+over a rolling horizon so calendar views (week/month, per vendor, per
+technician) are answered by a single indexed range query.
+
+Occurrences are kept in step with their schedule by the post_save receiver
+below, by complete_schedule() when maintenance is completed, and by the
+``refresh_maintenance_calendar`` management command which rolls the horizon
+forward.
+"""
+
+import calendar
+import logging
+from datetime import timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import MaintenanceOccurrence, MaintenanceSchedule
+
+logger = logging.getLogger(__name__)
+
+# Recurrence step for each MaintenanceSchedule.frequency; AS_NEEDED is a one-off
+FREQUENCY_STEPS = {
+    'WEEKLY': relativedelta(weeks=1),
+    'MONTHLY': relativedelta(months=1),
+    'QUARTERLY': relativedelta(months=3),
+    'SEMI_ANNUAL': relativedelta(months=6),
+    'ANNUAL': relativedelta(years=1),
+}
+
+# Schedule statuses that no longer produce open occurrences
+CLOSED_SCHEDULE_STATUSES = ['COMPLETED', 'CANCELLED']
+
+DEFAULT_HORIZON_DAYS = 365
+
+
+def get_horizon_end(today=None, horizon_days=None):
+    """Return the last date covered by the rolling calendar horizon"""
+    today = today or timezone.now().date()
+    if horizon_days is None:
+        horizon_days = getattr(settings, 'MAINTENANCE_CALENDAR_HORIZON_DAYS', DEFAULT_HORIZON_DAYS)
+    return today + timedelta(days=horizon_days)
+
+
+def expand_schedule_dates(schedule, horizon_end, today=None):
+    """
+    Return the due dates a schedule produces from next_due_date up to horizon_end.
+
+    The outstanding next_due_date is always included; later recurrences that
+    already lie in the past are skipped so an overdue schedule shows once.
+    """
+    today = today or timezone.now().date()
+    if not schedule.is_active or schedule.status in CLOSED_SCHEDULE_STATUSES:
+        return []
+    if not schedule.next_due_date:
+        return []
+
+    step = FREQUENCY_STEPS.get(schedule.frequency)
+    if step is None:
+        return [schedule.next_due_date]
+
+    dates = []
+    occurrence = 0
+    current = schedule.next_due_date
+    while current <= horizon_end:
+        if occurrence == 0 or current >= today:
+            dates.append(current)
+        occurrence += 1
+        # Always step from the anchor so month-end dates do not drift
+        current = schedule.next_due_date + step * occurrence
+
+    # A schedule first due beyond the horizon still keeps its outstanding occurrence
+    return dates or [schedule.next_due_date]
+
+
+def _build_occurrence(schedule, due_date):
+    return MaintenanceOccurrence(
+        schedule=schedule,
+        due_date=due_date,
+        device_id=schedule.device_id,
+        vendor_id=schedule.vendor_id,
+        assigned_technician_id=schedule.assigned_technician_id,
+        maintenance_type=schedule.maintenance_type,
+    )
+
+
+def sync_schedule(schedule, horizon_end=None):
+    """
+    Bring the open occurrences of one schedule in line with its current rule.
+
+    Completed/skipped occurrences are history and never touched. Returns a
+    tuple of (created, removed) counts.
+    """
+    horizon_end = horizon_end or get_horizon_end()
+    desired = set(expand_schedule_dates(schedule, horizon_end))
+
+    with transaction.atomic():
+        open_occurrences = MaintenanceOccurrence.objects.filter(
+            schedule=schedule, status='SCHEDULED'
+        )
+        existing = set(open_occurrences.values_list('due_date', flat=True))
+
+        removed = 0
+        if existing - desired:
+            removed, _ = open_occurrences.exclude(due_date__in=desired).delete()
+
+        # Denormalized columns follow the schedule in one UPDATE
+        open_occurrences.filter(due_date__in=desired).update(
+            device_id=schedule.device_id,
+            vendor_id=schedule.vendor_id,
+            assigned_technician_id=schedule.assigned_technician_id,
+            maintenance_type=schedule.maintenance_type,
+            updated_at=timezone.now(),
+        )
+
+        missing = sorted(desired - existing)
+        if missing:
+            MaintenanceOccurrence.objects.bulk_create(
+                [_build_occurrence(schedule, due_date) for due_date in missing],
+                ignore_conflicts=True,
+            )
+
+    return len(missing), removed
+
+
+def refresh_calendar(horizon_end=None, batch_size=500, rebuild=False):
+    """
+    Roll the occurrence index forward to horizon_end for all active schedules.
+
+    Works in batches with bulk inserts so it stays cheap for tens of thousands
+    of schedules. With rebuild=True all open occurrences are regenerated.
+    """
+    horizon_end = horizon_end or get_horizon_end()
+    today = timezone.now().date()
+    stats = {'schedules': 0, 'created': 0, 'removed': 0}
+
+    open_occurrences = MaintenanceOccurrence.objects.filter(status='SCHEDULED')
+    if rebuild:
+        stats['removed'], _ = open_occurrences.delete()
+    else:
+        # Drop open occurrences of schedules that were deactivated or closed
+        stats['removed'], _ = open_occurrences.filter(
+            Q(schedule__is_active=False) | Q(schedule__status__in=CLOSED_SCHEDULE_STATUSES)
+        ).delete()
+        # and past recurrences that sync_schedule() no longer wants: an
+        # overdue schedule keeps only its outstanding next_due_date
+        lapsed, _ = open_occurrences.filter(due_date__lt=today).filter(
+            Q(schedule__next_due_date__isnull=True) | ~Q(due_date=F('schedule__next_due_date'))
+        ).delete()
+        stats['removed'] += lapsed
+
+    schedules = MaintenanceSchedule.objects.filter(is_active=True).exclude(
+        status__in=CLOSED_SCHEDULE_STATUSES
+    ).only(
+        'id', 'device_id', 'vendor_id', 'assigned_technician_id', 'maintenance_type',
+        'frequency', 'next_due_date', 'status', 'is_active',
+    ).order_by('id')
+
+    batch = []
+    for schedule in schedules.iterator(chunk_size=batch_size):
+        stats['schedules'] += 1
+        batch.extend(
+            _build_occurrence(schedule, due_date)
+            for due_date in expand_schedule_dates(schedule, horizon_end)
+        )
+        if len(batch) >= batch_size:
+            MaintenanceOccurrence.objects.bulk_create(batch, ignore_conflicts=True, batch_size=batch_size)
+            stats['created'] += len(batch)
+            batch = []
+
+    if batch:
+        MaintenanceOccurrence.objects.bulk_create(batch, ignore_conflicts=True, batch_size=batch_size)
+        stats['created'] += len(batch)
+
+    logger.info(
+        f"Maintenance calendar refreshed to {horizon_end}: {stats['schedules']} schedules, "
+        f"{stats['created']} occurrences written, {stats['removed']} removed"
+    )
+    return stats
+
+
+def complete_schedule(schedule, completed_on=None):
+    """
+    Mark the outstanding occurrence of a schedule as completed and, for
+    recurring schedules, advance next_due_date to the following occurrence.
+
+    A schedule without a due date has no occurrence to close (see
+    expand_schedule_dates); returns None then, and a recurring schedule
+    is next due one step after the completion.
+    """
+    completed_on = completed_on or timezone.now().date()
+
+    with transaction.atomic():
+        occurrence = MaintenanceOccurrence.objects.select_for_update().filter(
+            schedule=schedule, status='SCHEDULED'
+        ).order_by('due_date').first()
+
+        if occurrence is None and schedule.next_due_date:
+            occurrence = _build_occurrence(schedule, schedule.next_due_date)
+        if occurrence is not None:
+            occurrence.status = 'COMPLETED'
+            occurrence.completed_date = completed_on
+            occurrence.save()
+
+        schedule.last_completed_date = completed_on
+        step = FREQUENCY_STEPS.get(schedule.frequency)
+        if step is None:
+            schedule.status = 'COMPLETED'
+        else:
+            next_due = (occurrence.due_date if occurrence is not None else completed_on) + step
+            while next_due <= completed_on:
+                next_due += step
+            schedule.next_due_date = next_due
+            schedule.status = 'SCHEDULED'
+
+        # post_save re-syncs the remaining open occurrences
+        schedule.save(update_fields=['last_completed_date', 'next_due_date', 'status', 'updated_at'])
+
+    return occurrence
+
+
+# ================================
+# RANGE QUERIES
+# ================================
+
+def week_bounds(day):
+    """Monday..Sunday bounds of the week containing day"""
+    start = day - timedelta(days=day.weekday())
+    return start, start + timedelta(days=6)
+
+
+def month_bounds(day):
+    """First..last day bounds of the month containing day"""
+    last_day = calendar.monthrange(day.year, day.month)[1]
+    return day.replace(day=1), day.replace(day=last_day)
+
+
+def occurrences_between(start, end, vendor=None, technician=None, status=None, maintenance_type=None):
+    """Return occurrences due in [start, end] as one indexed range query"""
+    occurrences = MaintenanceOccurrence.objects.filter(due_date__range=(start, end))
+    if vendor:
+        occurrences = occurrences.filter(vendor_id=vendor)
+    if technician:
+        occurrences = occurrences.filter(assigned_technician_id=technician)
+    if status:
+        occurrences = occurrences.filter(status=status)
+    if maintenance_type:
+        occurrences = occurrences.filter(maintenance_type=maintenance_type)
+
+    return occurrences.select_related(
+        'schedule', 'device', 'vendor', 'assigned_technician__user'
+    ).order_by('due_date', 'id')
+
+
+def calendar_stats(today=None, upcoming_days=30):
+    """Overdue/upcoming/completed counts for the planning views in a single aggregate"""
+    today = today or timezone.now().date()
+    month_start, month_end = month_bounds(today)
+    scheduled = Q(status='SCHEDULED')
+
+    return MaintenanceOccurrence.objects.aggregate(
+        total_schedules=Count('schedule', distinct=True, filter=scheduled),
+        overdue_count=Count('id', filter=scheduled & Q(due_date__lt=today)),
+        upcoming_count=Count('id', filter=scheduled & Q(
+            due_date__gte=today, due_date__lte=today + timedelta(days=upcoming_days)
+        )),
+        completed_this_month=Count('id', filter=Q(
+            status='COMPLETED', completed_date__range=(month_start, month_end)
+        )),
+    )
+
+
+def serialize_occurrence(occurrence):
+    """Compact dict used by the calendar JSON endpoint"""
+    return {
+        'id': occurrence.id,
+        'schedule_id': occurrence.schedule_id,
+        'date': occurrence.due_date.isoformat(),
+        'status': occurrence.status,
+        'device_id': occurrence.device_id,
+        'device_name': occurrence.device.device_name,
+        'type': occurrence.get_maintenance_type_display(),
+        'vendor': occurrence.vendor.name if occurrence.vendor else None,
+        'technician': str(occurrence.assigned_technician) if occurrence.assigned_technician else None,
+        'is_overdue': occurrence.is_overdue,
+    }
+
+
+# ================================
+# SIGNAL RECEIVERS
+# ================================
+
+@receiver(post_save, sender=MaintenanceSchedule)
+def sync_occurrences_on_schedule_save(sender, instance, raw=False, **kwargs):
+    """Incrementally re-expand a schedule whenever it changes"""
+    if raw:
+        return
+    try:
+        sync_schedule(instance)
+    except Exception as e:
+        logger.error(f"Failed to sync maintenance occurrences for schedule {instance.pk}: {e}")
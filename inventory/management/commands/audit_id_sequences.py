@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from inventory.sequences import audit_all
+
+
+def _format_ranges(ranges, limit=10):
+    shown = ', '.join(str(first) if first == last else f'{first}-{last}' for first, last in ranges[:limit])
+    return shown + (f' (+{len(ranges) - limit} more)' if len(ranges) > limit else '')
+
+
+class Command(BaseCommand):
+    help = 'Account for every generated ID: used, allocated but unused, or used without an allocation'
+
+    def handle(self, *args, **options):
+        reports = audit_all()
+        if not reports:
+            self.stdout.write('No ID sequences in use.')
+            return
+
+        problems = 0
+        for report in reports:
+            self.stdout.write(
+                f"{report['prefix']}: {report['allocations']} allocations, "
+                f"{report['allocated']} allocated, {report['used']} used"
+            )
+            if report['unused']:
+                self.stdout.write(f"  allocated but unused: {_format_ranges(report['unused'])}")
+            if report['unallocated']:
+                values = [(value, value) for value in report['unallocated']]
+                self.stdout.write(f"  used without allocation: {_format_ranges(values)}")
+            if report['overlaps']:
+                problems += 1
+                self.stdout.write(self.style.ERROR(f"  overlapping allocations: {_format_ranges(report['overlaps'])}"))
+
+        if problems:
+            self.stdout.write(self.style.ERROR(f'❌ {problems} sequences have overlapping allocations'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ {len(reports)} sequences audited, no overlapping allocations'))
@@ -0,0 +1,121 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.views import VIEW_MODULES
+
+# Libraries worth calling out when an import pulls them in
+HEAVY_LIBRARIES = ['pandas', 'numpy', 'openpyxl', 'qrcode', 'PIL', 'reportlab', 'rest_framework']
+
+# Runs in a fresh interpreter: time django.setup() and then the import of
+# one module, and list the heavy libraries that import loaded
+PROBE = '''
+import json, sys, time
+import django
+start = time.perf_counter()
+django.setup()
+setup = time.perf_counter() - start
+before = set(sys.modules)
+start = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - start
+loaded = {name.split('.')[0] for name in set(sys.modules) - before}
+print(json.dumps({'setup': setup, 'import': elapsed, 'libraries': sorted(loaded & set(sys.argv[2:]))}))
+'''
+
+
+def default_modules():
+    """The root URLconf, each project app's urls and views, and every inventory view module"""
+    modules = [settings.ROOT_URLCONF]
+    for config in apps.get_app_configs():
+        if not config.path.startswith(str(settings.BASE_DIR)):
+            continue
+        for submodule in ('urls', 'views'):
+            name = f'{config.name}.{submodule}'
+            path = os.path.join(config.path, submodule)
+            if os.path.exists(f'{path}.py') or os.path.isdir(path):
+                modules.append(name)
+    modules.extend(f'inventory.views.{module}' for module in VIEW_MODULES)
+    return modules
+
+
+class Command(BaseCommand):
+    help = 'Measure cold import time of the URLconfs and view modules, one fresh interpreter per module'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--module',
+            action='append',
+            dest='modules',
+            help='Module to measure (repeatable; default: URLconfs and view modules)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per module; the median is reported (default: 3)',
+        )
+        parser.add_argument(
+            '--importtime',
+            type=int,
+            default=0,
+            metavar='N',
+            help='Also show the N slowest imports (python -X importtime) of each module',
+        )
+
+    def probe(self, module, importtime=False):
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        command += ['-c', PROBE, module, *HEAVY_LIBRARIES]
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE))
+        result = subprocess.run(command, capture_output=True, text=True, env=env, cwd=str(settings.BASE_DIR))
+        if result.returncode != 0:
+            raise CommandError(f"Importing {module} failed:\n{result.stderr.strip()[-2000:]}")
+        return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def slowest_imports(self, stderr, count):
+        # "import time: self [us] | cumulative | imported package"
+        rows = []
+        for line in stderr.splitlines():
+            parts = line.split('|')
+            if len(parts) != 3 or not parts[1].strip().isdigit():
+                continue
+            rows.append((int(parts[1]), parts[2].strip()))
+        return sorted(rows, reverse=True)[:count]
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or default_modules()
+        repeat = max(1, options['repeat'])
+
+        results = []
+        setup_times = []
+        for module in modules:
+            runs = [self.probe(module)[0] for _run in range(repeat)]
+            setup_times.extend(run['setup'] for run in runs)
+            results.append((
+                module,
+                statistics.median(run['import'] for run in runs),
+                runs[0]['libraries'],
+            ))
+
+        self.stdout.write(f"django.setup(): {statistics.median(setup_times) * 1000:.0f} ms (median of {len(setup_times)} runs)")
+        self.stdout.write('')
+        width = max(len(module) for module in modules)
+        self.stdout.write(f"{'Module'.ljust(width)}  {'Import':>9}  Heavy libraries loaded")
+        for module, elapsed, libraries in sorted(results, key=lambda result: -result[1]):
+            self.stdout.write(f"{module.ljust(width)}  {elapsed * 1000:>6.0f} ms  {', '.join(libraries) or '-'}")
+
+        if options['importtime']:
+            for module in modules:
+                _run, stderr = self.probe(module, importtime=True)
+                self.stdout.write('')
+                self.stdout.write(f"Slowest imports of {module} (cumulative):")
+                for microseconds, name in self.slowest_imports(stderr, options['importtime']):
+                    self.stdout.write(f"  {microseconds / 1000:>8.1f} ms  {name}")
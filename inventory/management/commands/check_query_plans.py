@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.query_plans import PLAN_CHECKS, check_plan
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot-path filters and fail on full table scans (see inventory/query_plans.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            action='append',
+            dest='names',
+            help=f"Check to run (repeatable): {', '.join(check['name'] for check in PLAN_CHECKS)}",
+        )
+        parser.add_argument(
+            '--show-plans',
+            action='store_true',
+            help='Print each query plan',
+        )
+
+    def handle(self, *args, **options):
+        checks = PLAN_CHECKS
+        if options['names']:
+            known = {check['name'] for check in PLAN_CHECKS}
+            unknown = set(options['names']) - known
+            if unknown:
+                raise CommandError(f"Unknown check: {', '.join(sorted(unknown))}")
+            checks = [check for check in PLAN_CHECKS if check['name'] in options['names']]
+
+        failed = []
+        for check in checks:
+            result = check_plan(check)
+            outcome = self.style.ERROR('; '.join(result['failures'])) if result['failures'] else self.style.SUCCESS('ok')
+            self.stdout.write(f"{result['name']:32} {outcome}")
+            if options['show_plans'] and result['plan']:
+                for line in result['plan'].splitlines():
+                    self.stdout.write(f'    {line}')
+            if result['failures']:
+                failed.append(result['name'])
+
+        self.stdout.write('')
+        if failed:
+            raise CommandError(f"Full table scans in: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS('✅ No full table scans'))
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from inventory.change_feed import compact
+
+
+class Command(BaseCommand):
+    help = 'Delete change feed entries superseded by a later entry for the same object'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-hours',
+            type=float,
+            help='Only compact entries older than this (default: CHANGE_FEED COMPACT_AFTER_HOURS)',
+        )
+
+    def handle(self, *args, **options):
+        hours = options['older_than_hours']
+        deleted = compact(timedelta(hours=hours) if hours is not None else None)
+        self.stdout.write(self.style.SUCCESS(f'✅ Compacted {deleted} change feed entries'))
@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.synthetic import DEFAULT_RATIOS, SCALES, generate, purge
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic inventory (devices, staff, assignments, scans, audit logs, maintenance) for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            choices=sorted(SCALES, key=SCALES.get),
+            default='small',
+            help=f"Dataset size preset: {', '.join(f'{name}={count:,}' for name, count in SCALES.items())} devices",
+        )
+        parser.add_argument(
+            '--devices',
+            type=int,
+            help='Number of devices (overrides --scale)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed; the same seed and size give the same data (default: 0)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Devices generated and inserted per chunk (default: 5000)',
+        )
+        for name, ratio in DEFAULT_RATIOS.items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}-per-device",
+                type=float,
+                dest=name,
+                default=ratio,
+                help=f'{name.replace("_", " ").capitalize()} generated per device (default: {ratio})',
+            )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Delete all previously generated synthetic data instead of generating',
+        )
+
+    def handle(self, *args, **options):
+        if options['purge']:
+            deleted = purge()
+            summary = ', '.join(f'{count:,} {label}' for label, count in sorted(deleted.items()) if count)
+            self.stdout.write(self.style.SUCCESS(f"✅ Deleted {summary or 'nothing'}"))
+            return
+
+        devices = options['devices'] or SCALES[options['scale']]
+        if devices < 1 or options['batch_size'] < 1:
+            raise CommandError('--devices and --batch-size must be positive')
+
+        ratios = {name: options[name] for name in DEFAULT_RATIOS}
+        self.stdout.write(f'Generating {devices:,} synthetic devices (seed {options["seed"]})...')
+        start = time.perf_counter()
+
+        def progress(totals):
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"  {totals['devices']:>9,} devices, {totals['staff']:,} staff  ({elapsed:.0f} s)")
+
+        try:
+            totals = generate(
+                devices,
+                seed=options['seed'],
+                batch_size=options['batch_size'],
+                ratios=ratios,
+                progress=progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - start
+        summary = ', '.join(f'{count:,} {name.replace("_", " ")}' for name, count in totals.items())
+        self.stdout.write(self.style.SUCCESS(f'✅ Generated {summary} in {elapsed:.1f} s'))
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.depreciation import METHODS, last_closed_period, post_periods
+
+
+def _month(value):
+    try:
+        return datetime.strptime(value, '%Y-%m').date()
+    except ValueError:
+        raise CommandError(f"Invalid month '{value}', expected YYYY-MM")
+
+
+class Command(BaseCommand):
+    help = 'Post month-end book values and TCO to the depreciation ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period',
+            default=None,
+            help='Month to post, YYYY-MM (default: the last closed month)',
+        )
+        parser.add_argument(
+            '--from',
+            dest='start',
+            default=None,
+            help='Post every month from this one (YYYY-MM) through --period',
+        )
+        parser.add_argument(
+            '--method',
+            choices=METHODS,
+            default=None,
+            help='Depreciation method (default: LIFECYCLE_ANALYTICS DEPRECIATION_METHOD)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Rows per bulk insert (default: LIFECYCLE_ANALYTICS LEDGER_BATCH_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        end = _month(options['period']) if options['period'] else last_closed_period()
+        start = _month(options['start']) if options['start'] else end
+        if start > end:
+            raise CommandError('--from must not be after --period')
+
+        for stats in post_periods(start, end, method=options['method'], batch_size=options['batch_size']):
+            self.stdout.write(
+                f"{stats['period']:%Y-%m}: {stats['devices']} devices, purchase value {stats['purchase_value']}, "
+                f"book value {stats['book_value']}, maintenance to date {stats['cumulative_maintenance']}"
+            )
+        self.stdout.write(self.style.SUCCESS('✅ Depreciation ledger posted'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from inventory.hierarchy_rollup import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-node location hierarchy statistics (HierarchyRollup)'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding hierarchy rollups...')
+
+        stats = rebuild_rollups()
+
+        summary = ', '.join(f'{count} {node_type.lower()}' for node_type, count in stats.items())
+        self.stdout.write(self.style.SUCCESS(f'✅ Rollups rebuilt: {summary}'))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from inventory.maintenance_calendar import get_horizon_end, refresh_calendar
+
+
+class Command(BaseCommand):
+    help = 'Expand maintenance schedules into the occurrence calendar over a rolling horizon'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horizon-days',
+            type=int,
+            default=None,
+            help='Number of days ahead to expand (default: MAINTENANCE_CALENDAR_HORIZON_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows per bulk insert (default: 500)',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Discard all open occurrences and regenerate them',
+        )
+
+    def handle(self, *args, **options):
+        horizon_end = get_horizon_end(horizon_days=options['horizon_days'])
+        self.stdout.write(f'Refreshing maintenance calendar up to {horizon_end}...')
+
+        stats = refresh_calendar(
+            horizon_end=horizon_end,
+            batch_size=options['batch_size'],
+            rebuild=options['rebuild'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {stats['schedules']} schedules expanded, "
+            f"{stats['created']} occurrences written, {stats['removed']} removed"
+        ))
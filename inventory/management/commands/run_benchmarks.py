@@ -0,0 +1,124 @@
+import json
+import platform
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from inventory.benchmarks import BENCHMARKS, compare, run_benchmark
+from inventory.models import Device
+
+
+class Command(BaseCommand):
+    help = 'Time the hot-path views and check their query budgets (see inventory/benchmarks.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            action='append',
+            dest='names',
+            help=f"Benchmark to run (repeatable): {', '.join(benchmark['name'] for benchmark in BENCHMARKS)}",
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=5,
+            help='Timed rounds per benchmark (default: 5)',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=1,
+            help='Untimed rounds before timing (default: 1)',
+        )
+        parser.add_argument(
+            '--user',
+            help='Username to run the views as (default: first superuser)',
+        )
+        parser.add_argument(
+            '--save',
+            metavar='FILE',
+            help='Write the results as JSON, e.g. as the baseline for a later --compare',
+        )
+        parser.add_argument(
+            '--compare',
+            metavar='FILE',
+            help='Fail when a median is slower than in this saved result by more than --tolerance',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed slowdown against --compare, as a fraction (default: 0.25)',
+        )
+
+    def handle(self, *args, **options):
+        benchmarks = BENCHMARKS
+        if options['names']:
+            known = {benchmark['name'] for benchmark in BENCHMARKS}
+            unknown = set(options['names']) - known
+            if unknown:
+                raise CommandError(f"Unknown benchmark: {', '.join(sorted(unknown))}")
+            benchmarks = [benchmark for benchmark in BENCHMARKS if benchmark['name'] in options['names']]
+
+        users = User.objects.filter(username=options['user']) if options['user'] else User.objects.filter(is_superuser=True)
+        user = users.order_by('id').first()
+        if user is None:
+            raise CommandError('No user to run the views as; pass --user or create a superuser')
+
+        devices = Device.objects.count()
+        self.stdout.write(f'Running {len(benchmarks)} benchmarks on {devices:,} devices as {user.username}, {options["rounds"]} rounds each')
+        self.stdout.write('')
+        self.stdout.write(f"{'Benchmark':32} {'Min':>9} {'Median':>9} {'Mean':>9} {'Max':>9} {'StdDev':>8} {'Queries':>8}  Result")
+
+        results = []
+        for benchmark in benchmarks:
+            result = run_benchmark(benchmark, user, rounds=max(1, options['rounds']), warmup=max(0, options['warmup']))
+            results.append(result)
+            timings = ' '.join(f"{result[key] * 1000:>6.1f} ms" for key in ('min', 'median', 'mean', 'max'))
+            outcome = self.style.ERROR('; '.join(result['failures'])) if result['failures'] else self.style.SUCCESS('ok')
+            self.stdout.write(
+                f"{result['name']:32} {timings} {result['stddev'] * 1000:>5.1f} ms {result['queries']:>8}  {outcome}"
+            )
+
+        failures = {result['name']: '; '.join(result['failures']) for result in results if result['failures']}
+
+        if options['compare']:
+            try:
+                with open(options['compare']) as baseline_file:
+                    baseline = json.load(baseline_file)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read {options['compare']}: {e}")
+            self.stdout.write('')
+            regressions = {}
+            if baseline.get('devices') != devices:
+                # Timings of different dataset sizes are not comparable
+                self.stdout.write(self.style.WARNING(
+                    f"Baseline was taken on {baseline.get('devices')} devices, this run on {devices}; "
+                    f"timings not compared"
+                ))
+            else:
+                regressions = compare(results, baseline, options['tolerance'])
+                if not regressions:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"No benchmark slower than baseline by more than {options['tolerance']:.0%}"
+                    ))
+            for name, message in regressions.items():
+                self.stdout.write(self.style.ERROR(f'Slower than baseline: {name}: {message}'))
+                failures.setdefault(name, message)
+
+        if options['save']:
+            with open(options['save'], 'w') as output:
+                json.dump({
+                    'timestamp': timezone.now().isoformat(),
+                    'devices': devices,
+                    'database': settings.DATABASES['default']['ENGINE'],
+                    'python': platform.python_version(),
+                    'results': results,
+                }, output, indent=2)
+            self.stdout.write(f"Results written to {options['save']}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} benchmark(s) failed: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('✅ All benchmarks within budget'))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from inventory.notification_engine import (
+    deliver_pending_emails, install_default_rules, run_notification_rules,
+)
+
+
+class Command(BaseCommand):
+    help = 'Evaluate notification rules, fan out notifications and deliver pending emails (run periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--install-defaults',
+            action='store_true',
+            help='Create the default overdue/warranty/maintenance rules if missing',
+        )
+        parser.add_argument(
+            '--event-type',
+            action='append',
+            dest='event_types',
+            help='Only evaluate rules of this event type (can be repeated)',
+        )
+        parser.add_argument(
+            '--skip-email',
+            action='store_true',
+            help='Only create notifications, do not deliver email',
+        )
+        parser.add_argument(
+            '--email-batch-size',
+            type=int,
+            default=100,
+            help='Emails sent per SMTP connection (default: 100)',
+        )
+
+    def handle(self, *args, **options):
+        if options['install_defaults']:
+            created = install_default_rules()
+            self.stdout.write(f'{created} default notification rule(s) created')
+
+        stats = run_notification_rules(event_types=options['event_types'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {stats['rules']} rule(s) evaluated, {len(stats['recipients'])} recipient(s) notified"
+        ))
+        for error in stats['errors']:
+            self.stdout.write(self.style.ERROR(f'❌ {error}'))
+
+        if not options['skip_email']:
+            email_stats = deliver_pending_emails(batch_size=options['email_batch_size'])
+            self.stdout.write(
+                f"📧 {email_stats['sent']} sent, {email_stats['failed']} failed, "
+                f"{email_stats['skipped']} without email address"
+            )
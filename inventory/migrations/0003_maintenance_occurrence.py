@@ -0,0 +1,114 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0002_staff_last_activity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MaintenanceOccurrence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("due_date", models.DateField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("SCHEDULED", "Scheduled"),
+                            ("COMPLETED", "Completed"),
+                            ("SKIPPED", "Skipped"),
+                        ],
+                        default="SCHEDULED",
+                        max_length=20,
+                    ),
+                ),
+                ("completed_date", models.DateField(blank=True, null=True)),
+                (
+                    "maintenance_type",
+                    models.CharField(
+                        choices=[
+                            ("PREVENTIVE", "Preventive Maintenance"),
+                            ("CORRECTIVE", "Corrective Maintenance"),
+                            ("EMERGENCY", "Emergency Repair"),
+                            ("UPGRADE", "Hardware/Software Upgrade"),
+                            ("INSPECTION", "Routine Inspection"),
+                        ],
+                        max_length=40,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "assigned_technician",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="maintenance_occurrences",
+                        to="inventory.staff",
+                    ),
+                ),
+                (
+                    "device",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="maintenance_occurrences",
+                        to="inventory.device",
+                    ),
+                ),
+                (
+                    "schedule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occurrences",
+                        to="inventory.maintenanceschedule",
+                    ),
+                ),
+                (
+                    "vendor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="maintenance_occurrences",
+                        to="inventory.vendor",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["due_date", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["due_date", "status"],
+                        name="inventory_m_due_dat_af26e0_idx",
+                    ),
+                    models.Index(
+                        fields=["vendor", "due_date"],
+                        name="inventory_m_vendor__042973_idx",
+                    ),
+                    models.Index(
+                        fields=["assigned_technician", "due_date"],
+                        name="inventory_m_assigne_98396f_idx",
+                    ),
+                    models.Index(
+                        fields=["schedule", "status", "due_date"],
+                        name="inventory_m_schedul_cd1232_idx",
+                    ),
+                ],
+                "unique_together": {("schedule", "due_date")},
+            },
+        ),
+    ]
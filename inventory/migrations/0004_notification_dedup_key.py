@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0003_maintenance_occurrence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="dedup_key",
+            field=models.CharField(blank=True, max_length=150),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["dedup_key", "recipient"], name="inventory_n_dedup_k_32cc1f_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:22
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0004_notification_dedup_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HierarchyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "node_type",
+                    models.CharField(
+                        choices=[
+                            ("SYSTEM", "System"),
+                            ("BUILDING", "Building"),
+                            ("BLOCK", "Block"),
+                            ("FLOOR", "Floor"),
+                            ("DEPARTMENT", "Department"),
+                            ("ROOM", "Room"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("node_id", models.PositiveBigIntegerField()),
+                ("buildings", models.PositiveIntegerField(default=0)),
+                ("blocks", models.PositiveIntegerField(default=0)),
+                ("floors", models.PositiveIntegerField(default=0)),
+                ("departments", models.PositiveIntegerField(default=0)),
+                ("rooms", models.PositiveIntegerField(default=0)),
+                ("locations", models.PositiveIntegerField(default=0)),
+                ("devices", models.PositiveIntegerField(default=0)),
+                ("active_assignments", models.PositiveIntegerField(default=0)),
+                (
+                    "asset_value",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=16
+                    ),
+                ),
+                ("staff", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "unique_together": {("node_type", "node_id")},
+            },
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("inventory", "0005_hierarchy_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("DEVICE", "Device ID"),
+                            ("ASSIGNMENT", "Assignment ID"),
+                            ("EMPLOYEE", "Employee ID"),
+                            ("SERVICE_REQUEST", "Service Request ID"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("prefix", models.CharField(max_length=50)),
+                ("period", models.CharField(blank=True, max_length=10)),
+                ("width", models.PositiveSmallIntegerField(default=4)),
+                ("last_value", models.PositiveBigIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "unique_together": {("kind", "prefix")},
+            },
+        ),
+        migrations.CreateModel(
+            name="IdAllocation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("first_value", models.PositiveBigIntegerField()),
+                ("last_value", models.PositiveBigIntegerField()),
+                ("purpose", models.CharField(blank=True, max_length=100)),
+                ("allocated_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "allocated_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "sequence",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="allocations",
+                        to="inventory.idsequence",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["sequence", "first_value"],
+                "indexes": [
+                    models.Index(
+                        fields=["sequence", "first_value"],
+                        name="inventory_i_sequenc_506f96_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,163 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:50
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0006_id_sequences"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DepreciationSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("period", models.DateField()),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("ALL", "All Devices"),
+                            ("DEPARTMENT", "Department"),
+                            ("CATEGORY", "Category"),
+                            ("VENDOR", "Vendor"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("group_id", models.PositiveBigIntegerField()),
+                (
+                    "method",
+                    models.CharField(
+                        choices=[
+                            ("STRAIGHT_LINE", "Straight Line"),
+                            ("DECLINING_BALANCE", "Declining Balance"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("devices", models.PositiveIntegerField(default=0)),
+                (
+                    "purchase_value",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=16
+                    ),
+                ),
+                (
+                    "depreciation",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=16
+                    ),
+                ),
+                (
+                    "book_value",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=16
+                    ),
+                ),
+                (
+                    "maintenance_cost",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=16
+                    ),
+                ),
+                (
+                    "cumulative_maintenance",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=16
+                    ),
+                ),
+                ("posted_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-period", "dimension", "group_id"],
+                "unique_together": {("period", "dimension", "group_id")},
+            },
+        ),
+        migrations.CreateModel(
+            name="DepreciationEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("period", models.DateField()),
+                (
+                    "method",
+                    models.CharField(
+                        choices=[
+                            ("STRAIGHT_LINE", "Straight Line"),
+                            ("DECLINING_BALANCE", "Declining Balance"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "department_key",
+                    models.PositiveBigIntegerField(blank=True, null=True),
+                ),
+                ("category_key", models.PositiveBigIntegerField(blank=True, null=True)),
+                ("vendor_key", models.PositiveBigIntegerField(blank=True, null=True)),
+                (
+                    "purchase_value",
+                    models.DecimalField(decimal_places=2, max_digits=12),
+                ),
+                ("opening_value", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("depreciation", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("book_value", models.DecimalField(decimal_places=2, max_digits=12)),
+                (
+                    "maintenance_cost",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=12
+                    ),
+                ),
+                (
+                    "cumulative_maintenance",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=12
+                    ),
+                ),
+                (
+                    "device",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="depreciation_entries",
+                        to="inventory.device",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["period", "department_key"],
+                        name="inventory_d_period_dab408_idx",
+                    ),
+                    models.Index(
+                        fields=["period", "category_key"],
+                        name="inventory_d_period_a10659_idx",
+                    ),
+                    models.Index(
+                        fields=["period", "vendor_key"],
+                        name="inventory_d_period_b250e0_idx",
+                    ),
+                ],
+                "unique_together": {("device", "period")},
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0007_depreciation_ledger"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RequestMetric",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("period", models.DateTimeField()),
+                ("view_name", models.CharField(max_length=200)),
+                ("requests", models.PositiveIntegerField(default=0)),
+                ("errors", models.PositiveIntegerField(default=0)),
+                ("latency_ms", models.FloatField(default=0)),
+                ("latency_buckets", models.JSONField(default=list)),
+                ("queries", models.PositiveBigIntegerField(default=0)),
+                ("query_ms", models.FloatField(default=0)),
+                ("duplicate_query_requests", models.PositiveIntegerField(default=0)),
+                ("budget_violations", models.PositiveIntegerField(default=0)),
+                ("cache_hits", models.PositiveBigIntegerField(default=0)),
+                ("cache_misses", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["-period", "view_name"],
+                "unique_together": {("period", "view_name")},
+            },
+        ),
+    ]
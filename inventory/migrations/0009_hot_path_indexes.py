@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0008_request_metrics"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="device",
+            name="inventory_d_device__a3b9fe_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="device",
+            name="inventory_d_asset_t_4bef13_idx",
+        ),
+        migrations.AddIndex(
+            model_name="assignment",
+            index=models.Index(
+                fields=[
+                    "is_active",
+                    "is_temporary",
+                    "actual_return_date",
+                    "expected_return_date",
+                ],
+                name="inventory_a_is_acti_c189e7_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["model_name", "object_id", "timestamp"],
+                name="inventory_a_model_n_c4bde3_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["warranty_end_date"], name="inventory_d_warrant_2f5e7c_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0009_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="assignment",
+            index=models.Index(
+                fields=["updated_at"], name="inventory_a_updated_733b8e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["updated_at"], name="inventory_d_updated_35c57b_idx"
+            ),
+        ),
+    ]
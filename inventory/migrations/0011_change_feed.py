@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:29
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0010_sync_updated_at_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeFeedEntry",
+            fields=[
+                ("sequence", models.BigAutoField(primary_key=True, serialize=False)),
+                ("model_name", models.CharField(max_length=30)),
+                ("object_id", models.CharField(max_length=100)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("UPSERT", "Created or Updated"),
+                            ("DELETE", "Deleted"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "recorded_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "ordering": ["sequence"],
+                "indexes": [
+                    models.Index(
+                        fields=["model_name", "object_id", "sequence"],
+                        name="inventory_c_model_n_9fd486_idx",
+                    ),
+                    models.Index(
+                        fields=["recorded_at"], name="inventory_c_recorde_4be62c_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
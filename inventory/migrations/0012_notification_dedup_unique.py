@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:50
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Value
+from django.db.models.functions import Concat
+
+
+def scope_dedup_keys(apps, schema_editor):
+    """Prefix keys with their rule, blank keys become NULL and duplicates are dropped"""
+    Notification = apps.get_model("inventory", "Notification")
+    NotificationRule = apps.get_model("inventory", "NotificationRule")
+
+    Notification.objects.filter(dedup_key="").update(dedup_key=None)
+    for rule_id in NotificationRule.objects.values_list("pk", flat=True):
+        Notification.objects.filter(rule_id=rule_id, dedup_key__isnull=False).update(
+            dedup_key=Concat(Value(f"{rule_id}:"), "dedup_key")
+        )
+
+    duplicates = (
+        Notification.objects.filter(dedup_key__isnull=False)
+        .values("dedup_key", "recipient_id")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        rows = Notification.objects.filter(
+            dedup_key=duplicate["dedup_key"], recipient_id=duplicate["recipient_id"]
+        ).order_by("created_at", "pk")
+        Notification.objects.filter(pk__in=list(rows.values_list("pk", flat=True)[1:])).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("inventory", "0011_change_feed"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="notification",
+            name="dedup_key",
+            field=models.CharField(blank=True, max_length=150, null=True),
+        ),
+        migrations.RunPython(scope_dedup_keys, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="notification",
+            name="inventory_n_dedup_k_32cc1f_idx",
+        ),
+        migrations.AlterUniqueTogether(
+            name="notification",
+            unique_together={("dedup_key", "recipient")},
+        ),
+    ]
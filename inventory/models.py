@@ -5,6 +5,8 @@ from django.utils import timezone
 from decimal import Decimal
 import uuid
 
+from .change_tracking import ChangeTrackingMixin
+
 # ================================
 # 1. CORE ORGANIZATIONAL MODELS
 # ================================
@@ -242,7 +244,7 @@ class DeviceType(models.Model):
 # 4. CORE DEVICE MODEL
 # ================================
 
-class Device(models.Model):
+class Device(ChangeTrackingMixin, models.Model):
     """Core device/asset model"""
     STATUS_CHOICES = [
         ('AVAILABLE', 'Available'),
@@ -357,12 +359,14 @@ class Device(models.Model):
 
     class Meta:
         ordering = ['device_id']
+        # device_id (primary key) and asset_tag (unique) have their own indexes
         indexes = [
-            models.Index(fields=['device_id']),
-            models.Index(fields=['asset_tag']),
             models.Index(fields=['serial_number']),
             models.Index(fields=['status']),
             models.Index(fields=['device_type']),
+            models.Index(fields=['warranty_end_date']),
+            # Offline catalogue deltas (qr_management.offline_sync)
+            models.Index(fields=['updated_at']),
         ]
 
     def __str__(self):
@@ -390,7 +394,7 @@ class Device(models.Model):
 # 5. ASSIGNMENT MODELS
 # ================================
 
-class Assignment(models.Model):
+class Assignment(ChangeTrackingMixin, models.Model):
     """Device assignment tracking"""
     ASSIGNMENT_TYPES = [
         ('PERMANENT', 'Permanent Assignment'),
@@ -433,6 +437,9 @@ class Assignment(models.Model):
             models.Index(fields=['assigned_to_staff', 'is_active']),
             models.Index(fields=['start_date']),
             models.Index(fields=['expected_return_date']),
+            # Overdue checks: equality columns first, the date range last
+            models.Index(fields=['is_active', 'is_temporary', 'actual_return_date', 'expected_return_date']),
+            models.Index(fields=['updated_at']),
         ]
 
     def __str__(self):
@@ -597,6 +604,8 @@ class AuditLog(models.Model):
             models.Index(fields=['user', 'timestamp']),
             models.Index(fields=['action', 'timestamp']),
             models.Index(fields=['model_name', 'timestamp']),
+            # Audit trail of one object, newest first
+            models.Index(fields=['model_name', 'object_id', 'timestamp']),
         ]
 
     def __str__(self):
@@ -746,8 +755,13 @@ class Notification(models.Model):
     sent_via_sms = models.BooleanField(default=False)
     sent_via_app = models.BooleanField(default=False)
 
+    # Identifies the rule/object/occurrence this notification was raised for
+    dedup_key = models.CharField(max_length=150, null=True, blank=True)
+
     class Meta:
         ordering = ['-created_at']
+        # Concurrent fan-outs of the same rule cannot notify anyone twice
+        unique_together = ['dedup_key', 'recipient']
         indexes = [
             models.Index(fields=['recipient', 'status']),
             models.Index(fields=['created_at']),
@@ -985,13 +999,9 @@ class ServiceRequest(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.request_id:
-            # Auto-generate request ID
-            from django.utils import timezone
-            current_year = timezone.now().year
-            count = ServiceRequest.objects.filter(
-                created_at__year=current_year
-            ).count() + 1
-            self.request_id = f"SR-{current_year}-{count:04d}"
+            # Auto-generate request ID (SR-<year>-NNNN)
+            from .sequences import service_request_ids
+            self.request_id = service_request_ids().next_id(purpose='service request')
         super().save(*args, **kwargs)
 
     @property
@@ -1029,4 +1039,294 @@ class ServiceRequest(models.Model):
             'URGENT': 'danger',
             'CRITICAL': 'dark',
         }
-        return priority_colors.get(self.priority, 'secondary')
\ No newline at end of file
+        return priority_colors.get(self.priority, 'secondary')
+
+# ================================
+# 12. MAINTENANCE CALENDAR MODELS
+# ================================
+
+class MaintenanceOccurrence(models.Model):
+    """Expanded occurrence of a recurring maintenance schedule (calendar index)"""
+    STATUS_CHOICES = [
+        ('SCHEDULED', 'Scheduled'),
+        ('COMPLETED', 'Completed'),
+        ('SKIPPED', 'Skipped'),
+    ]
+
+    schedule = models.ForeignKey(MaintenanceSchedule, on_delete=models.CASCADE, related_name='occurrences')
+    due_date = models.DateField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='SCHEDULED')
+    completed_date = models.DateField(null=True, blank=True)
+
+    # Denormalized from the schedule so range queries never need a join to filter
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name='maintenance_occurrences')
+    vendor = models.ForeignKey(Vendor, on_delete=models.SET_NULL, null=True, blank=True, related_name='maintenance_occurrences')
+    assigned_technician = models.ForeignKey(Staff, on_delete=models.SET_NULL, null=True, blank=True, related_name='maintenance_occurrences')
+    maintenance_type = models.CharField(max_length=40, choices=MaintenanceSchedule.MAINTENANCE_TYPES)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['due_date', 'id']
+        unique_together = ['schedule', 'due_date']
+        indexes = [
+            models.Index(fields=['due_date', 'status']),
+            models.Index(fields=['vendor', 'due_date']),
+            models.Index(fields=['assigned_technician', 'due_date']),
+            models.Index(fields=['schedule', 'status', 'due_date']),
+        ]
+
+    def __str__(self):
+        return f"{self.schedule_id} @ {self.due_date} ({self.status})"
+
+    @property
+    def is_overdue(self):
+        return self.status == 'SCHEDULED' and self.due_date < timezone.now().date()
+
+    @property
+    def days_overdue(self):
+        if self.is_overdue:
+            return (timezone.now().date() - self.due_date).days
+        return 0
+
+# ================================
+# 13. HIERARCHY ROLLUP MODELS
+# ================================
+
+class HierarchyRollup(models.Model):
+    """Precomputed statistics for one node of the location hierarchy"""
+    NODE_TYPES = [
+        ('SYSTEM', 'System'),
+        ('BUILDING', 'Building'),
+        ('BLOCK', 'Block'),
+        ('FLOOR', 'Floor'),
+        ('DEPARTMENT', 'Department'),
+        ('ROOM', 'Room'),
+    ]
+
+    node_type = models.CharField(max_length=20, choices=NODE_TYPES)
+    # Primary key of the Building/Block/Floor/Department/Room; 0 for SYSTEM
+    node_id = models.PositiveBigIntegerField()
+
+    # Active child nodes below this node
+    buildings = models.PositiveIntegerField(default=0)
+    blocks = models.PositiveIntegerField(default=0)
+    floors = models.PositiveIntegerField(default=0)
+    departments = models.PositiveIntegerField(default=0)
+    rooms = models.PositiveIntegerField(default=0)
+    locations = models.PositiveIntegerField(default=0)
+
+    # Devices located below this node (through Device.location)
+    devices = models.PositiveIntegerField(default=0)
+    active_assignments = models.PositiveIntegerField(default=0)
+    asset_value = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0'))
+    staff = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['node_type', 'node_id']
+
+    def __str__(self):
+        return f"{self.node_type} {self.node_id}: {self.devices} devices"
+
+# ================================
+# 14. ID SEQUENCE MODELS
+# ================================
+
+class IdSequence(models.Model):
+    """Counter behind one family of generated IDs (see inventory.sequences)"""
+    KIND_CHOICES = [
+        ('DEVICE', 'Device ID'),
+        ('ASSIGNMENT', 'Assignment ID'),
+        ('EMPLOYEE', 'Employee ID'),
+        ('SERVICE_REQUEST', 'Service Request ID'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # Literal text before the number, e.g. 'BPS-LAP-2026-'
+    prefix = models.CharField(max_length=50)
+    # Year or day the prefix belongs to, blank for open-ended sequences
+    period = models.CharField(max_length=10, blank=True)
+    width = models.PositiveSmallIntegerField(default=4)
+    last_value = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['kind', 'prefix']
+
+    def __str__(self):
+        return f"{self.prefix}{'#' * self.width} at {self.last_value}"
+
+
+class IdAllocation(models.Model):
+    """One block of values handed out by an IdSequence, kept for auditing gaps"""
+    sequence = models.ForeignKey(IdSequence, on_delete=models.CASCADE, related_name='allocations')
+    first_value = models.PositiveBigIntegerField()
+    last_value = models.PositiveBigIntegerField()
+    allocated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    purpose = models.CharField(max_length=100, blank=True)
+    allocated_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['sequence', 'first_value']
+        indexes = [
+            models.Index(fields=['sequence', 'first_value']),
+        ]
+
+    @property
+    def count(self):
+        return self.last_value - self.first_value + 1
+
+    def __str__(self):
+        return f"{self.sequence.prefix}{self.first_value}-{self.last_value}"
+
+# ================================
+# 15. DEPRECIATION LEDGER MODELS
+# ================================
+
+DEPRECIATION_METHODS = [
+    ('STRAIGHT_LINE', 'Straight Line'),
+    ('DECLINING_BALANCE', 'Declining Balance'),
+]
+
+
+class DepreciationEntry(models.Model):
+    """Book value of one device at one month end (see inventory.depreciation)"""
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name='depreciation_entries')
+    # Last day of the month
+    period = models.DateField()
+    method = models.CharField(max_length=20, choices=DEPRECIATION_METHODS)
+
+    # Department/DeviceCategory/Vendor primary keys as they were at the period end
+    department_key = models.PositiveBigIntegerField(null=True, blank=True)
+    category_key = models.PositiveBigIntegerField(null=True, blank=True)
+    vendor_key = models.PositiveBigIntegerField(null=True, blank=True)
+
+    purchase_value = models.DecimalField(max_digits=12, decimal_places=2)
+    opening_value = models.DecimalField(max_digits=12, decimal_places=2)
+    depreciation = models.DecimalField(max_digits=12, decimal_places=2)
+    book_value = models.DecimalField(max_digits=12, decimal_places=2)
+    maintenance_cost = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'))
+    cumulative_maintenance = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0'))
+
+    class Meta:
+        unique_together = ['device', 'period']
+        indexes = [
+            models.Index(fields=['period', 'department_key']),
+            models.Index(fields=['period', 'category_key']),
+            models.Index(fields=['period', 'vendor_key']),
+        ]
+
+    @property
+    def accumulated_depreciation(self):
+        return self.purchase_value - self.book_value
+
+    @property
+    def total_cost_of_ownership(self):
+        return self.purchase_value + self.cumulative_maintenance
+
+    def __str__(self):
+        return f"{self.device_id} {self.period:%Y-%m}: {self.book_value}"
+
+
+class DepreciationSummary(models.Model):
+    """Month-end valuation and TCO of one department, category or vendor"""
+    DIMENSIONS = [
+        ('ALL', 'All Devices'),
+        ('DEPARTMENT', 'Department'),
+        ('CATEGORY', 'Category'),
+        ('VENDOR', 'Vendor'),
+    ]
+
+    period = models.DateField()
+    dimension = models.CharField(max_length=20, choices=DIMENSIONS)
+    # Primary key of the Department/DeviceCategory/Vendor; 0 for ALL and
+    # for devices without one
+    group_id = models.PositiveBigIntegerField()
+    method = models.CharField(max_length=20, choices=DEPRECIATION_METHODS)
+
+    devices = models.PositiveIntegerField(default=0)
+    purchase_value = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0'))
+    depreciation = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0'))
+    book_value = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0'))
+    maintenance_cost = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0'))
+    cumulative_maintenance = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0'))
+    posted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['period', 'dimension', 'group_id']
+        ordering = ['-period', 'dimension', 'group_id']
+
+    @property
+    def accumulated_depreciation(self):
+        return self.purchase_value - self.book_value
+
+    @property
+    def total_cost_of_ownership(self):
+        return self.purchase_value + self.cumulative_maintenance
+
+    def __str__(self):
+        return f"{self.period:%Y-%m} {self.dimension} {self.group_id}: {self.book_value}"
+
+
+# ================================
+# 16. REQUEST METRICS MODELS
+# ================================
+
+class RequestMetric(models.Model):
+    """Request statistics of one view over one window (see bps_inventory.instrumentation)"""
+    # Start of the BUCKET_MINUTES window
+    period = models.DateTimeField()
+    view_name = models.CharField(max_length=200)
+
+    requests = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    latency_ms = models.FloatField(default=0)
+    # Requests per LATENCY_BUCKETS_MS bound, then the overflow bucket
+    latency_buckets = models.JSONField(default=list)
+    queries = models.PositiveBigIntegerField(default=0)
+    query_ms = models.FloatField(default=0)
+    duplicate_query_requests = models.PositiveIntegerField(default=0)
+    budget_violations = models.PositiveIntegerField(default=0)
+    cache_hits = models.PositiveBigIntegerField(default=0)
+    cache_misses = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['period', 'view_name']
+        ordering = ['-period', 'view_name']
+
+    def __str__(self):
+        return f"{self.period:%Y-%m-%d %H:%M} {self.view_name}: {self.requests} requests"
+
+
+# ================================
+# 17. CHANGE FEED MODELS
+# ================================
+
+class ChangeFeedEntry(models.Model):
+    """One write to a Device, Assignment, Staff or Location row (see inventory.change_feed)"""
+    ACTIONS = [
+        ('UPSERT', 'Created or Updated'),
+        ('DELETE', 'Deleted'),
+    ]
+
+    # Monotonic position in the feed; consumers keep the last one they read
+    sequence = models.BigAutoField(primary_key=True)
+    model_name = models.CharField(max_length=30)
+    object_id = models.CharField(max_length=100)
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['sequence']
+        indexes = [
+            # Compaction: later entries for the same object
+            models.Index(fields=['model_name', 'object_id', 'sequence']),
+            models.Index(fields=['recorded_at']),
+        ]
+
+    def __str__(self):
+        return f"#{self.sequence} {self.action} {self.model_name} {self.object_id}"
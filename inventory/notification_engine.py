@@ -0,0 +1,401 @@
+# inventory/notification_engine.py - Notification Fan-out Engine
+"""
+Evaluates active NotificationRule rows in a periodic batch job, fans out
+Notification rows with bulk_create and delivers email over batched SMTP
+connections.
+
+Page loads never evaluate rules; they only read the per-user unread count
+(indexed on recipient/status and cached) via get_unread_count().
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .event_stream import publish_unread_counts
+from .models import Assignment, Device, MaintenanceOccurrence, Notification, NotificationRule
+
+logger = logging.getLogger(__name__)
+
+# Notification statuses that count as unread
+UNREAD_STATUSES = ['PENDING', 'SENT', 'FAILED']
+
+UNREAD_COUNT_CACHE_KEY = 'notification_unread_{user_id}'
+UNREAD_COUNT_CACHE_TIMEOUT = 300
+
+DEFAULT_RULES = [
+    {
+        'name': 'Overdue assignments',
+        'event_type': 'ASSIGNMENT_DUE',
+        'description': 'Temporary assignments past or near their expected return date',
+        'trigger_conditions': {'days_before': 0},
+    },
+    {
+        'name': 'Warranty expiring',
+        'event_type': 'WARRANTY_EXPIRING',
+        'description': 'Device warranties expiring soon',
+        'trigger_conditions': {'days_before': None},
+        'notify_device_owner': False,
+    },
+    {
+        'name': 'Maintenance due',
+        'event_type': 'MAINTENANCE_DUE',
+        'description': 'Scheduled maintenance due soon or overdue',
+        'trigger_conditions': {'days_before': 7},
+        'notify_device_owner': False,
+    },
+]
+
+
+# ================================
+# RULE EVALUATORS
+# ================================
+# Each evaluator yields candidate dicts with the notification payload and the
+# owner user id (if any); fan-out to recipients happens in one place.
+
+def _days_before(rule, default):
+    days = (rule.trigger_conditions or {}).get('days_before')
+    return default if days is None else int(days)
+
+
+def evaluate_assignment_due(rule, today):
+    days = _days_before(rule, getattr(settings, 'ASSIGNMENT_NOTIFICATION_DAYS', 7))
+    assignments = Assignment.objects.filter(
+        is_temporary=True,
+        is_active=True,
+        actual_return_date__isnull=True,
+        expected_return_date__lte=today + timedelta(days=days),
+    ).select_related('device', 'assigned_to_staff').only(
+        'assignment_id', 'expected_return_date', 'device__device_id', 'device__device_name',
+        'assigned_to_staff__user',
+    )
+
+    for assignment in assignments.iterator(chunk_size=1000):
+        overdue = assignment.expected_return_date < today
+        yield {
+            'key': f"assignment:{assignment.assignment_id}:{assignment.expected_return_date.isoformat()}",
+            'owner_id': assignment.assigned_to_staff.user_id if assignment.assigned_to_staff else None,
+            'notification_type': 'WARNING' if overdue else 'INFO',
+            'title': 'Overdue Assignment' if overdue else 'Assignment Due Soon',
+            'message': (
+                f"Device {assignment.device.device_id} ({assignment.device.device_name}) "
+                f"{'was due' if overdue else 'is due'} for return on {assignment.expected_return_date}"
+            ),
+            'related_device_id': assignment.device.device_id,
+            'related_assignment_id': assignment.assignment_id,
+        }
+
+
+def evaluate_warranty_expiring(rule, today):
+    days = _days_before(rule, getattr(settings, 'WARRANTY_ALERT_DAYS', 30))
+    devices = Device.objects.filter(
+        warranty_end_date__gte=today,
+        warranty_end_date__lte=today + timedelta(days=days),
+    ).exclude(status__in=['RETIRED', 'DISPOSED']).only(
+        'device_id', 'device_name', 'warranty_end_date'
+    )
+
+    # Current holders of the devices, fetched once for the whole batch
+    owners = dict(Assignment.objects.filter(
+        is_active=True,
+        device__in=devices,
+        assigned_to_staff__isnull=False,
+    ).values_list('device_id', 'assigned_to_staff__user_id'))
+
+    for device in devices.iterator(chunk_size=1000):
+        yield {
+            'key': f"warranty:{device.device_id}:{device.warranty_end_date.isoformat()}",
+            'owner_id': owners.get(device.device_id),
+            'notification_type': 'INFO',
+            'title': 'Warranty Expiring',
+            'message': f"Warranty for {device.device_id} ({device.device_name}) expires on {device.warranty_end_date}",
+            'related_device_id': device.device_id,
+            'related_assignment_id': None,
+        }
+
+
+def evaluate_maintenance_due(rule, today):
+    days = _days_before(rule, 7)
+    occurrences = MaintenanceOccurrence.objects.filter(
+        status='SCHEDULED',
+        due_date__lte=today + timedelta(days=days),
+    ).select_related('device', 'assigned_technician').only(
+        'id', 'schedule_id', 'due_date', 'device__device_id', 'device__device_name',
+        'assigned_technician__user',
+    )
+
+    for occurrence in occurrences.iterator(chunk_size=1000):
+        overdue = occurrence.due_date < today
+        yield {
+            'key': f"maintenance:{occurrence.schedule_id}:{occurrence.due_date.isoformat()}",
+            # The assigned technician is the "owner" of a maintenance task
+            'owner_id': occurrence.assigned_technician.user_id if occurrence.assigned_technician else None,
+            'notification_type': 'WARNING' if overdue else 'INFO',
+            'title': 'Maintenance Overdue' if overdue else 'Maintenance Due',
+            'message': (
+                f"Maintenance for {occurrence.device.device_id} ({occurrence.device.device_name}) "
+                f"{'was due' if overdue else 'is due'} on {occurrence.due_date}"
+            ),
+            'related_device_id': occurrence.device.device_id,
+            'related_assignment_id': None,
+        }
+
+
+RULE_EVALUATORS = {
+    'ASSIGNMENT_DUE': evaluate_assignment_due,
+    'WARRANTY_EXPIRING': evaluate_warranty_expiring,
+    'MAINTENANCE_DUE': evaluate_maintenance_due,
+}
+
+
+# ================================
+# FAN-OUT
+# ================================
+
+def _resolve_static_recipients(rule, admin_ids):
+    """Recipients that do not depend on the object: IT admins and additional recipients"""
+    recipients = set(admin_ids) if rule.notify_it_admin else set()
+
+    additional = [value for value in (rule.additional_recipients or []) if value]
+    if additional:
+        recipients.update(User.objects.filter(
+            Q(username__in=additional) | Q(email__in=additional), is_active=True
+        ).values_list('id', flat=True))
+    return recipients
+
+
+def _dedup_key(rule, key):
+    """Scope an evaluator key to its rule; two rules on the same event notify separately"""
+    return f"{rule.pk}:{key}"
+
+
+def _existing_keys(keys):
+    """(recipient_id, dedup_key) pairs already raised"""
+    existing = set()
+    keys = list(keys)
+    for start in range(0, len(keys), 500):
+        existing.update(Notification.objects.filter(
+            dedup_key__in=keys[start:start + 500]
+        ).values_list('recipient_id', 'dedup_key'))
+    return existing
+
+
+def fan_out_rule(rule, today=None, admin_ids=None, batch_size=500):
+    """
+    Evaluate a single rule and bulk insert one Notification per
+    recipient/object that has not been notified yet. Returns the set of
+    recipient ids that received new notifications.
+    """
+    evaluator = RULE_EVALUATORS.get(rule.event_type)
+    if evaluator is None:
+        return set()
+
+    today = today or timezone.now().date()
+    if admin_ids is None:
+        admin_ids = set(User.objects.filter(is_active=True, is_staff=True).values_list('id', flat=True))
+    static_recipients = _resolve_static_recipients(rule, admin_ids)
+
+    candidates = list(evaluator(rule, today))
+    if not candidates:
+        return set()
+    for candidate in candidates:
+        candidate['key'] = _dedup_key(rule, candidate['key'])
+    already_sent = _existing_keys({candidate['key'] for candidate in candidates})
+
+    # In-app only notifications are delivered by being created
+    status = 'PENDING' if rule.notify_email else 'SENT'
+    now = timezone.now()
+    pending = []
+    notified = set()
+
+    for candidate in candidates:
+        recipients = set(static_recipients)
+        if rule.notify_device_owner and candidate['owner_id']:
+            recipients.add(candidate['owner_id'])
+
+        for recipient_id in recipients:
+            if (recipient_id, candidate['key']) in already_sent:
+                continue
+            already_sent.add((recipient_id, candidate['key']))
+            notified.add(recipient_id)
+            pending.append(Notification(
+                rule=rule,
+                recipient_id=recipient_id,
+                notification_type=candidate['notification_type'],
+                status=status,
+                title=candidate['title'][:200],
+                message=candidate['message'],
+                related_device_id=candidate['related_device_id'],
+                related_assignment_id=candidate['related_assignment_id'],
+                dedup_key=candidate['key'],
+                sent_via_app=rule.notify_in_app,
+                sent_at=None if rule.notify_email else now,
+            ))
+
+    if pending:
+        # The check above skips the known keys cheaply; the unique
+        # (dedup_key, recipient) constraint drops rows a concurrent run
+        # inserted in the meantime
+        Notification.objects.bulk_create(pending, batch_size=batch_size, ignore_conflicts=True)
+    return notified
+
+
+def run_notification_rules(today=None, event_types=None):
+    """Evaluate all active rules once; intended to be run periodically"""
+    today = today or timezone.now().date()
+    rules = NotificationRule.objects.filter(is_active=True, event_type__in=RULE_EVALUATORS.keys())
+    if event_types:
+        rules = rules.filter(event_type__in=event_types)
+
+    admin_ids = set(User.objects.filter(is_active=True, is_staff=True).values_list('id', flat=True))
+    stats = {'rules': 0, 'recipients': set(), 'errors': []}
+
+    for rule in rules:
+        try:
+            stats['recipients'] |= fan_out_rule(rule, today=today, admin_ids=admin_ids)
+            stats['rules'] += 1
+        except Exception as e:
+            error_msg = f"Error evaluating notification rule {rule.pk} ({rule.name}): {e}"
+            stats['errors'].append(error_msg)
+            logger.error(error_msg)
+
+    invalidate_unread_counts(stats['recipients'])
+    # Connected browsers get their new badge count pushed (bulk_create sends no signals)
+    publish_unread_counts(stats['recipients'])
+    return stats
+
+
+def install_default_rules():
+    """Create the standard rules for the batch job if none exist yet"""
+    created = 0
+    for definition in DEFAULT_RULES:
+        _, was_created = NotificationRule.objects.get_or_create(
+            event_type=definition['event_type'],
+            name=definition['name'],
+            defaults={key: value for key, value in definition.items() if key not in ('event_type', 'name')},
+        )
+        created += int(was_created)
+    return created
+
+
+# ================================
+# EMAIL DELIVERY
+# ================================
+
+def deliver_pending_emails(batch_size=100, limit=None):
+    """
+    Send pending email notifications, reusing one SMTP connection per batch
+    and recording delivery with bulk_update.
+    """
+    pending = Notification.objects.filter(
+        status='PENDING', sent_via_email=False, rule__notify_email=True,
+    ).select_related('recipient').order_by('created_at')
+    if limit:
+        pending = pending[:limit]
+
+    stats = {'sent': 0, 'failed': 0, 'skipped': 0}
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', None)
+    batch = []
+
+    def flush(batch):
+        if not batch:
+            return
+        now = timezone.now()
+        deliverable = [n for n in batch if n.recipient.email]
+        try:
+            with get_connection() as connection:
+                connection.send_messages([
+                    EmailMessage(
+                        subject=notification.title,
+                        body=notification.message,
+                        from_email=from_email,
+                        to=[notification.recipient.email],
+                        connection=connection,
+                    )
+                    for notification in deliverable
+                ])
+            for notification in deliverable:
+                notification.status = 'SENT'
+                notification.sent_via_email = True
+                notification.sent_at = now
+            stats['sent'] += len(deliverable)
+        except Exception as e:
+            logger.error(f"Failed to deliver notification email batch: {e}")
+            for notification in deliverable:
+                notification.status = 'FAILED'
+            stats['failed'] += len(deliverable)
+
+        # Recipients without an address still have the in-app notification
+        for notification in batch:
+            if not notification.recipient.email:
+                notification.status = 'SENT'
+                notification.sent_at = now
+                stats['skipped'] += 1
+
+        Notification.objects.bulk_update(batch, ['status', 'sent_via_email', 'sent_at'])
+
+    for notification in pending.iterator(chunk_size=batch_size):
+        batch.append(notification)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    flush(batch)
+
+    return stats
+
+
+# ================================
+# READ SIDE (PAGE LOADS)
+# ================================
+
+def get_unread_count(user):
+    """Indexed per-user unread count, cached until the next fan-out or mark-read"""
+    if not user.is_authenticated:
+        return 0
+
+    cache_key = UNREAD_COUNT_CACHE_KEY.format(user_id=user.id)
+    count = cache.get(cache_key)
+    if count is None:
+        count = Notification.objects.filter(recipient=user, status__in=UNREAD_STATUSES).count()
+        cache.set(cache_key, count, UNREAD_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def get_recent_notifications(user, limit=10):
+    return Notification.objects.filter(
+        recipient=user, status__in=UNREAD_STATUSES
+    ).order_by('-created_at')[:limit]
+
+
+def invalidate_unread_counts(user_ids):
+    if user_ids:
+        cache.delete_many([UNREAD_COUNT_CACHE_KEY.format(user_id=user_id) for user_id in user_ids])
+
+
+def mark_read(user, notification_ids=None):
+    """Mark the given (or all) unread notifications of a user as read"""
+    notifications = Notification.objects.filter(recipient=user, status__in=UNREAD_STATUSES)
+    if notification_ids is not None:
+        notifications = notifications.filter(id__in=notification_ids)
+    updated = notifications.update(status='READ', read_at=timezone.now())
+    invalidate_unread_counts([user.id])
+    publish_unread_counts([user.id])
+    return updated
+
+
+def serialize_notification(notification):
+    return {
+        'id': str(notification.id),
+        'type': notification.notification_type.lower(),
+        'title': notification.title,
+        'message': notification.message,
+        'url': f'/inventory/devices/{notification.related_device_id}/' if notification.related_device_id else None,
+        'created_at': notification.created_at.isoformat(),
+        'is_read': notification.is_read,
+    }
@@ -0,0 +1,200 @@
+# inventory/query_plans.py - Query Plan Checks
+"""
+EXPLAIN checks for the filters on the hot paths, run by the tests in
+inventory/tests.py and with the check_query_plans management command.
+
+Each check builds the queryset a view or job runs and asks the database for
+its plan. A check fails when the plan reads one of the check's tables with
+a full table scan:
+- SQLite: a "SCAN <table>" step other than a covering index scan;
+- MySQL: access_type ALL in EXPLAIN FORMAT=JSON;
+- PostgreSQL: a "Seq Scan" node.
+
+Full index scans and scans of the other tables in a join are allowed. Cost
+based planners (MySQL, PostgreSQL) prefer table scans on small tables, so
+run the command against a database filled by generate_dataset. The tests
+run on a small test database with prefer_indexes=True instead, which
+discourages table scans for the session (INDEX_PREFERENCE): a check then
+fails only when no index can serve the filter at all.
+"""
+
+import json
+import re
+from datetime import timedelta
+
+from django.db import connections
+from django.utils import timezone
+
+from .models import Assignment, AuditLog, ChangeFeedEntry, Device
+from .utils import day_range
+
+
+def _sample_device_id():
+    return Device.objects.values_list('pk', flat=True).first() or 'BPS-2024-0001'
+
+
+def _scans():
+    from qr_management.models import QRCodeScan
+    return QRCodeScan.objects
+
+
+PLAN_CHECKS = [
+    {
+        'name': 'overdue_assignments',
+        'query': lambda today: Assignment.objects.filter(
+            is_temporary=True, is_active=True,
+            expected_return_date__lt=today, actual_return_date__isnull=True,
+        ),
+        'tables': [Assignment],
+    },
+    {
+        'name': 'device_active_assignment',
+        'query': lambda today: Assignment.objects.filter(device_id=_sample_device_id(), is_active=True),
+        'tables': [Assignment],
+    },
+    {
+        'name': 'device_audit_trail',
+        'query': lambda today: AuditLog.objects.filter(
+            model_name='Device', object_id=_sample_device_id(),
+        ).order_by('-timestamp')[:20],
+        'tables': [AuditLog],
+    },
+    {
+        'name': 'warranty_expiring',
+        'query': lambda today: Device.objects.filter(
+            warranty_end_date__gte=today, warranty_end_date__lte=today + timedelta(days=30),
+        ),
+        'tables': [Device],
+    },
+    {
+        'name': 'offline_sync_device_changes',
+        'query': lambda today: Device.objects.filter(
+            updated_at__gt=timezone.now() - timedelta(hours=1),
+        ).order_by().values_list('pk', flat=True),
+        'tables': [Device],
+    },
+    {
+        'name': 'offline_sync_assignment_changes',
+        'query': lambda today: Assignment.objects.filter(
+            updated_at__gt=timezone.now() - timedelta(hours=1),
+        ).order_by().values_list('device_id', flat=True),
+        'tables': [Assignment],
+    },
+    {
+        'name': 'change_feed_unsettled',
+        'query': lambda today: ChangeFeedEntry.objects.filter(
+            recorded_at__gt=timezone.now() - timedelta(seconds=5),
+        ).order_by().values_list('sequence', flat=True),
+        'tables': [ChangeFeedEntry],
+    },
+    {
+        'name': 'qr_scans_today',
+        'query': lambda today: _scans().filter(**day_range('timestamp', today, today)),
+        'tables': [lambda: _scans().model],
+    },
+    {
+        'name': 'qr_scan_type_distribution',
+        'query': lambda today: _scans().filter(
+            **day_range('timestamp', date_from=today - timedelta(days=30))
+        ).values('scan_type').order_by().distinct(),
+        'tables': [lambda: _scans().model],
+    },
+]
+
+
+def _table(model):
+    # Models from other apps are given as callables to avoid import cycles
+    model = model() if callable(model) and not hasattr(model, '_meta') else model
+    return model._meta.db_table
+
+
+# ================================
+# PLAN PARSING
+# ================================
+
+def _sqlite_full_scans(plan, tables):
+    scans = set()
+    for line in plan.splitlines():
+        match = re.search(r'\bSCAN (?:TABLE )?"?(\w+)"?(.*)$', line)
+        # SCAN ... USING INDEX walks every row in index order; only an
+        # index-only (covering) scan is let through
+        if match and match.group(1) in tables and 'COVERING INDEX' not in match.group(2):
+            scans.add(match.group(1))
+    return scans
+
+
+def _mysql_full_scans(plan, tables):
+    scans = set()
+
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get('access_type') == 'ALL' and node.get('table_name') in tables:
+                scans.add(node['table_name'])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(json.loads(plan))
+    return scans
+
+
+def _postgresql_full_scans(plan, tables):
+    scans = set()
+
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') in tables:
+                scans.add(node['Relation Name'])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(json.loads(plan))
+    return scans
+
+
+PLAN_PARSERS = {
+    'sqlite': (_sqlite_full_scans, {}),
+    'mysql': (_mysql_full_scans, {'format': 'json'}),
+    'postgresql': (_postgresql_full_scans, {'format': 'json'}),
+}
+
+# (set, reset) statements that make a cost based planner use an index
+# whenever one applies; SQLite's planner does not weigh table sizes
+INDEX_PREFERENCE = {
+    'mysql': ('SET SESSION max_seeks_for_key = 1', 'SET SESSION max_seeks_for_key = DEFAULT'),
+    'postgresql': ('SET enable_seqscan = off', 'RESET enable_seqscan'),
+}
+
+
+def check_plan(check, today=None, prefer_indexes=False):
+    """{'name', 'plan', 'full_scans', 'failures'} for one check"""
+    queryset = check['query'](today or timezone.now().date())
+    tables = {_table(model) for model in check['tables']}
+    connection = connections[queryset.db]
+    vendor = connection.vendor
+
+    result = {'name': check['name'], 'plan': '', 'full_scans': [], 'failures': []}
+    if vendor not in PLAN_PARSERS:
+        result['failures'].append(f'no plan parser for {vendor}')
+        return result
+
+    parse, options = PLAN_PARSERS[vendor]
+    preference = INDEX_PREFERENCE.get(vendor) if prefer_indexes else None
+    if preference:
+        with connection.cursor() as cursor:
+            cursor.execute(preference[0])
+    try:
+        result['plan'] = queryset.explain(**options)
+    finally:
+        if preference:
+            with connection.cursor() as cursor:
+                cursor.execute(preference[1])
+    result['full_scans'] = sorted(parse(result['plan'], tables))
+    for table in result['full_scans']:
+        result['failures'].append(f'full scan of {table}')
+    return result
@@ -0,0 +1,262 @@
+# inventory/sequences.py - ID Sequence Allocator
+"""
+Generated IDs (devices, assignments, employee IDs, service requests) are
+numbered from a counter row per prefix and period (IdSequence) instead of
+searching for the highest existing ID and probing until one is free.
+
+- allocate() advances the counter with a single UPDATE ... F() + n and
+  reads the new value back in the same short transaction, so concurrent
+  callers never receive the same value and no row scan is needed.
+- Bulk imports reserve a block of values in one allocation (IdBlock) before
+  opening their own transaction; the counter row is then locked only for
+  the three statements of the allocation, not for the whole import.
+- Every allocation is recorded (IdAllocation). audit() accounts for each
+  number: allocated and used, allocated but unused (rolled back imports,
+  partially used blocks), or used without an allocation (manual IDs,
+  rows created before the sequence existed).
+
+A counter is seeded from the highest matching ID the first time its prefix
+is used. Allocations made inside an enclosing transaction keep the counter
+row locked until that transaction ends; reserve blocks up front for long
+jobs.
+"""
+
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Model and field holding the IDs of each sequence kind
+KIND_FIELDS = {
+    'DEVICE': ('inventory.Device', 'device_id'),
+    'ASSIGNMENT': ('inventory.Assignment', 'assignment_id'),
+    'EMPLOYEE': ('inventory.Staff', 'employee_id'),
+    'SERVICE_REQUEST': ('inventory.ServiceRequest', 'request_id'),
+}
+
+# IdSequence pk per (kind, prefix), so allocations skip the get_or_create
+_sequence_ids = {}
+
+
+class IdBlock:
+    """Consecutive values reserved from a series; iterating yields formatted IDs"""
+
+    def __init__(self, series, first_value, last_value):
+        self.series = series
+        self.first_value = first_value
+        self.last_value = last_value
+        self._next = first_value
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._next > self.last_value:
+            raise StopIteration
+        value, self._next = self._next, self._next + 1
+        return self.series.format(value)
+
+    def __len__(self):
+        return self.last_value - self.first_value + 1
+
+    @property
+    def remaining(self):
+        return self.last_value - self._next + 1
+
+
+class IdSeries:
+    """IDs of one kind sharing a prefix: '<prefix><zero-padded number>'"""
+
+    def __init__(self, kind, prefix, period='', width=4):
+        self.kind = kind
+        self.prefix = prefix
+        self.period = period
+        self.width = width
+
+    @classmethod
+    def from_sequence(cls, sequence):
+        return cls(sequence.kind, sequence.prefix, sequence.period, sequence.width)
+
+    @property
+    def model(self):
+        return apps.get_model(KIND_FIELDS[self.kind][0])
+
+    @property
+    def field(self):
+        return KIND_FIELDS[self.kind][1]
+
+    def format(self, value):
+        return f"{self.prefix}{value:0{self.width}d}"
+
+    def parse(self, identifier):
+        """Number of an ID in this series, or None"""
+        identifier = str(identifier)
+        if not identifier.startswith(self.prefix):
+            return None
+        number = identifier[len(self.prefix):]
+        return int(number) if number.isdigit() else None
+
+    def used_values(self):
+        identifiers = self.model.objects.filter(
+            **{f'{self.field}__startswith': self.prefix}
+        ).values_list(self.field, flat=True)
+        return {value for value in map(self.parse, identifiers) if value is not None}
+
+    # Counter row
+
+    def _sequence_id(self):
+        from .models import IdSequence
+
+        key = (self.kind, self.prefix)
+        if key not in _sequence_ids:
+            sequence = IdSequence.objects.filter(kind=self.kind, prefix=self.prefix).only('pk').first()
+            if sequence is None:
+                # One-time scan; from here on the counter is authoritative
+                seed = max(self.used_values(), default=0)
+                sequence, _created = IdSequence.objects.get_or_create(
+                    kind=self.kind,
+                    prefix=self.prefix,
+                    defaults={'period': self.period, 'width': self.width, 'last_value': seed},
+                )
+            _sequence_ids[key] = sequence.pk
+        return _sequence_ids[key]
+
+    def peek(self):
+        """Next value that allocate() would hand out, without reserving it"""
+        from .models import IdSequence
+
+        last_value = IdSequence.objects.filter(pk=self._sequence_id()).values_list('last_value', flat=True).first()
+        return (last_value or 0) + 1
+
+    def allocate(self, count=1, user=None, purpose=''):
+        """Reserve count consecutive values; returns them as an IdBlock"""
+        from .models import IdAllocation, IdSequence
+
+        if count < 1:
+            raise ValueError('count must be at least 1')
+
+        for _attempt in range(2):
+            sequence_id = self._sequence_id()
+            with transaction.atomic():
+                updated = IdSequence.objects.filter(pk=sequence_id).update(
+                    last_value=F('last_value') + count, updated_at=timezone.now()
+                )
+                if not updated:
+                    # The row was deleted since it was cached; create it again
+                    _sequence_ids.pop((self.kind, self.prefix), None)
+                    continue
+                last_value = IdSequence.objects.filter(pk=sequence_id).values_list('last_value', flat=True).get()
+                first_value = last_value - count + 1
+                IdAllocation.objects.create(
+                    sequence_id=sequence_id,
+                    first_value=first_value,
+                    last_value=last_value,
+                    allocated_by=user if user is not None and user.is_authenticated else None,
+                    purpose=purpose[:100],
+                )
+            return IdBlock(self, first_value, last_value)
+        raise RuntimeError(f"Could not allocate from sequence {self.prefix}")
+
+    def next_id(self, user=None, purpose=''):
+        return next(self.allocate(1, user=user, purpose=purpose))
+
+    def advance_to(self, value):
+        """Make sure the counter is at least value (after an ID was chosen by hand)"""
+        from .models import IdSequence
+
+        IdSequence.objects.filter(pk=self._sequence_id()).update(
+            last_value=Greatest(F('last_value'), value), updated_at=timezone.now()
+        )
+
+    # Auditing
+
+    def audit(self):
+        """
+        Account for every number of the series. Returns allocated/used
+        counts, unused allocated values as (first, last) ranges, used values
+        outside any allocation and overlapping allocations (which the
+        allocator never produces).
+        """
+        from .models import IdAllocation
+
+        allocations = list(
+            IdAllocation.objects.filter(sequence_id=self._sequence_id())
+            .order_by('first_value')
+            .values_list('first_value', 'last_value')
+        )
+        used = self.used_values()
+
+        allocated = set()
+        overlaps = []
+        previous_last = 0
+        for first_value, last_value in allocations:
+            if first_value <= previous_last:
+                overlaps.append((first_value, last_value))
+            allocated.update(range(first_value, last_value + 1))
+            previous_last = max(previous_last, last_value)
+
+        return {
+            'prefix': self.prefix,
+            'allocations': len(allocations),
+            'allocated': len(allocated),
+            'used': len(used),
+            'unused': _ranges(allocated - used),
+            'unallocated': sorted(used - allocated),
+            'overlaps': overlaps,
+        }
+
+
+def _ranges(values):
+    ranges = []
+    for value in sorted(values):
+        if ranges and ranges[-1][1] == value - 1:
+            ranges[-1][1] = value
+        else:
+            ranges.append([value, value])
+    return [tuple(pair) for pair in ranges]
+
+
+# ================================
+# ID FAMILIES
+# ================================
+
+def device_ids(category_code=None, department_code=None, year=None):
+    """BPS[-CAT][-DEPT]-<year>-NNNN"""
+    year = str(year or timezone.now().year)
+    parts = ['BPS']
+    if category_code:
+        parts.append(category_code.upper())
+    if department_code:
+        parts.append(department_code.upper())
+    return IdSeries('DEVICE', f"{'-'.join(parts)}-{year}-", period=year)
+
+
+def assignment_ids(day=None):
+    """ASN-<yyyymmdd>-NNNN"""
+    day = (day or timezone.now().date()).strftime('%Y%m%d')
+    return IdSeries('ASSIGNMENT', f"ASN-{day}-", period=day)
+
+
+def employee_ids(department=None):
+    """<DEP>NNN, using the first three letters of the department code"""
+    code = getattr(department, 'code', None)
+    prefix = code[:3].upper() if code else 'EMP'
+    return IdSeries('EMPLOYEE', prefix, width=3)
+
+
+def service_request_ids(year=None):
+    """SR-<year>-NNNN"""
+    year = str(year or timezone.now().year)
+    return IdSeries('SERVICE_REQUEST', f"SR-{year}-", period=year)
+
+
+def audit_all():
+    """audit() of every sequence in use"""
+    from .models import IdSequence
+
+    return [IdSeries.from_sequence(sequence).audit() for sequence in IdSequence.objects.order_by('kind', 'prefix')]
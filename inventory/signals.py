@@ -4,18 +4,22 @@
 
 from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
-from .models import Device, AuditLog, Assignment, AssignmentHistory
+from .audit import record_action
+from .models import Device, Assignment, AssignmentHistory
 
 @receiver(post_save, sender=Device)
 def create_device_audit_log(sender, instance, created, **kwargs):
     """Create audit log entry when device is created or updated"""
+    if not created and not getattr(instance, '_field_changes', None):
+        return
     action = 'CREATE' if created else 'UPDATE'
-    AuditLog.objects.create(
+    record_action(
         user=getattr(instance, '_current_user', None),
         action=action,
         model_name='Device',
         object_id=instance.device_id,
         object_repr=str(instance),
+        # Filled in by ChangeTrackingMixin.save() with the columns it wrote
         changes=getattr(instance, '_field_changes', {})
     )
 
@@ -23,45 +27,44 @@ def create_device_audit_log(sender, instance, created, **kwargs):
 def update_device_status_on_assignment(sender, instance, created, **kwargs):
     """Update device status when assignment is created"""
     if created and instance.is_active:
+        # Device tracks its changed fields, so this writes status (and updated_at) only
         instance.device.status = 'ASSIGNED'
         instance.device.save()
         
         # Create assignment history record
+        changed_by = getattr(instance, '_current_user', None) or instance.created_by
         AssignmentHistory.objects.create(
-            device=instance.device,
             assignment=instance,
-            action='ASSIGNED',
-            new_staff=instance.assigned_to_staff,
-            new_department=instance.assigned_to_department,
-            new_location=instance.assigned_to_location,
+            changed_by=changed_by,
+            change_type='CREATED',
+            new_values={
+                'device': instance.device_id,
+                'assigned_to_staff': instance.assigned_to_staff_id,
+                'assigned_to_department': instance.assigned_to_department_id,
+                'assigned_to_location': instance.assigned_to_location_id,
+                'assignment_type': instance.assignment_type,
+            },
             reason=f"New assignment: {instance.assignment_type}",
-            changed_by=getattr(instance, '_current_user', None)
         )
 
 @receiver(pre_save, sender=Assignment)
 def track_assignment_changes(sender, instance, **kwargs):
     """Track changes in assignment before saving"""
-    if instance.pk:  # Existing assignment
-        try:
-            old_instance = Assignment.objects.get(pk=instance.pk)
-            changes = {}
-            
-            # Check for changes in assignment targets
-            if old_instance.assigned_to_staff != instance.assigned_to_staff:
-                changes['staff'] = {
-                    'old': str(old_instance.assigned_to_staff) if old_instance.assigned_to_staff else None,
-                    'new': str(instance.assigned_to_staff) if instance.assigned_to_staff else None
-                }
-            
-            if old_instance.assigned_to_location != instance.assigned_to_location:
-                changes['location'] = {
-                    'old': str(old_instance.assigned_to_location) if old_instance.assigned_to_location else None,
-                    'new': str(instance.assigned_to_location) if instance.assigned_to_location else None
-                }
-            
-            if changes:
-                instance._assignment_changes = changes
-                instance._old_assignment = old_instance
-                
-        except Assignment.DoesNotExist:
-            pass
\ No newline at end of file
+    # The loaded values come from the instance itself, not a second query
+    if not instance.is_tracked:
+        return
+    
+    changed = instance.get_changed_fields()
+    changes = {}
+    
+    # Check for changes in assignment targets (primary keys)
+    if 'assigned_to_staff' in changed:
+        old, new = changed['assigned_to_staff']
+        changes['staff'] = {'old': old, 'new': new}
+    
+    if 'assigned_to_location' in changed:
+        old, new = changed['assigned_to_location']
+        changes['location'] = {'old': old, 'new': new}
+    
+    if changes:
+        instance._assignment_changes = changes
@@ -0,0 +1,401 @@
+# inventory/synthetic.py - Synthetic Inventory Generator
+"""
+Realistic synthetic inventories for benchmarking (generate_dataset
+management command, see also inventory/benchmarks.py).
+
+generate() builds on the reference data created by setup_bps (locations,
+device types, vendors) and adds, per device, the rows a live system
+accumulates around it: staff to assign to, active and returned
+assignments, QR scans, audit entries and maintenance records. Everything
+is written with bulk_create in chunks of batch_size devices, so memory
+stays flat and a million devices costs a few thousand INSERTs rather than
+millions of saves. Values come from Faker and a seeded random generator,
+so a given seed and size always produce the same dataset.
+
+Synthetic rows are recognisable for purge(): devices use the SYNTHETIC
+device ID series (BPS-SYN-<year>-NNNN), users the synthetic_ username
+prefix, and audit entries point at synthetic device IDs.
+
+bulk_create bypasses post_save, so the new devices, assignments and staff
+are recorded in the change feed per chunk, and afterwards the hierarchy
+rollups are rebuilt and the cached dashboard statistics invalidated in
+one go.
+"""
+
+import logging
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from bps_inventory.cache import invalidate_tags
+from qr_management.models import QRCodeScan
+
+from .cache_tags import TAG_ASSIGNMENTS, TAG_DEVICES, TAG_MAINTENANCE, TAG_STAFF, TAG_USERS
+from .change_feed import record_changes
+from .hierarchy_rollup import rebuild_rollups
+from .models import (
+    Assignment, AuditLog, Department, Device, DeviceType, Location, MaintenanceRecord, Staff, Vendor,
+)
+from .sequences import device_ids, employee_ids
+
+logger = logging.getLogger(__name__)
+
+# Device counts of the named --scale presets
+SCALES = {
+    'small': 10_000,
+    'medium': 100_000,
+    'large': 1_000_000,
+}
+
+# Rows generated per device (fractions are rounded per chunk)
+DEFAULT_RATIOS = {
+    'staff': 0.2,
+    'active_assignments': 0.55,
+    'returned_assignments': 0.5,
+    'scans': 3,
+    'audit_logs': 2,
+    'maintenance': 0.3,
+}
+
+SYNTHETIC_CATEGORY_CODE = 'SYN'
+USERNAME_PREFIX = 'synthetic_'
+HISTORY_DAYS = 3 * 365
+
+BRANDS = {
+    'Dell': ['Latitude 5440', 'OptiPlex 7010', 'PowerEdge R650', 'P2422H'],
+    'HP': ['EliteBook 840 G10', 'ProDesk 400 G9', 'LaserJet Pro M404', 'E24 G5'],
+    'Lenovo': ['ThinkPad T14', 'ThinkCentre M70q', 'ThinkVision T24i'],
+    'Cisco': ['Catalyst 9200', 'ISR 1100', 'IP Phone 8841'],
+    'Canon': ['imageRUNNER 2425', 'PIXMA G3010'],
+    'Apple': ['MacBook Air M2', 'iPad 10th Gen'],
+}
+
+DESIGNATIONS = [
+    'Assistant Secretary', 'Deputy Secretary', 'Senior Assistant Secretary', 'Computer Operator',
+    'System Analyst', 'Programmer', 'Research Officer', 'Administrative Officer', 'Accounts Officer',
+]
+
+# Weighted so most devices are in use, as in a live inventory
+DEVICE_STATUSES = ['AVAILABLE'] * 25 + ['MAINTENANCE'] * 6 + ['RETIRED'] * 4 + ['DAMAGED'] * 2 + ['LOST']
+CONDITIONS = ['EXCELLENT', 'GOOD', 'GOOD', 'GOOD', 'FAIR', 'POOR']
+SCAN_TYPES = ['VERIFICATION', 'VERIFICATION', 'INVENTORY', 'AUDIT', 'MOBILE_SCAN', 'ASSIGNMENT_CHECK']
+AUDIT_ACTIONS = ['UPDATE', 'UPDATE', 'VIEW', 'ASSIGN', 'RETURN', 'TRANSFER', 'MAINTENANCE']
+MAINTENANCE_TYPES = ['PREVENTIVE', 'PREVENTIVE', 'CORRECTIVE', 'EMERGENCY', 'UPGRADE', 'INSPECTION']
+
+
+class explicit_timestamps:
+    """Let bulk_create keep the given values of auto_now_add fields"""
+
+    def __init__(self, *fields):
+        self.fields = fields
+
+    def __enter__(self):
+        for field in self.fields:
+            field.auto_now_add = False
+
+    def __exit__(self, *exc_info):
+        for field in self.fields:
+            field.auto_now_add = True
+
+
+def _amount(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def _ratio_count(rng, count, ratio):
+    whole = int(count * ratio)
+    return whole + (rng.random() < count * ratio - whole)
+
+
+# ================================
+# REFERENCE DATA
+# ================================
+
+def load_reference_data():
+    """Locations, device types, vendors and departments to attach rows to"""
+    reference = {
+        'locations': list(Location.objects.filter(is_active=True).select_related('department')),
+        'device_types': list(DeviceType.objects.all()),
+        'vendors': list(Vendor.objects.all()),
+        'departments': list(Department.objects.all()),
+    }
+    missing = [name for name, rows in reference.items() if not rows]
+    if missing:
+        raise ValueError(f"No {', '.join(missing)} found; run setup_bps first")
+    return reference
+
+
+def create_staff(count, reference, rng, fake, creator, batch_size):
+    """count users with Staff profiles, spread over the departments"""
+    password = make_password(None)
+    first = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+    created = []
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        departments = [rng.choice(reference['departments']) for _i in range(size)]
+        blocks = {}
+        for department in set(departments):
+            blocks[department.pk] = iter(employee_ids(department).allocate(
+                departments.count(department), user=creator, purpose='synthetic dataset',
+            ))
+
+        users = []
+        for offset in range(size):
+            first_name, last_name = fake.first_name(), fake.last_name()
+            users.append(User(
+                username=f'{USERNAME_PREFIX}{first + start + offset}',
+                first_name=first_name,
+                last_name=last_name,
+                email=f'{first_name}.{last_name}.{first + start + offset}@example.org'.lower(),
+                password=password,
+            ))
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=batch_size)
+            users = list(User.objects.filter(username__in=[user.username for user in users]).order_by('id'))
+            staff = [
+                Staff(
+                    user=user,
+                    employee_id=next(blocks[department.pk]),
+                    department=department,
+                    designation=rng.choice(DESIGNATIONS),
+                    office_location=rng.choice(reference['locations']),
+                    phone_number=fake.numerify('01#########'),
+                    joining_date=timezone.localdate() - timedelta(days=rng.randint(30, 20 * 365)),
+                )
+                for user, department in zip(users, departments)
+            ]
+            Staff.objects.bulk_create(staff, batch_size=batch_size)
+            # bulk_create does not set primary keys on every backend (MySQL)
+            staff = list(Staff.objects.filter(user__in=users).order_by('id'))
+            record_changes(Staff, [member.pk for member in staff])
+        created.extend(staff)
+    return created
+
+
+# ================================
+# DEVICE CHUNKS
+# ================================
+
+def _devices(ids, reference, rng, fake, creator, today):
+    devices = []
+    for device_id in ids:
+        brand = rng.choice(list(BRANDS))
+        model = rng.choice(BRANDS[brand])
+        purchase = today - timedelta(days=rng.randint(0, 8 * 365))
+        warranty_years = rng.choice([1, 2, 3, 3, 5])
+        devices.append(Device(
+            device_id=device_id,
+            device_name=f'{brand} {model}',
+            asset_tag=device_id.replace('BPS-', 'AT-', 1),
+            serial_number=fake.bothify('??########').upper(),
+            device_type=rng.choice(reference['device_types']),
+            brand=brand,
+            model=model,
+            status=rng.choice(DEVICE_STATUSES),
+            device_condition=rng.choice(CONDITIONS),
+            purchase_price=_amount(rng, 150, 4000),
+            purchase_date=purchase,
+            warranty_start_date=purchase,
+            warranty_end_date=purchase + timedelta(days=365 * warranty_years),
+            vendor=rng.choice(reference['vendors']),
+            location=rng.choice(reference['locations']),
+            is_critical=rng.random() < 0.05,
+            expected_life_years=rng.choice([3, 4, 5, 5, 7]),
+            notes='Synthetic benchmark device',
+            created_by=creator,
+            updated_by=creator,
+        ))
+    return devices
+
+
+def _assignments(devices, staff, reference, ratios, rng, creator, today):
+    assignments = []
+    available = [device for device in devices if device.status == 'AVAILABLE']
+    active = rng.sample(available, min(len(available), _ratio_count(rng, len(devices), ratios['active_assignments'])))
+    for device in active:
+        device.status = 'ASSIGNED'
+        start = max(device.purchase_date, today - timedelta(days=rng.randint(0, 700)))
+        temporary = rng.random() < 0.15
+        assignments.append(Assignment(
+            device=device,
+            assigned_to_staff=rng.choice(staff) if staff else None,
+            assigned_to_location=device.location,
+            assignment_type='TEMPORARY' if temporary else 'PERMANENT',
+            is_temporary=temporary,
+            start_date=start,
+            expected_return_date=start + timedelta(days=rng.randint(7, 120)) if temporary else None,
+            purpose='Synthetic assignment',
+            is_active=True,
+            created_by=creator,
+        ))
+
+    for _i in range(_ratio_count(rng, len(devices), ratios['returned_assignments'])):
+        device = rng.choice(devices)
+        start = device.purchase_date + timedelta(days=rng.randint(0, 200))
+        if start >= today:
+            continue
+        assignments.append(Assignment(
+            device=device,
+            assigned_to_staff=rng.choice(staff) if staff else None,
+            assigned_to_location=device.location,
+            start_date=start,
+            actual_return_date=min(today, start + timedelta(days=rng.randint(30, 500))),
+            purpose='Synthetic assignment',
+            is_active=False,
+            created_by=creator,
+        ))
+    return assignments
+
+
+def _scans(devices, ratios, rng, fake, creator, now):
+    scans = []
+    for _i in range(_ratio_count(rng, len(devices), ratios['scans'])):
+        device = rng.choice(devices)
+        scans.append(QRCodeScan(
+            device=device,
+            scan_type=rng.choice(SCAN_TYPES),
+            scanned_by=creator,
+            timestamp=now - timedelta(minutes=rng.randint(0, HISTORY_DAYS * 24 * 60)),
+            scan_location=device.location,
+            device_status_at_scan=device.status,
+            device_location_at_scan=device.location,
+            verification_success=rng.random() < 0.97,
+            ip_address=fake.ipv4_private(),
+            scan_duration_ms=rng.randint(80, 2500),
+        ))
+    return scans
+
+
+def _audit_logs(devices, ratios, rng, fake, creator, now):
+    entries = []
+    for _i in range(_ratio_count(rng, len(devices), ratios['audit_logs'])):
+        device = rng.choice(devices)
+        action = rng.choice(AUDIT_ACTIONS)
+        entries.append(AuditLog(
+            user=creator,
+            action=action,
+            model_name='Device',
+            object_id=device.device_id,
+            object_repr=str(device.device_name)[:200],
+            changes={'status': device.status} if action == 'UPDATE' else {},
+            ip_address=fake.ipv4_private(),
+            timestamp=now - timedelta(minutes=rng.randint(0, HISTORY_DAYS * 24 * 60)),
+        ))
+    return entries
+
+
+def _maintenance(devices, reference, ratios, rng, creator, today):
+    records = []
+    for _i in range(_ratio_count(rng, len(devices), ratios['maintenance'])):
+        device = rng.choice(devices)
+        scheduled = today - timedelta(days=rng.randint(-60, 2 * 365))
+        completed = scheduled <= today and rng.random() < 0.85
+        records.append(MaintenanceRecord(
+            device=device,
+            maintenance_type=rng.choice(MAINTENANCE_TYPES),
+            description='Synthetic maintenance',
+            scheduled_date=scheduled,
+            completed_date=scheduled + timedelta(days=rng.randint(0, 5)) if completed else None,
+            status='COMPLETED' if completed else 'SCHEDULED',
+            vendor=rng.choice(reference['vendors']),
+            cost=_amount(rng, 10, 600) if completed else None,
+            created_by=creator,
+        ))
+    return records
+
+
+# ================================
+# ENTRY POINTS
+# ================================
+
+def generate(devices, seed=0, batch_size=5000, ratios=None, creator=None, progress=None):
+    """
+    Add devices synthetic devices and their related rows; returns the
+    number of rows created per model
+    """
+    ratios = {**DEFAULT_RATIOS, **(ratios or {})}
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    reference = load_reference_data()
+    creator = creator or User.objects.filter(is_superuser=True).order_by('id').first()
+    if creator is None:
+        raise ValueError('No superuser found to own the generated rows; run setup_bps first')
+
+    today = timezone.localdate()
+    now = timezone.now()
+    totals = {'staff': 0, 'devices': 0, 'assignments': 0, 'scans': 0, 'audit_logs': 0, 'maintenance': 0}
+
+    staff = create_staff(int(devices * ratios['staff']), reference, rng, fake, creator, batch_size)
+    totals['staff'] = len(staff)
+    if progress:
+        progress(totals)
+
+    series = device_ids(category_code=SYNTHETIC_CATEGORY_CODE)
+    for start in range(0, devices, batch_size):
+        size = min(batch_size, devices - start)
+        ids = series.allocate(size, user=creator, purpose='synthetic dataset')
+        chunk = _devices(ids, reference, rng, fake, creator, today)
+        assignments = _assignments(chunk, staff, reference, ratios, rng, creator, today)
+        scans = _scans(chunk, ratios, rng, fake, creator, now)
+        entries = _audit_logs(chunk, ratios, rng, fake, creator, now)
+        records = _maintenance(chunk, reference, ratios, rng, creator, today)
+
+        with transaction.atomic(), explicit_timestamps(
+            QRCodeScan._meta.get_field('timestamp'), AuditLog._meta.get_field('timestamp'),
+        ):
+            Device.objects.bulk_create(chunk, batch_size=batch_size)
+            Assignment.objects.bulk_create(assignments, batch_size=batch_size)
+            QRCodeScan.objects.bulk_create(scans, batch_size=batch_size)
+            AuditLog.objects.bulk_create(entries, batch_size=batch_size)
+            MaintenanceRecord.objects.bulk_create(records, batch_size=batch_size)
+            device_pks = [device.pk for device in chunk]
+            record_changes(Device, device_pks)
+            record_changes(Assignment, Assignment.objects.filter(device_id__in=device_pks).values_list('pk', flat=True))
+
+        totals['devices'] += len(chunk)
+        totals['assignments'] += len(assignments)
+        totals['scans'] += len(scans)
+        totals['audit_logs'] += len(entries)
+        totals['maintenance'] += len(records)
+        if progress:
+            progress(totals)
+
+    refresh_derived_data()
+    logger.info(f"Generated synthetic dataset: {totals}")
+    return totals
+
+
+def purge():
+    """Delete every synthetic row; returns the number deleted per model label"""
+    prefix = series_prefix()
+    deleted = {}
+    with transaction.atomic():
+        # Assignments, scans and maintenance records cascade with the
+        # devices, staff profiles with the users
+        for queryset in (
+            AuditLog.objects.filter(object_id__startswith=prefix),
+            Device.objects.filter(device_id__startswith=prefix),
+            User.objects.filter(username__startswith=USERNAME_PREFIX),
+        ):
+            for label, count in queryset.delete()[1].items():
+                deleted[label] = deleted.get(label, 0) + count
+    refresh_derived_data()
+    return deleted
+
+
+def series_prefix():
+    """Device ID prefix shared by every synthetic device, whatever its year"""
+    return f'BPS-{SYNTHETIC_CATEGORY_CODE}-'
+
+
+def refresh_derived_data():
+    """Rollups and cached statistics that post_save would have kept current"""
+    rebuild_rollups()
+    invalidate_tags([TAG_DEVICES, TAG_ASSIGNMENTS, TAG_MAINTENANCE, TAG_STAFF, TAG_USERS])
@@ -1,3 +1,246 @@
-from django.test import TestCase
+# inventory/tests.py - Inventory Tests
+"""
+Hot path checks on a small generated dataset:
+- every benchmark of inventory.benchmarks must answer with its expected
+  status and content, within its query and repeated-statement budgets;
+- no filter of inventory.query_plans may need a full table scan.
 
-# Create your tests here.
+Change feed entries must commit and roll back with the writes they record;
+readers must stop before gaps that may still fill and compaction must keep
+the latest entry of every object.
+Completing a maintenance schedule must cope with a missing due date.
+ID sequences must hand out each number once and account for every number.
+
+Run with pytest (pytest-django); the timing figures stay with the
+run_benchmarks management command.
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+from dateutil.relativedelta import relativedelta
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from . import sequences
+from .benchmarks import BENCHMARKS, run_benchmark
+from .change_feed import compact, latest_sequence, read_changes
+from .maintenance_calendar import complete_schedule
+from .models import (
+    ChangeFeedEntry, Device, IdAllocation, IdSequence, Location, MaintenanceOccurrence, MaintenanceSchedule,
+    Staff,
+)
+from .query_plans import PLAN_CHECKS, check_plan
+from .sequences import IdSeries
+from .synthetic import generate
+
+DATASET_DEVICES = 200
+
+
+@pytest.fixture
+def reference(db):
+    """Reference data from setup_bps only"""
+    call_command('setup_bps', stdout=StringIO())
+
+
+@pytest.fixture
+def dataset(db):
+    """Reference data from setup_bps plus a small synthetic inventory; returns the superuser"""
+    call_command('setup_bps', stdout=StringIO())
+    user = User.objects.filter(is_superuser=True).order_by('id').first()
+    generate(DATASET_DEVICES, seed=0, creator=user)
+    return user
+
+
+@pytest.mark.parametrize('benchmark', BENCHMARKS, ids=[benchmark['name'] for benchmark in BENCHMARKS])
+def test_hot_path_budget(dataset, benchmark):
+    result = run_benchmark(benchmark, dataset, rounds=1, warmup=0)
+    assert result['failures'] == [], f"{benchmark['name']}: {'; '.join(result['failures'])}"
+
+
+@pytest.mark.parametrize('check', PLAN_CHECKS, ids=[check['name'] for check in PLAN_CHECKS])
+def test_no_full_table_scan(dataset, check):
+    result = check_plan(check, prefer_indexes=True)
+    assert result['failures'] == [], f"{check['name']}: {'; '.join(result['failures'])}\n{result['plan']}"
+
+
+def _new_location():
+    template = Location.objects.order_by('id').first()
+    return Location.objects.create(
+        building=template.building, block=template.block, floor=template.floor,
+        department=template.department, description='Change feed test',
+    )
+
+
+def _feed_actions(location_id, after):
+    return list(ChangeFeedEntry.objects.filter(
+        sequence__gt=after, model_name='location', object_id=str(location_id),
+    ).order_by('sequence').values_list('action', flat=True))
+
+
+def test_change_feed_drops_changes_of_rolled_back_savepoints(reference):
+    after = latest_sequence()
+    with transaction.atomic():
+        location = _new_location()
+        location_id = location.pk
+        with pytest.raises(RuntimeError), transaction.atomic():
+            location.delete()
+            raise RuntimeError('roll back the delete')
+
+    assert Location.objects.filter(pk=location_id).exists()
+    assert _feed_actions(location_id, after) == ['UPSERT']
+
+
+def test_change_feed_failure_fails_the_write(reference):
+    after = latest_sequence()
+    with mock.patch.object(ChangeFeedEntry.objects, 'bulk_create', side_effect=DatabaseError('feed down')):
+        with pytest.raises(DatabaseError), transaction.atomic():
+            _new_location()
+
+    assert not Location.objects.filter(description='Change feed test').exists()
+    assert ChangeFeedEntry.objects.filter(sequence__gt=after).count() == 0
+
+
+def test_complete_schedule_without_due_date(dataset):
+    today = timezone.localdate()
+    schedule = MaintenanceSchedule.objects.create(
+        device=Device.objects.order_by('device_id').first(), maintenance_type='PREVENTIVE',
+        frequency='MONTHLY', description='Calendar test', next_due_date=today,
+    )
+    MaintenanceOccurrence.objects.filter(schedule=schedule).delete()
+    schedule.next_due_date = None
+
+    assert complete_schedule(schedule, completed_on=today) is None
+
+    schedule.refresh_from_db()
+    assert schedule.last_completed_date == today
+    assert schedule.next_due_date == today + relativedelta(months=1)
+    assert not MaintenanceOccurrence.objects.filter(schedule=schedule, status='COMPLETED').exists()
+
+
+@pytest.fixture
+def employee_series(db, monkeypatch):
+    """An employee ID series with no counter yet; cached counter pks do not outlive a test"""
+    monkeypatch.setattr(sequences, '_sequence_ids', {})
+    return IdSeries('EMPLOYEE', 'TST', width=3)
+
+
+def _staff(employee_id):
+    user = User.objects.create(username=f'sequence-{employee_id}')
+    return Staff.objects.create(user=user, employee_id=employee_id, designation='Clerk')
+
+
+def test_id_series_is_seeded_from_existing_ids(employee_series):
+    _staff('TST007')
+
+    assert employee_series.peek() == 8
+    assert employee_series.next_id() == 'TST008'
+
+
+def test_id_blocks_never_overlap(employee_series):
+    first = employee_series.allocate(3)
+    second = employee_series.allocate(2)
+
+    assert list(first) == ['TST001', 'TST002', 'TST003']
+    assert list(second) == ['TST004', 'TST005']
+    assert first.remaining == 0 and len(second) == 2
+    with pytest.raises(ValueError):
+        employee_series.allocate(0)
+
+
+def test_id_series_recreates_a_deleted_counter(employee_series):
+    _staff(employee_series.next_id())
+    IdSequence.objects.filter(prefix='TST').delete()
+
+    # The cached counter pk is stale; the counter is seeded again from the IDs in use
+    assert employee_series.next_id() == 'TST002'
+
+
+def test_id_audit_accounts_for_every_number(employee_series):
+    block = employee_series.allocate(5)
+    for employee_id in list(block)[1::2]:
+        _staff(employee_id)
+    _staff('TST009')
+
+    report = employee_series.audit()
+    assert report['allocations'] == 1
+    assert report['allocated'] == 5
+    assert report['used'] == 3
+    assert report['unused'] == [(1, 1), (3, 3), (5, 5)]
+    assert report['unallocated'] == [9]
+    assert report['overlaps'] == []
+
+    IdAllocation.objects.create(sequence=IdSequence.objects.get(prefix='TST'), first_value=4, last_value=6)
+    assert employee_series.audit()['overlaps'] == [(4, 6)]
+
+
+def _feed_entry(sequence, object_id='BPS-0001', age=3600, action='UPSERT', model_name='device'):
+    """Feed entry recorded age seconds ago"""
+    return ChangeFeedEntry.objects.create(
+        sequence=sequence, model_name=model_name, object_id=object_id, action=action,
+        recorded_at=timezone.now() - timedelta(seconds=age),
+    )
+
+
+def _read(after=0, **kwargs):
+    entries, cursor, has_more = read_changes(after, **kwargs)
+    return [entry.sequence for entry in entries], cursor, has_more
+
+
+def test_change_feed_stops_before_a_young_gap(db):
+    for sequence, age in [(1, 3600), (2, 3600), (4, 0), (5, 0)]:
+        _feed_entry(sequence, age=age)
+
+    # Sequence 3 may belong to a transaction that has not committed yet
+    assert _read() == ([1, 2], 2, False)
+    _feed_entry(3, age=0)
+    assert _read(2) == ([3, 4, 5], 5, False)
+
+
+def test_change_feed_stops_at_a_gap_between_recent_entries(db):
+    for sequence, age in [(1, 3600), (2, 0), (4, 0)]:
+        _feed_entry(sequence, age=age)
+
+    assert _read() == ([1, 2], 2, False)
+
+
+def test_change_feed_skips_settled_gaps(db):
+    for sequence in [1, 3, 6]:
+        _feed_entry(sequence)
+
+    assert _read(limit=2) == ([1, 3], 3, True)
+    assert _read(3, limit=2) == ([6], 6, False)
+
+
+def test_change_feed_model_filter_advances_the_cursor(db):
+    _feed_entry(1)
+    _feed_entry(2, model_name='location', object_id='7')
+    _feed_entry(3)
+    assert _read(model_names=['location']) == ([2], 3, False)
+
+    # Never past entries that are not readable yet
+    _feed_entry(5, age=0)
+    assert _read(3, model_names=['location']) == ([], 4, False)
+
+
+def test_change_feed_compaction_keeps_the_latest_entries(db, settings):
+    settings.CHANGE_FEED = {'COMPACT_BATCH_SIZE': 1}
+    day = 24 * 3600
+    _feed_entry(1, 'BPS-0001', age=2 * day)
+    _feed_entry(2, 'BPS-0001', age=2 * day)
+    _feed_entry(3, 'BPS-0001', age=0)
+    _feed_entry(4, 'BPS-0002', age=2 * day)
+    _feed_entry(5, 'BPS-0002', age=2 * day, action='DELETE')
+    _feed_entry(6, 'BPS-0003', age=2 * day)
+    # Superseded, but not old enough to compact
+    _feed_entry(7, 'BPS-0004', age=0)
+    _feed_entry(8, 'BPS-0004', age=0)
+
+    assert compact() == 3
+    assert list(ChangeFeedEntry.objects.order_by('sequence').values_list('sequence', 'action')) == [
+        (3, 'UPSERT'), (5, 'DELETE'), (6, 'UPSERT'), (7, 'UPSERT'), (8, 'UPSERT'),
+    ]
@@ -2,7 +2,10 @@
 # Location: bps_inventory/apps/inventory/urls.py
 
 from django.urls import path
-from . import views
+from bps_inventory.lazy_views import LazyViewModule
+
+# View modules are imported on first request (see bps_inventory.lazy_views)
+views = LazyViewModule('inventory.views')
 
 app_name = 'inventory'
 
@@ -137,9 +140,11 @@ urlpatterns = [
     # ================================
     path('maintenance/', views.maintenance_list, name='maintenance_list'),
     path('maintenance/add/', views.maintenance_create, name='maintenance_create'),
+    path('maintenance/schedule/', views.maintenance_schedule, name='maintenance_schedule'),
     path('maintenance/<str:maintenance_id>/', views.maintenance_detail, name='maintenance_detail'),
     path('maintenance/<str:maintenance_id>/edit/', views.maintenance_edit, name='maintenance_edit'),
     path('maintenance/<str:maintenance_id>/delete/', views.maintenance_delete, name='maintenance_delete'),
+    path('maintenance/<str:maintenance_id>/complete/', views.maintenance_complete, name='maintenance_complete'),
     
     # ================================
     # BULK OPERATIONS
@@ -157,6 +162,8 @@ urlpatterns = [
     path('search/devices/', views.device_search, name='device_search'),
     path('search/assignments/', views.assignment_search, name='assignment_search'),
     path('search/advanced/', views.advanced_search, name='advanced_search'),
+    path('api/search/devices/', views.device_search_api, name='device_search_api'),
+    path('api/search/assignments/', views.assignment_search_api, name='assignment_search_api'),
     
     # ================================
     # CASCADE API ENDPOINTS
@@ -179,6 +186,7 @@ urlpatterns = [
     path('api/hierarchy/validate/', views.api_validate_hierarchy, name='api_hierarchy_validate'),
     path('api/locations/search/', views.api_location_search, name='api_location_search'),
     path('api/hierarchy/stats/', views.api_hierarchy_stats, name='api_hierarchy_stats'),
+    path('api/maintenance/calendar/', views.maintenance_calendar_api, name='api_maintenance_calendar'),
     
     # ================================
     # AJAX ENDPOINTS
@@ -187,6 +195,9 @@ urlpatterns = [
     path('ajax/get-device-types/', views.ajax_device_types_by_subcategory, name='ajax_get_device_types'),  
     path('ajax/device-stats/<str:device_id>/', views.ajax_device_stats, name='ajax_device_stats'),
     path('ajax/assignment-quick-actions/<str:assignment_id>/', views.ajax_assignment_quick_actions, name='ajax_assignment_quick_actions'),
+    path('ajax/dashboard-stats/', views.ajax_dashboard_stats, name='ajax_dashboard_stats'),
+    path('ajax/notifications/', views.ajax_notification_list, name='ajax_notification_list'),
+    path('ajax/notifications/mark-read/', views.ajax_notification_mark_read, name='ajax_notification_mark_read'),
     path('ajax/validate-hierarchy/', views.api_validate_hierarchy, name='ajax_validate_hierarchy'),
     # path('ajax/suggest-block-code/', views.ajax_suggest_block_code, name='ajax_suggest_block_code'),
     # path('ajax/location-breadcrumb/', views.ajax_location_breadcrumb, name='ajax_location_breadcrumb'),
@@ -1,8 +1,11 @@
 # inventory/utils.py - Utility Functions for Inventory Management
 
+from django.conf import settings
 from django.db.models import Count, Q, Sum, Avg, Max, Min, F
 from django.utils import timezone
-from datetime import date, timedelta, datetime
+from datetime import date, timedelta, datetime, time
+from functools import lru_cache
+import ipaddress
 import json
 import logging
 
@@ -34,7 +37,7 @@ def get_device_assignment_summary():
         # Recently assigned (last 7 days)
         week_ago = today - timedelta(days=7)
         recent_assignments = Assignment.objects.filter(
-            created_at__date__gte=week_ago
+            **day_range('created_at', date_from=week_ago)
         ).count()
         
         # Recently returned (last 7 days)
@@ -127,25 +130,32 @@ def get_assignment_trends(days=30):
     try:
         from .models import Assignment
         
+        from django.db.models.functions import TruncDate
+
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=days)
         
+        # One GROUP BY per series instead of two counts per day
+        created = dict(Assignment.objects.filter(
+            **day_range('created_at', start_date, end_date)
+        ).annotate(day=TruncDate('created_at')).values('day').annotate(
+            count=Count('pk')
+        ).values_list('day', 'count').order_by())
+        
+        returned = dict(Assignment.objects.filter(
+            actual_return_date__range=(start_date, end_date)
+        ).values('actual_return_date').annotate(
+            count=Count('pk')
+        ).values_list('actual_return_date', 'count').order_by())
+        
         trends = []
         current_date = start_date
         
         while current_date <= end_date:
-            assignments_created = Assignment.objects.filter(
-                created_at__date=current_date
-            ).count()
-            
-            assignments_returned = Assignment.objects.filter(
-                actual_return_date=current_date
-            ).count()
-            
             trends.append({
                 'date': current_date.strftime('%Y-%m-%d'),
-                'created': assignments_created,
-                'returned': assignments_returned
+                'created': created.get(current_date, 0),
+                'returned': returned.get(current_date, 0)
             })
             
             current_date += timedelta(days=1)
@@ -156,6 +166,28 @@ def get_assignment_trends(days=30):
         logger.error(f"Error in get_assignment_trends: {e}")
         return []
 
+def _start_of_day(day):
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    elif isinstance(day, datetime):
+        day = timezone.localtime(day).date() if timezone.is_aware(day) else day.date()
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+def day_range(field, date_from=None, date_to=None):
+    """
+    Filter lookups for a datetime field falling on the days date_from to
+    date_to (inclusive; dates or ISO strings, either may be omitted).
+
+    Written as a half-open range on the column itself so its index applies;
+    field__date lookups wrap the column in a function and scan the table.
+    """
+    lookups = {}
+    if date_from:
+        lookups[f'{field}__gte'] = _start_of_day(date_from)
+    if date_to:
+        lookups[f'{field}__lt'] = _start_of_day(date_to) + timedelta(days=1)
+    return lookups
+
 def validate_date_field(date_value, field_name="date"):
     """Validate and safely handle date fields"""
     try:
@@ -260,48 +292,11 @@ def calculate_warranty_status(warranty_end_date):
         logger.error(f"Error calculating warranty status: {e}")
         return {'status': 'error', 'days_remaining': None, 'class': 'secondary'}
 
-def generate_device_id(category_code=None, department_code=None):
-    """Generate unique device ID"""
+def generate_device_id(category_code=None, department_code=None, user=None):
+    """Generate unique device ID (BPS[-CAT][-DEPT]-<year>-NNNN, see inventory.sequences)"""
     try:
-        from .models import Device
-        
-        # Get current year
-        year = timezone.now().year
-        
-        # Build prefix
-        prefix_parts = ['BPS']
-        if category_code:
-            prefix_parts.append(category_code.upper())
-        if department_code:
-            prefix_parts.append(department_code.upper())
-        
-        prefix = '-'.join(prefix_parts)
-        
-        # Find last device with this prefix pattern
-        pattern = f"{prefix}-{year}-"
-        last_device = Device.objects.filter(
-            device_id__startswith=pattern
-        ).order_by('-device_id').first()
-        
-        if last_device:
-            # Extract sequence number
-            try:
-                last_seq = int(last_device.device_id.split('-')[-1])
-                next_seq = last_seq + 1
-            except (ValueError, IndexError):
-                next_seq = 1
-        else:
-            next_seq = 1
-        
-        # Generate new device ID
-        new_device_id = f"{prefix}-{year}-{next_seq:04d}"
-        
-        # Ensure uniqueness
-        while Device.objects.filter(device_id=new_device_id).exists():
-            next_seq += 1
-            new_device_id = f"{prefix}-{year}-{next_seq:04d}"
-        
-        return new_device_id
+        from .sequences import device_ids
+        return device_ids(category_code, department_code).next_id(user=user, purpose='device')
         
     except Exception as e:
         logger.error(f"Error generating device ID: {e}")
@@ -309,36 +304,16 @@ def generate_device_id(category_code=None, department_code=None):
         timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
         return f"BPS-DEV-{timestamp}"
 
+def reserve_device_ids(count, category_code=None, department_code=None, user=None, purpose='import'):
+    """Reserve a block of device IDs for a bulk import; iterate it to take IDs"""
+    from .sequences import device_ids
+    return device_ids(category_code, department_code).allocate(count, user=user, purpose=purpose)
+
 def generate_assignment_id():
-    """Generate unique assignment ID"""
+    """Generate unique assignment ID (ASN-<yyyymmdd>-NNNN, see inventory.sequences)"""
     try:
-        from .models import Assignment
-        
-        today = timezone.now().date()
-        prefix = f"ASN-{today.strftime('%Y%m%d')}-"
-        
-        # Find last assignment today
-        last_assignment = Assignment.objects.filter(
-            assignment_id__startswith=prefix
-        ).order_by('-assignment_id').first()
-        
-        if last_assignment:
-            try:
-                last_seq = int(last_assignment.assignment_id.split('-')[-1])
-                next_seq = last_seq + 1
-            except (ValueError, IndexError):
-                next_seq = 1
-        else:
-            next_seq = 1
-        
-        new_assignment_id = f"{prefix}{next_seq:04d}"
-        
-        # Ensure uniqueness
-        while Assignment.objects.filter(assignment_id=new_assignment_id).exists():
-            next_seq += 1
-            new_assignment_id = f"{prefix}{next_seq:04d}"
-        
-        return new_assignment_id
+        from .sequences import assignment_ids
+        return assignment_ids().next_id(purpose='assignment')
         
     except Exception as e:
         logger.error(f"Error generating assignment ID: {e}")
@@ -440,7 +415,7 @@ def send_notification_email(subject, message, recipient_list):
         logger.error(f"Error sending notification email: {e}")
         return False
 
-def log_user_activity(user, action, model_name, object_id, object_repr, changes=None, ip_address=None):
+def log_user_activity(user, action, model_name, object_id='', object_repr='', changes=None, ip_address=None, strict=False):
     """
     Enhanced logging function for user activities with better error handling.
     
@@ -448,39 +423,34 @@ def log_user_activity(user, action, model_name, object_id, object_repr, changes=
         user: User performing the action
         action: Action type (CREATE, UPDATE, DELETE, etc.)
         model_name: Name of the model being affected
-        object_id: ID of the object
+        object_id: ID of the object (optional)
         object_repr: String representation of the object
         changes: Dict of changes made (optional)
         ip_address: IP address of the user (optional)
+        strict: Write immediately and raise on failure (see inventory.audit)
+    
+    The entry is buffered and written after the transaction commits.
     """
+    from .audit import record_action
+
     try:
-        from .models import AuditLog
-        
-        # Create audit log entry
-        audit_log = AuditLog.objects.create(
-            user=user,
-            action=action,
-            model_name=model_name,
-            object_id=str(object_id),
-            object_repr=object_repr[:200],  # Limit length
-            changes=changes or {},
-            ip_address=ip_address or 'Unknown',
-            timestamp=timezone.now()
-        )
-        
-        # Log to file as well
-        logger.info(
-            f"User {user.username} performed {action} on {model_name} "
-            f"(ID: {object_id}) from IP {ip_address}"
+        audit_log = record_action(
+            user, action, model_name, object_id, object_repr,
+            changes=changes, ip_address=ip_address, strict=strict
         )
-        
-        return audit_log
-        
     except Exception as e:
+        if strict:
+            raise
         # Don't let logging failures break the main operation
         logger.error(f"Failed to log user activity: {e}")
         return None
 
+    logger.info(
+        f"User {user.username} performed {action} on {model_name} "
+        f"(ID: {object_id}) from IP {ip_address}"
+    )
+    return audit_log
+
 def validate_staff_business_rules(staff_data, instance=None):
     """
     Validate business rules for staff creation/updates.
@@ -747,6 +717,49 @@ def get_client_ip(request):
     except:
         return None
 
+@lru_cache(maxsize=8)
+def _proxy_networks(proxies):
+    networks = []
+    for proxy in proxies:
+        try:
+            networks.append(ipaddress.ip_network(proxy, strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid TRUSTED_PROXIES entry: {proxy!r}")
+    return networks
+
+def get_trusted_client_ip(request):
+    """
+    Client IP address for access control and rate limiting.
+
+    X-Forwarded-For is set by the client, so it is only honoured for requests
+    arriving from settings.TRUSTED_PROXIES (addresses or networks); the client
+    is then the right-most entry that was not added by a trusted proxy.
+    """
+    networks = _proxy_networks(tuple(getattr(settings, 'TRUSTED_PROXIES', ())))
+
+    def parse(value):
+        try:
+            return ipaddress.ip_address(value.strip())
+        except ValueError:
+            return None
+
+    def is_trusted(address):
+        return any(address in network for network in networks)
+
+    remote = parse(request.META.get('REMOTE_ADDR') or '')
+    if remote is None or not is_trusted(remote):
+        return str(remote) if remote else None
+
+    client = remote
+    for value in reversed(request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')):
+        address = parse(value)
+        if address is None:
+            break
+        client = address
+        if not is_trusted(address):
+            break
+    return str(client)
+
 # Device condition scoring
 CONDITION_SCORES = {
     'EXCELLENT': 5,
@@ -0,0 +1,119 @@
+# inventory/views/__init__.py - Inventory Views
+"""
+The inventory views, split into one module per feature so that a worker
+only imports the code, and the libraries, of the pages it actually serves.
+
+Views are still looked up by name on this package (``views.device_list``):
+the first lookup of a name imports the module that defines it (module
+__getattr__, PEP 562). urls.py wraps the lookups in LazyViewModule, so
+loading the URLconf imports none of the view modules.
+
+Heavy libraries are imported inside the views that need them: pandas by the
+CSV imports, qrcode by bulk QR generation and the lifecycle engine by the
+lifecycle and warranty reports. ``manage.py benchmark_startup`` reports the
+import time of each module.
+"""
+
+from importlib import import_module
+
+# View module -> names it provides
+VIEW_MODULES = {
+    'overview': [
+        'dashboard', 'ajax_dashboard_stats', 'ajax_notification_list',
+        'ajax_notification_mark_read', 'ajax_device_stats',
+    ],
+    'devices': [
+        'device_history', 'device_list', 'device_detail', 'device_create', 'device_edit',
+        'device_delete', 'device_type_detail', 'device_type_edit', 'device_type_delete',
+        'ajax_subcategories_by_category', 'ajax_device_types_by_subcategory',
+        'device_type_list', 'device_type_create',
+    ],
+    'assignments': [
+        'assignment_list', 'assignment_create', 'assignment_detail', 'assignment_edit',
+        'assignment_delete', 'assignment_return', 'assignment_transfer', 'assignment_extend',
+        'bulk_assignment_create', 'overdue_assignments_list', 'my_assignments',
+        'my_assignment_detail',
+    ],
+    'staff': [
+        'validate_staff_data', 'generate_employee_id_suggestion', 'ajax_generate_employee_id',
+        'ajax_check_employee_id', 'staff_list', 'staff_detail', 'staff_create', 'staff_edit',
+        'staff_delete', 'staff_assignments', 'department_list', 'department_detail',
+        'department_create', 'department_edit', 'department_assignments', 'department_delete',
+    ],
+    'locations': [
+        'location_list', 'location_detail', 'location_create', 'location_edit',
+        'location_delete', 'location_hierarchy_overview', 'building_list', 'building_detail',
+        'building_create', 'building_edit', 'building_delete', 'block_list', 'block_detail',
+        'block_create', 'block_edit', 'block_delete', 'floor_list', 'floor_detail',
+        'floor_create', 'floor_edit', 'floor_delete', 'room_list', 'room_detail', 'room_create',
+        'room_edit', 'room_delete', 'api_validate_hierarchy',
+    ],
+    'vendors': [
+        'vendor_list', 'vendor_detail', 'vendor_create', 'vendor_edit', 'vendor_delete',
+    ],
+    'maintenance': [
+        'maintenance_list', 'maintenance_create', 'maintenance_detail', 'maintenance_edit',
+        'maintenance_complete', 'maintenance_schedule', 'maintenance_calendar_api',
+        'maintenance_delete',
+    ],
+    'ajax': [
+        'get_device_info', 'quick_assign_device', 'search_suggestions',
+        'device_availability_check', 'get_staff_by_department', 'get_rooms_by_building',
+        'get_locations_by_room', 'ajax_staff_search', 'ajax_location_search',
+        'ajax_get_subcategories', 'ajax_get_device_types', 'ajax_device_quick_info',
+        'ajax_get_locations_by_room', 'ajax_assignment_quick_actions', 'ajax_get_blocks',
+        'ajax_get_floors', 'ajax_get_departments', 'ajax_get_rooms',
+    ],
+    'bulk': [
+        'bulk_device_update', 'bulk_assignment', 'bulk_qr_generate', 'bulk_assignment_return',
+        'bulk_actions', 'handle_bulk_device_assignment',
+    ],
+    'import_export': [
+        'bulk_import', 'bulk_export', 'import_template', 'export_devices_csv',
+        'export_assignments_csv', 'handle_bulk_export_dispatcher', 'export_selected_devices',
+        'export_selected_assignments', 'import_devices_csv', 'import_staff_csv',
+        'export_maintenance_csv',
+    ],
+    'reports': [
+        'inventory_summary_report', 'asset_utilization_report', 'device_lifecycle_report',
+        'warranty_management_report',
+    ],
+    'system': [
+        'system_statistics', 'audit_log_list', 'data_cleanup_tools',
+    ],
+    'qr': [
+        'generate_qr_codes_bulk', 'device_qr_code',
+    ],
+    'search': [
+        'advanced_search', 'global_search_api', 'AdvancedSearchForm', 'device_search',
+        'assignment_search', 'device_search_api', 'assignment_search_api',
+        'api_blocks_by_building', 'api_floors_by_block', 'api_floors_by_building',
+        'api_departments_by_floor', 'api_departments_by_building', 'api_departments_by_block',
+        'api_rooms_by_department', 'api_rooms_by_floor', 'api_rooms_by_building',
+        'api_locations_by_building', 'api_locations_by_department', 'api_location_search',
+        'api_hierarchy_stats', 'global_search',
+    ],
+    'backup': [
+        'DatabaseBackupForm', 'DatabaseRestoreForm', 'database_backup', 'database_restore',
+        'delete_backup',
+    ],
+    'common': [
+        'get_device_assignment_summary', 'get_warranty_alerts', 'get_overdue_assignments',
+        'get_device_status_distribution', 'get_assignment_trends', 'validate_date_field',
+        'get_recent_activities', 'AssignmentSearchForm', 'ReturnForm', 'TransferForm',
+        'DeviceTypeForm', 'DepartmentForm', 'MaintenanceForm', 'get_client_ip',
+    ],
+}
+
+_view_modules = {name: module for module, names in VIEW_MODULES.items() for name in names}
+
+
+def __getattr__(name):
+    module = _view_modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f'.{module}', __name__), name)
+
+
+def __dir__():
+    return sorted([*globals(), *_view_modules])
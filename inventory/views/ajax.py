@@ -0,0 +1,672 @@
+# inventory/views/ajax.py - AJAX Views
+"""AJAX and JSON endpoints used by the inventory pages."""
+
+# Django core imports
+from django.shortcuts import get_object_or_404
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+
+# Django contrib imports
+from django.contrib.auth.decorators import login_required
+
+# Django DB imports
+from django.db.models import Q
+
+# Python standard library imports
+from datetime import timedelta
+
+# Model imports
+from ..models import (
+    Device, Assignment, Staff, Department, Location, DeviceType, Room, Building, Block,
+    Floor,
+)
+
+# ================================
+# AJAX & API VIEWS
+# ================================
+
+@login_required
+@require_http_methods(["GET"])
+def get_device_info(request, device_id):
+    """Get device information via API"""
+    try:
+        device = get_object_or_404(Device, device_id=device_id)
+        current_assignment = device.assignments.filter(is_active=True).first()
+        
+        data = {
+            'device_id': device.device_id,
+            'asset_tag': device.asset_tag,
+            'device_name': device.device_name,
+            'status': device.status,
+            'status_display': device.get_status_display(),
+            'condition': device.condition,
+            'condition_display': device.get_condition_display(),
+            'brand': device.brand,
+            'model': device.model,
+            'serial_number': device.serial_number,
+            'category': device.device_type.subcategory.category.name if device.device_type else None,
+            'subcategory': device.device_type.subcategory.name if device.device_type else None,
+            'device_type': device.device_type.name if device.device_type else None,
+            'vendor': device.vendor.name if device.vendor else None,
+            'purchase_date': device.purchase_date.isoformat() if device.purchase_date else None,
+            'purchase_price': float(device.purchase_price) if device.purchase_price else None,
+            'warranty_end_date': device.warranty_end_date.isoformat() if device.warranty_end_date else None,
+            'current_assignment': {
+                'assignment_id': current_assignment.assignment_id if current_assignment else None,
+                'assigned_to_staff': str(current_assignment.assigned_to_staff) if current_assignment and current_assignment.assigned_to_staff else None,
+                'assigned_to_department': current_assignment.assigned_to_department.name if current_assignment and current_assignment.assigned_to_department else None,
+                'assigned_to_location': str(current_assignment.assigned_to_location) if current_assignment and current_assignment.assigned_to_location else None,
+                'start_date': current_assignment.start_date.isoformat() if current_assignment and current_assignment.start_date else None,
+                'is_temporary': current_assignment.is_temporary if current_assignment else False,
+                'expected_return_date': current_assignment.expected_return_date.isoformat() if current_assignment and current_assignment.expected_return_date else None,
+            } if current_assignment else None
+        }
+        
+        return JsonResponse(data)
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["POST"])
+def quick_assign_device(request):
+    """Quick assign device via API"""
+    try:
+        device_id = request.POST.get('device_id')
+        staff_id = request.POST.get('staff_id')
+        department_id = request.POST.get('department_id')
+        location_id = request.POST.get('location_id')
+        assignment_type = request.POST.get('assignment_type', 'permanent')
+        purpose = request.POST.get('purpose', '')
+        
+        if not device_id:
+            return JsonResponse({'error': 'Device ID is required'}, status=400)
+        
+        device = get_object_or_404(Device, device_id=device_id)
+        
+        # Check if device is already assigned
+        if device.assignments.filter(is_active=True).exists():
+            return JsonResponse({'error': 'Device is already assigned'}, status=400)
+        
+        # Get assignment targets
+        assigned_to_staff = None
+        assigned_to_department = None
+        assigned_to_location = None
+        
+        if staff_id:
+            assigned_to_staff = get_object_or_404(Staff, id=staff_id)
+        if department_id:
+            assigned_to_department = get_object_or_404(Department, id=department_id)
+        if location_id:
+            assigned_to_location = get_object_or_404(Location, id=location_id)
+        
+        if not any([assigned_to_staff, assigned_to_department, assigned_to_location]):
+            return JsonResponse({'error': 'At least one assignment target is required'}, status=400)
+        
+        # Create assignment
+        assignment = Assignment.objects.create(
+            device=device,
+            assigned_to_staff=assigned_to_staff,
+            assigned_to_department=assigned_to_department,
+            assigned_to_location=assigned_to_location,
+            is_temporary=(assignment_type == 'temporary'),
+            start_date=timezone.now().date(),
+            purpose=purpose,
+            created_by=request.user,
+            is_active=True
+        )
+        
+        # Update device status
+        device.status = 'ASSIGNED'
+        device.save()
+        
+        return JsonResponse({
+            'success': True,
+            'assignment_id': assignment.assignment_id,
+            'message': f'Device {device_id} assigned successfully'
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def search_suggestions(request):
+    """Get search suggestions via API"""
+    try:
+        query = request.GET.get('q', '').strip()
+        suggestion_type = request.GET.get('type', 'all')
+        
+        if len(query) < 2:
+            return JsonResponse({'suggestions': []})
+        
+        suggestions = []
+        
+        if suggestion_type in ['all', 'devices']:
+            # Device suggestions
+            devices = Device.objects.filter(
+                Q(device_id__icontains=query) |
+                Q(device_name__icontains=query) |
+                Q(asset_tag__icontains=query) |
+                Q(serial_number__icontains=query)
+            )[:10]
+            
+            for device in devices:
+                suggestions.append({
+                    'type': 'device',
+                    'id': device.device_id,
+                    'text': f"{device.device_id} - {device.device_name}",
+                    'category': 'Devices'
+                })
+        
+        if suggestion_type in ['all', 'staff']:
+            # Staff suggestions
+            staff = Staff.objects.filter(
+                Q(user__username__icontains=query) |
+                Q(user__first_name__icontains=query) |
+                Q(user__last_name__icontains=query) |
+                Q(employee_id__icontains=query)
+            )[:10]
+            
+            for s in staff:
+                suggestions.append({
+                    'type': 'staff',
+                    'id': s.id,
+                    'text': f"{s.user.get_full_name()} ({s.employee_id})",
+                    'category': 'Staff'
+                })
+        
+        if suggestion_type in ['all', 'departments']:
+            # Department suggestions
+            departments = Department.objects.filter(
+                name__icontains=query
+            )[:5]
+            
+            for dept in departments:
+                suggestions.append({
+                    'type': 'department',
+                    'id': dept.id,
+                    'text': dept.name,
+                    'category': 'Departments'
+                })
+        
+        return JsonResponse({'suggestions': suggestions})
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def device_availability_check(request):
+    """Check device availability via API"""
+    try:
+        device_id = request.GET.get('device_id')
+        
+        if not device_id:
+            return JsonResponse({'error': 'Device ID is required'}, status=400)
+        
+        try:
+            device = Device.objects.get(device_id=device_id)
+            current_assignment = device.assignments.filter(is_active=True).first()
+            
+            is_available = not current_assignment and device.status in ['ACTIVE', 'AVAILABLE']
+            
+            data = {
+                'device_id': device_id,
+                'is_available': is_available,
+                'status': device.status,
+                'status_display': device.get_status_display(),
+                'current_assignment': {
+                    'assignment_id': current_assignment.assignment_id,
+                    'assigned_to': str(current_assignment.assigned_to_staff) if current_assignment.assigned_to_staff else str(current_assignment.assigned_to_department),
+                    'start_date': current_assignment.start_date.isoformat()
+                } if current_assignment else None
+            }
+            
+            return JsonResponse(data)
+            
+        except Device.DoesNotExist:
+            return JsonResponse({
+                'device_id': device_id,
+                'is_available': False,
+                'error': 'Device not found'
+            })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def get_staff_by_department(request, department_id):
+    """Get staff members by department via API"""
+    try:
+        department = get_object_or_404(Department, id=department_id)
+        staff = Staff.objects.filter(
+            department=department, is_active=True
+        ).select_related('user')
+        
+        staff_data = []
+        for s in staff:
+            staff_data.append({
+                'id': s.id,
+                'name': s.user.get_full_name(),
+                'username': s.user.username,
+                'employee_id': s.employee_id,
+                'position': s.position,
+                'email': s.user.email,
+            })
+        
+        return JsonResponse({
+            'department': department.name,
+            'staff': staff_data
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def get_rooms_by_building(request, building_id):
+    """Get rooms by building via API"""
+    try:
+        building = get_object_or_404(Building, id=building_id)
+        rooms = Room.objects.filter(building=building, is_active=True)
+        
+        rooms_data = []
+        for room in rooms:
+            rooms_data.append({
+                'id': room.id,
+                'name': room.name,
+                'room_number': room.room_number,
+                'floor': room.floor,
+                'capacity': room.capacity,
+            })
+        
+        return JsonResponse({
+            'building': building.name,
+            'rooms': rooms_data
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def get_locations_by_room(request, room_id):
+    """Get locations by room via API"""
+    try:
+        room = get_object_or_404(Room, id=room_id)
+        locations = Location.objects.filter(room=room, is_active=True)
+        
+        locations_data = []
+        for location in locations:
+            locations_data.append({
+                'id': location.id,
+                'name': location.name,
+                'location_type': location.location_type,
+                'location_type_display': location.get_location_type_display(),
+                'description': location.description,
+            })
+        
+        return JsonResponse({
+            'room': str(room),
+            'locations': locations_data
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+# ================================
+# AJAX VIEWS  
+# ================================
+
+@login_required
+@require_http_methods(["GET"])
+def ajax_staff_search(request):
+    """AJAX: Search staff members for assignments and forms"""
+    try:
+        query = request.GET.get('q', '').strip()
+        department_id = request.GET.get('department_id')
+        limit = int(request.GET.get('limit', 20))
+        
+        if not query and not department_id:
+            return JsonResponse({'staff': []})
+        
+        # Start with active staff
+        staff_members = Staff.objects.filter(is_active=True).select_related(
+            'user', 'department'
+        )
+        
+        # Apply text search if query provided
+        if query:
+            staff_members = staff_members.filter(
+                Q(user__first_name__icontains=query) |
+                Q(user__last_name__icontains=query) |
+                Q(user__username__icontains=query) |
+                Q(employee_id__icontains=query) |
+                Q(department__name__icontains=query) |
+                Q(user__email__icontains=query)
+            )
+        
+        # Filter by department if specified
+        if department_id:
+            staff_members = staff_members.filter(department_id=department_id)
+        
+        # Limit results
+        staff_members = staff_members[:limit]
+        
+        # Prepare response data
+        staff_data = []
+        for staff in staff_members:
+            staff_data.append({
+                'id': staff.id,
+                'employee_id': staff.employee_id,
+                'full_name': staff.get_full_name(),
+                'first_name': staff.user.first_name,
+                'last_name': staff.user.last_name,
+                'username': staff.user.username,
+                'email': staff.user.email,
+                'department': {
+                    'id': staff.department.id if staff.department else None,
+                    'name': staff.department.name if staff.department else None
+                },
+                'display_text': f"{staff.get_full_name()} ({staff.employee_id}) - {staff.department.name if staff.department else 'No Department'}"
+            })
+        
+        return JsonResponse({
+            'staff': staff_data,
+            'count': len(staff_data),
+            'query': query
+        })
+        
+    except ValueError as e:
+        return JsonResponse({'error': 'Invalid limit parameter'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def ajax_location_search(request):
+    """AJAX: Search locations for assignments and forms"""
+    try:
+        query = request.GET.get('q', '').strip()
+        room_id = request.GET.get('room_id')
+        building_id = request.GET.get('building_id')
+        department_id = request.GET.get('department_id')
+        limit = int(request.GET.get('limit', 20))
+        
+        if not query and not room_id and not building_id and not department_id:
+            return JsonResponse({'locations': []})
+        
+        # Start with active locations
+        locations = Location.objects.filter(is_active=True).select_related(
+            'room', 'room__building', 'room__department'
+        )
+        
+        # Apply text search if query provided
+        if query:
+            locations = locations.filter(
+                Q(name__icontains=query) |
+                Q(description__icontains=query) |
+                Q(room__name__icontains=query) |
+                Q(room__building__name__icontains=query) |
+                Q(room__department__name__icontains=query)
+            )
+        
+        # Filter by room if specified
+        if room_id:
+            locations = locations.filter(room_id=room_id)
+        
+        # Filter by building if specified
+        if building_id:
+            locations = locations.filter(room__building_id=building_id)
+        
+        # Filter by department if specified
+        if department_id:
+            locations = locations.filter(room__department_id=department_id)
+        
+        # Limit results
+        locations = locations[:limit]
+        
+        # Prepare response data
+        location_data = []
+        for location in locations:
+            # Generate display text
+            display_parts = [location.name]
+            if location.room:
+                display_parts.append(location.room.name)
+                if location.room.building:
+                    display_parts.append(location.room.building.name)
+                if location.room.department:
+                    display_parts.append(location.room.department.name)
+            display_text = " - ".join(display_parts)
+            
+            location_data.append({
+                'id': location.id,
+                'name': location.name,
+                'description': location.description,
+                'room': {
+                    'id': location.room.id if location.room else None,
+                    'name': location.room.name if location.room else None,
+                    'building': {
+                        'id': location.room.building.id if location.room and location.room.building else None,
+                        'name': location.room.building.name if location.room and location.room.building else None
+                    } if location.room else None,
+                    'department': {
+                        'id': location.room.department.id if location.room and location.room.department else None,
+                        'name': location.room.department.name if location.room and location.room.department else None
+                    } if location.room else None
+                } if location.room else None,
+                'display_text': display_text
+            })
+        
+        return JsonResponse({
+            'locations': location_data,
+            'count': len(location_data),
+            'query': query
+        })
+        
+    except ValueError as e:
+        return JsonResponse({'error': 'Invalid limit parameter'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+@login_required
+@require_http_methods(["GET"])
+def ajax_get_subcategories(request):
+    """AJAX: Get subcategories for category"""
+    try:
+        category_id = request.GET.get('category_id')
+        if category_id:
+            from ..models import DeviceSubCategory
+            subcategories = DeviceSubCategory.objects.filter(
+                category_id=category_id, is_active=True
+            ).values('id', 'name')
+            return JsonResponse({'subcategories': list(subcategories)})
+        return JsonResponse({'subcategories': []})
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def ajax_get_device_types(request):
+    """AJAX: Get device types for subcategory"""
+    try:
+        subcategory_id = request.GET.get('subcategory_id')
+        if subcategory_id:
+            device_types = DeviceType.objects.filter(
+                subcategory_id=subcategory_id, is_active=True
+            ).values('id', 'name')
+            return JsonResponse({'device_types': list(device_types)})
+        return JsonResponse({'device_types': []})
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def ajax_device_quick_info(request, device_id):
+    """AJAX: Get quick device info"""
+    try:
+        device = get_object_or_404(Device, device_id=device_id)
+        data = {
+            'device_id': device.device_id,
+            'device_name': device.device_name,
+            'status': device.status,
+            'brand': device.brand,
+            'model': device.model,
+        }
+        return JsonResponse(data)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@require_http_methods(["GET"])
+def ajax_get_locations_by_room(request):
+    """AJAX: Get locations by room"""
+    try:
+        room_id = request.GET.get('room_id')
+        if room_id:
+            locations = Location.objects.filter(
+                room_id=room_id, is_active=True
+            ).values('id', 'name')
+            return JsonResponse({'locations': list(locations)})
+        return JsonResponse({'locations': []})
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["POST"])
+def ajax_assignment_quick_actions(request, assignment_id):
+    """AJAX: Assignment quick actions (return, extend, transfer)"""
+    try:
+        assignment = get_object_or_404(Assignment, assignment_id=assignment_id)
+        action = request.POST.get('action')
+        
+        if action == 'return':
+            assignment.is_active = False
+            assignment.actual_return_date = timezone.now().date()
+            assignment.save()
+            
+            # Update device status to available
+            if assignment.device:
+                assignment.device.status = 'available'
+                assignment.device.save()
+            
+            return JsonResponse({
+                'success': True, 
+                'message': 'Device returned successfully',
+                'action': 'return',
+                'assignment_id': assignment_id
+            })
+        
+        elif action == 'extend':
+            days_to_extend = int(request.POST.get('days', 30))
+            if assignment.expected_return_date:
+                assignment.expected_return_date = assignment.expected_return_date + timedelta(days=days_to_extend)
+            else:
+                assignment.expected_return_date = timezone.now().date() + timedelta(days=days_to_extend)
+            assignment.save()
+            
+            return JsonResponse({
+                'success': True, 
+                'message': f'Assignment extended by {days_to_extend} days',
+                'action': 'extend',
+                'new_return_date': assignment.expected_return_date.isoformat(),
+                'assignment_id': assignment_id
+            })
+        
+        elif action == 'transfer':
+            new_staff_id = request.POST.get('new_staff_id')
+            new_department_id = request.POST.get('new_department_id')
+            new_location_id = request.POST.get('new_location_id')
+            
+            if new_staff_id:
+                assignment.assigned_to_staff_id = new_staff_id
+            if new_department_id:
+                assignment.assigned_to_department_id = new_department_id
+            if new_location_id:
+                assignment.assigned_to_location_id = new_location_id
+            
+            assignment.save()
+            
+            return JsonResponse({
+                'success': True, 
+                'message': 'Assignment transferred successfully',
+                'action': 'transfer',
+                'assignment_id': assignment_id
+            })
+        
+        return JsonResponse({'error': 'Invalid action'}, status=400)
+
+    except ValueError as e:
+        return JsonResponse({'error': 'Invalid input data'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+@login_required
+def ajax_get_blocks(request):
+    """AJAX endpoint to get blocks for a building"""
+    building_id = request.GET.get('building_id')
+    
+    if building_id:
+        blocks = Block.objects.filter(
+            building_id=building_id,
+            is_active=True
+        ).order_by('name').values('id', 'name', 'code')
+        
+        return JsonResponse({
+            'blocks': list(blocks)
+        })
+    
+    return JsonResponse({'blocks': []})
+
+@login_required
+def ajax_get_floors(request):
+    """AJAX endpoint to get floors for a block"""
+    block_id = request.GET.get('block_id')
+    
+    if block_id:
+        floors = Floor.objects.filter(
+            block_id=block_id,
+            is_active=True
+        ).order_by('floor_number').values('id', 'name', 'floor_number')
+        
+        return JsonResponse({
+            'floors': list(floors)
+        })
+    
+    return JsonResponse({'floors': []})
+
+@login_required
+def ajax_get_departments(request):
+    """AJAX endpoint to get departments for a floor"""
+    floor_id = request.GET.get('floor_id')
+    
+    if floor_id:
+        departments = Department.objects.filter(
+            floor_id=floor_id,
+            is_active=True
+        ).order_by('name').values('id', 'name', 'code')
+        
+        return JsonResponse({
+            'departments': list(departments)
+        })
+    
+    return JsonResponse({'departments': []})
+
+@login_required
+def ajax_get_rooms(request):
+    """AJAX endpoint to get rooms for a department"""
+    department_id = request.GET.get('department_id')
+    
+    if department_id:
+        rooms = Room.objects.filter(
+            department_id=department_id,
+            is_active=True
+        ).order_by('room_number').values('id', 'room_number', 'room_name')
+        
+        return JsonResponse({
+            'rooms': list(rooms)
+        })
+    
+    return JsonResponse({'rooms': []})
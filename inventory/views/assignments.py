@@ -0,0 +1,887 @@
+# inventory/views/assignments.py - Assignment Views
+"""Device assignments, returns, transfers and the user's own assignments."""
+
+# Django core imports
+from django.shortcuts import render, get_object_or_404, redirect
+from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django.core.paginator import Paginator
+from django.core.exceptions import ValidationError
+from ..audit import record_action
+from bps_inventory.instrumentation import query_budget
+from bps_inventory.pagination import paginate_keyset
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+
+# Django DB imports
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+# Python standard library imports
+from datetime import timedelta, datetime
+
+# Model imports
+from ..models import Device, Assignment, Staff, AssignmentHistory
+from ..forms import AssignmentForm, BulkAssignmentForm
+
+# View package imports
+from .common import (
+    validate_date_field, AssignmentSearchForm, ReturnForm, TransferForm, get_client_ip,
+)
+
+# ================================
+# ASSIGNMENT MANAGEMENT VIEWS
+# ================================
+
+@login_required
+@query_budget(max_queries=20, max_duplicates=4)
+def assignment_list(request):
+    """List all assignments with search and filtering"""
+    form = AssignmentSearchForm(request.GET)
+    assignments = Assignment.objects.select_related(
+        'device__device_type',
+        'device__location__building',
+        'device__location__block',
+        'assigned_to_staff__user',
+        'assigned_to_staff__department',
+        'assigned_to_department',
+        'assigned_to_location__building',
+        'assigned_to_location__block',
+        'created_by'
+    )
+    
+    # Apply filters
+    if form.is_valid():
+        search_query = form.cleaned_data.get('search_query')
+        if search_query:
+            assignments = assignments.filter(
+                Q(device__device_id__icontains=search_query) |
+                Q(device__device_name__icontains=search_query) |
+                Q(assigned_to_staff__user__first_name__icontains=search_query) |
+                Q(assigned_to_staff__user__last_name__icontains=search_query) |
+                Q(assigned_to_staff__employee_id__icontains=search_query) |
+                Q(assigned_to_department__name__icontains=search_query) |
+                Q(purpose__icontains=search_query)
+            )
+        
+        assignment_type = form.cleaned_data.get('assignment_type')
+        if assignment_type:
+            assignments = assignments.filter(assignment_type=assignment_type)
+        
+        staff = form.cleaned_data.get('staff')
+        if staff:
+            assignments = assignments.filter(assigned_to_staff=staff)
+        
+        department = form.cleaned_data.get('department')
+        if department:
+            assignments = assignments.filter(
+                Q(assigned_to_department=department) |
+                Q(assigned_to_staff__department=department)
+            )
+        
+        date_from = form.cleaned_data.get('date_from')
+        if date_from:
+            assignments = assignments.filter(start_date__gte=date_from)
+        
+        date_to = form.cleaned_data.get('date_to')
+        if date_to:
+            assignments = assignments.filter(start_date__lte=date_to)
+    
+    # Keyset pagination, newest first
+    page_obj = paginate_keyset(request, assignments, ('-created_at', '-assignment_id'), per_page=25)
+    
+    # Statistics, in one pass
+    stats = Assignment.objects.aggregate(
+        total_assignments=Count('assignment_id'),
+        active_assignments=Count('assignment_id', filter=Q(is_active=True)),
+        overdue_assignments=Count('assignment_id', filter=Q(
+            is_active=True, expected_return_date__lt=timezone.now().date()
+        )),
+        unique_devices_count=Count('device', distinct=True),
+    )
+    
+    context = {
+        'assignments': page_obj,
+        'page_obj': page_obj,
+        'form': form,
+        **stats,
+    }
+    
+    return render(request, 'inventory/assignments/assignment_list.html', context)
+
+@login_required
+def assignment_create(request):
+    """Create a new assignment"""
+    if request.method == 'POST':
+        form = AssignmentForm(request.POST)
+        if form.is_valid():
+            try:
+                with transaction.atomic():
+                    assignment = form.save(commit=False)
+                    assignment.created_by = request.user
+                    assignment.start_date = timezone.now().date()
+                    assignment.save()
+                    
+                    # Update device status
+                    device = assignment.device
+                    device.status = 'ASSIGNED'
+                    device.save()
+                    
+                    # Create assignment history entry
+                    AssignmentHistory.objects.create(
+                        assignment=assignment,
+                        changed_by=request.user,
+                        change_type='CREATED',
+                        new_values={
+                            'device': device.device_id,
+                            'assigned_to_staff': str(assignment.assigned_to_staff) if assignment.assigned_to_staff else None,
+                            'assigned_to_department': str(assignment.assigned_to_department) if assignment.assigned_to_department else None,
+                            'assigned_to_location': str(assignment.assigned_to_location) if assignment.assigned_to_location else None,
+                            'assignment_type': assignment.assignment_type,
+                            'purpose': assignment.purpose,
+                        },
+                        reason='New assignment created',
+                        ip_address=get_client_ip(request),
+                        user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
+                    )
+                    
+                    # Determine assignment target for message
+                    target = (
+                        assignment.assigned_to_staff or 
+                        assignment.assigned_to_department or 
+                        assignment.assigned_to_location
+                    )
+                    
+                    messages.success(
+                        request, 
+                        f'Assignment created successfully! Device {device.device_id} assigned to {target}.'
+                    )
+                    return redirect('inventory:assignment_detail', pk=assignment.pk)
+                    
+            except ValidationError as e:
+                messages.error(request, f'Assignment creation failed: {e.message}')
+            except Exception as e:
+                messages.error(request, f'An error occurred: {str(e)}')
+    else:
+        # Pre-populate device if specified in URL
+        device_id = request.GET.get('device')
+        initial_data = {}
+        if device_id:
+            try:
+                device = Device.objects.get(pk=device_id, status='AVAILABLE')
+                initial_data['device'] = device
+            except Device.DoesNotExist:
+                messages.warning(request, 'Selected device is not available for assignment.')
+        
+        form = AssignmentForm(initial=initial_data)
+    
+    context = {
+        'form': form,
+        'title': 'Create Assignment',
+        'available_devices': Device.objects.filter(status='AVAILABLE').count(),
+        'active_staff': Staff.objects.filter(is_active=True).count(),
+    }
+    
+    return render(request, 'inventory/assignments/assignment_form.html', context)
+
+@login_required
+def assignment_detail(request, pk):
+    """View assignment details"""
+    assignment = get_object_or_404(
+        Assignment.objects.select_related(
+            'device__device_type',
+            'device__current_location__building',
+            'device__current_location__block',
+            'assigned_to_staff__user',
+            'assigned_to_staff__department',
+            'assigned_to_department',
+            'assigned_to_location__building',
+            'assigned_to_location__block',
+            'created_by'
+        ).prefetch_related(
+            'assignment_history__changed_by'
+        ),
+        pk=pk
+    )
+    
+    # Get assignment history
+    history = assignment.assignment_history.select_related('changed_by').order_by('-timestamp')[:10]
+    
+    # Check if assignment is overdue
+    is_overdue = assignment.is_overdue
+    days_until_due = assignment.days_until_due
+    
+    context = {
+        'assignment': assignment,
+        'history': history,
+        'is_overdue': is_overdue,
+        'days_until_due': days_until_due,
+        'can_edit': request.user.has_perm('inventory.change_assignment'),
+        'can_return': assignment.is_active and request.user.has_perm('inventory.change_assignment'),
+    }
+    
+    return render(request, 'inventory/assignments/assignment_detail.html', context)
+
+@login_required
+def assignment_edit(request, pk):
+    """Edit an existing assignment"""
+    assignment = get_object_or_404(Assignment, pk=pk)
+    
+    # Check permissions
+    if not request.user.has_perm('inventory.change_assignment'):
+        messages.error(request, 'You do not have permission to edit assignments.')
+        return redirect('inventory:assignment_detail', pk=assignment.pk)
+    
+    if request.method == 'POST':
+        # Store old values for history
+        old_values = {
+            'assigned_to_staff': str(assignment.assigned_to_staff) if assignment.assigned_to_staff else None,
+            'assigned_to_department': str(assignment.assigned_to_department) if assignment.assigned_to_department else None,
+            'assigned_to_location': str(assignment.assigned_to_location) if assignment.assigned_to_location else None,
+            'assignment_type': assignment.assignment_type,
+            'purpose': assignment.purpose,
+            'expected_return_date': str(assignment.expected_return_date) if assignment.expected_return_date else None,
+        }
+        
+        form = AssignmentForm(request.POST, instance=assignment)
+        if form.is_valid():
+            try:
+                with transaction.atomic():
+                    updated_assignment = form.save()
+                    
+                    # Create history entry
+                    new_values = {
+                        'assigned_to_staff': str(updated_assignment.assigned_to_staff) if updated_assignment.assigned_to_staff else None,
+                        'assigned_to_department': str(updated_assignment.assigned_to_department) if updated_assignment.assigned_to_department else None,
+                        'assigned_to_location': str(updated_assignment.assigned_to_location) if updated_assignment.assigned_to_location else None,
+                        'assignment_type': updated_assignment.assignment_type,
+                        'purpose': updated_assignment.purpose,
+                        'expected_return_date': str(updated_assignment.expected_return_date) if updated_assignment.expected_return_date else None,
+                    }
+                    
+                    AssignmentHistory.objects.create(
+                        assignment=updated_assignment,
+                        changed_by=request.user,
+                        change_type='MODIFIED',
+                        old_values=old_values,
+                        new_values=new_values,
+                        reason='Assignment updated',
+                        ip_address=get_client_ip(request),
+                        user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
+                    )
+                    
+                    messages.success(request, 'Assignment updated successfully!')
+                    return redirect('inventory:assignment_detail', pk=assignment.pk)
+                    
+            except ValidationError as e:
+                messages.error(request, f'Assignment update failed: {e.message}')
+            except Exception as e:
+                messages.error(request, f'An error occurred: {str(e)}')
+    else:
+        form = AssignmentForm(instance=assignment)
+    
+    context = {
+        'form': form,
+        'assignment': assignment,
+        'title': 'Edit Assignment',
+    }
+    
+    return render(request, 'inventory/assignments/assignment_form.html', context)
+@login_required
+@permission_required('inventory.delete_assignment', raise_exception=True)
+def assignment_delete(request, pk):
+    """Delete an assignment with confirmation"""
+    try:
+        assignment = get_object_or_404(
+            Assignment.objects.select_related(
+                'device__device_type',
+                'assigned_to_staff__user',
+                'assigned_to_staff__department',
+                'assigned_to_department',
+                'assigned_to_location__building',
+                'assigned_to_location__block',
+                'created_by'
+            ),
+            pk=pk
+        )
+        
+        # Check if user has permission to delete this specific assignment
+        # Allow deletion if user created it or has admin privileges
+        if not (request.user == assignment.created_by or 
+                request.user.has_perm('inventory.delete_assignment') or
+                request.user.is_superuser):
+            messages.error(request, 'You do not have permission to delete this assignment.')
+            return redirect('inventory:assignment_detail', pk=pk)
+        
+        # Store assignment details for logging before deletion
+        assignment_details = {
+            'assignment_id': str(assignment.pk),
+            'device_id': assignment.device.device_id,
+            'device_name': assignment.device.device_name,
+            'assigned_to_staff': str(assignment.assigned_to_staff) if assignment.assigned_to_staff else None,
+            'assigned_to_department': str(assignment.assigned_to_department) if assignment.assigned_to_department else None,
+            'assigned_to_location': str(assignment.assigned_to_location) if assignment.assigned_to_location else None,
+            'assignment_type': assignment.assignment_type,
+            'purpose': assignment.purpose,
+            'created_at': assignment.created_at.isoformat() if hasattr(assignment, 'created_at') else None,
+            'deleted_by': request.user.username,
+            'deleted_at': timezone.now().isoformat()
+        }
+        
+        if request.method == 'POST':
+            # Get deletion confirmation and reason
+            confirm_delete = request.POST.get('confirm_delete')
+            deletion_reason = request.POST.get('deletion_reason', '').strip()
+            
+            if confirm_delete == 'yes':
+                try:
+                    with transaction.atomic():
+                        # Store device reference before deletion
+                        device = assignment.device
+                        
+                        # Create assignment history entry for deletion
+                        try:
+                            AssignmentHistory.objects.create(
+                                assignment=assignment,
+                                changed_by=request.user,
+                                change_type='CANCELLED',
+                                old_values=assignment_details,
+                                new_values={'status': 'DELETED'},
+                                reason=f'Assignment deleted: {deletion_reason}' if deletion_reason else 'Assignment deleted',
+                                notes=f'Assignment permanently deleted by {request.user.get_full_name() or request.user.username}',
+                                ip_address=get_client_ip(request),
+                                user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
+                            )
+                        except Exception as history_error:
+                            # Log history creation error but don't fail the deletion
+                            print(f"Warning: Could not create assignment history: {history_error}")
+                        
+                        # Update device status back to available if this was an active assignment
+                        if assignment.is_active:
+                            device.status = 'AVAILABLE'
+                            device.save()
+                        
+                        # Create audit log entry
+                        try:
+                            record_action(
+                                user=request.user,
+                                action='DELETE',
+                                model_name='Assignment',
+                                object_id=str(assignment.pk),
+                                object_repr=f'Assignment {assignment.pk} - {assignment.device.device_name}',
+                                changes=assignment_details,
+                                ip_address=get_client_ip(request)
+                            )
+                        except Exception as audit_error:
+                            # Log audit creation error but don't fail the deletion
+                            print(f"Warning: Could not create audit log: {audit_error}")
+                        
+                        # Delete the assignment
+                        assignment.delete()
+                        
+                        # Success message with details
+                        target = (
+                            assignment_details['assigned_to_staff'] or 
+                            assignment_details['assigned_to_department'] or 
+                            assignment_details['assigned_to_location'] or
+                            'Unknown'
+                        )
+                        
+                        messages.success(
+                            request, 
+                            f'Assignment deleted successfully! Device {device.device_id} '
+                            f'(previously assigned to {target}) is now available for reassignment.'
+                        )
+                        
+                        # Redirect to appropriate view
+                        redirect_to = request.GET.get('next')
+                        if redirect_to in ['assignment_list', 'device_detail', 'staff_detail']:
+                            if redirect_to == 'device_detail':
+                                return redirect('inventory:device_detail', device_id=device.device_id)
+                            elif redirect_to == 'staff_detail' and assignment_details['assigned_to_staff']:
+                                # Extract staff ID if available
+                                try:
+                                    staff = Staff.objects.get(user__username=assignment_details['assigned_to_staff'])
+                                    return redirect('inventory:staff_detail', staff_id=staff.employee_id)
+                                except (Staff.DoesNotExist, KeyError):
+                                    pass
+                            return redirect('inventory:assignment_list')
+                        else:
+                            return redirect('inventory:assignment_list')
+                        
+                except Exception as e:
+                    messages.error(request, f'Error deleting assignment: {str(e)}')
+                    return redirect('inventory:assignment_detail', pk=pk)
+            else:
+                messages.info(request, 'Assignment deletion cancelled.')
+                return redirect('inventory:assignment_detail', pk=pk)
+        
+        # GET request - show confirmation page
+        context = {
+            'assignment': assignment,
+            'assignment_details': assignment_details,
+            'title': f'Delete Assignment - {assignment.device.device_name}',
+            'can_delete': True,
+            'warning_message': 'This action cannot be undone. The assignment will be permanently deleted.',
+            'device_will_be_available': assignment.is_active,
+        }
+        
+        return render(request, 'inventory/assignments/assignment_delete.html', context)
+        
+    except Assignment.DoesNotExist:
+        messages.error(request, 'Assignment not found.')
+        return redirect('inventory:assignment_list')
+        
+    except Exception as e:
+        messages.error(request, f'Error accessing assignment: {str(e)}')
+        return redirect('inventory:assignment_list')
+
+@login_required
+@require_http_methods(["POST"])
+def assignment_return(request, pk):
+    """Return a device from assignment"""
+    assignment = get_object_or_404(Assignment, pk=pk, is_active=True)
+    
+    # Check permissions
+    if not request.user.has_perm('inventory.change_assignment'):
+        messages.error(request, 'You do not have permission to return assignments.')
+        return redirect('inventory:assignment_detail', pk=assignment.pk)
+    
+    form = ReturnForm(request.POST)
+    if form.is_valid():
+        try:
+            with transaction.atomic():
+                # Update assignment
+                assignment.actual_return_date = form.cleaned_data['return_date']
+                assignment.is_active = False
+                assignment.save()
+                
+                # Update device
+                device = assignment.device
+                device.status = 'AVAILABLE'
+                
+                # Update device condition if specified
+                device_condition = form.cleaned_data.get('device_condition')
+                if device_condition:
+                    device.condition = device_condition
+                
+                device.save()
+                
+                # Create history entry
+                AssignmentHistory.objects.create(
+                    assignment=assignment,
+                    changed_by=request.user,
+                    change_type='RETURNED',
+                    new_values={
+                        'return_date': str(form.cleaned_data['return_date']),
+                        'return_condition': form.cleaned_data.get('return_condition', ''),
+                        'return_notes': form.cleaned_data.get('return_notes', ''),
+                        'device_condition': device_condition or device.condition,
+                    },
+                    reason='Device returned',
+                    notes=form.cleaned_data.get('return_notes', ''),
+                    ip_address=get_client_ip(request),
+                    user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
+                )
+                
+                messages.success(
+                    request, 
+                    f'Device {device.device_id} returned successfully!'
+                )
+                return redirect('inventory:assignment_detail', pk=assignment.pk)
+                
+        except Exception as e:
+            messages.error(request, f'Return failed: {str(e)}')
+    else:
+        for field, errors in form.errors.items():
+            for error in errors:
+                messages.error(request, f'{field}: {error}')
+    
+    return redirect('inventory:assignment_detail', pk=assignment.pk)
+
+@login_required
+@require_http_methods(["POST"])
+def assignment_transfer(request, pk):
+    """Transfer an assignment to a different target"""
+    assignment = get_object_or_404(Assignment, pk=pk, is_active=True)
+    
+    # Check permissions
+    if not request.user.has_perm('inventory.change_assignment'):
+        messages.error(request, 'You do not have permission to transfer assignments.')
+        return redirect('inventory:assignment_detail', pk=assignment.pk)
+    
+    form = TransferForm(request.POST)
+    if form.is_valid():
+        try:
+            with transaction.atomic():
+                # Store old assignment details
+                old_values = {
+                    'assigned_to_staff': str(assignment.assigned_to_staff) if assignment.assigned_to_staff else None,
+                    'assigned_to_department': str(assignment.assigned_to_department) if assignment.assigned_to_department else None,
+                    'assigned_to_location': str(assignment.assigned_to_location) if assignment.assigned_to_location else None,
+                }
+                
+                # Update assignment
+                assignment.assigned_to_staff = form.cleaned_data.get('new_assigned_to_staff')
+                assignment.assigned_to_department = form.cleaned_data.get('new_assigned_to_department')
+                assignment.assigned_to_location = form.cleaned_data.get('new_assigned_to_location')
+                assignment.save()
+                
+                # Create history entry
+                new_values = {
+                    'assigned_to_staff': str(assignment.assigned_to_staff) if assignment.assigned_to_staff else None,
+                    'assigned_to_department': str(assignment.assigned_to_department) if assignment.assigned_to_department else None,
+                    'assigned_to_location': str(assignment.assigned_to_location) if assignment.assigned_to_location else None,
+                }
+                
+                AssignmentHistory.objects.create(
+                    assignment=assignment,
+                    changed_by=request.user,
+                    change_type='TRANSFERRED',
+                    old_values=old_values,
+                    new_values=new_values,
+                    reason=form.cleaned_data.get('transfer_reason', 'Assignment transferred'),
+                    notes=form.cleaned_data.get('conditions', ''),
+                    ip_address=get_client_ip(request),
+                    user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
+                )
+                
+                # Determine new assignment target for message
+                new_target = (
+                    assignment.assigned_to_staff or 
+                    assignment.assigned_to_department or 
+                    assignment.assigned_to_location
+                )
+                
+                messages.success(
+                    request, 
+                    f'Assignment transferred successfully to {new_target}!'
+                )
+                return redirect('inventory:assignment_detail', pk=assignment.pk)
+                
+        except Exception as e:
+            messages.error(request, f'Transfer failed: {str(e)}')
+    else:
+        for field, errors in form.errors.items():
+            for error in errors:
+                messages.error(request, f'{field}: {error}')
+    
+    return redirect('inventory:assignment_detail', pk=assignment.pk)
+
+@login_required
+@permission_required('inventory.change_assignment', raise_exception=True)
+def assignment_extend(request, assignment_id):
+    """Extend assignment return date"""
+    try:
+        assignment = get_object_or_404(Assignment, assignment_id=assignment_id, is_active=True, is_temporary=True)
+        
+        if request.method == 'POST':
+            new_return_date = request.POST.get('new_return_date')
+            extension_reason = request.POST.get('extension_reason', '')
+            
+            if new_return_date:
+                try:
+                    new_date = datetime.strptime(new_return_date, '%Y-%m-%d').date()
+                    
+                    if new_date <= assignment.expected_return_date:
+                        messages.error(request, 'New return date must be after the current expected return date.')
+                    else:
+                        with transaction.atomic():
+                            old_date = assignment.expected_return_date
+                            assignment.expected_return_date = new_date
+                            assignment.notes = f"{assignment.notes}\n\nExtended on {timezone.now().date()}: {extension_reason}".strip()
+                            assignment.updated_by = request.user
+                            assignment.save()
+                            
+                            # Create audit log
+                            record_action(
+                                user=request.user,
+                                action='EXTEND',
+                                model_name='Assignment',
+                                object_id=assignment.assignment_id,
+                                object_repr=str(assignment),
+                                changes={
+                                    'old_return_date': str(old_date),
+                                    'new_return_date': str(new_date),
+                                    'reason': extension_reason
+                                },
+                                ip_address=request.META.get('REMOTE_ADDR')
+                            )
+                            
+                            messages.success(request, f'Assignment return date extended to {new_date.strftime("%B %d, %Y")}.')
+                            return redirect('inventory:assignment_detail', assignment_id=assignment.assignment_id)
+                            
+                except ValueError:
+                    messages.error(request, 'Invalid date format.')
+                except Exception as e:
+                    messages.error(request, f'Error extending assignment: {str(e)}')
+            else:
+                messages.error(request, 'Please provide a new return date.')
+        
+        context = {
+            'assignment': assignment,
+        }
+        return render(request, 'inventory/assignments/assignment_extend.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading assignment: {str(e)}")
+        return redirect('inventory:assignment_list')
+
+@login_required
+@permission_required('inventory.add_assignment', raise_exception=True)
+def bulk_assignment_create(request):
+    """Create multiple assignments at once"""
+    if request.method == 'POST':
+        form = BulkAssignmentForm(request.POST)
+        if form.is_valid():
+            try:
+                with transaction.atomic():
+                    devices = form.cleaned_data['devices']
+                    staff_member = form.cleaned_data.get('assigned_to_staff')
+                    department = form.cleaned_data.get('assigned_to_department')
+                    location = form.cleaned_data.get('assigned_to_location')
+                    
+                    created_assignments = []
+                    for device in devices:
+                        if device.status == 'AVAILABLE':
+                            assignment = Assignment.objects.create(
+                                device=device,
+                                assigned_to_staff=staff_member,
+                                assigned_to_department=department,
+                                assigned_to_location=location,
+                                is_temporary=form.cleaned_data['is_temporary'],
+                                expected_return_date=form.cleaned_data.get('expected_return_date'),
+                                purpose=form.cleaned_data.get('purpose', ''),
+                                conditions=form.cleaned_data.get('conditions', ''),
+                                created_by=request.user,
+                                updated_by=request.user,
+                                requested_by=request.user
+                            )
+                            
+                            # Update device status
+                            device.status = 'ASSIGNED'
+                            device.updated_by = request.user
+                            device.save()
+                            
+                            created_assignments.append(assignment)
+                    
+                    if created_assignments:
+                        messages.success(request, f'Successfully created {len(created_assignments)} assignments.')
+                        return redirect('inventory:assignment_list')
+                    else:
+                        messages.warning(request, 'No assignments created. All selected devices may already be assigned.')
+                        
+            except Exception as e:
+                messages.error(request, f'Error creating bulk assignments: {str(e)}')
+    else:
+        form = BulkAssignmentForm()
+    
+    context = {
+        'form': form,
+        'title': 'Bulk Assignment Creation',
+    }
+    return render(request, 'inventory/bulk/bulk_assignment.html', context)
+
+@login_required
+def overdue_assignments_list(request):
+    """List all overdue assignments"""
+    try:
+        today = timezone.now().date()
+        overdue_assignments = Assignment.objects.filter(
+            is_temporary=True,
+            is_active=True,
+            expected_return_date__lt=today,
+            actual_return_date__isnull=True
+        ).select_related(
+            'device', 'assigned_to_staff', 'assigned_to_department'
+        ).order_by('expected_return_date')
+        
+        # Calculate days overdue for each assignment
+        for assignment in overdue_assignments:
+            expected_date = validate_date_field(assignment.expected_return_date)
+            if expected_date:
+                assignment.days_overdue = (today - expected_date).days
+        
+        context = {
+            'overdue_assignments': overdue_assignments,
+            'total_overdue': overdue_assignments.count(),
+        }
+        
+        return render(request, 'inventory/assignments/overdue_assignments.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading overdue assignments: {str(e)}")
+        return render(request, 'inventory/overdue_assignments.html', {
+            'overdue_assignments': [], 
+            'total_overdue': 0
+        })
+
+# ================================
+# User's My Assignment VIEW 
+# ================================
+
+@login_required
+def my_assignments(request):
+    """Personal assignments view for users to see their own assignments"""
+    try:
+        # Get current user's staff profile
+        staff_profile = None
+        try:
+            staff_profile = Staff.objects.get(user=request.user)
+        except Staff.DoesNotExist:
+            messages.warning(request, 'No staff profile found. Please contact administrator.')
+            return redirect('inventory:dashboard')
+        
+        # Get user's assignments
+        assignments = Assignment.objects.filter(
+            assigned_to_staff=staff_profile
+        ).select_related(
+            'device', 'device__device_type', 'created_by'
+        ).order_by('-created_at')
+        
+        # Apply filters
+        status_filter = request.GET.get('status', 'all')
+        assignment_type_filter = request.GET.get('type', 'all')
+        search_query = request.GET.get('search', '')
+        
+        # Filter by status
+        if status_filter == 'active':
+            assignments = assignments.filter(is_active=True)
+        elif status_filter == 'returned':
+            assignments = assignments.filter(is_active=False)
+        elif status_filter == 'overdue':
+            assignments = assignments.filter(
+                assignment_type='TEMPORARY', 
+                is_active=True,
+                expected_return_date__lt=timezone.now().date()
+            )
+        
+        # Filter by assignment type
+        if assignment_type_filter == 'temporary':
+            assignments = assignments.filter(assignment_type='TEMPORARY')
+        elif assignment_type_filter == 'permanent':
+            assignments = assignments.filter(assignment_type='PERMANENT')
+        
+        # Search functionality
+        if search_query:
+            assignments = assignments.filter(
+                Q(device__device_name__icontains=search_query) |
+                Q(device__device_id__icontains=search_query) |
+                Q(device__asset_tag__icontains=search_query) 
+            )
+        
+        # Calculate statistics
+        stats = {
+            'total_assignments': Assignment.objects.filter(assigned_to_staff=staff_profile).count(),
+            'active_assignments': Assignment.objects.filter(
+                assigned_to_staff=staff_profile, 
+                is_active=True
+            ).count(),
+            'temporary_assignments': Assignment.objects.filter(
+                assigned_to_staff=staff_profile, 
+                assignment_type='TEMPORARY',
+                is_active=True
+            ).count(),
+            'overdue_assignments': Assignment.objects.filter(
+                assigned_to_staff=staff_profile,
+                assignment_type='TEMPORARY',
+                is_active=True,
+                expected_return_date__lt=timezone.now().date()
+            ).count(),
+        }
+        
+        # Calculate total value of active assignments
+        active_assignments_value = Assignment.objects.filter(
+            assigned_to_staff=staff_profile,
+            is_active=True
+        ).aggregate(
+            total_value=Sum('device__purchase_price')
+        )['total_value'] or 0
+        
+        stats['total_value'] = active_assignments_value
+        
+        # Pagination
+        paginator = Paginator(assignments, 10)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        # Get upcoming returns (next 30 days)
+        upcoming_returns = Assignment.objects.filter(
+            assigned_to_staff=staff_profile,
+            assignment_type='TEMPORARY', 
+            is_active=True,
+            expected_return_date__gte=timezone.now().date(),
+            expected_return_date__lte=timezone.now().date() + timedelta(days=30)
+        ).order_by('expected_return_date')[:5]
+        
+        context = {
+            'staff_profile': staff_profile,
+            'page_obj': page_obj,
+            'stats': stats,
+            'upcoming_returns': upcoming_returns,
+            'status_filter': status_filter,
+            'assignment_type_filter': assignment_type_filter,
+            'search_query': search_query,
+            'title': 'My Assignments'
+        }
+        
+        return render(request, 'inventory/my_assignments/my_assignments.html', context)
+        
+    except Exception as e:
+        messages.error(request, f'Error loading your assignments: {str(e)}')
+        return redirect('inventory:dashboard')
+
+@login_required
+def my_assignment_detail(request, assignment_id):
+    """Personal assignment detail view - users can only view their own assignments"""
+    try:
+        # Get current user's staff profile
+        staff_profile = Staff.objects.get(user=request.user)
+        
+        # Get assignment - ensure it belongs to the current user
+        assignment = get_object_or_404(
+            Assignment.objects.select_related(
+                'device', 'device__device_type', 'assigned_by', 'returned_by'
+            ),
+            assignment_id=assignment_id,
+            assigned_to_staff=staff_profile
+        )
+        
+        # Calculate assignment duration
+        assignment_duration = None
+        if assignment.assigned_date:
+            start_date = assignment.assigned_date
+            end_date = assignment.returned_date or timezone.now().date()
+            assignment_duration = (end_date - start_date).days
+        
+        # Check if overdue
+        is_overdue = False
+        days_overdue = 0
+        if (assignment.is_temporary and assignment.is_active and 
+            assignment.expected_return_date):
+            today = timezone.now().date()
+            if assignment.expected_return_date < today:
+                is_overdue = True
+                days_overdue = (today - assignment.expected_return_date).days
+        
+        context = {
+            'assignment': assignment,
+            'assignment_duration': assignment_duration,
+            'is_overdue': is_overdue,
+            'days_overdue': days_overdue,
+            'title': f'Assignment #{assignment.assignment_id}'
+        }
+        
+        return render(request, 'inventory/my_assignments/my_assignment_detail.html', context)
+        
+    except Staff.DoesNotExist:
+        messages.error(request, 'Staff profile not found. Please contact administrator.')
+        return redirect('inventory:dashboard')
+    except Assignment.DoesNotExist:
+        messages.error(request, 'Assignment not found or you do not have permission to view it.')
+        return redirect('inventory:my_assignments')
+    except Exception as e:
+        messages.error(request, f'Error loading assignment details: {str(e)}')
+        return redirect('inventory:my_assignments')
@@ -0,0 +1,577 @@
+# inventory/views/bulk.py - Bulk Operation Views
+"""Bulk device, assignment and QR code operations."""
+
+# Django core imports
+from django.shortcuts import render, get_object_or_404, redirect
+from django.utils import timezone
+from django.core.paginator import Paginator
+from ..audit import record_action
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+
+# Django DB imports
+from django.db import transaction
+from django.db.models import Q
+
+# Python standard library imports
+from datetime import datetime
+from io import BytesIO
+import base64
+
+# Model imports
+from ..models import Device, Assignment, Staff, Department, Location, DeviceCategory
+
+# View package imports
+from .import_export import handle_bulk_export_dispatcher
+
+# QR payload imports
+from qr_management.payload import qr_content
+
+# ================================
+# BULK OPERATIONS VIEWS
+# ================================
+
+@login_required
+@permission_required('inventory.change_device', raise_exception=True)
+def bulk_device_update(request):
+    """Handle bulk actions on selected devices - CORRECTED"""
+    if request.method == 'POST':
+        device_ids = request.POST.getlist('device_ids')
+        update_field = request.POST.get('update_field')
+        new_value = request.POST.get('new_value')
+        
+        if not device_ids:
+            messages.error(request, 'No devices selected.')
+            return redirect('inventory:device_list')
+        
+        if not update_field or not new_value:
+            messages.error(request, 'Please specify field and value to update.')
+            return redirect('inventory:device_list')
+        
+        try:
+            with transaction.atomic():
+                devices = Device.objects.filter(device_id__in=device_ids)
+                updated_devices = []
+                
+                for device in devices:
+                    if hasattr(device, update_field):
+                        if update_field == 'status':
+                            # CORRECTED: Use correct choice field validation
+                            if new_value in [choice[0] for choice in Device.STATUS_CHOICES]:
+                                setattr(device, update_field, new_value)
+                                device.updated_by = request.user
+                                device.save()
+                                updated_devices.append(device)
+                        elif update_field == 'condition':
+                            # CORRECTED: Use correct choice field validation
+                            if new_value in [choice[0] for choice in Device.CONDITION_CHOICES]:
+                                setattr(device, update_field, new_value)
+                                device.updated_by = request.user
+                                device.save()
+                                updated_devices.append(device)
+                        elif update_field == 'current_location':
+                            try:
+                                location = Location.objects.get(id=int(new_value))
+                                device.current_location = location
+                                device.updated_by = request.user
+                                device.save()
+                                updated_devices.append(device)
+                            except (Location.DoesNotExist, ValueError):
+                                continue
+                
+                # One audit row per device, written in a single insert after commit
+                for device in updated_devices:
+                    record_action(
+                        user=request.user,
+                        action='BULK_UPDATE',
+                        model_name='Device',
+                        object_id=device.device_id,
+                        object_repr=str(device),
+                        changes={'field': update_field, 'new_value': new_value},
+                        request=request
+                    )
+                updated_count = len(updated_devices)
+                
+                messages.success(request, f'Successfully updated {updated_count} devices.')
+                
+        except Exception as e:
+            messages.error(request, f'Error performing bulk update: {str(e)}')
+    
+    return redirect('inventory:device_list')
+
+@login_required
+@permission_required('inventory.add_assignment', raise_exception=True)
+def bulk_assignment(request):
+    """
+    Handle bulk device assignments
+    This is the missing function referenced in your URLs
+    """
+    if request.method == 'GET':
+        # Show bulk assignment form
+        context = {
+            'title': 'Bulk Device Assignment',
+            'staff_members': Staff.objects.filter(is_active=True).order_by('full_name'),
+            'departments': Department.objects.filter(is_active=True).order_by('name'),
+            'locations': Location.objects.filter(is_active=True).order_by('name'),
+        }
+        return render(request, 'inventory/bulk_assignment.html', context)
+    
+    elif request.method == 'POST':
+        device_ids = request.POST.getlist('device_ids')
+        staff_id = request.POST.get('assigned_staff')
+        department_id = request.POST.get('assigned_department')
+        assignment_type = request.POST.get('assignment_type', 'temporary')
+        assignment_date = request.POST.get('assignment_date')
+        expected_return_date = request.POST.get('expected_return_date')
+        notes = request.POST.get('assignment_notes', '')
+        
+        # Validation
+        if not device_ids:
+            messages.error(request, 'No devices selected for assignment.')
+            return redirect('inventory:bulk_assignment')
+        
+        if not staff_id and not department_id:
+            messages.error(request, 'Please select either a staff member or department.')
+            return redirect('inventory:bulk_assignment')
+        
+        try:
+            # Get staff and department objects
+            staff = get_object_or_404(Staff, id=staff_id) if staff_id else None
+            department = get_object_or_404(Department, id=department_id) if department_id else None
+            
+            # Parse dates
+            assignment_date_parsed = timezone.now().date()
+            if assignment_date:
+                try:
+                    assignment_date_parsed = datetime.strptime(assignment_date, '%Y-%m-%d').date()
+                except ValueError:
+                    pass
+            
+            expected_return_date_parsed = None
+            if expected_return_date:
+                try:
+                    expected_return_date_parsed = datetime.strptime(expected_return_date, '%Y-%m-%d').date()
+                except ValueError:
+                    pass
+            
+            with transaction.atomic():
+                assigned = []
+                skipped_count = 0
+                
+                for device_id in device_ids:
+                    try:
+                        device = Device.objects.get(device_id=device_id)
+                        
+                        # Check if device is available for assignment
+                        if device.status not in ['AVAILABLE', 'ACTIVE']:
+                            skipped_count += 1
+                            continue
+                        
+                        # Check for existing active assignments
+                        existing_assignment = Assignment.objects.filter(
+                            device=device,
+                            is_active=True
+                        ).first()
+                        
+                        if existing_assignment:
+                            skipped_count += 1
+                            continue
+                        
+                        # Create assignment
+                        assignment = Assignment.objects.create(
+                            device=device,
+                            assigned_to=staff,
+                            assigned_to_department=department,
+                            assignment_type=assignment_type,
+                            assignment_date=assignment_date_parsed,
+                            expected_return_date=expected_return_date_parsed,
+                            is_active=True,
+                            assigned_by=request.user,
+                            notes=notes
+                        )
+                        
+                        # Update device status
+                        device.status = 'ASSIGNED'
+                        device.updated_by = request.user
+                        device.save()
+                        
+                        assigned.append(assignment)
+                        
+                    except Device.DoesNotExist:
+                        skipped_count += 1
+                        continue
+                    except Exception as e:
+                        skipped_count += 1
+                        continue
+                
+                # One audit row per assignment, written in a single insert after commit
+                for assignment in assigned:
+                    record_action(
+                        user=request.user,
+                        action='BULK_ASSIGNMENT',
+                        model_name='Assignment',
+                        object_id=assignment.pk,
+                        object_repr=str(assignment),
+                        changes={
+                            'device_id': assignment.device_id,
+                            'staff_id': staff_id,
+                            'department_id': department_id,
+                            'assignment_type': assignment_type
+                        },
+                        request=request
+                    )
+                assigned_count = len(assigned)
+                
+                if assigned_count > 0:
+                    assignee = staff.full_name if staff else department.name
+                    messages.success(request, f'Successfully assigned {assigned_count} devices to {assignee}.')
+                    
+                if skipped_count > 0:
+                    messages.warning(request, f'{skipped_count} devices were skipped (already assigned or unavailable).')
+                
+        except Exception as e:
+            messages.error(request, f'Error performing bulk assignment: {str(e)}')
+        
+        return redirect('inventory:assignment_list')
+
+
+@login_required
+@permission_required('inventory.change_device', raise_exception=True)
+def bulk_qr_generate(request):
+    """
+    Handle bulk QR code generation for devices
+    This is the missing function referenced in your URLs
+    """
+    import qrcode
+    
+    if request.method == 'GET':
+        # Show device selection for QR generation
+        search = request.GET.get('search', '')
+        category = request.GET.get('category')
+        status = request.GET.get('status')
+        has_qr = request.GET.get('has_qr')
+        
+        devices = Device.objects.select_related(
+            'device_type__subcategory__category', 'vendor'
+        ).order_by('device_id')
+        
+        # Apply filters
+        if search:
+            devices = devices.filter(
+                Q(device_id__icontains=search) |
+                Q(device_name__icontains=search) |
+                Q(asset_tag__icontains=search)
+            )
+        
+        if category:
+            devices = devices.filter(device_type__subcategory__category_id=category)
+            
+        if status:
+            devices = devices.filter(status=status)
+            
+        if has_qr == 'yes':
+            devices = devices.exclude(qr_code__isnull=True).exclude(qr_code='')
+        elif has_qr == 'no':
+            devices = devices.filter(Q(qr_code__isnull=True) | Q(qr_code=''))
+        
+        # Pagination
+        paginator = Paginator(devices, 50)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        context = {
+            'title': 'Bulk QR Code Generation',
+            'page_obj': page_obj,
+            'categories': DeviceCategory.objects.all().order_by('name'),
+            'status_choices': Device.STATUS_CHOICES,
+            'filters': {
+                'search': search,
+                'category': category,
+                'status': status,
+                'has_qr': has_qr,
+            }
+        }
+        return render(request, 'inventory/bulk/bulk_qr_generate.html', context)
+    
+    elif request.method == 'POST':
+        device_ids = request.POST.getlist('device_ids')
+        regenerate = request.POST.get('regenerate', False)
+        
+        if not device_ids:
+            messages.error(request, 'No devices selected for QR code generation.')
+            return redirect('inventory:bulk_qr_generate')
+        
+        try:
+            generated = []
+            skipped_count = 0
+            failed_count = 0
+            
+            with transaction.atomic():
+                for device_id in device_ids:
+                    try:
+                        device = Device.objects.get(device_id=device_id)
+                        
+                        # Skip if QR code exists and regenerate is not requested
+                        if device.qr_code and not regenerate:
+                            skipped_count += 1
+                            continue
+                        
+                        # Compact signed payload (device ID + signature)
+                        qr_text = qr_content(device.device_id)
+                        
+                        # Create QR code
+                        qr = qrcode.QRCode(
+                            version=1,
+                            error_correction=qrcode.constants.ERROR_CORRECT_L,
+                            box_size=10,
+                            border=4,
+                        )
+                        qr.add_data(qr_text)
+                        qr.make(fit=True)
+                        
+                        # Generate image
+                        img = qr.make_image(fill_color="black", back_color="white")
+                        
+                        # Convert to base64
+                        buffer = BytesIO()
+                        img.save(buffer, format='PNG')
+                        qr_code_data = base64.b64encode(buffer.getvalue()).decode()
+                        
+                        # Update device with QR code
+                        device.qr_code = qr_code_data
+                        device.updated_by = request.user
+                        device.save()
+                        
+                        generated.append(device)
+                        
+                    except Device.DoesNotExist:
+                        failed_count += 1
+                        continue
+                    except Exception as e:
+                        failed_count += 1
+                        continue
+                
+                # One audit row per device, written in a single insert after commit
+                for device in generated:
+                    record_action(
+                        user=request.user,
+                        action='BULK_QR_GENERATION',
+                        model_name='Device',
+                        object_id=device.device_id,
+                        object_repr=str(device),
+                        changes={'regenerate': bool(regenerate)},
+                        request=request
+                    )
+                generated_count = len(generated)
+                
+                # Success message
+                if generated_count > 0:
+                    messages.success(request, f'Generated QR codes for {generated_count} devices.')
+                
+                if skipped_count > 0:
+                    messages.info(request, f'{skipped_count} devices skipped (QR codes already exist).')
+                
+                if failed_count > 0:
+                    messages.warning(request, f'{failed_count} devices failed to generate QR codes.')
+                
+        except Exception as e:
+            messages.error(request, f'Error in bulk QR generation: {str(e)}')
+        
+        return redirect('inventory:bulk_qr_generate')
+
+@login_required
+@permission_required('inventory.change_assignment', raise_exception=True)
+def bulk_assignment_return(request):
+    """Bulk return multiple assignments"""
+    if request.method == 'POST':
+        assignment_ids = request.POST.getlist('assignment_ids')
+        return_date = request.POST.get('return_date')
+        return_notes = request.POST.get('return_notes', '')
+        
+        if not assignment_ids:
+            messages.error(request, 'No assignments selected.')
+            return redirect('inventory:assignment_list')
+        
+        try:
+            return_date_parsed = datetime.strptime(return_date, '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            return_date_parsed = timezone.now().date()
+        
+        try:
+            with transaction.atomic():
+                assignments = Assignment.objects.filter(
+                    assignment_id__in=assignment_ids,
+                    is_active=True
+                )
+                returned = []
+                
+                for assignment in assignments:
+                    # Update assignment
+                    assignment.is_active = False
+                    assignment.actual_return_date = return_date_parsed
+                    assignment.return_notes = return_notes
+                    assignment.updated_by = request.user
+                    assignment.save()
+                    
+                    # Update device status
+                    device = assignment.device
+                    device.status = 'AVAILABLE'
+                    device.updated_by = request.user
+                    device.save()
+                    
+                    returned.append(assignment)
+                
+                # One audit row per assignment, written in a single insert after commit
+                for assignment in returned:
+                    record_action(
+                        user=request.user,
+                        action='BULK_RETURN',
+                        model_name='Assignment',
+                        object_id=assignment.pk,
+                        object_repr=str(assignment),
+                        changes={
+                            'device_id': assignment.device_id,
+                            'return_date': return_date_parsed,
+                            'notes': return_notes
+                        },
+                        request=request
+                    )
+                returned_count = len(returned)
+                
+                messages.success(request, f'Successfully returned {returned_count} assignments.')
+                
+        except Exception as e:
+            messages.error(request, f'Error performing bulk return: {str(e)}')
+    
+    return redirect('inventory:assignment_list')
+@login_required
+@permission_required('inventory.change_device', raise_exception=True)
+def bulk_actions(request):
+    """
+    Main bulk actions dispatcher - integrates with your existing bulk functions
+    This function acts as a router to your existing bulk operation functions
+    """
+    if request.method == 'GET':
+        # Show bulk actions selection page
+        context = {
+            'title': 'Bulk Actions',
+            'available_actions': [
+                ('device_update', 'Update Device Properties'),
+                ('assignment_return', 'Return Assignments'), 
+                ('device_assignment', 'Assign Devices'),
+                ('export_selected', 'Export Selected Items'),
+            ]
+        }
+        return render(request, 'inventory/bulk_actions.html', context)
+    
+    elif request.method == 'POST':
+        action = request.POST.get('action')
+        
+        # Route to your existing bulk functions based on action
+        if action == 'device_update':
+            # Use your existing bulk_device_update function
+            return bulk_device_update(request)
+            
+        elif action == 'assignment_return':
+            # Use your existing bulk_assignment_return function  
+            return bulk_assignment_return(request)
+            
+        elif action == 'device_assignment':
+            # Handle new device assignments
+            return handle_bulk_device_assignment(request)
+            
+        elif action == 'export_selected':
+            # Handle export functionality
+            return handle_bulk_export_dispatcher(request)
+            
+        else:
+            messages.error(request, f'Unknown bulk action: {action}')
+            return redirect('inventory:device_list')
+
+
+def handle_bulk_device_assignment(request):
+    """Handle bulk device assignments - extends your existing functionality"""
+    if request.method == 'POST':
+        device_ids = request.POST.getlist('device_ids')
+        staff_id = request.POST.get('assigned_staff')
+        assignment_type = request.POST.get('assignment_type', 'temporary')
+        
+        if not device_ids:
+            messages.error(request, 'No devices selected.')
+            return redirect('inventory:device_list')
+            
+        if not staff_id:
+            messages.error(request, 'Please select a staff member.')
+            return redirect('inventory:device_list')
+        
+        try:
+            staff = get_object_or_404(Staff, id=staff_id)
+            
+            with transaction.atomic():
+                assigned = []
+                
+                for device_id in device_ids:
+                    try:
+                        device = Device.objects.get(device_id=device_id)
+                        
+                        # Check if device is available for assignment
+                        if device.status not in ['AVAILABLE', 'ACTIVE']:
+                            continue
+                            
+                        # Check for existing active assignments
+                        existing_assignment = Assignment.objects.filter(
+                            device=device,
+                            is_active=True
+                        ).first()
+                        
+                        if existing_assignment:
+                            continue  # Skip already assigned devices
+                        
+                        # Create new assignment using your existing model structure
+                        assignment = Assignment.objects.create(
+                            device=device,
+                            assigned_to=staff,
+                            assignment_type=assignment_type,
+                            is_active=True,
+                            assigned_by=request.user,
+                            assignment_date=timezone.now().date()
+                        )
+                        
+                        # Update device status
+                        device.status = 'ASSIGNED'
+                        device.updated_by = request.user
+                        device.save()
+                        
+                        assigned.append(assignment)
+                        
+                    except Device.DoesNotExist:
+                        continue
+                
+                # One audit row per assignment, written in a single insert after commit
+                for assignment in assigned:
+                    record_action(
+                        user=request.user,
+                        action='BULK_ASSIGNMENT',
+                        model_name='Assignment',
+                        object_id=assignment.pk,
+                        object_repr=str(assignment),
+                        changes={
+                            'device_id': assignment.device_id,
+                            'staff_id': staff_id,
+                            'assignment_type': assignment_type
+                        },
+                        request=request
+                    )
+                assigned_count = len(assigned)
+                
+                if assigned_count > 0:
+                    messages.success(request, f'Successfully assigned {assigned_count} devices to {staff.full_name}.')
+                else:
+                    messages.warning(request, 'No devices were assigned. They may already be assigned or unavailable.')
+                    
+        except Exception as e:
+            messages.error(request, f'Error performing bulk assignment: {str(e)}')
+    
+    return redirect('inventory:device_list')
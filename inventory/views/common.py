@@ -0,0 +1,127 @@
+# inventory/views/common.py - Shared View Helpers
+"""Helpers and fallback forms shared by the view modules."""
+
+from datetime import timedelta
+
+from django import forms
+from django.utils import timezone
+
+from ..forms import MaintenanceScheduleForm
+from ..models import Assignment, Department, Device, DeviceType, Location, Staff
+
+
+#Import with comprehensive error handling and missing form fallbacks
+try:
+    from ..utils import (
+        get_device_assignment_summary, 
+        get_warranty_alerts, 
+        get_overdue_assignments,
+        get_device_status_distribution,
+        get_assignment_trends,
+        validate_date_field,
+        get_recent_activities
+    )
+except ImportError as e:
+    print(f"Import error in inventory/views/common.py: {e}")
+    # Create comprehensive fallback functions
+    def get_device_assignment_summary():
+        try:
+            return {
+                'total_devices': Device.objects.count(),
+                'active_assignments': Assignment.objects.filter(is_active=True).count(),
+                'available_devices': Device.objects.filter(status='AVAILABLE').count(),
+                'overdue_assignments': Assignment.objects.filter(
+                    is_temporary=True, is_active=True,
+                    expected_return_date__lt=timezone.now().date()
+                ).count()
+            }
+        except:
+            return {'total_devices': 0, 'active_assignments': 0, 'available_devices': 0, 'overdue_assignments': 0}
+    
+    def get_warranty_alerts():
+        try:
+            today = timezone.now().date()
+            alert_date = today + timedelta(days=30)
+            return Device.objects.filter(
+                warranty_end_date__gte=today,
+                warranty_end_date__lte=alert_date
+            ).order_by('warranty_end_date')
+        except:
+            return Device.objects.none()
+    
+    def get_overdue_assignments():
+        try:
+            today = timezone.now().date()
+            return Assignment.objects.filter(
+                is_temporary=True, is_active=True,
+                expected_return_date__lt=today,
+                actual_return_date__isnull=True
+            ).select_related('device', 'assigned_to_staff')
+        except:
+            return Assignment.objects.none()
+    
+    def get_device_status_distribution():
+        return []
+    
+    def get_assignment_trends(days=30):
+        return []
+    
+    def validate_date_field(date_value, field_name="date"):
+        return date_value
+    
+    def get_recent_activities(limit=10):
+        return []
+
+# Create missing forms as fallbacks
+
+class AssignmentSearchForm(forms.Form):
+    """Simple search form for assignments"""
+    search = forms.CharField(max_length=200, required=False)
+    status = forms.ChoiceField(choices=[('', 'All'), ('active', 'Active'), ('inactive', 'Inactive')], required=False)
+    assignment_type = forms.ChoiceField(choices=[('', 'All'), ('permanent', 'Permanent'), ('temporary', 'Temporary')], required=False)
+    department = forms.ModelChoiceField(queryset=Department.objects.all(), required=False, empty_label="All Departments")
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+
+class ReturnForm(forms.Form):
+    """Simple form for returning devices"""
+    return_date = forms.DateField(initial=timezone.now().date)
+    return_condition = forms.CharField(max_length=200, required=False)
+    return_notes = forms.CharField(widget=forms.Textarea, required=False)
+    device_condition = forms.CharField(max_length=50, required=False)
+
+class TransferForm(forms.Form):
+    """Simple form for transferring assignments"""
+    new_assigned_to_staff = forms.ModelChoiceField(queryset=Staff.objects.filter(is_active=True), required=False)
+    new_assigned_to_department = forms.ModelChoiceField(queryset=Department.objects.all(), required=False)
+    new_assigned_to_location = forms.ModelChoiceField(queryset=Location.objects.filter(is_active=True), required=False)
+    transfer_reason = forms.CharField(widget=forms.Textarea, required=False)
+    conditions = forms.CharField(widget=forms.Textarea, required=False)
+
+class DeviceTypeForm(forms.ModelForm):
+    """Simple form for device types"""
+    class Meta:
+        model = DeviceType
+        fields = ['name', 'subcategory', 'description']
+
+class DepartmentForm(forms.ModelForm):
+    """Simple form for departments"""
+    class Meta:
+        model = Department
+        fields = ['name', 'code', ]
+
+# Alias the correctly named forms
+MaintenanceForm = MaintenanceScheduleForm
+
+
+def get_client_ip(request):
+    """
+    Get the client's IP address from request headers.
+    Handles various proxy configurations.
+    """
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip = x_forwarded_for.split(',')[0].strip()
+    else:
+        ip = request.META.get('REMOTE_ADDR', 'Unknown')
+    return ip
@@ -0,0 +1,745 @@
+# inventory/views/devices.py - Device Views
+"""Device and device type management."""
+
+# Django core imports
+from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django.core.paginator import Paginator
+from ..utils import generate_device_id
+from ..audit import record_action
+from bps_inventory.instrumentation import query_budget
+from bps_inventory.pagination import paginate_keyset
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+
+# Django DB imports
+from django.db import transaction
+from django.db.models import Count, Q, Prefetch
+
+# Python standard library imports
+from datetime import timedelta
+
+# Model imports
+from ..models import (
+    Device, Assignment, DeviceCategory, DeviceType, DeviceSubCategory,
+    MaintenanceSchedule, AuditLog,
+)
+from ..forms import DeviceForm
+
+# View package imports
+from .common import DeviceTypeForm
+
+# ================================
+# DEVICE MANAGEMENT VIEWS
+# ================================
+
+@login_required
+def device_history(request, device_id):
+    """Show device history"""
+    try:
+        device = get_object_or_404(Device, device_id=device_id)
+        
+        # Get assignment history
+        assignment_history = Assignment.objects.filter(
+            device=device
+        ).select_related(
+            'assigned_to_staff', 'assigned_to_department', 'assigned_to_location'
+        ).order_by('-created_at')
+        
+        # Get maintenance history
+        maintenance_history = MaintenanceSchedule.objects.filter(
+            device=device
+        ).order_by('-scheduled_date')
+        
+        # Get audit logs for this device
+        audit_logs = AuditLog.objects.filter(
+            model_name='Device',
+            object_id=device.device_id
+        ).order_by('-timestamp')
+        
+        context = {
+            'device': device,
+            'assignment_history': assignment_history,
+            'maintenance_history': maintenance_history,
+            'audit_logs': audit_logs,
+        }
+        
+        return render(request, 'inventory/devices/device_history.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading device history: {str(e)}")
+        return redirect('inventory:device_detail', device_id=device_id)
+
+@login_required
+@query_budget(max_queries=20, max_duplicates=4)
+def device_list(request):
+    """List all devices with search and filtering"""
+    devices = Device.objects.select_related(
+        'device_type__subcategory__category', 'vendor', 'location'
+    ).prefetch_related(
+        Prefetch(
+            'assignments',
+            queryset=Assignment.objects.filter(is_active=True).select_related(
+                'assigned_to_staff__user', 'assigned_to_department'
+            ),
+        )
+    )
+
+    search = request.GET.get('search', '').strip()
+    if search:
+        devices = devices.filter(
+            Q(device_id__icontains=search) |
+            Q(device_name__icontains=search) |
+            Q(asset_tag__icontains=search) |
+            Q(serial_number__icontains=search)
+        )
+    if request.GET.get('status'):
+        devices = devices.filter(status=request.GET['status'])
+    if request.GET.get('condition'):
+        devices = devices.filter(device_condition=request.GET['condition'])
+    if request.GET.get('category'):
+        devices = devices.filter(device_type__subcategory__category_id=request.GET['category'])
+
+    # Keyset pagination on the primary key: deep pages cost the same as the first
+    page_obj = paginate_keyset(request, devices, ('device_id',), per_page=25)
+
+    # Statistics for dashboard, in one pass
+    stats = Device.objects.aggregate(
+        total_devices=Count('device_id'),
+        available_devices=Count('device_id', filter=Q(status='AVAILABLE')),
+        assigned_devices=Count('device_id', filter=Q(status='ASSIGNED')),
+        maintenance_devices=Count('device_id', filter=Q(status='MAINTENANCE')),
+    )
+
+    context = {
+        'page_obj': page_obj,
+        'devices': page_obj,
+        'stats': stats,
+        'status_choices': Device.STATUS_CHOICES,
+        'condition_choices': Device.CONDITION_CHOICES,
+        'categories': DeviceCategory.objects.filter(is_active=True).order_by('name'),
+        'today': timezone.now().date(),
+        'title': 'Device Management',
+        **stats,
+    }
+
+    return render(request, 'inventory/devices/device_list.html', context)
+
+@login_required
+def device_detail(request, device_id):
+    """Complete device detail view - safe version"""
+    try:
+        # Get device with related objects
+        device = get_object_or_404(
+            Device.objects.select_related(
+                'device_type__subcategory__category',
+                'vendor',
+                'current_location',
+                'created_by',
+                'updated_by'
+            ),
+            device_id=device_id
+        )
+        
+        # Get current assignment
+        current_assignment = None
+        try:
+            from ..models import Assignment
+            current_assignment = Assignment.objects.filter(
+                device=device, is_active=True
+            ).select_related('assigned_to_staff', 'assigned_to_department', 'assigned_to_location').first()
+        except:
+            pass
+        
+        # Get assignment history (last 10) - safe
+        assignment_history = []
+        try:
+            from ..models import Assignment
+            assignment_history = Assignment.objects.filter(
+                device=device
+            ).select_related(
+                'assigned_to_staff__user', 
+                'assigned_to_department', 
+                'assigned_to_location'
+            ).order_by('-assigned_at')[:10]
+        except:
+            pass
+        
+        # Get maintenance history - safe
+        maintenance_history = []
+        try:
+            from ..models import MaintenanceRecord
+            maintenance_history = MaintenanceRecord.objects.filter(
+                device=device
+            ).select_related('technician').order_by('-scheduled_date')[:5]
+        except ImportError:
+            pass
+        except:
+            pass
+        
+        # Get movement history - safe
+        movement_history = []
+        try:
+            from ..models import DeviceMovement
+            movement_history = DeviceMovement.objects.filter(
+                device=device
+            ).select_related('from_location', 'to_location', 'moved_by').order_by('-movement_date')[:5]
+        except ImportError:
+            pass
+        except:
+            pass
+        
+        # Get recent audit logs for this device - safe
+        audit_logs = []
+        try:
+            from ..models import AuditLog
+            audit_logs = AuditLog.objects.filter(
+                model_name='Device',
+                object_id=str(device.id)
+            ).select_related('user').order_by('-timestamp')[:10]
+        except ImportError:
+            pass
+        except:
+            pass
+        
+        # Calculate device statistics
+        device_stats = {
+            'days_since_purchase': (timezone.now().date() - device.purchase_date).days if device.purchase_date else 0,
+            'warranty_days_remaining': (device.warranty_end_date - timezone.now().date()).days if device.warranty_end_date and device.warranty_end_date > timezone.now().date() else 0,
+        }
+        
+        # Safe assignment counts
+        try:
+            from ..models import Assignment
+            device_stats.update({
+                'total_assignments': Assignment.objects.filter(device=device).count(),
+                'active_assignments': Assignment.objects.filter(device=device, is_active=True).count(),
+            })
+        except:
+            device_stats.update({
+                'total_assignments': 0,
+                'active_assignments': 0,
+            })
+        
+        # Safe movement counts
+        try:
+            from ..models import DeviceMovement
+            device_stats['total_movements'] = DeviceMovement.objects.filter(device=device).count()
+        except:
+            device_stats['total_movements'] = 0
+        
+        # Check if device has any issues
+        issues = []
+        if device.warranty_end_date and device.warranty_end_date < timezone.now().date():
+            issues.append({'type': 'warning', 'message': 'Warranty has expired'})
+        elif device.warranty_end_date and device.warranty_end_date <= timezone.now().date() + timedelta(days=30):
+            issues.append({'type': 'info', 'message': 'Warranty expires within 30 days'})
+        
+        if current_assignment and current_assignment.is_temporary and current_assignment.expected_return_date:
+            if current_assignment.expected_return_date < timezone.now().date():
+                issues.append({'type': 'danger', 'message': 'Temporary assignment is overdue'})
+            elif current_assignment.expected_return_date <= timezone.now().date() + timedelta(days=7):
+                issues.append({'type': 'warning', 'message': 'Temporary assignment due within 7 days'})
+        
+        context = {
+            'device': device,
+            'current_assignment': current_assignment,
+            'assignment_history': assignment_history,
+            'maintenance_history': maintenance_history,
+            'movement_history': movement_history,
+            'audit_logs': audit_logs,
+            'device_stats': device_stats,
+            'issues': issues,
+            'title': f'Device: {device.device_name}',
+            'can_edit': request.user.has_perm('inventory.change_device'),
+            'can_delete': request.user.has_perm('inventory.delete_device'),
+            'can_assign': request.user.has_perm('inventory.add_assignment'),
+        }
+        
+        return render(request, 'inventory/devices/device_detail.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading device details: {str(e)}")
+        return redirect('inventory:device_list')
+
+@login_required
+@permission_required('inventory.add_device', raise_exception=True)
+def device_create(request):
+    """Your existing device_create function - just need to ensure forms use correct STATUS_CHOICES"""
+    if request.method == 'POST':
+        form = DeviceForm(request.POST)
+        if form.is_valid():
+            try:
+                with transaction.atomic():
+                    device = form.save(commit=False)
+                    if not device.device_id:
+                        device.device_id = generate_device_id(user=request.user)
+                    device.created_by = request.user
+                    device.updated_by = request.user
+                    device.save()
+                    
+                    # Log the activity
+                    record_action(
+                        user=request.user,
+                        action='CREATE',
+                        model_name='Device',
+                        object_id=device.device_id,
+                        object_repr=str(device),
+                        changes={
+                            'device_id': device.device_id,
+                            'device_name': device.device_name,
+                            'status': device.status
+                        },
+                        ip_address=request.META.get('REMOTE_ADDR')
+                    )
+                    
+                    messages.success(request, f'Device "{device.device_name}" created successfully.')
+                    return redirect('inventory:device_detail', device_id=device.device_id)
+                    
+            except Exception as e:
+                messages.error(request, f'Error creating device: {str(e)}')
+    else:
+        form = DeviceForm()
+    
+    context = {
+        'form': form,
+        'title': 'Create New Device'
+    }
+    
+    return render(request, 'inventory/devices/device_form.html', context)
+
+@login_required
+@permission_required('inventory.change_device', raise_exception=True)
+def device_edit(request, device_id):
+    """Edit device"""
+    device = get_object_or_404(Device, id=device_id)
+    
+    if request.method == 'POST':
+        form = DeviceForm(request.POST, instance=device)
+        if form.is_valid():
+            try:
+                with transaction.atomic():
+                    # Track changes
+                    changes = {}
+                    for field in form.changed_data:
+                        changes[field] = {
+                            'old': getattr(device, field),
+                            'new': form.cleaned_data[field]
+                        }
+                    
+                    device = form.save(commit=False)
+                    device.updated_by = request.user
+                    device.save()
+                    
+                    # Log the activity
+                    record_action(
+                        user=request.user,
+                        action='UPDATE',
+                        model_name='Device',
+                        object_id=device.id,
+                        object_repr=str(device),
+                        changes=changes,
+                        ip_address=request.META.get('REMOTE_ADDR')
+                    )
+                    
+                    messages.success(request, f'Device "{device.device_name}" updated successfully.')
+                    return redirect('inventory:device_detail', device_id=device.id)
+                    
+            except Exception as e:
+                messages.error(request, f'Error updating device: {str(e)}')
+    else:
+        form = DeviceForm(instance=device)
+        # Populate specifications_text for editing
+        if device.specifications:
+            specs_text = '\n'.join([f"{k}: {v}" for k, v in device.specifications.items()])
+            form.initial['specifications_text'] = specs_text
+    
+    context = {
+        'form': form,
+        'device': device,
+        'title': f'Edit Device: {device.device_name}'
+    }
+    
+    return render(request, 'inventory/device_form.html', context)
+
+@login_required
+@permission_required('inventory.delete_device', raise_exception=True)
+def device_delete(request, device_id):
+    """Soft delete device with proper validation"""
+    try:
+        device = get_object_or_404(Device, device_id=device_id)
+        
+        if request.method == 'POST':
+            # Check for active assignments
+            active_assignments = Assignment.objects.filter(device=device, is_active=True)
+            if active_assignments.exists():
+                messages.error(request, 'Cannot delete device with active assignments. Please return the device first.')
+                return redirect('inventory:device_detail', device_id=device.device_id)
+            
+            try:
+                with transaction.atomic():
+                    # Soft delete by changing status
+                    device.status = 'DISPOSED'
+                    device.updated_by = request.user
+                    device.save()
+                    
+                    # Create audit log
+                    record_action(
+                        user=request.user,
+                        action='DELETE',
+                        model_name='Device',
+                        object_id=device.device_id,
+                        object_repr=str(device),
+                        changes={'status': {'old': device.status, 'new': 'DISPOSED'}},
+                        ip_address=request.META.get('REMOTE_ADDR')
+                    )
+                    
+                    messages.success(request, f'Device "{device.device_name}" has been marked as disposed.')
+                    return redirect('inventory:device_list')
+            except Exception as e:
+                messages.error(request, f'Error deleting device: {str(e)}')
+        
+        context = {
+            'device': device,
+            'active_assignments': Assignment.objects.filter(device=device, is_active=True).count()
+        }
+        return render(request, 'inventory/devices/device_delete.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error processing request: {str(e)}")
+        return redirect('inventory:device_list')
+@login_required
+def device_type_detail(request, type_id):
+    """Device type detail view"""
+    try:
+        device_type = get_object_or_404(
+            DeviceType.objects.select_related('subcategory__category'),
+            id=type_id
+        )
+        
+        # Get devices of this type
+        devices = Device.objects.filter(device_type=device_type).select_related(
+            'vendor', 'current_location'
+        ).prefetch_related('assignments')
+        
+        # Pagination for devices
+        paginator = Paginator(devices, 20)
+        page_number = request.GET.get('page')
+        devices_page = paginator.get_page(page_number)
+        
+        # Statistics for this device type
+        stats = {
+            'total_devices': devices.count(),
+            'available_devices': devices.filter(status='AVAILABLE').count(),
+            'assigned_devices': devices.filter(status='ASSIGNED').count(),
+            'maintenance_devices': devices.filter(status='MAINTENANCE').count(),
+            'retired_devices': devices.filter(status='RETIRED').count(),
+        }
+        
+        # Condition distribution
+        condition_stats = list(
+            devices.values('condition')
+            .annotate(count=Count('condition'))
+            .order_by('condition')
+        )
+        
+        # Vendor distribution
+        vendor_stats = list(
+            devices.filter(vendor__isnull=False)
+            .values('vendor__name')
+            .annotate(count=Count('vendor'))
+            .order_by('-count')[:10]
+        )
+        
+        # Age distribution (based on purchase date)
+        today = timezone.now().date()
+        age_ranges = [
+            ('0-1 years', 0, 365),
+            ('1-3 years', 366, 1095),
+            ('3-5 years', 1096, 1825),
+            ('5+ years', 1826, 9999)
+        ]
+        
+        age_stats = []
+        for label, min_days, max_days in age_ranges:
+            start_date = today - timedelta(days=max_days)
+            end_date = today - timedelta(days=min_days)
+            
+            if max_days == 9999:
+                count = devices.filter(
+                    purchase_date__lte=end_date,
+                    purchase_date__isnull=False
+                ).count()
+            else:
+                count = devices.filter(
+                    purchase_date__gte=start_date,
+                    purchase_date__lte=end_date,
+                    purchase_date__isnull=False
+                ).count()
+            
+            age_stats.append({'label': label, 'count': count})
+        
+        # Recent activities for this device type
+        recent_assignments = Assignment.objects.filter(
+            device__device_type=device_type,
+            created_at__gte=timezone.now() - timedelta(days=30)
+        ).select_related(
+            'device', 'assigned_to_staff', 'assigned_to_department'
+        ).order_by('-created_at')[:10]
+        
+        context = {
+            'device_type': device_type,
+            'devices': devices_page,
+            'stats': stats,
+            'condition_stats': condition_stats,
+            'vendor_stats': vendor_stats,
+            'age_stats': age_stats,
+            'recent_assignments': recent_assignments,
+            'title': f'Device Type: {device_type.name}'
+        }
+        
+        return render(request, 'inventory/devices/device_type_detail.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading device type details: {str(e)}")
+        return redirect('inventory:device_type_list')
+
+@login_required
+@permission_required('inventory.change_devicetype', raise_exception=True)
+def device_type_edit(request, type_id):
+    """Edit device type"""
+    try:
+        device_type = get_object_or_404(DeviceType, id=type_id)
+        
+        if request.method == 'POST':
+            form = DeviceTypeForm(request.POST, instance=device_type)
+            if form.is_valid():
+                try:
+                    with transaction.atomic():
+                        device_type = form.save()
+                        
+                        # Log the activity
+                        from ..utils import log_user_activity
+                        log_user_activity(
+                            user=request.user,
+                            action='UPDATE',
+                            model_name='DeviceType',
+                            object_id=device_type.id,
+                            object_repr=str(device_type),
+                            ip_address=request.META.get('REMOTE_ADDR')
+                        )
+                        
+                        messages.success(request, f'Device type "{device_type.name}" updated successfully.')
+                        return redirect('inventory:device_type_detail', type_id=device_type.id)
+                        
+                except Exception as e:
+                    messages.error(request, f'Error updating device type: {str(e)}')
+            else:
+                for field, errors in form.errors.items():
+                    for error in errors:
+                        messages.error(request, f'{field}: {error}')
+        else:
+            form = DeviceTypeForm(instance=device_type)
+        
+        # Get subcategories for the selected category
+        if device_type.subcategory:
+            subcategories = DeviceSubCategory.objects.filter(
+                category=device_type.subcategory.category
+            )
+        else:
+            subcategories = DeviceSubCategory.objects.none()
+        
+        context = {
+            'form': form,
+            'device_type': device_type,
+            'subcategories': subcategories,
+            'title': f'Edit Device Type: {device_type.name}'
+        }
+        
+        return render(request, 'inventory/device_types/device_type_form.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading device type: {str(e)}")
+        return redirect('inventory:device_type_list')
+
+@login_required
+@permission_required('inventory.delete_devicetype', raise_exception=True)
+def device_type_delete(request, type_id):
+    """Delete device type (soft delete if has devices)"""
+    try:
+        device_type = get_object_or_404(DeviceType, id=type_id)
+        
+        # Check if device type has associated devices
+        device_count = Device.objects.filter(device_type=device_type).count()
+        
+        if request.method == 'POST':
+            if device_count > 0:
+                # Soft delete - mark as inactive
+                device_type.is_active = False
+                device_type.save()
+                
+                # Log the activity
+                from ..utils import log_user_activity
+                log_user_activity(
+                    user=request.user,
+                    action='SOFT_DELETE',
+                    model_name='DeviceType',
+                    object_id=device_type.id,
+                    object_repr=str(device_type),
+                    ip_address=request.META.get('REMOTE_ADDR')
+                )
+                
+                messages.success(
+                    request, 
+                    f'Device type "{device_type.name}" has been deactivated (has {device_count} associated devices).'
+                )
+            else:
+                # Hard delete - no associated devices
+                device_type_name = device_type.name
+                device_type.delete()
+                
+                # Log the activity
+                from ..utils import log_user_activity
+                log_user_activity(
+                    user=request.user,
+                    action='DELETE',
+                    model_name='DeviceType',
+                    object_id=type_id,
+                    object_repr=device_type_name,
+                    ip_address=request.META.get('REMOTE_ADDR')
+                )
+                
+                messages.success(request, f'Device type "{device_type_name}" deleted successfully.')
+            
+            return redirect('inventory:device_type_list')
+        
+        context = {
+            'device_type': device_type,
+            'device_count': device_count,
+            'can_hard_delete': device_count == 0,
+            'title': f'Delete Device Type: {device_type.name}'
+        }
+        
+        return render(request, 'inventory/device_types/device_type_confirm_delete.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error deleting device type: {str(e)}")
+        return redirect('inventory:device_type_list')
+
+@login_required
+@require_http_methods(["GET"])
+def ajax_subcategories_by_category(request):
+    """AJAX: Get subcategories for category - matches URL pattern name"""
+    try:
+        category_id = request.GET.get('category_id')
+        if category_id:
+            subcategories = DeviceSubCategory.objects.filter(
+                category_id=category_id, is_active=True
+            ).values('id', 'name')
+            return JsonResponse({'subcategories': list(subcategories)})
+        return JsonResponse({'subcategories': []})
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def ajax_device_types_by_subcategory(request):
+    """AJAX: Get device types for subcategory - matches URL pattern name"""
+    try:
+        subcategory_id = request.GET.get('subcategory_id')
+        if subcategory_id:
+            device_types = DeviceType.objects.filter(
+                subcategory_id=subcategory_id, is_active=True
+            ).values('id', 'name')
+            return JsonResponse({'device_types': list(device_types)})
+        return JsonResponse({'device_types': []})
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+# ================================
+# DEVICE TYPE MANAGEMENT VIEWS
+# ================================
+
+@login_required
+def device_type_list(request):
+    """List all device types with device counts"""
+    try:
+        device_types = DeviceType.objects.select_related(
+            'subcategory__category'
+        ).prefetch_related('devices').annotate(
+            device_count=Count('devices')
+        ).order_by('subcategory__category__name', 'subcategory__name', 'name')
+        
+        # Search functionality
+        search = request.GET.get('search')
+        if search:
+            device_types = device_types.filter(
+                Q(name__icontains=search) |
+                Q(subcategory__name__icontains=search) |
+                Q(subcategory__category__name__icontains=search)
+            )
+        
+        # Category filter
+        category_id = request.GET.get('category')
+        if category_id:
+            device_types = device_types.filter(subcategory__category_id=category_id)
+        
+        # Pagination
+        paginator = Paginator(device_types, 25)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        # Get categories for filter
+        categories = DeviceCategory.objects.all().order_by('name')
+        
+        context = {
+            'page_obj': page_obj,
+            'categories': categories,
+            'search': search,
+            'selected_category': category_id,
+        }
+        
+        return render(request, 'inventory/device_type/device_type_list.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading device types: {str(e)}")
+        return render(request, 'inventory/device_type/device_type_list.html', {'page_obj': None})
+
+@login_required
+@permission_required('inventory.add_devicetype', raise_exception=True)
+def device_type_create(request):
+    """Create new device type"""
+    if request.method == 'POST':
+        form = DeviceTypeForm(request.POST)
+        if form.is_valid():
+            try:
+                device_type = form.save()
+                
+                # Create audit log
+                record_action(
+                    user=request.user,
+                    action='CREATE',
+                    model_name='DeviceType',
+                    object_id=str(device_type.id),
+                    object_repr=str(device_type),
+                    changes={'created': 'New device type added'},
+                    ip_address=request.META.get('REMOTE_ADDR')
+                )
+                
+                messages.success(request, f'Device type "{device_type.name}" created successfully.')
+                return redirect('inventory:device_type_detail', type_id=device_type.id)
+            except Exception as e:
+                messages.error(request, f'Error creating device type: {str(e)}')
+    else:
+        form = DeviceTypeForm()
+    
+    context = {
+        'form': form,
+        'title': 'Add New Device Type',
+        'action': 'Create',
+    }
+    return render(request, 'inventory/device_type/device_type_form.html', context)
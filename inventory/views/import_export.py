@@ -0,0 +1,826 @@
+# inventory/views/import_export.py - Import/Export Views
+"""CSV/Excel exports and CSV imports; pandas is only imported by the import views."""
+
+# Django core imports
+from django.shortcuts import render, redirect
+from django.http import HttpResponse
+from ..utils import reserve_device_ids
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+
+# Django DB imports
+from django.db import transaction
+from django.db.models import Prefetch, Q
+
+# Python standard library imports
+import csv
+
+# Model imports
+from ..models import (
+    Device, Assignment, Staff, Department, DeviceCategory, DeviceType, DeviceSubCategory,
+    Vendor, MaintenanceSchedule,
+)
+from ..forms import CSVImportForm
+
+# ================================
+# EXPORT FUNCTIONS
+# ================================
+
+@login_required
+def bulk_import(request):
+    """Main bulk import page"""
+    return render(request, 'inventory/bulk/bulk_import.html', {
+        'title': 'Bulk Import Data'
+    })
+
+@login_required
+def bulk_export(request):
+    """Main bulk export page"""
+    return render(request, 'inventory/bulk/bulk_export.html', {
+        'title': 'Bulk Export Data'
+    })
+
+@login_required
+def import_template(request):
+    """Download CSV import template"""
+    try:
+        template_type = request.GET.get('type', 'devices')
+        
+        response = HttpResponse(content_type='text/csv')
+        
+        if template_type == 'devices':
+            response['Content-Disposition'] = 'attachment; filename="devices_import_template.csv"'
+            writer = csv.writer(response)
+            writer.writerow([
+                'device_id', 'asset_tag', 'device_name', 'category', 'subcategory', 'device_type',
+                'brand', 'model', 'serial_number', 'status', 'condition',
+                'purchase_date', 'purchase_price', 'vendor', 'warranty_start_date', 'warranty_end_date',
+                'description', 'notes'
+            ])
+            # Add sample row
+            writer.writerow([
+                'DEV001', 'AT001', 'Sample Laptop', 'IT Equipment', 'Computers', 'Laptop',
+                'Dell', 'Latitude 7420', 'SN123456', 'ACTIVE', 'EXCELLENT',
+                '2023-01-15', '1200.00', 'Dell Inc', '2023-01-15', '2026-01-15',
+                'Sample laptop for demonstration', 'Sample notes'
+            ])
+            
+        elif template_type == 'assignments':
+            response['Content-Disposition'] = 'attachment; filename="assignments_import_template.csv"'
+            writer = csv.writer(response)
+            writer.writerow([
+                'device_id', 'assigned_to_staff_email', 'assigned_to_department', 'assignment_type',
+                'start_date', 'expected_return_date', 'location', 'purpose', 'notes'
+            ])
+            # Add sample row
+            writer.writerow([
+                'DEV001', 'john.doe@example.com', 'IT Department', 'permanent',
+                '2023-01-15', '', 'Office 101', 'Daily work laptop', 'Sample assignment'
+            ])
+            
+        elif template_type == 'maintenance':
+            response['Content-Disposition'] = 'attachment; filename="maintenance_import_template.csv"'
+            writer = csv.writer(response)
+            writer.writerow([
+                'device_id', 'maintenance_type', 'scheduled_date', 'vendor', 'cost',
+                'description', 'status', 'notes'
+            ])
+            # Add sample row
+            writer.writerow([
+                'DEV001', 'PREVENTIVE', '2023-06-15', 'Dell Inc', '150.00',
+                'Regular maintenance check', 'SCHEDULED', 'Sample maintenance'
+            ])
+        
+        return response
+        
+    except Exception as e:
+        messages.error(request, f"Error generating template: {str(e)}")
+        return redirect('inventory:dashboard')
+
+@login_required
+def export_devices_csv(request):
+    """Export devices to CSV"""
+    try:
+        # Get filter parameters from request
+        category = request.GET.get('category')
+        status = request.GET.get('status')
+        condition = request.GET.get('condition')
+        vendor = request.GET.get('vendor')
+        
+        # Base queryset
+        devices = Device.objects.select_related(
+            'device_type__subcategory__category', 'vendor'
+        ).prefetch_related(Prefetch(
+            'assignments',
+            queryset=Assignment.objects.filter(is_active=True).select_related(
+                'assigned_to_staff__user',
+                'assigned_to_location__building', 'assigned_to_location__block',
+                'assigned_to_location__floor', 'assigned_to_location__department',
+                'assigned_to_location__room',
+            ),
+            to_attr='active_assignments',
+        ))
+        
+        # Apply filters
+        if category:
+            devices = devices.filter(device_type__subcategory__category_id=category)
+        if status:
+            devices = devices.filter(status=status)
+        if condition:
+            devices = devices.filter(device_condition=condition)
+        if vendor:
+            devices = devices.filter(vendor_id=vendor)
+        
+        # Create CSV response
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="devices_export.csv"'
+        
+        writer = csv.writer(response)
+        writer.writerow([
+            'Device ID', 'Asset Tag', 'Device Name', 'Category', 'Subcategory', 'Type',
+            'Brand', 'Model', 'Serial Number', 'Status', 'Condition',
+            'Purchase Date', 'Purchase Price', 'Vendor', 'Warranty Start', 'Warranty End',
+            'Current Assignment', 'Assigned To', 'Assignment Date', 'Location',
+            'Created Date', 'Last Updated'
+        ])
+        
+        # Stream in chunks; each chunk prefetches its active assignments
+        for device in devices.iterator(chunk_size=2000):
+            current_assignment = device.active_assignments[0] if device.active_assignments else None
+            
+            writer.writerow([
+                device.device_id,
+                device.asset_tag,
+                device.device_name,
+                device.device_type.subcategory.category.name if device.device_type else '',
+                device.device_type.subcategory.name if device.device_type else '',
+                device.device_type.name if device.device_type else '',
+                device.brand,
+                device.model,
+                device.serial_number,
+                device.get_status_display(),
+                device.get_device_condition_display(),
+                device.purchase_date.strftime('%Y-%m-%d') if device.purchase_date else '',
+                device.purchase_price,
+                device.vendor.name if device.vendor else '',
+                device.warranty_start_date.strftime('%Y-%m-%d') if device.warranty_start_date else '',
+                device.warranty_end_date.strftime('%Y-%m-%d') if device.warranty_end_date else '',
+                current_assignment.assignment_id if current_assignment else '',
+                str(current_assignment.assigned_to_staff) if current_assignment and current_assignment.assigned_to_staff else '',
+                current_assignment.start_date.strftime('%Y-%m-%d') if current_assignment and current_assignment.start_date else '',
+                str(current_assignment.assigned_to_location) if current_assignment and current_assignment.assigned_to_location else '',
+                device.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                device.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+            ])
+        
+        return response
+        
+    except Exception as e:
+        messages.error(request, f"Error exporting devices: {str(e)}")
+        return redirect('inventory:device_list')
+    
+@login_required
+def export_assignments_csv(request):
+    """Export assignments to CSV"""
+    try:
+        # Get filter parameters
+        status = request.GET.get('status')
+        department = request.GET.get('department')
+        date_from = request.GET.get('date_from')
+        date_to = request.GET.get('date_to')
+        
+        # Base queryset
+        assignments = Assignment.objects.select_related(
+            'device', 'assigned_to_staff__department', 'assigned_to_department',
+            'assigned_to_location', 'created_by'
+        )
+        
+        # Apply filters
+        if status == 'active':
+            assignments = assignments.filter(is_active=True)
+        elif status == 'inactive':
+            assignments = assignments.filter(is_active=False)
+        if department:
+            assignments = assignments.filter(
+                Q(assigned_to_department_id=department) |
+                Q(assigned_to_staff__department_id=department)
+            )
+        if date_from:
+            assignments = assignments.filter(start_date__gte=date_from)
+        if date_to:
+            assignments = assignments.filter(start_date__lte=date_to)
+        
+        # Create CSV response
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="assignments_export.csv"'
+        
+        writer = csv.writer(response)
+        writer.writerow([
+            'Assignment ID', 'Device ID', 'Device Name', 'Assigned To Staff', 'Staff Department',
+            'Assigned To Department', 'Assignment Type', 'Start Date', 'Expected Return',
+            'Actual Return', 'Status', 'Purpose', 'Location', 'Notes',
+            'Created Date', 'Created By'
+        ])
+        
+        for assignment in assignments:
+            writer.writerow([
+                assignment.assignment_id,
+                assignment.device.device_id,
+                assignment.device.device_name,
+                str(assignment.assigned_to_staff) if assignment.assigned_to_staff else '',
+                assignment.assigned_to_staff.department.name if assignment.assigned_to_staff and assignment.assigned_to_staff.department else '',
+                assignment.assigned_to_department.name if assignment.assigned_to_department else '',
+                'Temporary' if assignment.is_temporary else 'Permanent',
+                assignment.start_date.strftime('%Y-%m-%d') if assignment.start_date else '',
+                assignment.expected_return_date.strftime('%Y-%m-%d') if assignment.expected_return_date else '',
+                assignment.actual_return_date.strftime('%Y-%m-%d') if assignment.actual_return_date else '',
+                'Active' if assignment.is_active else 'Inactive',
+                assignment.purpose or '',
+                str(assignment.assigned_to_location) if assignment.assigned_to_location else '',
+                assignment.notes or '',
+                assignment.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                assignment.created_by.username
+            ])
+        
+        return response
+        
+    except Exception as e:
+        messages.error(request, f"Error exporting assignments: {str(e)}")
+        return redirect('inventory:assignment_list')
+
+def handle_bulk_export_dispatcher(request):
+    """Handle bulk export - works with your existing system"""
+    try:
+        item_type = request.POST.get('export_type', 'devices')
+        selected_ids = request.POST.getlist('device_ids') or request.POST.getlist('assignment_ids')
+        
+        if not selected_ids:
+            messages.error(request, 'No items selected for export.')
+            return redirect('inventory:device_list')
+        
+        if item_type == 'devices':
+            return export_selected_devices(request, selected_ids)
+        elif item_type == 'assignments':
+            return export_selected_assignments(request, selected_ids)
+        else:
+            messages.error(request, 'Invalid export type.')
+            return redirect('inventory:device_list')
+            
+    except Exception as e:
+        messages.error(request, f'Error exporting data: {str(e)}')
+        return redirect('inventory:device_list')
+
+
+def export_selected_devices(request, device_ids):
+    """Export selected devices to CSV"""
+    try:
+        devices = Device.objects.filter(device_id__in=device_ids).select_related(
+            'category', 'subcategory', 'device_type', 'vendor', 'current_location'
+        )
+        
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="selected_devices_export.csv"'
+        
+        writer = csv.writer(response)
+        
+        # Write header (matching your existing export structure)
+        writer.writerow([
+            'Device ID', 'Asset Tag', 'Device Name', 'Category', 'Subcategory',
+            'Device Type', 'Brand', 'Model', 'Serial Number', 'Status',
+            'Condition', 'Current Location', 'Purchase Date', 'Purchase Price',
+            'Vendor', 'Warranty Start', 'Warranty End'
+        ])
+        
+        # Write device data
+        for device in devices:
+            writer.writerow([
+                device.device_id,
+                device.asset_tag,
+                device.device_name,
+                device.category.name if device.category else '',
+                device.subcategory.name if device.subcategory else '',
+                device.device_type.name if device.device_type else '',
+                device.brand,
+                device.model,
+                device.serial_number,
+                device.get_status_display(),
+                device.get_condition_display(),
+                str(device.current_location) if device.current_location else '',
+                device.purchase_date,
+                device.purchase_price,
+                device.vendor.name if device.vendor else '',
+                device.warranty_start_date,
+                device.warranty_end_date,
+            ])
+        
+        messages.success(request, f'Exported {devices.count()} devices successfully.')
+        return response
+        
+    except Exception as e:
+        messages.error(request, f'Error exporting devices: {str(e)}')
+        return redirect('inventory:device_list')
+
+
+def export_selected_assignments(request, assignment_ids):
+    """Export selected assignments to CSV"""
+    try:
+        assignments = Assignment.objects.filter(assignment_id__in=assignment_ids).select_related(
+            'device', 'assigned_to', 'assigned_by'
+        )
+        
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="selected_assignments_export.csv"'
+        
+        writer = csv.writer(response)
+        
+        # Write header
+        writer.writerow([
+            'Assignment ID', 'Device ID', 'Device Name', 'Assigned To', 'Assignment Type',
+            'Assignment Date', 'Expected Return', 'Actual Return', 'Status', 'Assigned By'
+        ])
+        
+        # Write assignment data
+        for assignment in assignments:
+            writer.writerow([
+                assignment.assignment_id,
+                assignment.device.device_id,
+                assignment.device.device_name,
+                assignment.assigned_to.full_name,
+                assignment.get_assignment_type_display(),
+                assignment.assignment_date,
+                assignment.expected_return_date,
+                assignment.actual_return_date,
+                'Active' if assignment.is_active else 'Returned',
+                assignment.assigned_by.username if assignment.assigned_by else '',
+            ])
+        
+        messages.success(request, f'Exported {assignments.count()} assignments successfully.')
+        return response
+        
+    except Exception as e:
+        messages.error(request, f'Error exporting assignments: {str(e)}')
+        return redirect('inventory:assignment_list')
+
+# ================================
+# IMPORT/EXPORT VIEWS - HIGH PRIORITY
+# ================================
+
+@login_required
+@permission_required('inventory.add_device', raise_exception=True)
+def import_devices_csv(request):
+    """Import devices from CSV/Excel file"""
+    import pandas as pd
+    
+    if request.method == 'POST':
+        form = CSVImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                csv_file = request.FILES['csv_file']
+                skip_header = form.cleaned_data['skip_header']
+                update_existing = form.cleaned_data['update_existing']
+                
+                # Validate file size (10MB limit)
+                if csv_file.size > 10 * 1024 * 1024:
+                    messages.error(request, "File size exceeds 10MB limit.")
+                    return render(request, 'inventory/import_devices.html', {'form': form})
+                
+                # Read file based on extension
+                file_extension = csv_file.name.split('.')[-1].lower()
+                
+                if file_extension == 'csv':
+                    # Read CSV file
+                    df = pd.read_csv(csv_file, skip_blank_lines=True)
+                elif file_extension in ['xlsx', 'xls']:
+                    # Read Excel file
+                    df = pd.read_excel(csv_file, engine='openpyxl' if file_extension == 'xlsx' else 'xlrd')
+                else:
+                    messages.error(request, "Unsupported file format. Please upload CSV or Excel file.")
+                    return render(request, 'inventory/import_devices.html', {'form': form})
+                
+                if skip_header:
+                    df = df.iloc[1:]  # Skip first row
+                
+                # Process the data
+                success_count = 0
+                error_count = 0
+                errors = []
+                
+                # Expected column mapping (case-insensitive)
+                column_mapping = {
+                    'asset_tag': ['asset_tag', 'asset tag', 'tag'],
+                    'device_name': ['device_name', 'device name', 'name'],
+                    'device_type': ['device_type', 'device type', 'type'],
+                    'brand': ['brand', 'manufacturer'],
+                    'model': ['model'],
+                    'serial_number': ['serial_number', 'serial number', 'serial'],
+                    'purchase_date': ['purchase_date', 'purchase date'],
+                    'purchase_price': ['purchase_price', 'purchase price', 'price'],
+                    'vendor': ['vendor', 'supplier'],
+                    'warranty_end_date': ['warranty_end_date', 'warranty end', 'warranty'],
+                    'status': ['status'],
+                    'condition': ['condition'],
+                    'notes': ['notes', 'description', 'remarks']
+                }
+                
+                # Map actual columns to expected fields
+                df_columns = [col.lower().strip() for col in df.columns]
+                field_mapping = {}
+                
+                for field, possible_names in column_mapping.items():
+                    for possible_name in possible_names:
+                        if possible_name.lower() in df_columns:
+                            actual_column = df.columns[df_columns.index(possible_name.lower())]
+                            field_mapping[field] = actual_column
+                            break
+                
+                # Reserve IDs for the new devices up front, outside the import
+                # transaction, so concurrent imports don't queue on the counter
+                new_device_ids = reserve_device_ids(len(df), user=request.user, purpose=f'import {csv_file.name}') if len(df) else iter(())
+                
+                # Process each row
+                with transaction.atomic():
+                    for index, row in df.iterrows():
+                        try:
+                            # Extract device data
+                            device_data = {}
+                            
+                            # Required fields
+                            device_name = row.get(field_mapping.get('device_name', ''), '').strip()
+                            if not device_name:
+                                error_count += 1
+                                errors.append(f"Row {index + 1}: Device name is required")
+                                continue
+                            
+                            device_data['device_name'] = device_name
+                            
+                            # Optional fields
+                            if 'asset_tag' in field_mapping:
+                                device_data['asset_tag'] = str(row.get(field_mapping['asset_tag'], '')).strip()
+                            
+                            if 'brand' in field_mapping:
+                                device_data['brand'] = str(row.get(field_mapping['brand'], '')).strip()
+                            
+                            if 'model' in field_mapping:
+                                device_data['model'] = str(row.get(field_mapping['model'], '')).strip()
+                            
+                            if 'serial_number' in field_mapping:
+                                device_data['serial_number'] = str(row.get(field_mapping['serial_number'], '')).strip()
+                            
+                            # Handle device type
+                            if 'device_type' in field_mapping:
+                                device_type_name = str(row.get(field_mapping['device_type'], '')).strip()
+                                if device_type_name:
+                                    try:
+                                        device_type = DeviceType.objects.get(name__icontains=device_type_name)
+                                        device_data['device_type'] = device_type
+                                    except DeviceType.DoesNotExist:
+                                        # Create default device type if not found
+                                        default_category, _ = DeviceCategory.objects.get_or_create(
+                                            name='General',
+                                            defaults={'category_type': 'OTHER'}
+                                        )
+                                        default_subcategory, _ = DeviceSubCategory.objects.get_or_create(
+                                            category=default_category,
+                                            name='General',
+                                            defaults={'code': 'GEN'}
+                                        )
+                                        device_type, _ = DeviceType.objects.get_or_create(
+                                            subcategory=default_subcategory,
+                                            name=device_type_name,
+                                            defaults={'code': device_type_name[:10].upper()}
+                                        )
+                                        device_data['device_type'] = device_type
+                            
+                            # Handle vendor
+                            if 'vendor' in field_mapping:
+                                vendor_name = str(row.get(field_mapping['vendor'], '')).strip()
+                                if vendor_name:
+                                    vendor, _ = Vendor.objects.get_or_create(
+                                        name=vendor_name,
+                                        defaults={'vendor_code': vendor_name[:10].upper()}
+                                    )
+                                    device_data['vendor'] = vendor
+                            
+                            # Handle dates
+                            for date_field in ['purchase_date', 'warranty_end_date']:
+                                if date_field in field_mapping:
+                                    date_value = row.get(field_mapping[date_field])
+                                    if pd.notna(date_value):
+                                        try:
+                                            if isinstance(date_value, str):
+                                                parsed_date = pd.to_datetime(date_value, errors='coerce')
+                                                if pd.notna(parsed_date):
+                                                    device_data[date_field] = parsed_date.date()
+                                            else:
+                                                device_data[date_field] = date_value
+                                        except:
+                                            pass
+                            
+                            # Handle numeric fields
+                            if 'purchase_price' in field_mapping:
+                                price_value = row.get(field_mapping['purchase_price'])
+                                if pd.notna(price_value):
+                                    try:
+                                        device_data['purchase_price'] = float(price_value)
+                                    except (ValueError, TypeError):
+                                        pass
+                            
+                            # Handle status and condition
+                            if 'status' in field_mapping:
+                                status_value = str(row.get(field_mapping['status'], '')).strip().upper()
+                                valid_statuses = [choice[0] for choice in Device.STATUS_CHOICES]
+                                if status_value in valid_statuses:
+                                    device_data['status'] = status_value
+                                else:
+                                    device_data['status'] = 'AVAILABLE'  # Default
+                            
+                            if 'condition' in field_mapping:
+                                condition_value = str(row.get(field_mapping['condition'], '')).strip().upper()
+                                valid_conditions = [choice[0] for choice in Device.CONDITION_CHOICES]
+                                if condition_value in valid_conditions:
+                                    device_data['device_condition'] = condition_value
+                                else:
+                                    device_data['device_condition'] = 'GOOD'  # Default
+                            
+                            if 'notes' in field_mapping:
+                                device_data['notes'] = str(row.get(field_mapping['notes'], '')).strip()
+                            
+                            # Check if device exists (for updates)
+                            existing_device = None
+                            if update_existing and device_data.get('asset_tag'):
+                                try:
+                                    existing_device = Device.objects.get(asset_tag=device_data['asset_tag'])
+                                except Device.DoesNotExist:
+                                    pass
+                            
+                            if existing_device and update_existing:
+                                # Update existing device
+                                for field, value in device_data.items():
+                                    if value:  # Only update non-empty values
+                                        setattr(existing_device, field, value)
+                                existing_device.save()
+                                success_count += 1
+                            else:
+                                # Create new device
+                                device_data['device_id'] = next(new_device_ids)
+                                if not device_data.get('asset_tag'):
+                                    # Generated IDs are unique, so they double as asset tags
+                                    device_data['asset_tag'] = device_data['device_id']
+                                
+                                # Set defaults
+                                device_data.setdefault('status', 'AVAILABLE')
+                                device_data.setdefault('device_condition', 'GOOD')
+                                device_data['created_by'] = request.user
+                                device_data['updated_by'] = request.user
+                                
+                                device = Device.objects.create(**device_data)
+                                success_count += 1
+                        
+                        except Exception as e:
+                            error_count += 1
+                            errors.append(f"Row {index + 1}: {str(e)}")
+                
+                # Summary message
+                if success_count > 0:
+                    messages.success(request, f"Successfully imported {success_count} devices.")
+                
+                if error_count > 0:
+                    messages.warning(request, f"{error_count} rows had errors.")
+                    for error in errors[:10]:  # Show first 10 errors
+                        messages.error(request, error)
+                    if len(errors) > 10:
+                        messages.error(request, f"... and {len(errors) - 10} more errors.")
+                
+                return redirect('inventory:device_list')
+                
+            except Exception as e:
+                messages.error(request, f"Error processing file: {str(e)}")
+    else:
+        form = CSVImportForm()
+    
+    return render(request, 'inventory/import_devices.html', {
+        'form': form,
+        'title': 'Import Devices from CSV/Excel'
+    })
+
+@login_required
+@permission_required('inventory.add_staff', raise_exception=True)
+def import_staff_csv(request):
+    """Import staff from CSV/Excel file"""
+    import pandas as pd
+    
+    if request.method == 'POST':
+        form = CSVImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                csv_file = request.FILES['csv_file']
+                skip_header = form.cleaned_data['skip_header']
+                update_existing = form.cleaned_data['update_existing']
+                
+                # Validate file size
+                if csv_file.size > 10 * 1024 * 1024:
+                    messages.error(request, "File size exceeds 10MB limit.")
+                    return render(request, 'inventory/import_staff.html', {'form': form})
+                
+                # Read file
+                file_extension = csv_file.name.split('.')[-1].lower()
+                
+                if file_extension == 'csv':
+                    df = pd.read_csv(csv_file, skip_blank_lines=True)
+                elif file_extension in ['xlsx', 'xls']:
+                    df = pd.read_excel(csv_file, engine='openpyxl' if file_extension == 'xlsx' else 'xlrd')
+                else:
+                    messages.error(request, "Unsupported file format.")
+                    return render(request, 'inventory/import_staff.html', {'form': form})
+                
+                if skip_header:
+                    df = df.iloc[1:]
+                
+                success_count = 0
+                error_count = 0
+                errors = []
+                
+                # Column mapping for staff
+                column_mapping = {
+                    'employee_id': ['employee_id', 'emp_id', 'id'],
+                    'first_name': ['first_name', 'first name', 'fname'],
+                    'last_name': ['last_name', 'last name', 'lname'],
+                    'email': ['email', 'email_address'],
+                    'phone': ['phone', 'mobile', 'contact'],
+                    'designation': ['designation', 'position', 'title'],
+                    'department': ['department', 'dept'],
+                    'reporting_manager': ['reporting_manager', 'manager'],
+                    'hire_date': ['hire_date', 'joining_date', 'start_date']
+                }
+                
+                # Map columns
+                df_columns = [col.lower().strip() for col in df.columns]
+                field_mapping = {}
+                
+                for field, possible_names in column_mapping.items():
+                    for possible_name in possible_names:
+                        if possible_name.lower() in df_columns:
+                            actual_column = df.columns[df_columns.index(possible_name.lower())]
+                            field_mapping[field] = actual_column
+                            break
+                
+                # Process rows
+                with transaction.atomic():
+                    for index, row in df.iterrows():
+                        try:
+                            staff_data = {}
+                            
+                            # Required fields
+                            employee_id = str(row.get(field_mapping.get('employee_id', ''), '')).strip()
+                            first_name = str(row.get(field_mapping.get('first_name', ''), '')).strip()
+                            last_name = str(row.get(field_mapping.get('last_name', ''), '')).strip()
+                            
+                            if not employee_id or not first_name or not last_name:
+                                error_count += 1
+                                errors.append(f"Row {index + 1}: Employee ID, first name, and last name are required")
+                                continue
+                            
+                            staff_data.update({
+                                'employee_id': employee_id,
+                                'first_name': first_name,
+                                'last_name': last_name
+                            })
+                            
+                            # Optional fields
+                            for field in ['email', 'phone', 'designation']:
+                                if field in field_mapping:
+                                    value = str(row.get(field_mapping[field], '')).strip()
+                                    if value:
+                                        staff_data[field] = value
+                            
+                            # Handle department
+                            if 'department' in field_mapping:
+                                dept_name = str(row.get(field_mapping['department'], '')).strip()
+                                if dept_name:
+                                    department, _ = Department.objects.get_or_create(
+                                        name=dept_name,
+                                        defaults={'code': dept_name[:10].upper()}
+                                    )
+                                    staff_data['department'] = department
+                            
+                            # Handle hire date
+                            if 'hire_date' in field_mapping:
+                                date_value = row.get(field_mapping['hire_date'])
+                                if pd.notna(date_value):
+                                    try:
+                                        if isinstance(date_value, str):
+                                            parsed_date = pd.to_datetime(date_value, errors='coerce')
+                                            if pd.notna(parsed_date):
+                                                staff_data['hire_date'] = parsed_date.date()
+                                        else:
+                                            staff_data['hire_date'] = date_value
+                                    except:
+                                        pass
+                            
+                            # Check for existing staff
+                            existing_staff = None
+                            if update_existing:
+                                try:
+                                    existing_staff = Staff.objects.get(employee_id=employee_id)
+                                except Staff.DoesNotExist:
+                                    pass
+                            
+                            if existing_staff and update_existing:
+                                # Update existing
+                                for field, value in staff_data.items():
+                                    if value:
+                                        setattr(existing_staff, field, value)
+                                existing_staff.save()
+                                success_count += 1
+                            else:
+                                # Create new
+                                staff_data.setdefault('is_active', True)
+                                staff = Staff.objects.create(**staff_data)
+                                success_count += 1
+                        
+                        except Exception as e:
+                            error_count += 1
+                            errors.append(f"Row {index + 1}: {str(e)}")
+                
+                # Summary
+                if success_count > 0:
+                    messages.success(request, f"Successfully imported {success_count} staff members.")
+                
+                if error_count > 0:
+                    messages.warning(request, f"{error_count} rows had errors.")
+                    for error in errors[:10]:
+                        messages.error(request, error)
+                
+                return redirect('inventory:staff_list')
+                
+            except Exception as e:
+                messages.error(request, f"Error processing file: {str(e)}")
+    else:
+        form = CSVImportForm()
+    
+    return render(request, 'inventory/import_staff.html', {
+        'form': form,
+        'title': 'Import Staff from CSV/Excel'
+    })
+
+@login_required
+def export_maintenance_csv(request):
+    """Export maintenance schedules to CSV"""
+    try:
+        # Get filter parameters
+        status = request.GET.get('status')
+        vendor = request.GET.get('vendor')
+        date_from = request.GET.get('date_from')
+        date_to = request.GET.get('date_to')
+        
+        # Base queryset
+        maintenance = MaintenanceSchedule.objects.select_related(
+            'device', 'vendor', 'created_by'
+        )
+        
+        # Apply filters
+        if status:
+            maintenance = maintenance.filter(status=status)
+        if vendor:
+            maintenance = maintenance.filter(vendor_id=vendor)
+        if date_from:
+            maintenance = maintenance.filter(scheduled_date__gte=date_from)
+        if date_to:
+            maintenance = maintenance.filter(scheduled_date__lte=date_to)
+        
+        # Create CSV response
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="maintenance_export.csv"'
+        
+        writer = csv.writer(response)
+        writer.writerow([
+            'Maintenance ID', 'Device ID', 'Device Name', 'Maintenance Type', 'Status',
+            'Scheduled Date', 'Completed Date', 'Vendor', 'Cost', 'Description',
+            'Notes', 'Created Date', 'Created By'
+        ])
+        
+        for item in maintenance:
+            writer.writerow([
+                item.id,
+                item.device.device_id,
+                item.device.device_name,
+                item.get_maintenance_type_display(),
+                item.get_status_display(),
+                item.scheduled_date.strftime('%Y-%m-%d') if item.scheduled_date else '',
+                item.completed_date.strftime('%Y-%m-%d') if item.completed_date else '',
+                item.vendor.name if item.vendor else '',
+                item.cost,
+                item.description,
+                item.notes or '',
+                item.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                item.created_by.username
+            ])
+        
+        return response
+        
+    except Exception as e:
+        messages.error(request, f"Error exporting maintenance: {str(e)}")
+        return redirect('inventory:maintenance_list')
+    
@@ -0,0 +1,1271 @@
+# inventory/views/locations.py - Location Views
+"""Locations and the building/block/floor/room hierarchy."""
+
+# Django core imports
+from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse
+from django.core.paginator import Paginator
+from django.core.exceptions import ValidationError
+from ..hierarchy_rollup import attach_rollups, get_rollup
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+
+# Django DB imports
+from django.db.models import Count, Q, Sum, Prefetch
+
+# Model imports
+from ..models import (
+    Device, Assignment, Department, Location, Room, Building, Block, Floor,
+    HierarchyRollup,
+)
+from ..forms import LocationForm, BlockForm, FloorForm
+
+# Django core imports
+from django import forms
+
+# ================================
+# LOCATION MANAGEMENT VIEWS
+# ================================
+
+@login_required
+@permission_required('inventory.view_location', raise_exception=True)
+def location_list(request):
+    """Enhanced location list with full block hierarchy support"""
+    try:
+        # Get filter parameters
+        search = request.GET.get('search', '')
+        building_filter = request.GET.get('building', '')
+        block_filter = request.GET.get('block', '')
+        floor_filter = request.GET.get('floor', '')
+        department_filter = request.GET.get('department', '')
+        room_filter = request.GET.get('room', '')
+        is_active_filter = request.GET.get('is_active', '')
+        sort_by = request.GET.get('sort', 'building__name')
+        
+        # Base queryset with proper relationships including block
+        locations = Location.objects.select_related(
+            'building', 'block', 'floor', 'department', 'room'
+        ).annotate(
+            device_count=Count('device_assignments'),
+            active_assignments=Count('device_assignments', filter=Q(device_assignments__status='ASSIGNED'))
+        )
+        
+        # Search functionality across all hierarchy levels
+        if search:
+            locations = locations.filter(
+                Q(building__name__icontains=search) |
+                Q(building__code__icontains=search) |
+                Q(block__name__icontains=search) |
+                Q(block__code__icontains=search) |
+                Q(floor__name__icontains=search) |
+                Q(department__name__icontains=search) |
+                Q(department__code__icontains=search) |
+                Q(room__room_number__icontains=search) |
+                Q(room__room_name__icontains=search) |
+                Q(description__icontains=search)
+            )
+        
+        # Apply hierarchical filters
+        if building_filter:
+            locations = locations.filter(building_id=building_filter)
+        if block_filter:
+            locations = locations.filter(block_id=block_filter)
+        if floor_filter:
+            locations = locations.filter(floor_id=floor_filter)
+        if department_filter:
+            locations = locations.filter(department_id=department_filter)
+        if room_filter:
+            locations = locations.filter(room_id=room_filter)
+        if is_active_filter:
+            locations = locations.filter(is_active=is_active_filter == 'true')
+        
+        # Sorting with block support
+        valid_sort_fields = [
+            'building__name', 'block__name', 'floor__floor_number', 
+            'department__name', 'room__room_number', '-created_at',
+            'device_count', '-device_count', 'active_assignments', '-active_assignments'
+        ]
+        if sort_by in valid_sort_fields:
+            locations = locations.order_by(sort_by)
+        else:
+            locations = locations.order_by('building__name', 'block__name', 'floor__floor_number', 'department__name')
+        
+        # Pagination
+        paginator = Paginator(locations, 15)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        # Get data for filter dropdowns with block hierarchy
+        buildings = Building.objects.filter(is_active=True).order_by('name')
+        blocks = Block.objects.filter(is_active=True).order_by('building__name', 'name')
+        floors = Floor.objects.filter(is_active=True).order_by('building__name', 'block__name', 'floor_number')
+        departments = Department.objects.filter(is_active=True).order_by('name')
+        rooms = Room.objects.filter(is_active=True).order_by('department__name', 'room_number')
+        
+        # Statistics
+        total_locations = locations.count()
+        active_locations = locations.filter(is_active=True).count()
+        total_devices = locations.aggregate(total=Sum('device_count'))['total'] or 0
+        total_active_assignments = locations.aggregate(total=Sum('active_assignments'))['total'] or 0
+        
+        # Block-wise statistics
+        block_stats = blocks.annotate(
+            location_count=Count('locations'),
+            device_count=Count('locations__device_assignments')
+        ).order_by('building__name', 'name')[:10]
+        
+        context = {
+            'page_obj': page_obj,
+            'locations': page_obj.object_list,
+            'buildings': buildings,
+            'blocks': blocks,
+            'floors': floors,
+            'departments': departments,
+            'rooms': rooms,
+            'block_stats': block_stats,
+            'total_locations': total_locations,
+            'active_locations': active_locations,
+            'total_devices': total_devices,
+            'total_active_assignments': total_active_assignments,
+            'current_filters': {
+                'building': building_filter,
+                'block': block_filter,
+                'floor': floor_filter,
+                'department': department_filter,
+                'room': room_filter,
+                'is_active': is_active_filter,
+                'search': search,
+                'sort': sort_by,
+            },
+            'title': 'Location Management',
+        }
+        
+        return render(request, 'inventory/locations/location_list.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading locations: {str(e)}")
+        return render(request, 'inventory/locations/location_list.html', {'locations': [], 'error': str(e)})
+
+@login_required
+@permission_required('inventory.view_location', raise_exception=True)
+def location_detail(request, location_id):
+    """Enhanced location detail with full block hierarchy display"""
+    try:
+        location = get_object_or_404(
+            Location.objects.select_related(
+                'building', 'block', 'floor', 'department', 'room'
+            ),
+            id=location_id
+        )
+        
+        # Current assignments at this location
+        current_assignments = Assignment.objects.filter(
+            location=location,
+            status='ASSIGNED'
+        ).select_related(
+            'device', 'device__device_type', 'staff__user'
+        ).order_by('-assigned_date')
+        
+        # Assignment history for this location
+        assignment_history = Assignment.objects.filter(
+            location=location
+        ).select_related(
+            'device', 'device__device_type', 'staff__user'
+        ).order_by('-assigned_date')[:20]
+        
+        # Devices ever assigned to this location
+        devices_history = Device.objects.filter(
+            assignments__location=location
+        ).distinct().select_related('device_type').order_by('asset_tag')
+        
+        # Statistics
+        total_assignments = assignment_history.count()
+        active_assignments = current_assignments.count()
+        
+        # Device type breakdown
+        device_types = current_assignments.values(
+            'device__device_type__name'
+        ).annotate(
+            count=Count('id'),
+            total_value=Sum('device__purchase_price')
+        ).order_by('-count')
+        
+        # Total value of current assignments
+        total_current_value = current_assignments.aggregate(
+            total=Sum('device__purchase_price')
+        )['total'] or 0
+        
+        # Location hierarchy breadcrumb
+        hierarchy_path = []
+        if location.building:
+            hierarchy_path.append(('Building', location.building.name, 'inventory:building_detail', location.building.id))
+        if location.block:
+            hierarchy_path.append(('Block', location.block.name, 'inventory:block_detail', location.block.id))
+        if location.floor:
+            hierarchy_path.append(('Floor', location.floor.name, 'inventory:floor_detail', location.floor.id))
+        if location.department:
+            hierarchy_path.append(('Department', location.department.name, 'inventory:department_detail', location.department.id))
+        if location.room:
+            hierarchy_path.append(('Room', f"{location.room.room_number} - {location.room.room_name}", 'inventory:room_detail', location.room.id))
+        
+        # Nearby locations (same department)
+        nearby_locations = Location.objects.filter(
+            department=location.department,
+            is_active=True
+        ).exclude(id=location.id).select_related('room')[:5]
+        
+        context = {
+            'location': location,
+            'current_assignments': current_assignments,
+            'assignment_history': assignment_history,
+            'devices_history': devices_history,
+            'device_types': device_types,
+            'nearby_locations': nearby_locations,
+            'hierarchy_path': hierarchy_path,
+            'total_assignments': total_assignments,
+            'active_assignments': active_assignments,
+            'total_current_value': total_current_value,
+            'title': f'Location: {str(location)}',
+        }
+        
+        return render(request, 'inventory/locations/location_detail.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading location details: {str(e)}")
+        return redirect('inventory:location_list')
+
+@login_required
+@permission_required('inventory.add_location', raise_exception=True)
+def location_create(request):
+    """Create new location with block hierarchy support"""
+    if request.method == 'POST':
+        form = LocationForm(request.POST)
+        if form.is_valid():
+            try:
+                # Validate hierarchy consistency
+                building = form.cleaned_data.get('building')
+                block = form.cleaned_data.get('block')
+                floor = form.cleaned_data.get('floor')
+                department = form.cleaned_data.get('department')
+                room = form.cleaned_data.get('room')
+                
+                # Validate block belongs to building
+                if block and building and block.building != building:
+                    form.add_error('block', 'Selected block does not belong to the selected building.')
+                    raise ValidationError("Hierarchy validation failed")
+                
+                # Validate floor belongs to block
+                if floor and block and floor.block != block:
+                    form.add_error('floor', 'Selected floor does not belong to the selected block.')
+                    raise ValidationError("Hierarchy validation failed")
+                
+                # Validate department belongs to floor
+                if department and floor and department.floor != floor:
+                    form.add_error('department', 'Selected department does not belong to the selected floor.')
+                    raise ValidationError("Hierarchy validation failed")
+                
+                # Validate room belongs to department
+                if room and department and room.department != department:
+                    form.add_error('room', 'Selected room does not belong to the selected department.')
+                    raise ValidationError("Hierarchy validation failed")
+                
+                # Check for duplicate location
+                existing_location = Location.objects.filter(
+                    building=building,
+                    block=block,
+                    floor=floor,
+                    department=department,
+                    room=room
+                ).first()
+                
+                if existing_location:
+                    messages.error(request, 'A location with this exact hierarchy already exists.')
+                    raise ValidationError("Duplicate location")
+                
+                location = form.save()
+                messages.success(request, f'Location "{location}" created successfully.')
+                return redirect('inventory:location_detail', location_id=location.id)
+                
+            except ValidationError:
+                pass  # Form errors already added
+            except Exception as e:
+                messages.error(request, f'Error creating location: {str(e)}')
+    else:
+        form = LocationForm()
+        
+        # Pre-populate from URL parameters for hierarchy drill-down
+        building_id = request.GET.get('building')
+        block_id = request.GET.get('block')
+        floor_id = request.GET.get('floor')
+        department_id = request.GET.get('department')
+        room_id = request.GET.get('room')
+        
+        if building_id:
+            form.fields['building'].initial = building_id
+        if block_id:
+            form.fields['block'].initial = block_id
+        if floor_id:
+            form.fields['floor'].initial = floor_id
+        if department_id:
+            form.fields['department'].initial = department_id
+        if room_id:
+            form.fields['room'].initial = room_id
+    
+    # Get hierarchy data for cascade dropdowns
+    buildings = Building.objects.filter(is_active=True).order_by('name')
+    
+    context = {
+        'form': form,
+        'buildings': buildings,
+        'title': 'Add New Location',
+        'form_action': 'Create',
+    }
+    
+    return render(request, 'inventory/locations/location_form.html', context)
+
+@login_required
+@permission_required('inventory.change_location', raise_exception=True)
+def location_edit(request, location_id):
+    """Edit existing location with block hierarchy validation"""
+    location = get_object_or_404(Location, id=location_id)
+    
+    if request.method == 'POST':
+        form = LocationForm(request.POST, instance=location)
+        if form.is_valid():
+            try:
+                # Validate hierarchy consistency (same as create)
+                building = form.cleaned_data.get('building')
+                block = form.cleaned_data.get('block')
+                floor = form.cleaned_data.get('floor')
+                department = form.cleaned_data.get('department')
+                room = form.cleaned_data.get('room')
+                
+                # Validate block belongs to building
+                if block and building and block.building != building:
+                    form.add_error('block', 'Selected block does not belong to the selected building.')
+                    raise ValidationError("Hierarchy validation failed")
+                
+                # Validate floor belongs to block
+                if floor and block and floor.block != block:
+                    form.add_error('floor', 'Selected floor does not belong to the selected block.')
+                    raise ValidationError("Hierarchy validation failed")
+                
+                # Validate department belongs to floor
+                if department and floor and department.floor != floor:
+                    form.add_error('department', 'Selected department does not belong to the selected floor.')
+                    raise ValidationError("Hierarchy validation failed")
+                
+                # Validate room belongs to department
+                if room and department and room.department != department:
+                    form.add_error('room', 'Selected room does not belong to the selected department.')
+                    raise ValidationError("Hierarchy validation failed")
+                
+                # Check for duplicate location (excluding current)
+                existing_location = Location.objects.filter(
+                    building=building,
+                    block=block,
+                    floor=floor,
+                    department=department,
+                    room=room
+                ).exclude(id=location.id).first()
+                
+                if existing_location:
+                    messages.error(request, 'A location with this exact hierarchy already exists.')
+                    raise ValidationError("Duplicate location")
+                
+                # Check if location has active assignments before major changes
+                active_assignments = Assignment.objects.filter(
+                    location=location,
+                    status='ASSIGNED'
+                ).count()
+                
+                if active_assignments > 0:
+                    # Check if hierarchy changed significantly
+                    if (location.building != building or location.block != block or 
+                        location.floor != floor or location.department != department):
+                        messages.warning(
+                            request, 
+                            f'Warning: This location has {active_assignments} active device assignments. '
+                            'Consider transferring devices before major location changes.'
+                        )
+                
+                location = form.save()
+                messages.success(request, f'Location "{location}" updated successfully.')
+                return redirect('inventory:location_detail', location_id=location.id)
+                
+            except ValidationError:
+                pass  # Form errors already added
+            except Exception as e:
+                messages.error(request, f'Error updating location: {str(e)}')
+    else:
+        form = LocationForm(instance=location)
+    
+    # Get hierarchy data for cascade dropdowns
+    buildings = Building.objects.filter(is_active=True).order_by('name')
+    
+    # Get active assignments for warning
+    active_assignments = Assignment.objects.filter(
+        location=location,
+        status='ASSIGNED'
+    ).count()
+    
+    context = {
+        'form': form,
+        'location': location,
+        'buildings': buildings,
+        'active_assignments': active_assignments,
+        'title': f'Edit Location: {location}',
+        'form_action': 'Update',
+    }
+    
+    return render(request, 'inventory/locations/location_form.html', context)
+
+@login_required
+@permission_required('inventory.delete_location', raise_exception=True)
+def location_delete(request, location_id):
+    """Delete location with safety checks"""
+    location = get_object_or_404(Location, id=location_id)
+    
+    if request.method == 'POST':
+        try:
+            # Check for active assignments
+            active_assignments = Assignment.objects.filter(
+                location=location,
+                status='ASSIGNED'
+            ).count()
+            
+            if active_assignments > 0:
+                messages.error(
+                    request, 
+                    f'Cannot delete location "{location}": {active_assignments} active device assignments exist. '
+                    'Please return or transfer all devices first.'
+                )
+                return redirect('inventory:location_detail', location_id=location.id)
+            
+            # Check for assignment history
+            total_assignments = Assignment.objects.filter(location=location).count()
+            
+            if total_assignments > 0:
+                # Ask for confirmation if there's assignment history
+                confirm = request.POST.get('confirm_delete')
+                if not confirm:
+                    messages.warning(
+                        request,
+                        f'Location "{location}" has {total_assignments} assignment records in history. '
+                        'Are you sure you want to delete it? This action cannot be undone.'
+                    )
+                    return redirect('inventory:location_detail', location_id=location.id)
+            
+            location_name = str(location)
+            location.delete()
+            messages.success(request, f'Location "{location_name}" deleted successfully.')
+            return redirect('inventory:location_list')
+            
+        except Exception as e:
+            messages.error(request, f'Error deleting location: {str(e)}')
+            return redirect('inventory:location_detail', location_id=location.id)
+    
+    return redirect('inventory:location_detail', location_id=location.id)
+
+# ================================
+# LOCATION HIERARCHY UTILITIES
+# ================================
+
+@login_required
+def location_hierarchy_overview(request):
+    """Display complete location hierarchy with block support"""
+    try:
+        # Active hierarchy in one query per level; statistics from the rollups
+        buildings = Building.objects.filter(is_active=True).prefetch_related(
+            Prefetch('blocks', queryset=Block.objects.filter(is_active=True)),
+            Prefetch('blocks__floors', queryset=Floor.objects.filter(is_active=True)),
+            Prefetch('blocks__floors__departments', queryset=Department.objects.filter(is_active=True)),
+            Prefetch('blocks__floors__departments__rooms', queryset=Room.objects.filter(is_active=True)),
+        ).order_by('name')
+        buildings = attach_rollups(buildings, 'BUILDING')
+        for building in buildings:
+            building.total_floors = building.rollup.floors
+            building.total_rooms = building.rollup.rooms
+        
+        system_rollup = get_rollup('SYSTEM')
+        
+        context = {
+            'buildings': buildings,
+            'total_buildings': system_rollup.buildings,
+            'total_blocks': system_rollup.blocks,
+            'total_floors': system_rollup.floors,
+            'total_departments': system_rollup.departments,
+            'total_rooms': system_rollup.rooms,
+            'total_locations': system_rollup.locations,
+            'active_assignments': system_rollup.active_assignments,
+            'utilization_rate': round(
+                system_rollup.active_assignments * 100 / system_rollup.devices
+            ) if system_rollup.devices else 0,
+            'title': 'Location Hierarchy Overview',
+        }
+        
+        return render(request, 'inventory/locations/hierarchy_overview.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading hierarchy overview: {str(e)}")
+        return redirect('inventory:location_list')
+
+# ================================
+# BUILDING MANAGEMENT VIEWS
+# ================================
+
+@login_required
+@permission_required('inventory.view_building', raise_exception=True)
+def building_list(request):
+    """Display list of all buildings with search and filtering"""
+    search = request.GET.get('search', '')
+    is_active_filter = request.GET.get('is_active', '')
+    sort_by = request.GET.get('sort', 'name')
+    
+    buildings = Building.objects.all()
+    
+    # Search functionality
+    if search:
+        buildings = buildings.filter(
+            Q(name__icontains=search) |
+            Q(code__icontains=search) |
+            Q(address__icontains=search)
+        )
+    
+    # Filter by active status
+    if is_active_filter:
+        buildings = buildings.filter(is_active=is_active_filter == 'true')
+    
+    # Sorting
+    valid_sort_fields = ['name', 'code', '-created_at', 'created_at']
+    if sort_by in valid_sort_fields:
+        buildings = buildings.order_by(sort_by)
+    else:
+        buildings = buildings.order_by('name')
+    
+    # Pagination
+    paginator = Paginator(buildings, 12)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Per-building and header statistics come from the hierarchy rollups
+    page_obj.object_list = attach_rollups(page_obj.object_list, 'BUILDING')
+    system_rollup = get_rollup('SYSTEM')
+    
+    context = {
+        'page_obj': page_obj,
+        'buildings': page_obj.object_list,
+        'search': search,
+        'is_active_filter': is_active_filter,
+        'sort_by': sort_by,
+        'total_buildings': paginator.count,
+        'active_buildings': system_rollup.buildings,
+        'total_blocks': system_rollup.blocks,
+        'total_floors': system_rollup.floors,
+        'title': 'Building Management',
+    }
+    
+    return render(request, 'inventory/locations/building_list.html', context)
+
+@login_required
+@permission_required('inventory.view_building', raise_exception=True)
+def building_detail(request, building_id):
+    """Display detailed information about a building"""
+    building = get_object_or_404(Building, id=building_id)
+    
+    # Get related data
+    blocks = building.blocks.all().annotate(
+        floors_count=Count('floors'),
+        departments_count=Count('floors__departments')
+    )
+    
+    # Statistics
+    total_blocks = blocks.count()
+    total_floors = building.floors.count()
+    total_departments = building.departments.count()
+    total_locations = building.locations.count()
+    
+    context = {
+        'building': building,
+        'blocks': blocks,
+        'total_blocks': total_blocks,
+        'total_floors': total_floors,
+        'total_departments': total_departments,
+        'total_locations': total_locations,
+        'title': f'Building: {building.name}',
+    }
+    
+    return render(request, 'inventory/locations/building_detail.html', context)
+
+@login_required
+@permission_required('inventory.add_building', raise_exception=True)
+def building_create(request):
+    """Create a new building"""
+    if request.method == 'POST':
+        form = forms.BuildingForm(request.POST)
+        if form.is_valid():
+            try:
+                building = form.save()
+                messages.success(request, f'Building "{building.name}" created successfully.')
+                return redirect('inventory:building_detail', building_id=building.id)
+            except Exception as e:
+                messages.error(request, f'Error creating building: {str(e)}')
+    else:
+        form = forms.BuildingForm()
+    
+    context = {
+        'form': form,
+        'title': 'Add New Building',
+        'form_action': 'Create',
+    }
+    
+    return render(request, 'inventory/locations/building_form.html', context)
+
+@login_required
+@permission_required('inventory.change_building', raise_exception=True)
+def building_edit(request, building_id):
+    """Edit an existing building"""
+    building = get_object_or_404(Building, id=building_id)
+    
+    if request.method == 'POST':
+        form = forms.BuildingForm(request.POST, instance=building)
+        if form.is_valid():
+            try:
+                building = form.save()
+                messages.success(request, f'Building "{building.name}" updated successfully.')
+                return redirect('inventory:building_detail', building_id=building.id)
+            except Exception as e:
+                messages.error(request, f'Error updating building: {str(e)}')
+    else:
+        form = forms.BuildingForm(instance=building)
+    
+    context = {
+        'form': form,
+        'building': building,
+        'title': f'Edit Building: {building.name}',
+        'form_action': 'Update',
+    }
+    
+    return render(request, 'inventory/locations/building_form.html', context)
+
+@login_required
+@permission_required('inventory.delete_building', raise_exception=True)
+def building_delete(request, building_id):
+    """Delete a building"""
+    building = get_object_or_404(Building, id=building_id)
+    
+    if request.method == 'POST':
+        try:
+            building_name = building.name
+            building.delete()
+            messages.success(request, f'Building "{building_name}" deleted successfully.')
+            return redirect('inventory:building_list')
+        except Exception as e:
+            messages.error(request, f'Error deleting building: {str(e)}')
+            return redirect('inventory:building_detail', building_id=building.id)
+    
+    return redirect('inventory:building_detail', building_id=building.id)
+
+# ================================
+# BLOCK MANAGEMENT VIEWS
+# ================================
+
+@login_required
+@permission_required('inventory.view_block', raise_exception=True)
+def block_list(request):
+    """Display list of all blocks with search and filtering"""
+    search = request.GET.get('search', '')
+    building_filter = request.GET.get('building', '')
+    is_active_filter = request.GET.get('is_active', '')
+    sort_by = request.GET.get('sort', 'building__name')
+    
+    blocks = Block.objects.select_related('building')
+    
+    # Search functionality
+    if search:
+        blocks = blocks.filter(
+            Q(name__icontains=search) |
+            Q(code__icontains=search) |
+            Q(building__name__icontains=search)
+        )
+    
+    # Filter by building
+    if building_filter:
+        blocks = blocks.filter(building_id=building_filter)
+    
+    # Filter by active status
+    if is_active_filter:
+        blocks = blocks.filter(is_active=is_active_filter == 'true')
+    
+    # Sorting
+    valid_sort_fields = ['building__name', 'name', 'code', '-created_at']
+    if sort_by in valid_sort_fields:
+        blocks = blocks.order_by(sort_by)
+    else:
+        blocks = blocks.order_by('building__name', 'name')
+    
+    # Get buildings for filter dropdown
+    buildings = Building.objects.filter(is_active=True).order_by('name')
+    
+    # Pagination
+    paginator = Paginator(blocks, 12)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Per-block and header statistics come from the hierarchy rollups
+    page_obj.object_list = attach_rollups(page_obj.object_list, 'BLOCK')
+    system_rollup = get_rollup('SYSTEM')
+    
+    context = {
+        'page_obj': page_obj,
+        'blocks': page_obj.object_list,
+        'buildings': buildings,
+        'search': search,
+        'building_filter': building_filter,
+        'is_active_filter': is_active_filter,
+        'sort_by': sort_by,
+        'total_blocks': paginator.count,
+        'active_blocks': system_rollup.blocks,
+        'total_floors': system_rollup.floors,
+        'total_departments': system_rollup.departments,
+        'title': 'Block Management',
+    }
+    
+    return render(request, 'inventory/locations/block_list.html', context)
+
+@login_required
+@permission_required('inventory.view_block', raise_exception=True)
+def block_detail(request, block_id):
+    """Display detailed information about a block"""
+    block = get_object_or_404(Block.objects.select_related('building'), id=block_id)
+    
+    # Get related data
+    floors = block.floors.all().annotate(
+        departments_count=Count('departments')
+    ).order_by('floor_number')
+    
+    # Statistics
+    total_floors = floors.count()
+    total_departments = sum(floor.departments_count for floor in floors)
+    total_locations = block.locations.count()
+    
+    context = {
+        'block': block,
+        'floors': floors,
+        'total_floors': total_floors,
+        'total_departments': total_departments,
+        'total_locations': total_locations,
+        'title': f'Block: {block.name}',
+    }
+    
+    return render(request, 'inventory/locations/block_detail.html', context)
+
+@login_required
+@permission_required('inventory.add_block', raise_exception=True)
+def block_create(request):
+    """Create a new block"""
+    if request.method == 'POST':
+        form = BlockForm(request.POST)
+        if form.is_valid():
+            try:
+                block = form.save()
+                messages.success(request, f'Block "{block.name}" created successfully.')
+                return redirect('inventory:block_detail', block_id=block.id)
+            except Exception as e:
+                messages.error(request, f'Error creating block: {str(e)}')
+    else:
+        form = BlockForm()
+    
+    context = {
+        'form': form,
+        'title': 'Add New Block',
+        'form_action': 'Create',
+    }
+    
+    return render(request, 'inventory/locations/block_form.html', context)
+
+@login_required
+@permission_required('inventory.change_block', raise_exception=True)
+def block_edit(request, block_id):
+    """Edit an existing block"""
+    block = get_object_or_404(Block, id=block_id)
+    
+    if request.method == 'POST':
+        form = BlockForm(request.POST, instance=block)
+        if form.is_valid():
+            try:
+                block = form.save()
+                messages.success(request, f'Block "{block.name}" updated successfully.')
+                return redirect('inventory:block_detail', block_id=block.id)
+            except Exception as e:
+                messages.error(request, f'Error updating block: {str(e)}')
+    else:
+        form = BlockForm(instance=block)
+    
+    context = {
+        'form': form,
+        'block': block,
+        'title': f'Edit Block: {block.name}',
+        'form_action': 'Update',
+    }
+    
+    return render(request, 'inventory/locations/block_form.html', context)
+
+@login_required
+@permission_required('inventory.delete_block', raise_exception=True)
+def block_delete(request, block_id):
+    """Delete a block"""
+    block = get_object_or_404(Block, id=block_id)
+    
+    if request.method == 'POST':
+        try:
+            block_name = block.name
+            block.delete()
+            messages.success(request, f'Block "{block_name}" deleted successfully.')
+            return redirect('inventory:block_list')
+        except Exception as e:
+            messages.error(request, f'Error deleting block: {str(e)}')
+            return redirect('inventory:block_detail', block_id=block.id)
+    
+    return redirect('inventory:block_detail', block_id=block.id)
+
+# ================================
+# FLOOR MANAGEMENT VIEWS
+# ================================
+
+@login_required
+@permission_required('inventory.view_floor', raise_exception=True)
+def floor_list(request):
+    """Display list of all floors with search and filtering"""
+    search = request.GET.get('search', '')
+    building_filter = request.GET.get('building', '')
+    block_filter = request.GET.get('block', '')
+    is_active_filter = request.GET.get('is_active', '')
+    sort_by = request.GET.get('sort', 'building__name')
+    
+    floors = Floor.objects.select_related('building', 'block')
+    
+    # Search functionality
+    if search:
+        floors = floors.filter(
+            Q(name__icontains=search) |
+            Q(building__name__icontains=search) |
+            Q(block__name__icontains=search)
+        )
+    
+    # Filter by building
+    if building_filter:
+        floors = floors.filter(building_id=building_filter)
+    
+    # Filter by block
+    if block_filter:
+        floors = floors.filter(block_id=block_filter)
+    
+    # Filter by active status
+    if is_active_filter:
+        floors = floors.filter(is_active=is_active_filter == 'true')
+    
+    # Sorting
+    valid_sort_fields = ['building__name', 'block__name', 'floor_number', 'name', '-created_at']
+    if sort_by in valid_sort_fields:
+        floors = floors.order_by(sort_by)
+    else:
+        floors = floors.order_by('building__name', 'block__name', 'floor_number')
+    
+    # Get data for filter dropdowns
+    buildings = Building.objects.filter(is_active=True).order_by('name')
+    blocks = Block.objects.filter(is_active=True).order_by('building__name', 'name')
+    
+    # Pagination
+    paginator = Paginator(floors, 12)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Per-floor and header statistics come from the hierarchy rollups
+    page_obj.object_list = attach_rollups(page_obj.object_list, 'FLOOR')
+    system_rollup = get_rollup('SYSTEM')
+    
+    context = {
+        'page_obj': page_obj,
+        'floors': page_obj.object_list,
+        'buildings': buildings,
+        'blocks': blocks,
+        'search': search,
+        'building_filter': building_filter,
+        'block_filter': block_filter,
+        'is_active_filter': is_active_filter,
+        'sort_by': sort_by,
+        'total_floors': paginator.count,
+        'active_floors': system_rollup.floors,
+        'total_departments': system_rollup.departments,
+        'total_locations': system_rollup.locations,
+        'title': 'Floor Management',
+    }
+    
+    return render(request, 'inventory/locations/floor_list.html', context)
+
+@login_required
+@permission_required('inventory.view_floor', raise_exception=True)
+def floor_detail(request, floor_id):
+    """Display detailed information about a floor"""
+    floor = get_object_or_404(Floor.objects.select_related('building', 'block'), id=floor_id)
+    
+    # Get related data
+    departments = floor.departments.all().annotate(
+        rooms_count=Count('rooms')
+    ).order_by('name')
+    
+    # Statistics
+    total_departments = departments.count()
+    total_rooms = sum(dept.rooms_count for dept in departments)
+    total_locations = floor.locations.count()
+    
+    context = {
+        'floor': floor,
+        'departments': departments,
+        'total_departments': total_departments,
+        'total_rooms': total_rooms,
+        'total_locations': total_locations,
+        'title': f'Floor: {floor.name}',
+    }
+    
+    return render(request, 'inventory/locations/floor_detail.html', context)
+
+@login_required
+@permission_required('inventory.add_floor', raise_exception=True)
+def floor_create(request):
+    """Create a new floor"""
+    if request.method == 'POST':
+        form = FloorForm(request.POST)
+        if form.is_valid():
+            try:
+                floor = form.save()
+                messages.success(request, f'Floor "{floor.name}" created successfully.')
+                return redirect('inventory:floor_detail', floor_id=floor.id)
+            except Exception as e:
+                messages.error(request, f'Error creating floor: {str(e)}')
+    else:
+        form = FloorForm()
+        # Pre-select building and block if provided in URL
+        building_id = request.GET.get('building')
+        block_id = request.GET.get('block')
+        if building_id:
+            form.fields['building'].initial = building_id
+        if block_id:
+            form.fields['block'].initial = block_id
+    
+    context = {
+        'form': form,
+        'title': 'Add New Floor',
+        'form_action': 'Create',
+    }
+    
+    return render(request, 'inventory/locations/floor_form.html', context)
+
+@login_required
+@permission_required('inventory.change_floor', raise_exception=True)
+def floor_edit(request, floor_id):
+    """Edit an existing floor"""
+    floor = get_object_or_404(Floor, id=floor_id)
+    
+    if request.method == 'POST':
+        form = FloorForm(request.POST, instance=floor)
+        if form.is_valid():
+            try:
+                floor = form.save()
+                messages.success(request, f'Floor "{floor.name}" updated successfully.')
+                return redirect('inventory:floor_detail', floor_id=floor.id)
+            except Exception as e:
+                messages.error(request, f'Error updating floor: {str(e)}')
+    else:
+        form = FloorForm(instance=floor)
+    
+    context = {
+        'form': form,
+        'floor': floor,
+        'title': f'Edit Floor: {floor.name}',
+        'form_action': 'Update',
+    }
+    
+    return render(request, 'inventory/locations/floor_form.html', context)
+
+@login_required
+@permission_required('inventory.delete_floor', raise_exception=True)
+def floor_delete(request, floor_id):
+    """Delete a floor"""
+    floor = get_object_or_404(Floor, id=floor_id)
+    
+    if request.method == 'POST':
+        try:
+            floor_name = floor.name
+            floor.delete()
+            messages.success(request, f'Floor "{floor_name}" deleted successfully.')
+            return redirect('inventory:floor_list')
+        except Exception as e:
+            messages.error(request, f'Error deleting floor: {str(e)}')
+            return redirect('inventory:floor_detail', floor_id=floor.id)
+    
+    return redirect('inventory:floor_detail', floor_id=floor.id)
+
+# ================================
+# ROOM MANAGEMENT VIEWS
+# ================================
+
+@login_required
+@permission_required('inventory.view_room', raise_exception=True)
+def room_list(request):
+    """Display list of all rooms with enhanced filtering"""
+    search = request.GET.get('search', '')
+    building_filter = request.GET.get('building', '')
+    block_filter = request.GET.get('block', '')
+    floor_filter = request.GET.get('floor', '')
+    department_filter = request.GET.get('department', '')
+    is_active_filter = request.GET.get('is_active', '')
+    sort_by = request.GET.get('sort', 'department__name')
+    
+    rooms = Room.objects.select_related(
+        'department__floor__building', 
+        'department__floor__block',
+        'department'
+    )
+    
+    # Search functionality
+    if search:
+        rooms = rooms.filter(
+            Q(room_number__icontains=search) |
+            Q(room_name__icontains=search) |
+            Q(department__name__icontains=search) |
+            Q(department__floor__building__name__icontains=search) |
+            Q(department__floor__block__name__icontains=search)
+        )
+    
+    # Apply filters
+    if building_filter:
+        rooms = rooms.filter(department__floor__building_id=building_filter)
+    if block_filter:
+        rooms = rooms.filter(department__floor__block_id=block_filter)
+    if floor_filter:
+        rooms = rooms.filter(department__floor_id=floor_filter)
+    if department_filter:
+        rooms = rooms.filter(department_id=department_filter)
+    if is_active_filter:
+        rooms = rooms.filter(is_active=is_active_filter == 'true')
+    
+    # Sorting
+    valid_sort_fields = ['department__name', 'room_number', 'room_name', 'capacity', '-created_at']
+    if sort_by in valid_sort_fields:
+        rooms = rooms.order_by(sort_by)
+    else:
+        rooms = rooms.order_by('department__name', 'room_number')
+    
+    # Get data for filter dropdowns
+    buildings = Building.objects.filter(is_active=True).order_by('name')
+    blocks = Block.objects.filter(is_active=True).order_by('building__name', 'name')
+    floors = Floor.objects.filter(is_active=True).order_by('building__name', 'block__name', 'floor_number')
+    departments = Department.objects.filter(is_active=True).order_by('name')
+    
+    # Pagination
+    paginator = Paginator(rooms, 12)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Per-room and header statistics come from the hierarchy rollups
+    page_obj.object_list = attach_rollups(page_obj.object_list, 'ROOM')
+    for room in page_obj.object_list:
+        room.utilization = round(room.rollup.staff * 100 / room.capacity) if room.capacity else 0
+    system_rollup = get_rollup('SYSTEM')
+    
+    context = {
+        'page_obj': page_obj,
+        'rooms': page_obj.object_list,
+        'buildings': buildings,
+        'blocks': blocks,
+        'floors': floors,
+        'departments': departments,
+        'search': search,
+        'building_filter': building_filter,
+        'block_filter': block_filter,
+        'floor_filter': floor_filter,
+        'department_filter': department_filter,
+        'is_active_filter': is_active_filter,
+        'sort_by': sort_by,
+        'total_rooms': paginator.count,
+        'active_rooms': system_rollup.rooms,
+        'total_capacity': rooms.aggregate(total=Sum('capacity'))['total'] or 0,
+        'occupied_rooms': HierarchyRollup.objects.filter(node_type='ROOM', devices__gt=0).count(),
+        'title': 'Room Management',
+    }
+    
+    return render(request, 'inventory/locations/room_list.html', context)
+
+@login_required
+@permission_required('inventory.view_room', raise_exception=True)
+def room_detail(request, room_id):
+    """Display detailed information about a room"""
+    room = get_object_or_404(
+        Room.objects.select_related(
+            'department__floor__building',
+            'department__floor__block',
+            'department'
+        ), 
+        id=room_id
+    )
+    
+    # Get related data
+    locations = room.locations.all()
+    
+    # Statistics
+    total_locations = locations.count()
+    active_assignments = Assignment.objects.filter(
+        location__room=room,
+        status='ASSIGNED'
+    ).count()
+    
+    context = {
+        'room': room,
+        'locations': locations,
+        'total_locations': total_locations,
+        'active_assignments': active_assignments,
+        'title': f'Room: {room.room_number} - {room.room_name}',
+    }
+    
+    return render(request, 'inventory/locations/room_detail.html', context)
+
+@login_required
+@permission_required('inventory.add_room', raise_exception=True)
+def room_create(request):
+    """Create a new room"""
+    if request.method == 'POST':
+        form = forms.RoomForm(request.POST)
+        if form.is_valid():
+            try:
+                room = form.save()
+                messages.success(request, f'Room "{room.room_number}" created successfully.')
+                return redirect('inventory:room_detail', room_id=room.id)
+            except Exception as e:
+                messages.error(request, f'Error creating room: {str(e)}')
+    else:
+        form = forms.RoomForm()
+        # Pre-select department if provided in URL
+        department_id = request.GET.get('department')
+        if department_id:
+            form.fields['department'].initial = department_id
+    
+    context = {
+        'form': form,
+        'title': 'Add New Room',
+        'form_action': 'Create',
+    }
+    
+    return render(request, 'inventory/locations/room_form.html', context)
+
+@login_required
+@permission_required('inventory.change_room', raise_exception=True)
+def room_edit(request, room_id):
+    """Edit an existing room"""
+    room = get_object_or_404(Room, id=room_id)
+    
+    if request.method == 'POST':
+        form = forms.RoomForm(request.POST, instance=room)
+        if form.is_valid():
+            try:
+                room = form.save()
+                messages.success(request, f'Room "{room.room_number}" updated successfully.')
+                return redirect('inventory:room_detail', room_id=room.id)
+            except Exception as e:
+                messages.error(request, f'Error updating room: {str(e)}')
+    else:
+        form = forms.RoomForm(instance=room)
+    
+    context = {
+        'form': form,
+        'room': room,
+        'title': f'Edit Room: {room.room_number}',
+        'form_action': 'Update',
+    }
+    
+    return render(request, 'inventory/locations/room_form.html', context)
+
+@login_required
+@permission_required('inventory.delete_room', raise_exception=True)
+def room_delete(request, room_id):
+    """Delete a room"""
+    room = get_object_or_404(Room, id=room_id)
+    
+    if request.method == 'POST':
+        try:
+            room_number = room.room_number
+            room.delete()
+            messages.success(request, f'Room "{room_number}" deleted successfully.')
+            return redirect('inventory:room_list')
+        except Exception as e:
+            messages.error(request, f'Error deleting room: {str(e)}')
+            return redirect('inventory:room_detail', room_id=room.id)
+    
+    return redirect('inventory:room_detail', room_id=room.id)
+
+# ================================
+# HIERARCHY VALIDATION API
+# ================================
+
+@login_required
+def api_validate_hierarchy(request):
+    """API endpoint to validate location hierarchy relationships"""
+    try:
+        building_id = request.GET.get('building_id')
+        block_id = request.GET.get('block_id')
+        floor_id = request.GET.get('floor_id')
+        department_id = request.GET.get('department_id')
+        room_id = request.GET.get('room_id')
+        
+        errors = []
+        
+        # Validate block belongs to building
+        if building_id and block_id:
+            try:
+                block = Block.objects.get(id=block_id)
+                if str(block.building_id) != building_id:
+                    errors.append('Selected block does not belong to the selected building.')
+            except Block.DoesNotExist:
+                errors.append('Selected block does not exist.')
+        
+        # Validate floor belongs to block
+        if block_id and floor_id:
+            try:
+                floor = Floor.objects.get(id=floor_id)
+                if str(floor.block_id) != block_id:
+                    errors.append('Selected floor does not belong to the selected block.')
+            except Floor.DoesNotExist:
+                errors.append('Selected floor does not exist.')
+        
+        # Validate department belongs to floor
+        if floor_id and department_id:
+            try:
+                department = Department.objects.get(id=department_id)
+                if str(department.floor_id) != floor_id:
+                    errors.append('Selected department does not belong to the selected floor.')
+            except Department.DoesNotExist:
+                errors.append('Selected department does not exist.')
+        
+        # Validate room belongs to department
+        if department_id and room_id:
+            try:
+                room = Room.objects.get(id=room_id)
+                if str(room.department_id) != department_id:
+                    errors.append('Selected room does not belong to the selected department.')
+            except Room.DoesNotExist:
+                errors.append('Selected room does not exist.')
+        
+        return JsonResponse({
+            'success': len(errors) == 0,
+            'errors': errors,
+            'valid': len(errors) == 0
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
@@ -0,0 +1,575 @@
+# inventory/views/maintenance.py - Maintenance Views
+"""Maintenance schedules, records and the maintenance calendar."""
+
+# Django core imports
+from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from ..audit import record_action
+from bps_inventory.pagination import paginate_keyset
+from ..maintenance_calendar import (
+    calendar_stats, complete_schedule, month_bounds, occurrences_between,
+    serialize_occurrence, week_bounds,
+)
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+
+# Django DB imports
+from django.db import transaction
+from django.db.models import Count, Q
+
+# Python standard library imports
+from datetime import date, timedelta
+
+# Model imports
+from ..models import Device, Vendor, MaintenanceSchedule
+from ..forms import MaintenanceScheduleForm
+
+# View package imports
+from .common import validate_date_field, get_client_ip
+
+# ================================
+# MAINTENANCE MANAGEMENT VIEWS
+# ================================
+
+@login_required
+def maintenance_list(request):
+    """List all maintenance schedules"""
+    try:
+        # Get filter parameters
+        status = request.GET.get('status')
+        device_id = request.GET.get('device_id')
+        vendor = request.GET.get('vendor')
+        date_from = request.GET.get('date_from')
+        date_to = request.GET.get('date_to')
+        
+        # Base queryset
+        maintenance = MaintenanceSchedule.objects.select_related(
+            'device', 'vendor', 'assigned_technician__user'
+        )
+        
+        # Apply filters
+        if status:
+            maintenance = maintenance.filter(status=status)
+        if device_id:
+            maintenance = maintenance.filter(
+                Q(device__device_id__icontains=device_id) |
+                Q(device__device_name__icontains=device_id)
+            )
+        if vendor:
+            maintenance = maintenance.filter(vendor_id=vendor)
+        if date_from:
+            maintenance = maintenance.filter(next_due_date__gte=date_from)
+        if date_to:
+            maintenance = maintenance.filter(next_due_date__lte=date_to)
+        
+        # Statistics in a single aggregate over the filtered queryset
+        stats = maintenance.aggregate(
+            total=Count('id'),
+            scheduled=Count('id', filter=Q(status='SCHEDULED')),
+            in_progress=Count('id', filter=Q(status='IN_PROGRESS')),
+            completed=Count('id', filter=Q(status='COMPLETED')),
+            overdue=Count('id', filter=Q(
+                status='SCHEDULED', next_due_date__lt=timezone.now().date()
+            )),
+        )
+        
+        # Keyset pagination (reuses the aggregate total instead of a second COUNT)
+        page_obj = paginate_keyset(
+            request, maintenance, ('-next_due_date', '-id'), per_page=25, total_count=stats['total']
+        )
+        
+        context = {
+            'page_obj': page_obj,
+            'total_maintenance': stats['total'],
+            'scheduled': stats['scheduled'],
+            'in_progress': stats['in_progress'],
+            'completed': stats['completed'],
+            'overdue': stats['overdue'],
+            'vendors': Vendor.objects.filter(is_active=True),
+            'status_choices': MaintenanceSchedule.STATUS_CHOICES,
+            'filters': {
+                'status': status,
+                'device_id': device_id,
+                'vendor': vendor,
+                'date_from': date_from,
+                'date_to': date_to,
+            }
+        }
+        
+        return render(request, 'inventory/maintenance/maintenance_list.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading maintenance list: {str(e)}")
+        return render(request, 'inventory/maintenance/maintenance_list.html', {})
+
+@login_required
+def maintenance_create(request):
+    """Create new maintenance schedule"""
+    try:
+        if request.method == 'POST':
+            form = MaintenanceScheduleForm(request.POST)
+            if form.is_valid():
+                maintenance = form.save(commit=False)
+                maintenance.created_by = request.user
+                maintenance.save()
+                
+                # Create audit log
+                try:
+                    record_action(
+                        user=request.user,
+                        action='CREATE',
+                        model_name='MaintenanceSchedule',
+                        object_id=maintenance.id,
+                        object_repr=str(maintenance),
+                        changes=form.cleaned_data,
+                        ip_address=request.META.get('REMOTE_ADDR')
+                    )
+                except:
+                    pass
+                
+                messages.success(request, f'Maintenance schedule created successfully for {maintenance.device.device_id}')
+                return redirect('inventory:maintenance_detail', maintenance_id=maintenance.id)
+            else:
+                messages.error(request, 'Please correct the errors below.')
+        else:
+            form = MaintenanceScheduleForm()
+        
+        context = {
+            'form': form,
+            'title': 'Schedule Maintenance',
+            'devices': Device.objects.filter(status__in=['ACTIVE', 'MAINTENANCE']),
+            'vendors': Vendor.objects.filter(is_active=True),
+        }
+        
+        return render(request, 'inventory/maintenance/maintenance_create.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error creating maintenance schedule: {str(e)}")
+        return redirect('inventory:maintenance_list')
+
+@login_required
+def maintenance_detail(request, maintenance_id):
+    """View maintenance schedule details"""
+    try:
+        maintenance = get_object_or_404(
+            MaintenanceSchedule.objects.select_related(
+                'device', 'vendor', 'created_by'
+            ),
+            id=maintenance_id
+        )
+        
+        # Get related maintenance history for this device
+        related_maintenance = MaintenanceSchedule.objects.filter(
+            device=maintenance.device
+        ).exclude(id=maintenance_id).order_by('-scheduled_date')[:5]
+        
+        context = {
+            'maintenance': maintenance,
+            'related_maintenance': related_maintenance,
+            'can_edit': request.user.has_perm('inventory.change_maintenanceschedule'),
+        }
+        
+        return render(request, 'inventory/maintenance/maintenance_detail.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading maintenance details: {str(e)}")
+        return redirect('inventory:maintenance_list')
+
+@login_required
+def maintenance_edit(request, maintenance_id):
+    """Edit maintenance schedule"""
+    try:
+        maintenance = get_object_or_404(MaintenanceSchedule, id=maintenance_id)
+        
+        if request.method == 'POST':
+            original_data = {
+                'status': maintenance.status,
+                'scheduled_date': maintenance.scheduled_date,
+                'description': maintenance.description,
+                'cost': maintenance.cost,
+                'vendor': maintenance.vendor_id,
+            }
+            
+            form = MaintenanceScheduleForm(request.POST, instance=maintenance)
+            if form.is_valid():
+                maintenance = form.save()
+                
+                # Create audit log
+                try:
+                    changes = {}
+                    for field, old_value in original_data.items():
+                        new_value = getattr(maintenance, field)
+                        if old_value != new_value:
+                            changes[field] = {'old': old_value, 'new': new_value}
+                    
+                    if changes:
+                        record_action(
+                            user=request.user,
+                            action='UPDATE',
+                            model_name='MaintenanceSchedule',
+                            object_id=maintenance.id,
+                            object_repr=str(maintenance),
+                            changes=changes,
+                            ip_address=request.META.get('REMOTE_ADDR')
+                        )
+                except:
+                    pass
+                
+                messages.success(request, 'Maintenance schedule updated successfully.')
+                return redirect('inventory:maintenance_detail', maintenance_id=maintenance.id)
+            else:
+                messages.error(request, 'Please correct the errors below.')
+        else:
+            form = MaintenanceScheduleForm(instance=maintenance)
+        
+        context = {
+            'form': form,
+            'maintenance': maintenance,
+            'title': 'Edit Maintenance Schedule',
+        }
+        
+        return render(request, 'inventory/maintenance/maintenance_edit.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error editing maintenance schedule: {str(e)}")
+        return redirect('inventory:maintenance_list')
+    
+@login_required
+@permission_required('inventory.change_maintenanceschedule', raise_exception=True)
+def maintenance_complete(request, maintenance_id):
+    """Mark maintenance as completed"""
+    try:
+        maintenance = get_object_or_404(MaintenanceSchedule, id=maintenance_id)
+        
+        if maintenance.status == 'COMPLETED':
+            messages.warning(request, 'This maintenance schedule is already marked as completed.')
+            return redirect('inventory:maintenance_detail', maintenance_id=maintenance.id)
+        
+        if request.method == 'POST':
+            completion_notes = request.POST.get('completion_notes', '')
+            actual_cost = request.POST.get('actual_cost')
+            
+            try:
+                with transaction.atomic():
+                    maintenance.completion_notes = completion_notes
+                    
+                    if actual_cost:
+                        try:
+                            maintenance.actual_cost = float(actual_cost)
+                        except ValueError:
+                            messages.warning(request, 'Invalid cost format. Cost not updated.')
+                    
+                    # Closes the outstanding calendar occurrence and advances
+                    # recurring schedules to their next due date
+                    complete_schedule(maintenance)
+                    
+                    # Log the activity
+                    from ..utils import log_user_activity
+                    log_user_activity(
+                        user=request.user,
+                        action='UPDATE',
+                        model_name='MaintenanceSchedule',
+                        object_id=maintenance.id,
+                        object_repr=f'{maintenance} - COMPLETED',
+                        ip_address=request.META.get('REMOTE_ADDR')
+                    )
+                    
+                    messages.success(request, f'Maintenance for "{maintenance.device}" marked as completed.')
+                    return redirect('inventory:maintenance_detail', maintenance_id=maintenance.id)
+            except Exception as e:
+                messages.error(request, f'Error completing maintenance: {str(e)}')
+        
+        context = {
+            'maintenance': maintenance,
+            'title': f'Complete Maintenance: {maintenance.device}',
+        }
+        return render(request, 'inventory/maintenance/maintenance_complete.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading maintenance for completion: {str(e)}")
+        return redirect('inventory:maintenance_list')
+    
+@login_required
+def maintenance_schedule(request):
+    """View for managing maintenance schedules - calendar/overview view"""
+    try:
+        today = timezone.now().date()
+        
+        # Calendar window: week or month around the requested date
+        view_mode = request.GET.get('view', 'month')
+        anchor = validate_date_field(request.GET.get('date')) or today
+        if view_mode == 'week':
+            range_start, range_end = week_bounds(anchor)
+        else:
+            range_start, range_end = month_bounds(anchor)
+        
+        # Explicit date range overrides the window
+        date_from = validate_date_field(request.GET.get('date_from'))
+        date_to = validate_date_field(request.GET.get('date_to'))
+        range_start = date_from or range_start
+        range_end = date_to or range_end
+        
+        filters = {
+            'vendor': request.GET.get('vendor') or None,
+            'technician': request.GET.get('technician') or None,
+            'status': request.GET.get('status') or None,
+        }
+        
+        # One indexed range query each for the calendar, overdue and upcoming panels
+        occurrences = occurrences_between(range_start, range_end, **filters)
+        overdue_occurrences = occurrences_between(
+            date.min, today - timedelta(days=1),
+            vendor=filters['vendor'], technician=filters['technician'], status='SCHEDULED'
+        )[:6]
+        upcoming_occurrences = occurrences_between(
+            today, today + timedelta(days=30),
+            vendor=filters['vendor'], technician=filters['technician'], status='SCHEDULED'
+        )[:50]
+        
+        context = {
+            'occurrences': occurrences,
+            'overdue_occurrences': overdue_occurrences,
+            'upcoming_occurrences': upcoming_occurrences,
+            'stats': calendar_stats(today),
+            'status_choices': MaintenanceSchedule.STATUS_CHOICES,
+            'vendors': Vendor.objects.filter(is_active=True),
+            'view_mode': view_mode,
+            'current_month': anchor,
+            'range_start': range_start,
+            'range_end': range_end,
+            'filters': filters,
+        }
+        
+        return render(request, 'inventory/maintenance/maintenance_schedule.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading maintenance schedule: {str(e)}")
+        return render(request, 'inventory/maintenance/maintenance_schedule.html', {})
+
+@login_required
+@require_http_methods(["GET"])
+def maintenance_calendar_api(request):
+    """Calendar occurrences for a date range (week/month views, per vendor or technician)"""
+    try:
+        today = timezone.now().date()
+        anchor = validate_date_field(request.GET.get('date')) or today
+        if request.GET.get('view') == 'week':
+            range_start, range_end = week_bounds(anchor)
+        else:
+            range_start, range_end = month_bounds(anchor)
+        range_start = validate_date_field(request.GET.get('start')) or range_start
+        range_end = validate_date_field(request.GET.get('end')) or range_end
+        
+        if (range_end - range_start).days > 366:
+            return JsonResponse({'error': 'Date range cannot exceed one year'}, status=400)
+        
+        occurrences = occurrences_between(
+            range_start, range_end,
+            vendor=request.GET.get('vendor') or None,
+            technician=request.GET.get('technician') or None,
+            status=request.GET.get('status') or None,
+            maintenance_type=request.GET.get('type') or None,
+        )
+        
+        return JsonResponse({
+            'start': range_start.isoformat(),
+            'end': range_end.isoformat(),
+            'occurrences': [serialize_occurrence(occurrence) for occurrence in occurrences],
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@permission_required('inventory.delete_maintenanceschedule', raise_exception=True)
+def maintenance_delete(request, maintenance_id):
+    """Delete a maintenance schedule with confirmation"""
+    try:
+        maintenance = get_object_or_404(
+            MaintenanceSchedule.objects.select_related(
+                'device__device_type',
+                'vendor',
+                'assigned_technician__user',
+                'assigned_technician__department'
+            ),
+            id=maintenance_id
+        )
+        
+        # Check if user has permission to delete this specific maintenance
+        # Allow deletion if user has admin privileges or created the schedule
+        if not (request.user.has_perm('inventory.delete_maintenanceschedule') or
+                request.user.is_superuser or
+                (hasattr(maintenance, 'created_by') and request.user == maintenance.created_by)):
+            messages.error(request, 'You do not have permission to delete this maintenance schedule.')
+            return redirect('inventory:maintenance_detail', maintenance_id=maintenance_id)
+        
+        # Check if maintenance is in progress - prevent deletion
+        if maintenance.status == 'IN_PROGRESS':
+            messages.error(request, 
+                'Cannot delete maintenance schedule that is currently in progress. '
+                'Please complete or cancel the maintenance first.')
+            return redirect('inventory:maintenance_detail', maintenance_id=maintenance_id)
+        
+        # Store maintenance details for logging before deletion
+        maintenance_details = {
+            'maintenance_id': maintenance_id,
+            'device_id': maintenance.device.device_id,
+            'device_name': maintenance.device.device_name,
+            'maintenance_type': maintenance.get_maintenance_type_display(),
+            'next_due_date': maintenance.next_due_date.isoformat(),
+            'status': maintenance.get_status_display(),
+            'vendor': str(maintenance.vendor) if maintenance.vendor else None,
+            'assigned_technician': str(maintenance.assigned_technician) if maintenance.assigned_technician else None,
+            'cost_estimate': float(maintenance.cost_estimate) if maintenance.cost_estimate else None,
+            'description': maintenance.description,
+            'frequency': maintenance.get_frequency_display(),
+            'is_active': maintenance.is_active,
+            'created_at': maintenance.created_at.isoformat() if hasattr(maintenance, 'created_at') else None,
+            'deleted_by': request.user.username,
+            'deleted_at': timezone.now().isoformat()
+        }
+        
+        if request.method == 'POST':
+            # Get deletion confirmation and reason
+            confirm_delete = request.POST.get('confirm_delete')
+            deletion_reason = request.POST.get('deletion_reason', '').strip()
+            
+            if confirm_delete == 'yes':
+                try:
+                    with transaction.atomic():
+                        # Store device and vendor references before deletion
+                        device = maintenance.device
+                        vendor_name = str(maintenance.vendor) if maintenance.vendor else 'No vendor'
+                        
+                        # Check if there are any maintenance records linked to this schedule
+                        linked_records_count = 0
+                        try:
+                            # Check for MaintenanceRecord if it exists
+                            if hasattr(maintenance, 'records'):
+                                linked_records = maintenance.records.all()
+                                linked_records_count = linked_records.count()
+                                
+                                if linked_records_count > 0:
+                                    # Option 1: Prevent deletion if records exist
+                                    messages.error(request, 
+                                        f'Cannot delete maintenance schedule. It has {linked_records_count} '
+                                        'linked maintenance records. Please remove the records first.')
+                                    return redirect('inventory:maintenance_detail', maintenance_id=maintenance_id)
+                                    
+                                    # Option 2: Delete linked records (uncomment if preferred)
+                                    # linked_records.delete()
+                        except Exception:
+                            # Handle case where MaintenanceRecord model doesn't exist or no relation
+                            pass
+                        
+                        # Create audit log entry before deletion
+                        try:
+                            record_action(
+                                user=request.user,
+                                action='DELETE',
+                                model_name='MaintenanceSchedule',
+                                object_id=str(maintenance_id),
+                                object_repr=f'Maintenance Schedule {maintenance_id} - {maintenance.device.device_name}',
+                                changes=maintenance_details,
+                                ip_address=get_client_ip(request)
+                            )
+                        except Exception as audit_error:
+                            # Log audit creation error but don't fail the deletion
+                            print(f"Warning: Could not create audit log: {audit_error}")
+                        
+                        # Update device maintenance status if needed
+                        if device.status == 'MAINTENANCE' and maintenance.status in ['SCHEDULED', 'IN_PROGRESS']:
+                            # Check if this is the only active maintenance for this device
+                            other_active_maintenance = MaintenanceSchedule.objects.filter(
+                                device=device,
+                                status__in=['SCHEDULED', 'IN_PROGRESS'],
+                                is_active=True
+                            ).exclude(id=maintenance_id)
+                            
+                            if not other_active_maintenance.exists():
+                                # No other active maintenance, set device back to available
+                                device.status = 'AVAILABLE'
+                                device.save()
+                        
+                        # Delete the maintenance schedule
+                        maintenance.delete()
+                        
+                        # Success message with details
+                        messages.success(
+                            request, 
+                            f'Maintenance schedule deleted successfully! '
+                            f'{maintenance_details["maintenance_type"]} for device {device.device_id} '
+                            f'(scheduled with {vendor_name}) has been removed.'
+                        )
+                        
+                        # Redirect to appropriate view
+                        redirect_to = request.GET.get('next')
+                        if redirect_to in ['maintenance_list', 'device_detail', 'vendor_detail']:
+                            if redirect_to == 'device_detail':
+                                return redirect('inventory:device_detail', device_id=device.device_id)
+                            elif redirect_to == 'vendor_detail' and maintenance_details['vendor']:
+                                try:
+                                    vendor = Vendor.objects.get(name=maintenance_details['vendor'])
+                                    return redirect('inventory:vendor_detail', vendor_id=vendor.id)
+                                except Vendor.DoesNotExist:
+                                    pass
+                            return redirect('inventory:maintenance_list')
+                        else:
+                            return redirect('inventory:maintenance_list')
+                        
+                except Exception as e:
+                    messages.error(request, f'Error deleting maintenance schedule: {str(e)}')
+                    return redirect('inventory:maintenance_detail', maintenance_id=maintenance_id)
+            else:
+                messages.info(request, 'Maintenance schedule deletion cancelled.')
+                return redirect('inventory:maintenance_detail', maintenance_id=maintenance_id)
+        
+        # GET request - show confirmation page
+        # Check for dependent records
+        warnings = []
+        linked_records_count = 0
+        
+        try:
+            if hasattr(maintenance, 'records'):
+                linked_records_count = maintenance.records.count()
+                if linked_records_count > 0:
+                    warnings.append(f'This maintenance schedule has {linked_records_count} linked maintenance records.')
+        except:
+            pass
+        
+        # Check if device will be affected
+        device_status_warning = None
+        if maintenance.device.status == 'MAINTENANCE' and maintenance.status in ['SCHEDULED', 'IN_PROGRESS']:
+            other_maintenance = MaintenanceSchedule.objects.filter(
+                device=maintenance.device,
+                status__in=['SCHEDULED', 'IN_PROGRESS'],
+                is_active=True
+            ).exclude(id=maintenance_id).count()
+            
+            if other_maintenance == 0:
+                device_status_warning = f'Device {maintenance.device.device_id} will be set back to "Available" status.'
+        
+        context = {
+            'maintenance': maintenance,
+            'maintenance_details': maintenance_details,
+            'title': f'Delete Maintenance Schedule - {maintenance.device.device_name}',
+            'can_delete': maintenance.status != 'IN_PROGRESS',
+            'warnings': warnings,
+            'device_status_warning': device_status_warning,
+            'linked_records_count': linked_records_count,
+            'warning_message': 'This action cannot be undone. The maintenance schedule will be permanently deleted.',
+        }
+        
+        return render(request, 'inventory/maintenance/maintenance_delete.html', context)
+        
+    except MaintenanceSchedule.DoesNotExist:
+        messages.error(request, 'Maintenance schedule not found.')
+        return redirect('inventory:maintenance_list')
+        
+    except Exception as e:
+        messages.error(request, f'Error accessing maintenance schedule: {str(e)}')
+        return redirect('inventory:maintenance_list')
@@ -0,0 +1,207 @@
+# inventory/views/overview.py - Dashboard Views
+"""Inventory dashboard and its analytics endpoints."""
+
+# Django core imports
+from django.shortcuts import render
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from bps_inventory.instrumentation import query_budget
+from ..event_stream import get_live_dashboard_stats
+from ..notification_engine import (
+    get_recent_notifications, get_unread_count, mark_read, serialize_notification,
+)
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+
+# Django DB imports
+from django.db.models import Count
+
+# Python standard library imports
+from datetime import timedelta
+
+# Model imports
+from ..models import Device, Assignment, MaintenanceSchedule
+
+# View package imports
+from .common import (
+    get_device_assignment_summary, get_warranty_alerts, get_overdue_assignments,
+    get_assignment_trends,
+)
+
+# ================================
+# DASHBOARD VIEWS
+# ================================
+
+@login_required
+@query_budget(max_queries=15, max_duplicates=4)
+def dashboard(request):
+    """Main inventory dashboard with comprehensive stats"""
+    try:
+        # Get summary statistics
+        summary = get_device_assignment_summary()
+        
+        # Get recent activities
+        recent_assignments = Assignment.objects.select_related(
+            'device', 'assigned_to_staff', 'assigned_to_department', 'created_by'
+        ).order_by('-created_at')[:5]
+        
+        # Get warranty alerts
+        warranty_alerts = get_warranty_alerts()[:5]
+        
+        # Get overdue assignments
+        overdue_assignments = get_overdue_assignments()[:5]
+        
+        # Get device status distribution
+        device_status_stats = Device.objects.values('status').annotate(
+            count=Count('pk')
+        ).order_by('status')
+        
+        # Get category distribution
+        category_stats = Device.objects.select_related(
+            'device_type__subcategory__category'
+        ).values(
+            'device_type__subcategory__category__name'
+        ).annotate(
+            count=Count('pk')
+        ).order_by('-count')[:5]
+        
+        # Get assignment trends for chart
+        assignment_trends = get_assignment_trends(30)
+        
+        # Get department assignments
+        dept_assignments = Assignment.objects.filter(
+            is_active=True
+        ).values(
+            'assigned_to_department__name'
+        ).annotate(
+            count=Count('pk')
+        ).order_by('-count')[:5]
+        
+        # Recent maintenance activities
+        recent_maintenance = MaintenanceSchedule.objects.select_related(
+            'device', 'vendor'
+        ).order_by('-next_due_date')[:5]
+        
+        context = {
+            'summary': summary,
+            'recent_assignments': recent_assignments,
+            'warranty_alerts': warranty_alerts,
+            'overdue_assignments': overdue_assignments,
+            'device_status_stats': device_status_stats,
+            'category_stats': category_stats,
+            'assignment_trends': assignment_trends,
+            'dept_assignments': dept_assignments,
+            'recent_maintenance': recent_maintenance,
+        }
+        
+        return render(request, 'inventory/dashboard.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading dashboard: {str(e)}")
+        return render(request, 'inventory/dashboard.html', {
+            'summary': {'total_devices': 0, 'active_assignments': 0, 'available_devices': 0, 'overdue_assignments': 0},
+            'recent_assignments': [], 'warranty_alerts': [], 'overdue_assignments': [],
+            'device_status_stats': [], 'category_stats': [], 'assignment_trends': [],
+            'dept_assignments': [], 'recent_maintenance': []
+        })
+    
+
+# ================================
+# DASHBOARD ANALYTICS API 
+# ================================
+
+
+@login_required
+@require_http_methods(["GET"])
+def ajax_dashboard_stats(request):
+    """Get dashboard statistics via AJAX (fallback for clients without the live event stream)"""
+    try:
+        return JsonResponse(get_live_dashboard_stats())
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def ajax_notification_list(request):
+    """Get the user's unread notifications via AJAX (raised by the send_notifications job)"""
+    try:
+        notifications = get_recent_notifications(request.user, limit=10)
+        
+        return JsonResponse({
+            'notifications': [serialize_notification(n) for n in notifications],
+            'count': get_unread_count(request.user),
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["POST"])
+def ajax_notification_mark_read(request):
+    """Mark one, several or all of the user's notifications as read"""
+    try:
+        notification_ids = request.POST.getlist('notification_id') or None
+        updated = mark_read(request.user, notification_ids)
+        
+        return JsonResponse({
+            'success': True,
+            'updated': updated,
+            'count': get_unread_count(request.user),
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def ajax_device_stats(request):
+    """Get device statistics via AJAX"""
+    try:
+        # Status distribution
+        status_stats = Device.objects.values('status').annotate(
+            count=Count('id')
+        ).order_by('-count')
+        
+        # Condition distribution
+        condition_stats = Device.objects.values('condition').annotate(
+            count=Count('id')
+        ).order_by('-count')
+        
+        # Category distribution
+        category_stats = Device.objects.values(
+            'device_type__subcategory__category__name'
+        ).annotate(
+            count=Count('id')
+        ).order_by('-count')[:10]
+        
+        # Assignment trends (last 6 months)
+        six_months_ago = timezone.now().date() - timedelta(days=180)
+        monthly_assignments = []
+        
+        for i in range(6):
+            month_start = six_months_ago + timedelta(days=i*30)
+            month_end = month_start + timedelta(days=30)
+            
+            count = Assignment.objects.filter(
+                start_date__gte=month_start,
+                start_date__lt=month_end
+            ).count()
+            
+            monthly_assignments.append({
+                'month': month_start.strftime('%Y-%m'),
+                'count': count
+            })
+        
+        return JsonResponse({
+            'status_distribution': list(status_stats),
+            'condition_distribution': list(condition_stats),
+            'category_distribution': list(category_stats),
+            'assignment_trends': monthly_assignments
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
@@ -0,0 +1,63 @@
+# inventory/views/qr.py - QR Code Views
+"""QR code helpers used by the inventory pages."""
+
+# Django core imports
+from django.shortcuts import render, get_object_or_404, redirect
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+
+# Model imports
+from ..models import Device
+
+# ================================
+# QR CODE AND UTILITY FUNCTIONS
+# ================================
+
+@login_required
+def generate_qr_codes_bulk(request):
+    """Generate QR codes for multiple devices"""
+    if request.method == 'POST':
+        device_ids = request.POST.getlist('device_ids')
+        
+        if not device_ids:
+            messages.error(request, 'No devices selected for QR code generation.')
+            return redirect('inventory:device_list')
+        
+        try:
+            # Simple fallback QR code generation (you can implement this later)
+            generated_count = 0
+            for device_id in device_ids:
+                try:
+                    device = Device.objects.get(device_id=device_id)
+                    # TODO: Implement QR code generation when qr_management app is available
+                    generated_count += 1
+                except Device.DoesNotExist:
+                    continue
+            
+            messages.success(request, f'QR code generation queued for {generated_count} devices. (Feature pending implementation)')
+            
+        except Exception as e:
+            messages.error(request, f'Error generating QR codes: {str(e)}')
+    
+    return redirect('inventory:device_list')
+
+@login_required
+def device_qr_code(request, device_id):
+    """Generate and display QR code for device"""
+    try:
+        device = get_object_or_404(Device, device_id=device_id)
+        
+        # For now, just show the QR code UUID
+        # You can implement actual QR code generation when qr_management app is ready
+        context = {
+            'device': device,
+            'qr_code': device.qr_code,
+        }
+        
+        return render(request, 'inventory/devices/device_qr_code.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading device QR code: {str(e)}")
+        return redirect('inventory:device_detail', device_id=device_id)
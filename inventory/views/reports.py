@@ -0,0 +1,213 @@
+# inventory/views/reports.py - Report Views
+"""Inventory reports rendered from the inventory app."""
+
+# Django core imports
+from django.shortcuts import render, redirect
+from django.utils import timezone
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+
+# Django DB imports
+from django.db.models import Count, Sum, Max
+
+# Python standard library imports
+from datetime import date, timedelta
+
+# Model imports
+from ..models import Device, Assignment, Department
+
+# Reporting reads are served by the read replica when one is configured
+from bps_inventory.db_router import read_replica
+
+# ================================
+# REPORTING VIEWS
+# ================================
+
+@login_required
+@read_replica()
+def inventory_summary_report(request):
+    """Generate inventory summary report"""
+    try:
+        # Device statistics
+        total_devices = Device.objects.count()
+        active_devices = Device.objects.filter(status='ACTIVE').count()
+        inactive_devices = Device.objects.filter(status='INACTIVE').count()
+        maintenance_devices = Device.objects.filter(status='MAINTENANCE').count()
+        
+        # Assignment statistics
+        total_assignments = Assignment.objects.count()
+        active_assignments = Assignment.objects.filter(is_active=True).count()
+        temporary_assignments = Assignment.objects.filter(is_temporary=True, is_active=True).count()
+        
+        # Value statistics
+        total_value = Device.objects.aggregate(Sum('purchase_price'))['purchase_price__sum'] or 0
+        
+        # Category breakdown
+        category_breakdown = Device.objects.values(
+            'device_type__subcategory__category__name'
+        ).annotate(
+            count=Count('id'),
+            total_value=Sum('purchase_price')
+        ).order_by('-count')
+        
+        context = {
+            'total_devices': total_devices,
+            'active_devices': active_devices,
+            'inactive_devices': inactive_devices,
+            'maintenance_devices': maintenance_devices,
+            'total_assignments': total_assignments,
+            'active_assignments': active_assignments,
+            'temporary_assignments': temporary_assignments,
+            'total_value': total_value,
+            'category_breakdown': category_breakdown,
+            'report_date': date.today(),
+        }
+        
+        return render(request, 'inventory/reports/summary.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error generating summary report: {str(e)}")
+        return redirect('inventory:dashboard')
+
+@login_required
+@read_replica()
+def asset_utilization_report(request):
+    """Generate asset utilization report"""
+    try:
+        # Device utilization analysis
+        devices_with_assignments = Device.objects.filter(
+            assignments__is_active=True
+        ).distinct().count()
+        
+        devices_without_assignments = Device.objects.filter(
+            assignments__isnull=True
+        ).count()
+        
+        # Department utilization
+        dept_utilization = Department.objects.annotate(
+            device_count=Count('staff__assignments__device', distinct=True),
+            staff_count=Count('staff', distinct=True)
+        ).order_by('-device_count')
+        
+        context = {
+            'devices_with_assignments': devices_with_assignments,
+            'devices_without_assignments': devices_without_assignments,
+            'dept_utilization': dept_utilization,
+            'report_date': date.today(),
+        }
+        
+        return render(request, 'inventory/reports/utilization.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error generating utilization report: {str(e)}")
+        return redirect('inventory:dashboard')
+
+@login_required
+@read_replica()
+def device_lifecycle_report(request):
+    """Generate device lifecycle analysis report"""
+    from ..lifecycle import portfolio_analytics
+    
+    try:
+        today = timezone.now().date()
+        
+        # Age groups, depreciation, replacement forecast and purchases by
+        # year come from the vectorized lifecycle engine (cached for the day)
+        analytics = portfolio_analytics(refresh=request.GET.get('refresh') == '1')
+        age_groups = {
+            name: count for name, count in analytics['age']['counts'].items() if name != 'unknown'
+        }
+        
+        # Devices approaching retirement (>5 years old)
+        retirement_candidates = Device.objects.filter(
+            purchase_date__lt=today - timedelta(days=1825)
+        ).select_related('device_type__subcategory__category').order_by('purchase_date')[:20]
+        
+        # Maintenance frequency analysis
+        maintenance_frequency = Device.objects.annotate(
+            maintenance_count=Count('maintenance_schedules'),
+            last_maintenance=Max('maintenance_schedules__actual_date')
+        ).filter(maintenance_count__gt=0).order_by('-maintenance_count')[:20]
+        
+        # Devices never maintained
+        never_maintained = Device.objects.filter(
+            maintenance_schedules__isnull=True,
+            purchase_date__lt=today - timedelta(days=365)
+        ).order_by('purchase_date')[:20]
+        
+        context = {
+            'age_groups': age_groups,
+            'age_stats': analytics['age'],
+            'depreciation': analytics['depreciation'],
+            'replacement_forecast': analytics['replacement_forecast'],
+            'retirement_candidates': retirement_candidates,
+            'maintenance_frequency': maintenance_frequency,
+            'never_maintained': never_maintained,
+            'yearly_purchases': analytics['yearly_purchases'],
+            'report_date': today,
+        }
+        
+        return render(request, 'inventory/device_lifecycle_report.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error generating lifecycle report: {str(e)}")
+        return redirect('inventory:dashboard')
+
+@login_required
+@read_replica()
+def warranty_management_report(request):
+    """Generate warranty management report"""
+    from ..lifecycle import portfolio_analytics
+    
+    try:
+        today = timezone.now().date()
+        
+        # Warranty buckets, vendor breakdown and values come from the
+        # vectorized lifecycle engine (cached for the day)
+        analytics = portfolio_analytics(refresh=request.GET.get('refresh') == '1')
+        warranty_stats = analytics['warranty']['counts']
+        
+        # Devices expiring soon (detailed list)
+        expiring_soon = Device.objects.filter(
+            warranty_end_date__gte=today,
+            warranty_end_date__lte=today + timedelta(days=90)
+        ).select_related(
+            'device_type__subcategory__category', 'vendor'
+        ).order_by('warranty_end_date')
+        
+        # Recently expired warranties
+        recently_expired = Device.objects.filter(
+            warranty_end_date__gte=today - timedelta(days=30),
+            warranty_end_date__lt=today
+        ).select_related(
+            'device_type__subcategory__category', 'vendor'
+        ).order_by('-warranty_end_date')
+        
+        # Warranty by vendor
+        vendor_warranty = [
+            dict(row, total_devices=row['total'], expired_warranties=row['expired_count'],
+                 active_warranties=row['active_count'])
+            for row in analytics['warranty']['by_vendor']
+        ]
+        
+        # Warranty cost implications (estimated)
+        warranty_values = analytics['warranty']['values']
+        expiring_value = warranty_values['expiring_30'] + warranty_values['expiring_90']
+        
+        context = {
+            'warranty_stats': warranty_stats,
+            'expiring_soon': expiring_soon,
+            'recently_expired': recently_expired,
+            'vendor_warranty': vendor_warranty,
+            'expiring_value': expiring_value,
+            'warranty_timeline': analytics['warranty']['timeline'],
+            'report_date': today,
+        }
+        
+        return render(request, 'inventory/warranty_management_report.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error generating warranty report: {str(e)}")
+        return redirect('inventory:dashboard')
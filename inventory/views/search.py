@@ -0,0 +1,992 @@
+# inventory/views/search.py - Search Views
+"""Advanced search, search APIs and global search."""
+
+# Django core imports
+from django.shortcuts import render, get_object_or_404
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django.core.paginator import Paginator
+from django.core.exceptions import ValidationError
+from bps_inventory.pagination import InvalidCursor, paginate_keyset
+from ..hierarchy_rollup import get_rollup
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+
+# Django DB imports
+from django.db.models import Q
+
+# Python standard library imports
+from datetime import timedelta
+
+# Model imports
+from ..models import (
+    Device, Assignment, Staff, Department, Location, DeviceCategory, Vendor,
+    MaintenanceSchedule, Room, Building, Block, Floor,
+)
+
+# Django core imports
+from django import forms
+
+# ================================
+# ADVANCED SEARCH VIEWS 
+# ================================
+
+@login_required
+def advanced_search(request):
+    """Advanced search with multiple filters"""
+    try:
+        if request.method == 'POST':
+            # Process advanced search form
+            form_data = request.POST.dict()
+            
+            # Build device query
+            devices = Device.objects.select_related(
+                'device_type__subcategory__category', 'vendor'
+            ).prefetch_related('assignments')
+            
+            # Apply filters
+            if form_data.get('device_id'):
+                devices = devices.filter(device_id__icontains=form_data['device_id'])
+            if form_data.get('device_name'):
+                devices = devices.filter(device_name__icontains=form_data['device_name'])
+            if form_data.get('category'):
+                devices = devices.filter(device_type__subcategory__category_id=form_data['category'])
+            if form_data.get('status'):
+                devices = devices.filter(status=form_data['status'])
+            if form_data.get('condition'):
+                devices = devices.filter(condition=form_data['condition'])
+            if form_data.get('vendor'):
+                devices = devices.filter(vendor_id=form_data['vendor'])
+            if form_data.get('purchase_date_from'):
+                devices = devices.filter(purchase_date__gte=form_data['purchase_date_from'])
+            if form_data.get('purchase_date_to'):
+                devices = devices.filter(purchase_date__lte=form_data['purchase_date_to'])
+            if form_data.get('warranty_status'):
+                today = timezone.now().date()
+                if form_data['warranty_status'] == 'active':
+                    devices = devices.filter(warranty_end_date__gt=today)
+                elif form_data['warranty_status'] == 'expired':
+                    devices = devices.filter(warranty_end_date__lt=today)
+                elif form_data['warranty_status'] == 'expiring':
+                    thirty_days = today + timedelta(days=30)
+                    devices = devices.filter(
+                        warranty_end_date__gte=today,
+                        warranty_end_date__lte=thirty_days
+                    )
+            
+            # Pagination
+            paginator = Paginator(devices, 25)
+            page_number = request.GET.get('page')
+            page_obj = paginator.get_page(page_number)
+            
+            context = {
+                'page_obj': page_obj,
+                'search_performed': True,
+                'form_data': form_data,
+                'total_results': devices.count(),
+                'categories': DeviceCategory.objects.filter(is_active=True),
+                'vendors': Vendor.objects.filter(is_active=True),
+            }
+            
+        else:
+            # Show search form
+            context = {
+                'search_performed': False,
+                'categories': DeviceCategory.objects.filter(is_active=True),
+                'vendors': Vendor.objects.filter(is_active=True),
+            }
+        
+        return render(request, 'inventory/search/advanced_search.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error in advanced search: {str(e)}")
+        return render(request, 'inventory/search/advanced_search.html', {})
+
+@login_required
+@require_http_methods(["GET"])
+def global_search_api(request):
+    """Global search API endpoint"""
+    try:
+        query = request.GET.get('q', '').strip()
+        limit = int(request.GET.get('limit', 10))
+        
+        if len(query) < 2:
+            return JsonResponse({'results': [], 'message': 'Query too short'})
+        
+        results = []
+        
+        # Search devices
+        devices = Device.objects.filter(
+            Q(device_id__icontains=query) |
+            Q(device_name__icontains=query) |
+            Q(asset_tag__icontains=query)
+        )[:limit]
+        
+        for device in devices:
+            results.append({
+                'type': 'device',
+                'id': device.device_id,
+                'title': device.device_name,
+                'subtitle': f"ID: {device.device_id} | Status: {device.get_status_display()}",
+                'url': f'/inventory/devices/{device.device_id}/',
+                'icon': 'device'
+            })
+        
+        # Search assignments
+        assignments = Assignment.objects.filter(
+            Q(assignment_id__icontains=query) |
+            Q(device__device_id__icontains=query) |
+            Q(device__device_name__icontains=query)
+        ).select_related('device', 'assigned_to_staff__user', 'assigned_to_department')[:limit]
+        
+        for assignment in assignments:
+            results.append({
+                'type': 'assignment',
+                'id': assignment.assignment_id,
+                'title': f"Assignment {assignment.assignment_id}",
+                'subtitle': f"Device: {assignment.device.device_id} | Assigned to: {assignment.assigned_to_staff or assignment.assigned_to_department}",
+                'url': f'/inventory/assignments/{assignment.pk}/',
+                'icon': 'assignment'
+            })
+        
+        return JsonResponse({
+            'results': results[:limit],
+            'total': len(results),
+            'query': query
+        })
+        
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+# Advanced search form for forms.py
+class AdvancedSearchForm(forms.Form):
+    """Advanced search form"""
+    
+    SEARCH_TYPE_CHOICES = [
+        ('all', 'All Items'),
+        ('devices', 'Devices Only'),
+        ('assignments', 'Assignments Only'),
+        ('staff', 'Staff Only'),
+        ('locations', 'Locations Only'),
+        ('maintenance', 'Maintenance Only'),
+    ]
+    
+    query = forms.CharField(
+        max_length=200,
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Search devices, assignments, staff, locations...',
+            'autocomplete': 'off'
+        }),
+        help_text="Enter keywords to search across all fields"
+    )
+    
+    search_type = forms.ChoiceField(
+        choices=SEARCH_TYPE_CHOICES,
+        initial='all',
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    
+    category = forms.ModelChoiceField(
+        queryset=DeviceCategory.objects.filter(is_active=True),
+        required=False,
+        empty_label="All Categories",
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    
+    status = forms.ChoiceField(
+        choices=[('', 'All Statuses')] + Device.STATUS_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    
+    department = forms.ModelChoiceField(
+        queryset=Department.objects.all(),
+        required=False,
+        empty_label="All Departments",
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    
+    date_from = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={
+            'class': 'form-control',
+            'type': 'date'
+        }),
+        help_text="Filter by date range (from)"
+    )
+    
+    date_to = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={
+            'class': 'form-control',
+            'type': 'date'
+        }),
+        help_text="Filter by date range (to)"
+    )
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get('date_from')
+        date_to = cleaned_data.get('date_to')
+        
+        if date_from and date_to and date_from > date_to:
+            raise ValidationError("Start date cannot be after end date.")
+        
+        return cleaned_data
+@login_required
+def device_search(request):
+    """
+    Device-specific search functionality
+    This is the missing function referenced in your URLs
+    """
+    try:
+        query = request.GET.get('q', '').strip()
+        category = request.GET.get('category', '')
+        status = request.GET.get('status', '')
+        condition = request.GET.get('condition', '')
+        vendor = request.GET.get('vendor', '')
+        
+        # Start with all devices
+        devices = Device.objects.select_related(
+            'device_type__subcategory__category', 'vendor', 'current_location'
+        ).prefetch_related('assignments')
+        
+        # Apply text search if query provided
+        if query:
+            devices = devices.filter(
+                Q(device_id__icontains=query) |
+                Q(device_name__icontains=query) |
+                Q(asset_tag__icontains=query) |
+                Q(serial_number__icontains=query) |
+                Q(brand__icontains=query) |
+                Q(model__icontains=query) |
+                Q(description__icontains=query)
+            )
+        
+        # Apply filters
+        if category:
+            devices = devices.filter(device_type__subcategory__category_id=category)
+        
+        if status:
+            devices = devices.filter(status=status)
+            
+        if condition:
+            devices = devices.filter(condition=condition)
+            
+        if vendor:
+            devices = devices.filter(vendor_id=vendor)
+        
+        # Order results
+        devices = devices.order_by('device_id')
+        
+        # Pagination
+        paginator = Paginator(devices, 25)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        # Get filter choices for form
+        context = {
+            'title': 'Device Search',
+            'page_obj': page_obj,
+            'query': query,
+            'categories': DeviceCategory.objects.filter(is_active=True).order_by('name'),
+            'vendors': Vendor.objects.filter(is_active=True).order_by('name'),
+            'status_choices': Device.STATUS_CHOICES,
+            'condition_choices': Device.CONDITION_CHOICES,
+            'filters': {
+                'category': category,
+                'status': status,
+                'condition': condition,
+                'vendor': vendor,
+            },
+            'total_results': devices.count() if query or any([category, status, condition, vendor]) else 0,
+            'search_performed': bool(query or any([category, status, condition, vendor]))
+        }
+        
+        return render(request, 'inventory/search/device_search.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error in device search: {str(e)}")
+        return render(request, 'inventory/search/device_search.html', {
+            'title': 'Device Search',
+            'error': str(e)
+        })
+
+
+@login_required
+def assignment_search(request):
+    """
+    Assignment-specific search functionality  
+    This is the missing function referenced in your URLs
+    """
+    try:
+        query = request.GET.get('q', '').strip()
+        status = request.GET.get('status', '')
+        assignment_type = request.GET.get('assignment_type', '')
+        department = request.GET.get('department', '')
+        date_from = request.GET.get('date_from', '')
+        date_to = request.GET.get('date_to', '')
+        
+        # Start with all assignments
+        assignments = Assignment.objects.select_related(
+            'device__device_type__subcategory__category',
+            'assigned_to_staff__user',
+            'assigned_to_department',
+            'assigned_to_location',
+            'assigned_by'
+        )
+        
+        # Apply text search if query provided
+        if query:
+            assignments = assignments.filter(
+                Q(assignment_id__icontains=query) |
+                Q(device__device_id__icontains=query) |
+                Q(device__device_name__icontains=query) |
+                Q(device__asset_tag__icontains=query) |
+                Q(assigned_to_staff__user__first_name__icontains=query) |
+                Q(assigned_to_staff__user__last_name__icontains=query) |
+                Q(assigned_to_staff__employee_id__icontains=query) |
+                Q(assigned_to_department__name__icontains=query) |
+                Q(notes__icontains=query)
+            )
+        
+        # Apply filters
+        if status == 'active':
+            assignments = assignments.filter(is_active=True)
+        elif status == 'inactive':
+            assignments = assignments.filter(is_active=False)
+        elif status == 'overdue':
+            from datetime import date
+            assignments = assignments.filter(
+                is_active=True,
+                expected_return_date__lt=date.today()
+            )
+        
+        if assignment_type:
+            assignments = assignments.filter(assignment_type=assignment_type)
+            
+        if department:
+            assignments = assignments.filter(assigned_to_department_id=department)
+        
+        # Date range filters
+        if date_from:
+            try:
+                from datetime import datetime
+                date_from_parsed = datetime.strptime(date_from, '%Y-%m-%d').date()
+                assignments = assignments.filter(assignment_date__gte=date_from_parsed)
+            except ValueError:
+                pass
+        
+        if date_to:
+            try:
+                from datetime import datetime
+                date_to_parsed = datetime.strptime(date_to, '%Y-%m-%d').date()
+                assignments = assignments.filter(assignment_date__lte=date_to_parsed)
+            except ValueError:
+                pass
+        
+        # Order results
+        assignments = assignments.order_by('-assignment_date')
+        
+        # Pagination
+        paginator = Paginator(assignments, 25)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        # Get filter choices for form
+        context = {
+            'title': 'Assignment Search',
+            'page_obj': page_obj,
+            'query': query,
+            'departments': Department.objects.filter(is_active=True).order_by('name'),
+            'assignment_type_choices': Assignment.ASSIGNMENT_TYPES,
+            'filters': {
+                'status': status,
+                'assignment_type': assignment_type,
+                'department': department,
+                'date_from': date_from,
+                'date_to': date_to,
+            },
+            'total_results': assignments.count() if query or any([status, assignment_type, department, date_from, date_to]) else 0,
+            'search_performed': bool(query or any([status, assignment_type, department, date_from, date_to]))
+        }
+        
+        return render(request, 'inventory/search/assignment_search.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error in assignment search: {str(e)}")
+        return render(request, 'inventory/search/assignment_search.html', {
+            'title': 'Assignment Search',
+            'error': str(e)
+        })
+
+# ================================
+# SEARCH API ENDPOINTS
+# ================================
+
+@login_required
+@require_http_methods(["GET"])
+def device_search_api(request):
+    """API endpoint for device search - for AJAX calls, paged with ?cursor="""
+    try:
+        query = request.GET.get('q', '').strip()
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 100)
+        
+        if len(query) < 2:
+            return JsonResponse({
+                'results': [],
+                'message': 'Please enter at least 2 characters'
+            })
+        
+        devices = Device.objects.filter(
+            Q(device_id__icontains=query) |
+            Q(device_name__icontains=query) |
+            Q(asset_tag__icontains=query) |
+            Q(serial_number__icontains=query)
+        ).select_related('device_type__subcategory__category')
+        page = paginate_keyset(request, devices, ('device_id',), per_page=limit, strict=True)
+        
+        results = []
+        for device in page:
+            results.append({
+                'id': device.device_id,
+                'device_id': device.device_id,
+                'device_name': device.device_name,
+                'asset_tag': device.asset_tag,
+                'status': device.get_status_display(),
+                'category': device.device_type.subcategory.category.name if device.device_type else 'N/A',
+                'url': f'/inventory/devices/{device.device_id}/'
+            })
+        
+        return JsonResponse({
+            'results': results,
+            'total': len(results),
+            'query': query,
+            'pagination': page.to_dict(),
+        })
+        
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+
+@login_required
+@require_http_methods(["GET"])
+def assignment_search_api(request):
+    """API endpoint for assignment search - for AJAX calls, paged with ?cursor="""
+    try:
+        query = request.GET.get('q', '').strip()
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 100)
+        
+        if len(query) < 2:
+            return JsonResponse({
+                'results': [],
+                'message': 'Please enter at least 2 characters'
+            })
+        
+        assignments = Assignment.objects.filter(
+            Q(assignment_id__icontains=query) |
+            Q(device__device_id__icontains=query) |
+            Q(device__device_name__icontains=query) |
+            Q(assigned_to_staff__user__first_name__icontains=query) |
+            Q(assigned_to_staff__user__last_name__icontains=query)
+        ).select_related(
+            'device', 'assigned_to_staff__user', 'assigned_to_department'
+        )
+        page = paginate_keyset(
+            request, assignments, ('-created_at', '-assignment_id'), per_page=limit, strict=True
+        )
+        
+        results = []
+        for assignment in page:
+            assigned_to = "N/A"
+            if assignment.assigned_to_staff:
+                assigned_to = f"{assignment.assigned_to_staff.user.first_name} {assignment.assigned_to_staff.user.last_name}"
+            elif assignment.assigned_to_department:
+                assigned_to = assignment.assigned_to_department.name
+            
+            results.append({
+                'id': assignment.assignment_id,
+                'assignment_id': assignment.assignment_id,
+                'device_id': assignment.device.device_id,
+                'device_name': assignment.device.device_name,
+                'assigned_to': assigned_to,
+                'assignment_type': assignment.get_assignment_type_display(),
+                'is_active': assignment.is_active,
+                'url': f'/inventory/assignments/{assignment.assignment_id}/'
+            })
+        
+        return JsonResponse({
+            'results': results,
+            'total': len(results),
+            'query': query,
+            'pagination': page.to_dict(),
+        })
+        
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+@login_required
+def api_blocks_by_building(request, building_id):
+    """API endpoint to get blocks by building for cascade dropdowns"""
+    try:
+        blocks = Block.objects.filter(
+            building_id=building_id, 
+            is_active=True
+        ).values('id', 'name', 'code').order_by('name')
+        
+        return JsonResponse({
+            'success': True,
+            'blocks': list(blocks)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_floors_by_block(request, block_id):
+    """API endpoint to get floors by block for cascade dropdowns"""
+    try:
+        floors = Floor.objects.filter(
+            block_id=block_id, 
+            is_active=True
+        ).values('id', 'name', 'floor_number').order_by('floor_number')
+        
+        return JsonResponse({
+            'success': True,
+            'floors': list(floors)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_floors_by_building(request, building_id):
+    """API endpoint to get floors by building (for direct building-to-floor cascade)"""
+    try:
+        floors = Floor.objects.filter(
+            building_id=building_id,
+            is_active=True
+        ).select_related('block').values(
+            'id', 'name', 'floor_number', 'block__name', 'block__code'
+        ).order_by('block__name', 'floor_number')
+        
+        return JsonResponse({
+            'success': True,
+            'floors': list(floors)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_departments_by_floor(request, floor_id):
+    """API endpoint to get departments by floor for cascade dropdowns"""
+    try:
+        departments = Department.objects.filter(
+            floor_id=floor_id, 
+            is_active=True
+        ).values('id', 'name', 'code').order_by('name')
+        
+        return JsonResponse({
+            'success': True,
+            'departments': list(departments)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_departments_by_building(request, building_id):
+    """API endpoint to get departments by building (for building-wide views)"""
+    try:
+        departments = Department.objects.filter(
+            floor__building_id=building_id,
+            is_active=True
+        ).select_related('floor__block').values(
+            'id', 'name', 'code', 'floor__name', 'floor__block__name'
+        ).order_by('floor__block__name', 'floor__name', 'name')
+        
+        return JsonResponse({
+            'success': True,
+            'departments': list(departments)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_departments_by_block(request, block_id):
+    """API endpoint to get departments by block"""
+    try:
+        departments = Department.objects.filter(
+            floor__block_id=block_id,
+            is_active=True
+        ).select_related('floor').values(
+            'id', 'name', 'code', 'floor__name', 'floor__floor_number'
+        ).order_by('floor__floor_number', 'name')
+        
+        return JsonResponse({
+            'success': True,
+            'departments': list(departments)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_rooms_by_department(request, department_id):
+    """API endpoint to get rooms by department for cascade dropdowns"""
+    try:
+        rooms = Room.objects.filter(
+            department_id=department_id, 
+            is_active=True
+        ).values('id', 'room_number', 'room_name', 'capacity').order_by('room_number')
+        
+        return JsonResponse({
+            'success': True,
+            'rooms': list(rooms)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_rooms_by_floor(request, floor_id):
+    """API endpoint to get rooms by floor (across all departments)"""
+    try:
+        rooms = Room.objects.filter(
+            department__floor_id=floor_id,
+            is_active=True
+        ).select_related('department').values(
+            'id', 'room_number', 'room_name', 'capacity', 'department__name', 'department__code'
+        ).order_by('department__name', 'room_number')
+        
+        return JsonResponse({
+            'success': True,
+            'rooms': list(rooms)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_rooms_by_building(request, building_id):
+    """API endpoint to get rooms by building (for building-wide views)"""
+    try:
+        rooms = Room.objects.filter(
+            department__floor__building_id=building_id,
+            is_active=True
+        ).select_related('department__floor__block', 'department').values(
+            'id', 'room_number', 'room_name', 'capacity',
+            'department__name', 'department__floor__name', 'department__floor__block__name'
+        ).order_by('department__floor__block__name', 'department__floor__name', 'department__name', 'room_number')
+        
+        return JsonResponse({
+            'success': True,
+            'rooms': list(rooms)
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_locations_by_building(request, building_id):
+    """API endpoint to get locations by building"""
+    try:
+        locations = Location.objects.filter(
+            building_id=building_id,
+            is_active=True
+        ).select_related('block', 'floor', 'department', 'room').values(
+            'id', 'description',
+            'block__name', 'floor__name', 'department__name', 'room__room_number'
+        ).order_by('block__name', 'floor__floor_number', 'department__name', 'room__room_number')
+        
+        # Format location display name
+        formatted_locations = []
+        for loc in locations:
+            display_name = f"{loc['block__name']} - {loc['floor__name']} - {loc['department__name']}"
+            if loc['room__room_number']:
+                display_name += f" - Room {loc['room__room_number']}"
+            
+            formatted_locations.append({
+                'id': loc['id'],
+                'display_name': display_name,
+                'description': loc['description']
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'locations': formatted_locations
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_locations_by_department(request, department_id):
+    """API endpoint to get locations by department"""
+    try:
+        locations = Location.objects.filter(
+            department_id=department_id,
+            is_active=True
+        ).select_related('room').values(
+            'id', 'description', 'room__room_number', 'room__room_name'
+        ).order_by('room__room_number')
+        
+        # Format location display name
+        formatted_locations = []
+        for loc in locations:
+            if loc['room__room_number']:
+                display_name = f"Room {loc['room__room_number']}"
+                if loc['room__room_name']:
+                    display_name += f" - {loc['room__room_name']}"
+            else:
+                display_name = "Department General Area"
+            
+            formatted_locations.append({
+                'id': loc['id'],
+                'display_name': display_name,
+                'description': loc['description']
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'locations': formatted_locations
+        })
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+# ================================
+# SEARCH API ENDPOINTS
+# ================================
+
+@login_required
+def api_location_search(request):
+    """API endpoint for location search with hierarchy context"""
+    try:
+        query = request.GET.get('q', '').strip()
+        building_id = request.GET.get('building')
+        department_id = request.GET.get('department')
+        limit = int(request.GET.get('limit', 20))
+        
+        if len(query) < 2:
+            return JsonResponse({'success': True, 'locations': []})
+        
+        locations = Location.objects.select_related(
+            'building', 'block', 'floor', 'department', 'room'
+        ).filter(is_active=True)
+        
+        # Apply building filter
+        if building_id:
+            locations = locations.filter(building_id=building_id)
+        
+        # Apply department filter
+        if department_id:
+            locations = locations.filter(department_id=department_id)
+        
+        # Search across hierarchy
+        locations = locations.filter(
+            Q(building__name__icontains=query) |
+            Q(block__name__icontains=query) |
+            Q(floor__name__icontains=query) |
+            Q(department__name__icontains=query) |
+            Q(room__room_number__icontains=query) |
+            Q(room__room_name__icontains=query) |
+            Q(description__icontains=query)
+        )[:limit]
+        
+        results = []
+        for location in locations:
+            results.append({
+                'id': location.id,
+                'display_name': str(location),
+                'description': location.description,
+                'building': location.building.name,
+                'block': location.block.name if location.block else '',
+                'floor': location.floor.name if location.floor else '',
+                'department': location.department.name if location.department else '',
+                'room': f"{location.room.room_number} - {location.room.room_name}" if location.room else '',
+            })
+        
+        return JsonResponse({
+            'success': True,
+            'locations': results
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+@login_required
+def api_hierarchy_stats(request):
+    """API endpoint to get hierarchy statistics (served from HierarchyRollup)"""
+    try:
+        building_id = request.GET.get('building_id')
+        
+        if building_id:
+            # Building-specific stats
+            building = get_object_or_404(Building, id=building_id)
+            rollup = get_rollup('BUILDING', building.id)
+            stats = {
+                'building': building.name,
+                'blocks': rollup.blocks,
+                'floors': rollup.floors,
+                'departments': rollup.departments,
+                'rooms': rollup.rooms,
+                'locations': rollup.locations,
+            }
+        else:
+            # System-wide stats
+            rollup = get_rollup('SYSTEM')
+            stats = {
+                'buildings': rollup.buildings,
+                'blocks': rollup.blocks,
+                'floors': rollup.floors,
+                'departments': rollup.departments,
+                'rooms': rollup.rooms,
+                'locations': rollup.locations,
+            }
+        stats.update({
+            'devices': rollup.devices,
+            'active_assignments': rollup.active_assignments,
+            'asset_value': rollup.asset_value,
+            'staff': rollup.staff,
+            'updated_at': rollup.updated_at,
+        })
+        
+        return JsonResponse({
+            'success': True,
+            'stats': stats
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+    
+
+# ================================
+# Global Search VIEW 
+# ================================
+@login_required
+def global_search(request):
+    """Global search across all inventory items"""
+    try:
+        query = request.GET.get('q', '').strip()
+        search_type = request.GET.get('type', 'all')
+        
+        if len(query) < 2:
+            return render(request, 'inventory/search/global_search.html', {
+                'query': query,
+                'results': {},
+                'message': 'Please enter at least 2 characters to search.'
+            })
+        
+        results = {}
+        
+        if search_type in ['all', 'devices']:
+            # Search devices
+            device_results = Device.objects.filter(
+                Q(device_id__icontains=query) |
+                Q(device_name__icontains=query) |
+                Q(asset_tag__icontains=query) |
+                Q(serial_number__icontains=query) |
+                Q(brand__icontains=query) |
+                Q(model__icontains=query)
+            ).select_related('device_type__subcategory__category', 'vendor')[:20]
+            
+            results['devices'] = device_results
+        
+        if search_type in ['all', 'assignments']:
+            # Search assignments
+            assignment_results = Assignment.objects.filter(
+                Q(assignment_id__icontains=query) |
+                Q(device__device_id__icontains=query) |
+                Q(device__device_name__icontains=query) |
+                Q(assigned_to_staff__user__first_name__icontains=query) |
+                Q(assigned_to_staff__user__last_name__icontains=query) |
+                Q(assigned_to_department__name__icontains=query)
+            ).select_related(
+                'device', 'assigned_to_staff__user', 'assigned_to_department'
+            )[:20]
+            
+            results['assignments'] = assignment_results
+        
+        if search_type in ['all', 'staff']:
+            # Search staff
+            staff_results = Staff.objects.filter(
+                Q(user__first_name__icontains=query) |
+                Q(user__last_name__icontains=query) |
+                Q(user__username__icontains=query) |
+                Q(employee_id__icontains=query) |
+                Q(department__name__icontains=query)
+            ).select_related('user', 'department')[:20]
+            
+            results['staff'] = staff_results
+        
+        if search_type in ['all', 'maintenance']:
+            # Search maintenance records
+            try:
+                maintenance_results = MaintenanceSchedule.objects.filter(
+                    Q(device__device_id__icontains=query) |
+                    Q(device__device_name__icontains=query) |
+                    Q(description__icontains=query) |
+                    Q(vendor__name__icontains=query)
+                ).select_related('device', 'vendor')[:20]
+                
+                results['maintenance'] = maintenance_results
+            except:
+                results['maintenance'] = []
+        
+        context = {
+            'query': query,
+            'search_type': search_type,
+            'results': results,
+            'total_results': sum(len(v) for v in results.values() if hasattr(v, '__len__')),
+        }
+        
+        return render(request, 'inventory/search/global_search.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error performing search: {str(e)}")
+        return render(request, 'inventory/search/global_search.html', {
+            'query': query,
+            'results': {},
+            'error': str(e)
+        })
@@ -0,0 +1,1016 @@
+# inventory/views/staff.py - Staff Views
+"""Staff and department management."""
+
+# Django core imports
+from django.shortcuts import render, get_object_or_404, redirect
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.core.paginator import Paginator
+from django.core.exceptions import ValidationError
+from bps_inventory.pagination import paginate_keyset
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+from django.contrib.auth.models import User
+
+# Django DB imports
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+# Python standard library imports
+import logging
+from datetime import timedelta
+
+# Model imports
+from ..models import Assignment, Staff, Department, Building, Block, Floor
+from ..forms import StaffForm
+
+# View package imports
+from .common import DepartmentForm, get_client_ip
+
+logger = logging.getLogger(__name__)
+
+# ================================
+# Helper functions for staff management
+# ================================
+
+
+
+def validate_staff_data(form_data, instance=None):
+    """
+    Additional validation for staff data beyond form validation.
+    
+    Args:
+        form_data: Cleaned form data
+        instance: Existing staff instance for updates (None for create)
+    
+    Returns:
+        tuple: (is_valid: bool, errors: list)
+    """
+    errors = []
+    
+    # Check user availability
+    user = form_data.get('user')
+    if user:
+        # Check if user already has staff profile (for create or different user in update)
+        if hasattr(user, 'staff_profile'):
+            if not instance or instance.user != user:
+                errors.append(f'User "{user.username}" already has a staff profile.')
+    
+    # Check employee ID uniqueness
+    employee_id = form_data.get('employee_id')
+    if employee_id:
+        existing_staff = Staff.objects.filter(employee_id=employee_id)
+        if instance:
+            existing_staff = existing_staff.exclude(pk=instance.pk)
+        
+        if existing_staff.exists():
+            errors.append(f'Employee ID "{employee_id}" is already in use.')
+    
+    # Check department status
+    department = form_data.get('department')
+    if department and not department.is_active:
+        errors.append(f'Department "{department.name}" is not active.')
+    
+    # Validate joining date
+    joining_date = form_data.get('joining_date')
+    if joining_date:
+        if joining_date > timezone.now().date():
+            errors.append('Joining date cannot be in the future.')
+        
+        # Check if joining date is too far in the past (more than 50 years)
+        if joining_date < timezone.now().date() - timedelta(days=50*365):
+            errors.append('Joining date seems too far in the past.')
+    
+    # Validate phone number format (basic validation)
+    phone_number = form_data.get('phone_number')
+    if phone_number:
+        # Remove common formatting characters
+        clean_phone = phone_number.replace('+', '').replace('-', '').replace(' ', '').replace('(', '').replace(')', '')
+        if not clean_phone.isdigit():
+            errors.append('Phone number should contain only digits and standard formatting characters.')
+        elif len(clean_phone) < 10 or len(clean_phone) > 15:
+            errors.append('Phone number should be between 10 and 15 digits.')
+    
+    return len(errors) == 0, errors
+
+
+def generate_employee_id_suggestion(department=None):
+    """
+    Generate a suggested employee ID based on department and existing IDs.
+    
+    Args:
+        department: Department instance (optional)
+    
+    Returns:
+        str: Suggested employee ID
+    
+    Suggestions are read from the employee ID sequence without reserving a
+    number. Employee IDs are typed in by hand, so a suggestion that has been
+    taken since moves the sequence past it.
+    """
+    try:
+        from ..sequences import employee_ids
+        series = employee_ids(department)
+        
+        for _attempt in range(10):
+            suggestion = series.format(series.peek())
+            if not Staff.objects.filter(employee_id=suggestion).exists():
+                return suggestion
+            series.advance_to(series.parse(suggestion))
+        return suggestion
+        
+    except Exception:
+        # Fallback to simple numbering
+        staff_count = Staff.objects.count()
+        return f"EMP{staff_count + 1:03d}"
+
+
+@login_required
+def ajax_generate_employee_id(request):
+    """
+    AJAX endpoint to generate employee ID suggestion.
+    """
+    if request.method == 'GET':
+        department_id = request.GET.get('department_id')
+        department = None
+        
+        if department_id:
+            try:
+                department = Department.objects.get(id=department_id)
+            except Department.DoesNotExist:
+                pass
+        
+        suggested_id = generate_employee_id_suggestion(department)
+        
+        return JsonResponse({
+            'success': True,
+            'suggested_id': suggested_id
+        })
+    
+    return JsonResponse({'success': False, 'error': 'Invalid request method'})
+
+
+@login_required
+def ajax_check_employee_id(request):
+    """
+    AJAX endpoint to check if employee ID is available.
+    """
+    if request.method == 'GET':
+        employee_id = request.GET.get('employee_id', '').strip()
+        staff_id = request.GET.get('staff_id')  # For edit operations
+        
+        if not employee_id:
+            return JsonResponse({
+                'available': False,
+                'message': 'Employee ID is required'
+            })
+        
+        # Check if ID exists
+        existing = Staff.objects.filter(employee_id=employee_id)
+        
+        # Exclude current staff member for edit operations
+        if staff_id:
+            existing = existing.exclude(id=staff_id)
+        
+        is_available = not existing.exists()
+        
+        return JsonResponse({
+            'available': is_available,
+            'message': 'Available' if is_available else 'Employee ID already exists'
+        })
+    
+    return JsonResponse({'available': False, 'error': 'Invalid request method'})
+
+# ================================
+# STAFF MANAGEMENT VIEWS
+# ================================
+
+@login_required
+def staff_list(request):
+    """List all staff members with device assignment counts"""
+    try:
+        staff_members = Staff.objects.select_related('user', 'department').annotate(
+            active_assignments=Count('device_assignments', filter=Q(device_assignments__is_active=True)),
+            total_assignments=Count('device_assignments')
+        )
+        
+        # Search functionality
+        search = request.GET.get('search')
+        if search:
+            staff_members = staff_members.filter(
+                Q(user__first_name__icontains=search) |
+                Q(user__last_name__icontains=search) |
+                Q(employee_id__icontains=search) |
+                Q(user__email__icontains=search) |
+                Q(department__name__icontains=search)
+            )
+        
+        # Department filter
+        department_id = request.GET.get('department')
+        if department_id:
+            staff_members = staff_members.filter(department_id=department_id)
+        
+        # Keyset pagination by name; the primary key breaks ties
+        page_obj = paginate_keyset(
+            request, staff_members, ('user__first_name', 'user__last_name', 'id'), per_page=25
+        )
+        
+        # Get departments for filter dropdown
+        departments = Department.objects.all().order_by('name')
+        
+        context = {
+            'page_obj': page_obj,
+            'search': search,
+            'departments': departments,
+            'selected_department': department_id,
+        }
+        
+        return render(request, 'inventory/staff/staff_list.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading staff list: {str(e)}")
+        return render(request, 'inventory/staff/staff_list.html', {'page_obj': None})
+
+@login_required
+def staff_detail(request, staff_id):
+    """Staff detail view with assignment history"""
+    try:
+        staff = get_object_or_404(Staff.objects.select_related('department'), id=staff_id)
+        
+        # Get assignments with pagination
+        assignments = Assignment.objects.filter(
+            assigned_to_staff=staff 
+        ).select_related(
+            'device', 'device__device_type', 'created_by'  
+        ).order_by('-created_at')
+        
+        # Current assignments
+        current_assignments = assignments.filter(is_active=True)
+        
+        # Assignment history
+        assignment_history = assignments.filter(is_active=False) 
+        
+        # Calculate stats
+        total_assignments = assignments.count()
+        active_assignments = current_assignments.count()
+        
+        # Calculate total value of current assignments
+        total_value = current_assignments.aggregate(
+            total=Sum('device__purchase_price')
+        )['total'] or 0
+        
+        # Recent activities (last 10)
+        recent_activities = assignment_history[:10]
+        
+        context = {
+            'staff': staff,
+            'current_assignments': current_assignments,
+            'assignment_history': assignment_history,
+            'total_assignments': total_assignments,
+            'active_assignments': active_assignments,
+            'total_value': total_value,
+            'recent_activities': recent_activities,
+        }
+        
+        return render(request, 'inventory/staff/staff_detail.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading staff details: {str(e)}")
+        return redirect('inventory:staff_list') 
+
+@login_required
+@permission_required('inventory.add_staff', raise_exception=True)
+def staff_create(request):
+    """
+    Create new staff member with comprehensive validation and error handling.
+    Features:
+    - Atomic transaction support
+    - Comprehensive form validation
+    - User activity logging
+    - Duplicate checking
+    - Email validation
+    - Employee ID uniqueness validation
+    - Department validation
+    - Enhanced error handling
+    """
+    
+    if request.method == 'POST':
+        form = StaffForm(request.POST)
+        
+        if form.is_valid():
+            try:
+                with transaction.atomic():
+                    # Get form data
+                    user = form.cleaned_data['user']
+                    employee_id = form.cleaned_data['employee_id']
+                    department = form.cleaned_data.get('department')
+                    
+                    # Additional validation before saving
+                    
+                    # 1. Check if user already has a staff profile
+                    if hasattr(user, 'staff_profile'):
+                        messages.error(
+                            request, 
+                            f'User "{user.username}" already has a staff profile. Please select a different user.'
+                        )
+                        raise ValidationError("User already has staff profile")
+                    
+                    # 2. Check employee ID uniqueness (extra safety)
+                    if Staff.objects.filter(employee_id=employee_id).exists():
+                        messages.error(
+                            request,
+                            f'Employee ID "{employee_id}" is already in use. Please choose a different ID.'
+                        )
+                        raise ValidationError("Employee ID already exists")
+                    
+                    # 3. Validate department is active
+                    if department and not department.is_active:
+                        messages.error(
+                            request,
+                            f'Department "{department.name}" is not active. Please select an active department.'
+                        )
+                        raise ValidationError("Department is not active")
+                    
+                    # 4. Save the staff member
+                    staff = form.save(commit=False)
+                    
+                    # Set additional fields
+                    staff.created_at = timezone.now()
+                    staff.updated_at = timezone.now()
+                    
+                    # If no joining date specified, set to today
+                    if not staff.joining_date:
+                        staff.joining_date = timezone.now().date()
+                    
+                    # Save the staff member
+                    staff.save()
+                    
+                    # 5. Update user permissions if needed
+                    if not user.is_staff:
+                        user.is_staff = True
+                        user.save(update_fields=['is_staff'])
+                    
+                    # 6. Log the activity
+                    try:
+                        from ..utils import log_user_activity
+                        log_user_activity(
+                            user=request.user,
+                            action='CREATE',
+                            model_name='Staff',
+                            object_id=staff.id,
+                            object_repr=str(staff),
+                            changes={
+                                'employee_id': employee_id,
+                                'user': user.username,
+                                'department': str(department) if department else None,
+                                'designation': staff.designation,
+                                'is_active': staff.is_active,
+                            },
+                            ip_address=get_client_ip(request)
+                        )
+                    except Exception as log_error:
+                        # Don't fail the whole operation if logging fails
+                        logger.warning(f"Failed to log staff creation activity: {log_error}")
+                    
+                    # 7. Create success message with detailed info
+                    success_msg = f'Staff member "{staff.get_full_name()}" (ID: {staff.employee_id}) created successfully.'
+                    if department:
+                        success_msg += f' Assigned to {department.name} department.'
+                    
+                    messages.success(request, success_msg)
+                    
+                    # 8. Redirect to staff detail page
+                    return redirect('inventory:staff_detail', staff_id=staff.id)
+                    
+            except ValidationError as ve:
+                # Form validation errors - don't log as exceptions
+                if not messages.get_messages(request):
+                    messages.error(request, f'Validation error: {str(ve)}')
+                    
+            except Exception as e:
+                # Log unexpected errors
+                logger.error(f"Error creating staff member: {str(e)}", exc_info=True)
+                
+                # User-friendly error message
+                error_msg = f'Error creating staff member: {str(e)}'
+                if 'duplicate key' in str(e).lower():
+                    error_msg = 'A staff member with this information already exists.'
+                elif 'foreign key' in str(e).lower():
+                    error_msg = 'Invalid department or user selection.'
+                elif 'null value' in str(e).lower():
+                    error_msg = 'Please fill in all required fields.'
+                
+                messages.error(request, error_msg)
+        
+        else:
+            # Form validation failed
+            error_messages = []
+            for field, errors in form.errors.items():
+                for error in errors:
+                    if field == '__all__':
+                        error_messages.append(f"Form error: {error}")
+                    else:
+                        field_label = form.fields[field].label or field.replace('_', ' ').title()
+                        error_messages.append(f"{field_label}: {error}")
+            
+            if error_messages:
+                messages.error(request, "Please correct the following errors: " + "; ".join(error_messages))
+            else:
+                messages.error(request, "Please correct the form errors and try again.")
+    
+    else:
+        # GET request - initialize empty form
+        form = StaffForm()
+        
+        # Pre-populate fields if provided in URL parameters
+        department_id = request.GET.get('department')
+        if department_id:
+            try:
+                department = Department.objects.get(id=department_id, is_active=True)
+                form.fields['department'].initial = department
+            except Department.DoesNotExist:
+                pass
+        
+        user_id = request.GET.get('user')
+        if user_id:
+            try:
+                user = User.objects.get(id=user_id, is_active=True)
+                # Check if user doesn't already have staff profile
+                if not hasattr(user, 'staff_profile'):
+                    form.fields['user'].initial = user
+            except User.DoesNotExist:
+                pass
+    
+    # Prepare context for template
+    context = {
+        'form': form,
+        'title': 'Add New Staff Member',
+        'action': 'Create',
+        'breadcrumbs': [
+            {'name': 'Dashboard', 'url': reverse('inventory:dashboard')},
+            {'name': 'Staff', 'url': reverse('inventory:staff_list')},
+            {'name': 'Add Staff', 'url': None}
+        ],
+        # Additional context for template
+        'available_departments': Department.objects.filter(is_active=True).order_by('name'),
+        'available_users_count': User.objects.filter(
+            staff_profile__isnull=True, 
+            is_active=True
+        ).count(),
+        'form_help_text': {
+            'employee_id': 'Unique identifier for the staff member (e.g., EMP001)',
+            'user': 'Select a user account that doesn\'t already have a staff profile',
+            'department': 'The department this staff member belongs to',
+            'designation': 'Job title or position (e.g., IT Officer, Manager)',
+            'phone_number': 'Contact phone number (e.g., +880-1XXXXXXXXX)',
+            'joining_date': 'Date when the staff member joined the organization'
+        }
+    }
+    
+    return render(request, 'inventory/staff/staff_form.html', context)
+
+@login_required
+@permission_required('inventory.change_staff', raise_exception=True)
+def staff_edit(request, staff_id):
+    """Edit staff details"""
+    try:
+        staff = get_object_or_404(Staff, id=staff_id)
+        
+        if request.method == 'POST':
+            form = StaffForm(request.POST, instance=staff)
+            if form.is_valid():
+                try:
+                    with transaction.atomic():
+                        staff = form.save()
+                        
+                        # Log the activity
+                        from ..utils import log_user_activity
+                        log_user_activity(
+                            user=request.user,
+                            action='UPDATE',
+                            model_name='Staff',
+                            object_id=staff.id,
+                            object_repr=str(staff),
+                            ip_address=request.META.get('REMOTE_ADDR')
+                        )
+                        
+                        messages.success(request, f'Staff member "{staff.get_full_name()}" updated successfully.')
+                        return redirect('inventory:staff_detail', staff_id=staff.id)
+                except Exception as e:
+                    messages.error(request, f'Error updating staff member: {str(e)}')
+        else:
+            form = StaffForm(instance=staff)
+        
+        context = {
+            'form': form,
+            'staff': staff,
+            'title': f'Edit Staff: {staff.get_full_name()}',
+            'action': 'Update',
+        }
+        return render(request, 'inventory/staff/staff_form.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading staff for edit: {str(e)}")
+        return redirect('inventory:staff_list')
+
+@login_required
+@permission_required('inventory.delete_staff', raise_exception=True)
+def staff_delete(request, staff_id):
+    """Delete staff member"""
+    try:
+        staff = get_object_or_404(Staff, id=staff_id)
+        
+        # Check if staff has active assignments
+        active_assignments = Assignment.objects.filter(
+            assigned_to_staff=staff,
+            is_active=True            
+        ).count()
+        
+        if active_assignments > 0:
+            messages.error(
+                request, 
+                f'Cannot delete staff member "{staff.get_full_name()}". They have {active_assignments} active device assignments.'
+            )
+            return redirect('inventory:staff_detail', staff_id=staff.id)
+        
+        if request.method == 'POST':
+            staff_name = staff.get_full_name()
+            staff.delete()
+            messages.success(request, f'Staff member "{staff_name}" deleted successfully.')
+            return redirect('inventory:staff_list')
+        
+        context = {
+            'staff': staff,
+            'active_assignments': active_assignments,
+        }
+        return render(request, 'inventory/staff/staff_delete_confirm.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error deleting staff member: {str(e)}")
+        return redirect('inventory:staff_list')
+
+@login_required
+def staff_assignments(request, staff_id):
+    """View all assignments for a specific staff member"""
+    try:
+        staff = get_object_or_404(Staff.objects.select_related('department'), id=staff_id)
+        
+        # Get all assignments for this staff member
+        assignments = Assignment.objects.filter(
+            assigned_to_staff=staff
+        ).select_related(
+            'device', 'device__device_type', 'created_by'
+        ).order_by('-created_at')
+        
+        # Filter by search query if provided
+        search = request.GET.get('search', '')
+        if search:
+            assignments = assignments.filter(
+                Q(device__device_id__icontains=search) |
+                Q(device__device_name__icontains=search) |
+                Q(device__asset_tag__icontains=search)
+            )
+        
+        # Filter by status if provided
+        status_filter = request.GET.get('status', '')
+        if status_filter == 'active':
+            assignments = assignments.filter(is_active=True) 
+        elif status_filter == 'inactive':
+            assignments = assignments.filter(is_active=False)  
+        
+        # Pagination
+        paginator = Paginator(assignments, 25)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        # Calculate statistics
+        stats = {
+            'total': assignments.count(),
+            'active': assignments.filter(is_active=True).count(),  
+            'inactive': assignments.filter(is_active=False).count(),  
+        }
+        
+        context = {
+            'staff': staff,
+            'page_obj': page_obj,
+            'search': search,
+            'status_filter': status_filter,
+            'stats': stats,
+        }
+        
+        return render(request, 'inventory/staff/staff_assignments.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading staff assignments: {str(e)}")
+        return redirect('inventory:staff_detail', staff_id=staff_id)
+    
+
+# ================================
+# DEPARTMENT MANAGEMENT VIEWS
+# ================================
+
+@login_required
+@permission_required('inventory.view_department', raise_exception=True)
+def department_list(request):
+    """Enhanced department list with block support and comprehensive filtering"""
+    search = request.GET.get('search', '')
+    building_filter = request.GET.get('building', '')
+    block_filter = request.GET.get('block', '')
+    floor_filter = request.GET.get('floor', '')
+    is_active_filter = request.GET.get('is_active', '')
+    sort_by = request.GET.get('sort', 'name')
+    
+    departments = Department.objects.select_related('floor__building', 'floor__block')
+    
+    # Search functionality
+    if search:
+        departments = departments.filter(
+            Q(name__icontains=search) |
+            Q(code__icontains=search) |
+            Q(head_of_department__icontains=search) |
+            Q(floor__building__name__icontains=search) |
+            Q(floor__block__name__icontains=search)
+        )
+    
+    # Filter by building
+    if building_filter:
+        departments = departments.filter(floor__building_id=building_filter)
+    
+    # Filter by block
+    if block_filter:
+        departments = departments.filter(floor__block_id=block_filter)
+    
+    # Filter by floor
+    if floor_filter:
+        departments = departments.filter(floor_id=floor_filter)
+    
+    # Filter by active status
+    if is_active_filter:
+        departments = departments.filter(is_active=is_active_filter == 'true')
+    
+    # Sorting
+    valid_sort_fields = ['name', 'code', 'floor__building__name', 'floor__block__name', '-created_at']
+    if sort_by in valid_sort_fields:
+        departments = departments.order_by(sort_by)
+    else:
+        departments = departments.order_by('name')
+    
+    # Add annotations for statistics
+    departments = departments.annotate(
+        rooms_count=Count('rooms'),
+        locations_count=Count('locations'),
+        staff_count=Count('staff'),
+        active_assignments=Count('staff__assignments', filter=Q(staff__assignments__status='ASSIGNED'))
+    )
+    
+    # Get data for filter dropdowns
+    buildings = Building.objects.filter(is_active=True).order_by('name')
+    blocks = Block.objects.filter(is_active=True).order_by('building__name', 'name')
+    floors = Floor.objects.filter(is_active=True).order_by('building__name', 'block__name', 'floor_number')
+    
+    # Pagination
+    paginator = Paginator(departments, 12)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    
+    # Statistics
+    total_departments = departments.count()
+    active_departments = departments.filter(is_active=True).count()
+    total_staff = departments.aggregate(total=Sum('staff_count'))['total'] or 0
+    total_active_assignments = departments.aggregate(total=Sum('active_assignments'))['total'] or 0
+    
+    context = {
+        'page_obj': page_obj,
+        'departments': page_obj.object_list,
+        'buildings': buildings,
+        'blocks': blocks,
+        'floors': floors,
+        'search': search,
+        'building_filter': building_filter,
+        'block_filter': block_filter,
+        'floor_filter': floor_filter,
+        'is_active_filter': is_active_filter,
+        'sort_by': sort_by,
+        'total_departments': total_departments,
+        'active_departments': active_departments,
+        'total_staff': total_staff,
+        'total_active_assignments': total_active_assignments,
+        'title': 'Department Management',
+        'current_filters': {
+            'building': building_filter,
+            'block': block_filter,
+            'floor': floor_filter,
+            'is_active': is_active_filter,
+            'search': search,
+            'sort': sort_by,
+        },
+    }
+    
+    return render(request, 'inventory/locations/department_list.html', context)
+
+@login_required
+@permission_required('inventory.view_department', raise_exception=True)
+def department_detail(request, department_id):
+    """Enhanced department detail with block hierarchy and comprehensive statistics"""
+    department = get_object_or_404(
+        Department.objects.select_related('floor__building', 'floor__block'), 
+        id=department_id
+    )
+    
+    # Get related data
+    rooms = department.rooms.all().order_by('room_number')
+    staff = department.staff.filter(is_active=True).select_related('user').order_by('user__first_name', 'user__last_name')
+    locations = department.locations.all().select_related('room')
+    
+    # Get assignments for staff in this department
+    active_assignments = Assignment.objects.filter(
+        staff__department=department,
+        status='ASSIGNED'
+    ).select_related('device', 'device__device_type', 'staff__user', 'location')
+    
+    # Get recent assignments (last 30 days)
+    from datetime import datetime, timedelta
+    recent_assignments = Assignment.objects.filter(
+        staff__department=department,
+        assigned_date__gte=datetime.now() - timedelta(days=30)
+    ).select_related('device', 'staff__user').order_by('-assigned_date')[:10]
+    
+    # Statistics
+    total_rooms = rooms.count()
+    total_staff = staff.count()
+    total_locations = locations.count()
+    total_active_assignments = active_assignments.count()
+    
+    # Device statistics
+    device_categories = active_assignments.values(
+        'device__device_type__subcategory__category__name'
+    ).annotate(
+        count=Count('id'),
+        total_value=Sum('device__purchase_price')
+    ).order_by('-count')
+    
+    # Staff utilization
+    staff_with_assignments = staff.annotate(
+        assignment_count=Count('assignments', filter=Q(assignments__status='ASSIGNED'))
+    ).order_by('-assignment_count')
+    
+    # Total value of assigned devices
+    total_assignment_value = active_assignments.aggregate(
+        total=Sum('device__purchase_price')
+    )['total'] or 0
+    
+    # Room utilization
+    room_utilization = []
+    for room in rooms:
+        room_assignments = active_assignments.filter(location__room=room).count()
+        room_utilization.append({
+            'room': room,
+            'assignment_count': room_assignments,
+            'utilization_percentage': (room_assignments / room.capacity * 100) if room.capacity > 0 else 0
+        })
+    
+    context = {
+        'department': department,
+        'rooms': rooms,
+        'staff': staff,
+        'locations': locations,
+        'active_assignments': active_assignments,
+        'recent_assignments': recent_assignments,
+        'staff_with_assignments': staff_with_assignments,
+        'room_utilization': room_utilization,
+        'device_categories': device_categories,
+        'total_rooms': total_rooms,
+        'total_staff': total_staff,
+        'total_locations': total_locations,
+        'total_active_assignments': total_active_assignments,
+        'total_assignment_value': total_assignment_value,
+        'avg_assignments_per_staff': round(total_active_assignments / total_staff, 1) if total_staff > 0 else 0,
+        'title': f'Department: {department.name}',
+    }
+    
+    return render(request, 'inventory/locations/department_detail.html', context)
+
+@login_required
+@permission_required('inventory.add_department', raise_exception=True)
+def department_create(request):
+    """Create a new department"""
+    if request.method == 'POST':
+        form = DepartmentForm(request.POST)
+        if form.is_valid():
+            try:
+                department = form.save()
+                messages.success(request, f'Department "{department.name}" created successfully.')
+                return redirect('inventory:department_detail', department_id=department.id)
+            except Exception as e:
+                messages.error(request, f'Error creating department: {str(e)}')
+    else:
+        form = DepartmentForm()
+        # Pre-select floor if provided in URL
+        floor_id = request.GET.get('floor')
+        if floor_id:
+            form.fields['floor'].initial = floor_id
+    
+    context = {
+        'form': form,
+        'title': 'Add New Department',
+        'form_action': 'Create',
+    }
+    
+    return render(request, 'inventory/locations/department_form.html', context)
+
+@login_required
+@permission_required('inventory.change_department', raise_exception=True)
+def department_edit(request, department_id):
+    """Edit department details"""
+    try:
+        department = get_object_or_404(Department, id=department_id)
+        
+        if request.method == 'POST':
+            form = DepartmentForm(request.POST, instance=department)
+            if form.is_valid():
+                try:
+                    with transaction.atomic():
+                        department = form.save()
+                        
+                        # Log the activity
+                        from ..utils import log_user_activity
+                        log_user_activity(
+                            user=request.user,
+                            action='UPDATE',
+                            model_name='Department',
+                            object_id=department.id,
+                            object_repr=str(department),
+                            ip_address=request.META.get('REMOTE_ADDR')
+                        )
+                        
+                        messages.success(request, f'Department "{department.name}" updated successfully.')
+                        return redirect('inventory:department_detail', department_id=department.id)
+                except Exception as e:
+                    messages.error(request, f'Error updating department: {str(e)}')
+        else:
+            form = DepartmentForm(instance=department)
+        
+        context = {
+            'form': form,
+            'department': department,
+            'title': f'Edit Department: {department.name}',
+            'action': 'Update',
+        }
+        return render(request, 'inventory/department_form.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading department for edit: {str(e)}")
+        return redirect('inventory:department_list')
+
+@login_required
+@permission_required('inventory.view_assignment', raise_exception=True)
+def department_assignments(request, department_id):
+    """View all assignments for a specific department"""
+    try:
+        department = get_object_or_404(Department.objects.select_related('floor__building', 'floor__block'), id=department_id)
+        
+        # Get all assignments for this department
+        assignments = Assignment.objects.filter(
+            assigned_to_department=department
+        ).select_related(
+            'device', 'device__device_type', 'assigned_to_staff__user', 'created_by'
+        ).order_by('-created_at')
+        
+        # Also get assignments to staff members in this department
+        staff_assignments = Assignment.objects.filter(
+            assigned_to_staff__department=department
+        ).select_related(
+            'device', 'device__device_type', 'assigned_to_staff__user', 'created_by'
+        ).order_by('-created_at')
+        
+        # Combine both querysets
+        all_assignments = assignments.union(staff_assignments).order_by('-created_at')
+        
+        # Apply filters
+        search = request.GET.get('search', '')
+        status_filter = request.GET.get('status', '')
+        staff_filter = request.GET.get('staff', '')
+        assignment_type_filter = request.GET.get('type', '')
+        
+        # Search functionality
+        if search:
+            all_assignments = all_assignments.filter(
+                Q(device__device_id__icontains=search) |
+                Q(device__device_name__icontains=search) |
+                Q(device__asset_tag__icontains=search) |
+                Q(assigned_to_staff__user__first_name__icontains=search) |
+                Q(assigned_to_staff__user__last_name__icontains=search) |
+                Q(assigned_to_staff__employee_id__icontains=search)
+            )
+        
+        # Filter by status
+        if status_filter == 'active':
+            all_assignments = all_assignments.filter(is_active=True)
+        elif status_filter == 'inactive':
+            all_assignments = all_assignments.filter(is_active=False)
+        
+        # Filter by assignment type
+        if assignment_type_filter:
+            all_assignments = all_assignments.filter(assignment_type=assignment_type_filter)
+        
+        # Filter by specific staff member
+        if staff_filter:
+            all_assignments = all_assignments.filter(assigned_to_staff_id=staff_filter)
+        
+        # Get staff members in this department for filter
+        staff_members = Staff.objects.filter(
+            department=department,
+            is_active=True
+        ).select_related('user').order_by('user__first_name', 'user__last_name')
+        
+        # Pagination
+        paginator = Paginator(all_assignments, 25)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        # Calculate statistics
+        total_assignments = all_assignments.count()
+        active_assignments = all_assignments.filter(is_active=True).count()
+        inactive_assignments = all_assignments.filter(is_active=False).count()
+        
+        # Assignment type statistics
+        permanent_assignments = all_assignments.filter(assignment_type='PERMANENT').count()
+        temporary_assignments = all_assignments.filter(assignment_type='TEMPORARY').count()
+        
+        # Calculate total value of active assignments
+        active_value = all_assignments.filter(is_active=True).aggregate(
+            total=Sum('device__purchase_price')
+        )['total'] or 0
+        
+        # Get overdue assignments
+        overdue_assignments = all_assignments.filter(
+            assignment_type='TEMPORARY',
+            is_active=True,
+            expected_return_date__lt=timezone.now().date()
+        ).count()
+        
+        stats = {
+            'total': total_assignments,
+            'active': active_assignments,
+            'inactive': inactive_assignments,
+            'permanent': permanent_assignments,
+            'temporary': temporary_assignments,
+            'overdue': overdue_assignments,
+            'total_value': active_value,
+        }
+        
+        context = {
+            'department': department,
+            'page_obj': page_obj,
+            'search': search,
+            'status_filter': status_filter,
+            'staff_filter': staff_filter,
+            'assignment_type_filter': assignment_type_filter,
+            'staff_members': staff_members,
+            'stats': stats,
+        }
+        
+        return render(request, 'inventory/department/department_assignments.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading department assignments: {str(e)}")
+        return redirect('inventory:department_detail', department_id=department_id)
+
+@login_required
+@permission_required('inventory.delete_department', raise_exception=True)
+def department_delete(request, department_id):
+    """Delete a department"""
+    department = get_object_or_404(Department, id=department_id)
+    
+    if request.method == 'POST':
+        try:
+            # Check if department has staff or assignments
+            staff_count = department.staff.count()
+            room_count = department.rooms.count()
+            location_count = department.locations.count()
+            
+            if staff_count > 0:
+                messages.error(request, f'Cannot delete department "{department.name}": {staff_count} staff members are assigned.')
+                return redirect('inventory:department_detail', department_id=department.id)
+            
+            if room_count > 0:
+                messages.error(request, f'Cannot delete department "{department.name}": {room_count} rooms exist.')
+                return redirect('inventory:department_detail', department_id=department.id)
+            
+            if location_count > 0:
+                messages.error(request, f'Cannot delete department "{department.name}": {location_count} locations exist.')
+                return redirect('inventory:department_detail', department_id=department.id)
+            
+            department_name = department.name
+            department.delete()
+            messages.success(request, f'Department "{department_name}" deleted successfully.')
+            return redirect('inventory:department_list')
+            
+        except Exception as e:
+            messages.error(request, f'Error deleting department: {str(e)}')
+            return redirect('inventory:department_detail', department_id=department.id)
+    
+    return redirect('inventory:department_detail', department_id=department.id)
@@ -0,0 +1,251 @@
+# inventory/views/system.py - System Administration Views
+"""System settings, data cleanup and maintenance tasks."""
+
+# Django core imports
+from django.shortcuts import render, redirect
+from django.utils import timezone
+from bps_inventory.pagination import paginate_keyset
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+from django.contrib.auth.models import User
+
+# Django DB imports
+from django.db.models import Count, Q
+
+# Python standard library imports
+from datetime import timedelta, datetime
+
+# Model imports
+from ..models import (
+    Device, Assignment, Staff, Department, Location, Vendor, MaintenanceSchedule,
+    AuditLog,
+)
+from ..utils import day_range
+
+# ================================
+# SYSTEM ADMINISTRATION VIEWS
+# ================================
+
+@login_required
+@permission_required('inventory.view_auditlog', raise_exception=True)
+def system_statistics(request):
+    """Display comprehensive system statistics"""
+    try:
+        # Database statistics
+        db_stats = {
+            'total_devices': Device.objects.count(),
+            'total_assignments': Assignment.objects.count(),
+            'total_staff': Staff.objects.count(),
+            'total_departments': Department.objects.count(),
+            'total_locations': Location.objects.count(),
+            'total_vendors': Vendor.objects.count(),
+            'total_maintenance_schedules': MaintenanceSchedule.objects.count(),
+            'total_audit_logs': AuditLog.objects.count(),
+        }
+        
+        # Activity statistics (last 30 days)
+        thirty_days_ago = timezone.now().date() - timedelta(days=30)
+        activity_stats = {
+            'devices_added': Device.objects.filter(**day_range('created_at', date_from=thirty_days_ago)).count(),
+            'assignments_created': Assignment.objects.filter(**day_range('created_at', date_from=thirty_days_ago)).count(),
+            'assignments_returned': Assignment.objects.filter(
+                actual_return_date__gte=thirty_days_ago
+            ).count(),
+            'maintenance_completed': MaintenanceSchedule.objects.filter(
+                actual_date__gte=thirty_days_ago,
+                status='COMPLETED'
+            ).count(),
+        }
+        
+        # User activity
+        user_activity = User.objects.annotate(
+            recent_logins=Count('auditlog_entries', filter=Q(**day_range('auditlog_entries__timestamp', date_from=thirty_days_ago))),
+            total_actions=Count('auditlog_entries')
+        ).filter(total_actions__gt=0).order_by('-recent_logins')[:10]
+        
+        # System health indicators
+        health_indicators = {
+            'devices_without_assignments': Device.objects.filter(assignments__isnull=True).count(),
+            'overdue_assignments': Assignment.objects.filter(
+                is_temporary=True,
+                is_active=True,
+                expected_return_date__lt=timezone.now().date()
+            ).count(),
+            'expired_warranties': Device.objects.filter(
+                warranty_end_date__lt=timezone.now().date()
+            ).count(),
+            'pending_maintenance': MaintenanceSchedule.objects.filter(
+                status__in=['SCHEDULED', 'IN_PROGRESS']
+            ).count(),
+        }
+        
+        # Recent system errors (from audit logs)
+        recent_errors = AuditLog.objects.filter(
+            action='ERROR',
+            **day_range('timestamp', date_from=thirty_days_ago)
+        ).order_by('-timestamp')[:10]
+        
+        context = {
+            'db_stats': db_stats,
+            'activity_stats': activity_stats,
+            'user_activity': user_activity,
+            'health_indicators': health_indicators,
+            'recent_errors': recent_errors,
+            'report_date': timezone.now().date(),
+        }
+        
+        return render(request, 'inventory/system_statistics.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error generating system statistics: {str(e)}")
+        return redirect('inventory:dashboard')
+
+@login_required
+@permission_required('inventory.view_auditlog', raise_exception=True)
+def audit_log_list(request):
+    """Display audit logs with filtering"""
+    try:
+        audit_logs = AuditLog.objects.select_related('user')
+        
+        # Filters
+        user_id = request.GET.get('user')
+        action = request.GET.get('action')
+        model_name = request.GET.get('model')
+        date_from = request.GET.get('date_from')
+        date_to = request.GET.get('date_to')
+        
+        if user_id:
+            audit_logs = audit_logs.filter(user_id=user_id)
+        
+        if action:
+            audit_logs = audit_logs.filter(action=action)
+        
+        if model_name:
+            audit_logs = audit_logs.filter(model_name=model_name)
+        
+        # Date filters as timestamp ranges so the (…, timestamp) indexes apply
+        if date_from:
+            try:
+                date_from_parsed = datetime.strptime(date_from, '%Y-%m-%d')
+                audit_logs = audit_logs.filter(timestamp__gte=timezone.make_aware(date_from_parsed))
+            except ValueError:
+                messages.warning(request, 'Invalid date format for "from" date.')
+        
+        if date_to:
+            try:
+                date_to_parsed = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1)
+                audit_logs = audit_logs.filter(timestamp__lt=timezone.make_aware(date_to_parsed))
+            except ValueError:
+                messages.warning(request, 'Invalid date format for "to" date.')
+        
+        # Keyset pagination: no OFFSET scan or exact COUNT(*) over the whole log
+        page_obj = paginate_keyset(request, audit_logs, ('-timestamp', '-id'), per_page=50)
+        
+        # Get filter options
+        users = User.objects.filter(
+            id__in=AuditLog.objects.order_by().values('user_id').distinct()
+        ).order_by('username')
+        actions = AuditLog.ACTION_CHOICES
+        models = AuditLog.objects.order_by('model_name').values_list('model_name', flat=True).distinct()
+        
+        context = {
+            'page_obj': page_obj,
+            'users': users,
+            'actions': actions,
+            'models': models,
+            'filters': {
+                'user': user_id,
+                'action': action,
+                'model': model_name,
+                'date_from': date_from,
+                'date_to': date_to,
+            }
+        }
+        
+        return render(request, 'inventory/audit_log_list.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading audit logs: {str(e)}")
+        return render(request, 'inventory/audit_log_list.html', {'page_obj': None})
+
+# ================================
+# DATA CLEANUP AND MAINTENANCE VIEWS
+# ================================
+
+@login_required
+@permission_required('inventory.change_device', raise_exception=True)
+def data_cleanup_tools(request):
+    """Data cleanup and maintenance tools"""
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        
+        try:
+            if action == 'cleanup_inactive_assignments':
+                # Remove very old inactive assignments
+                cutoff_date = timezone.now().date() - timedelta(days=2 * 365)  # 2 years
+                deleted_count = Assignment.objects.filter(
+                    is_active=False,
+                    actual_return_date__lt=cutoff_date
+                ).count()
+                
+                messages.success(request, f'Would delete {deleted_count} old inactive assignments (dry run).')
+                
+            elif action == 'fix_device_statuses':
+                # Fix device statuses based on active assignments
+                fixed_count = 0
+                for device in Device.objects.all():
+                    active_assignment = Assignment.objects.filter(device=device, is_active=True).first()
+                    if active_assignment and device.status != 'ASSIGNED':
+                        device.status = 'ASSIGNED'
+                        device.save()
+                        fixed_count += 1
+                    elif not active_assignment and device.status == 'ASSIGNED':
+                        device.status = 'AVAILABLE'
+                        device.save()
+                        fixed_count += 1
+                
+                messages.success(request, f'Fixed status for {fixed_count} devices.')
+                
+            elif action == 'update_maintenance_dates':
+                # Update device last maintenance dates
+                updated_count = 0
+                for device in Device.objects.all():
+                    last_maintenance = MaintenanceSchedule.objects.filter(
+                        device=device,
+                        status='COMPLETED',
+                        actual_date__isnull=False
+                    ).order_by('-actual_date').first()
+                    
+                    if last_maintenance and device.last_maintenance_date != last_maintenance.actual_date:
+                        device.last_maintenance_date = last_maintenance.actual_date
+                        device.save()
+                        updated_count += 1
+                
+                messages.success(request, f'Updated maintenance dates for {updated_count} devices.')
+                
+            else:
+                messages.error(request, 'Unknown cleanup action.')
+                
+        except Exception as e:
+            messages.error(request, f'Error during cleanup: {str(e)}')
+    
+    # Get cleanup statistics
+    cleanup_stats = {
+        'old_inactive_assignments': Assignment.objects.filter(
+            is_active=False,
+            actual_return_date__lt=timezone.now().date() - timedelta(days=2 * 365)
+        ).count(),
+        'devices_wrong_status': 0,  # Would need complex query
+        'devices_missing_maintenance_dates': Device.objects.filter(
+            last_maintenance_date__isnull=True,
+            maintenance_schedules__status='COMPLETED'
+        ).count(),
+    }
+    
+    context = {
+        'cleanup_stats': cleanup_stats,
+    }
+    
+    return render(request, 'inventory/data_cleanup_tools.html', context)
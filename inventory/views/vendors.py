@@ -0,0 +1,247 @@
+# inventory/views/vendors.py - Vendor Views
+"""Vendor management."""
+
+# Django core imports
+from django.shortcuts import render, get_object_or_404, redirect
+from django.utils import timezone
+from django.core.paginator import Paginator
+from ..audit import record_action
+
+# Django contrib imports
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, permission_required
+
+# Django DB imports
+from django.db.models import Count, Q, Sum
+
+# Python standard library imports
+from datetime import timedelta
+
+# Model imports
+from ..models import Device, Vendor, MaintenanceSchedule
+from ..forms import VendorForm
+
+# ================================
+# VENDOR MANAGEMENT VIEWS
+# ================================
+
+@login_required
+def vendor_list(request):
+    """List all vendors with device and maintenance counts"""
+    try:
+        vendors = Vendor.objects.prefetch_related(
+            'devices', 'maintenance_schedules'
+        ).annotate(
+            device_count=Count('devices'),
+            maintenance_count=Count('maintenance_schedules')
+        ).order_by('name')
+        
+        # Search functionality
+        search = request.GET.get('search')
+        if search:
+            vendors = vendors.filter(
+                Q(name__icontains=search) |
+                Q(contact_person__icontains=search) |
+                Q(email__icontains=search)
+            )
+        
+        # Pagination
+        paginator = Paginator(vendors, 25)
+        page_number = request.GET.get('page')
+        page_obj = paginator.get_page(page_number)
+        
+        context = {
+            'page_obj': page_obj,
+            'search': search,
+        }
+        
+        return render(request, 'inventory/vendor_list.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading vendors: {str(e)}")
+        return render(request, 'inventory/vendor_list.html', {'page_obj': None})
+
+@login_required
+def vendor_detail(request, vendor_id):
+    """Display vendor details with devices and maintenance history"""
+    try:
+        vendor = get_object_or_404(Vendor, id=vendor_id)
+        
+        # Get devices from this vendor
+        vendor_devices = Device.objects.filter(vendor=vendor).select_related(
+            'device_type__subcategory__category'
+        ).order_by('-purchase_date')
+        
+        # Get maintenance schedules
+        maintenance_schedules = MaintenanceSchedule.objects.filter(
+            vendor=vendor
+        ).select_related('device').order_by('-scheduled_date')[:20]
+        
+        # Calculate statistics
+        total_devices = vendor_devices.count()
+        total_purchase_value = vendor_devices.aggregate(
+            total=Sum('purchase_price')
+        )['total'] or 0
+        
+        recent_purchases = vendor_devices.filter(
+            purchase_date__gte=timezone.now().date() - timedelta(days=365)
+        ).count()
+        
+        # Device categories from this vendor
+        category_breakdown = vendor_devices.values(
+            'device__device_type__subcategory__category__name'
+        ).annotate(count=Count('id')).order_by('-count')
+        
+        # Maintenance statistics
+        maintenance_stats = maintenance_schedules.values('status').annotate(
+            count=Count('id')
+        )
+        
+        context = {
+            'vendor': vendor,
+            'vendor_devices': vendor_devices[:10],  # Show latest 10
+            'maintenance_schedules': maintenance_schedules,
+            'total_devices': total_devices,
+            'total_purchase_value': total_purchase_value,
+            'recent_purchases': recent_purchases,
+            'category_breakdown': category_breakdown,
+            'maintenance_stats': maintenance_stats,
+        }
+        
+        return render(request, 'inventory/vendor_detail.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading vendor details: {str(e)}")
+        return redirect('inventory:vendor_list')
+
+@login_required
+@permission_required('inventory.add_vendor', raise_exception=True)
+def vendor_create(request):
+    """Create new vendor"""
+    if request.method == 'POST':
+        form = VendorForm(request.POST)
+        if form.is_valid():
+            try:
+                vendor = form.save()
+                
+                # Create audit log
+                record_action(
+                    user=request.user,
+                    action='CREATE',
+                    model_name='Vendor',
+                    object_id=str(vendor.id),
+                    object_repr=str(vendor),
+                    changes={'created': 'New vendor added'},
+                    ip_address=request.META.get('REMOTE_ADDR')
+                )
+                
+                messages.success(request, f'Vendor "{vendor.name}" created successfully.')
+                return redirect('inventory:vendor_detail', vendor_id=vendor.id)
+            except Exception as e:
+                messages.error(request, f'Error creating vendor: {str(e)}')
+    else:
+        form = VendorForm()
+    
+    context = {
+        'form': form,
+        'title': 'Add New Vendor',
+        'action': 'Create',
+    }
+    return render(request, 'inventory/vendor_form.html', context)
+
+@login_required
+@permission_required('inventory.change_vendor', raise_exception=True)
+def vendor_edit(request, vendor_id):
+    """Edit vendor details"""
+    try:
+        vendor = get_object_or_404(Vendor, id=vendor_id)
+        
+        if request.method == 'POST':
+            form = VendorForm(request.POST, instance=vendor)
+            if form.is_valid():
+                try:
+                    vendor = form.save()
+                    
+                    # Create audit log
+                    record_action(
+                        user=request.user,
+                        action='UPDATE',
+                        model_name='Vendor',
+                        object_id=str(vendor.id),
+                        object_repr=str(vendor),
+                        changes={'updated': 'Vendor details updated'},
+                        ip_address=request.META.get('REMOTE_ADDR')
+                    )
+                    
+                    messages.success(request, f'Vendor "{vendor.name}" updated successfully.')
+                    return redirect('inventory:vendor_detail', vendor_id=vendor.id)
+                except Exception as e:
+                    messages.error(request, f'Error updating vendor: {str(e)}')
+        else:
+            form = VendorForm(instance=vendor)
+        
+        context = {
+            'form': form,
+            'vendor': vendor,
+            'title': f'Edit {vendor.name}',
+            'action': 'Update',
+        }
+        return render(request, 'inventory/vendor_form.html', context)
+        
+    except Exception as e:
+        messages.error(request, f"Error loading vendor: {str(e)}")
+        return redirect('inventory:vendor_list')
+
+@login_required
+@permission_required('inventory.delete_vendor', raise_exception=True)
+def vendor_delete(request, vendor_id):
+   """Delete vendor with safety checks"""
+   try:
+       vendor = get_object_or_404(Vendor, id=vendor_id)
+       
+       # Check if vendor has associated devices
+       device_count = Device.objects.filter(vendor=vendor).count()
+       maintenance_count = MaintenanceSchedule.objects.filter(vendor=vendor).count()
+       
+       if request.method == 'POST':
+           if device_count > 0 or maintenance_count > 0:
+               messages.error(
+                   request, 
+                   f'Cannot delete vendor "{vendor.name}". It has {device_count} devices and {maintenance_count} maintenance records.'
+               )
+               return redirect('inventory:vendor_detail', vendor_id=vendor.id)
+           
+           try:
+               vendor_name = vendor.name
+               
+               # Create audit log before deletion
+               record_action(
+                   user=request.user,
+                   action='DELETE',
+                   model_name='Vendor',
+                   object_id=str(vendor.id),
+                   object_repr=str(vendor),
+                   changes={'deleted': 'Vendor deleted'},
+                   ip_address=request.META.get('REMOTE_ADDR')
+               )
+               
+               vendor.delete()
+               messages.success(request, f'Vendor "{vendor_name}" deleted successfully.')
+               return redirect('inventory:vendor_list')
+               
+           except Exception as e:
+               messages.error(request, f'Error deleting vendor: {str(e)}')
+               return redirect('inventory:vendor_detail', vendor_id=vendor.id)
+       
+       context = {
+           'vendor': vendor,
+           'device_count': device_count,
+           'maintenance_count': maintenance_count,
+           'can_delete': device_count == 0 and maintenance_count == 0,
+       }
+       
+       return render(request, 'inventory/vendor_confirm_delete.html', context)
+       
+   except Exception as e:
+       messages.error(request, f"Error loading vendor: {str(e)}")
+       return redirect('inventory:vendor_list')
@@ -6,6 +6,8 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils import timezone
+
+from bps_inventory.admin_mixins import LargeTableAdminMixin
 from .models import (
     QRCodeTemplate, QRCodeBatch, QRCodeScan, QRCampaign
 )
@@ -121,7 +123,7 @@ class QRCodeBatchAdmin(admin.ModelAdmin):
 # ================================
 
 @admin.register(QRCodeScan)
-class QRCodeScanAdmin(admin.ModelAdmin):
+class QRCodeScanAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         'device', 'scanned_by', 'timestamp', 'verification_success', 'get_discrepancy_count'
     )
@@ -129,6 +131,7 @@ class QRCodeScanAdmin(admin.ModelAdmin):
     search_fields = (
         'device__device_id', 'scanned_by__username', 'device_location_at_scan__name'
     )
+    list_select_related = ('device', 'scanned_by')
     readonly_fields = ('timestamp', 'gps_coordinates', 'device_info')
     date_hierarchy = 'timestamp'
     
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class QrManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'qr_management'
+
+    def ready(self):
+        # Keep campaign reconciliation current as scans are recorded
+        from . import reconciliation
+        reconciliation.connect_signals()
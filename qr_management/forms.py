@@ -12,6 +12,7 @@ import json
 
 from inventory.models import Device, Location, Department, Staff
 from .models import QRCodeScan
+from .payload import InvalidQRPayload, decode
 
 
 # ================================
@@ -211,27 +212,17 @@ class QRCodeScanForm(forms.Form):
     def clean_qr_data(self):
         qr_data = self.cleaned_data.get('qr_data')
         if qr_data:
+            # Signed compact codes, legacy JSON codes or a bare device ID
             try:
-                # Try to parse as JSON
-                data = json.loads(qr_data)
-                
-                # Validate required fields
-                if 'deviceId' not in data:
-                    raise ValidationError("QR code data must contain deviceId field.")
-                
-                # Check if device exists
-                if not Device.objects.filter(device_id=data['deviceId']).exists():
-                    raise ValidationError(f"Device with ID '{data['deviceId']}' not found.")
-                
-                return data
-                
-            except json.JSONDecodeError:
-                # If not JSON, assume it's a simple device ID
-                device_id = qr_data.strip()
-                if not Device.objects.filter(device_id=device_id).exists():
-                    raise ValidationError(f"Device with ID '{device_id}' not found.")
-                
-                return {'deviceId': device_id}
+                payload = decode(qr_data)
+            except InvalidQRPayload as e:
+                raise ValidationError(f"Invalid QR code: {e}")
+            
+            # Check if device exists
+            if not Device.objects.filter(device_id=payload.device_id).exists():
+                raise ValidationError(f"Device with ID '{payload.device_id}' not found.")
+            
+            return {'deviceId': payload.device_id, 'payloadVersion': payload.version}
         
         return qr_data
 
@@ -246,21 +237,14 @@ class QuickQRScanForm(forms.Form):
         qr_data = self.cleaned_data.get('qr_data')
         
         try:
-            if qr_data.startswith('{'):
-                # JSON format
-                data = json.loads(qr_data)
-                device_id = data.get('deviceId')
-            else:
-                # Simple device ID
-                device_id = qr_data.strip()
-            
-            if not Device.objects.filter(device_id=device_id).exists():
-                raise ValidationError("Device not found.")
-            
-            return qr_data
-        
-        except (json.JSONDecodeError, AttributeError):
+            device_id = decode(qr_data).device_id
+        except InvalidQRPayload:
             raise ValidationError("Invalid QR code data.")
+        
+        if not Device.objects.filter(device_id=device_id).exists():
+            raise ValidationError("Device not found.")
+        
+        return qr_data
 
 
 class MobileQRScanForm(forms.Form):
@@ -289,6 +273,13 @@ class MobileQRScanForm(forms.Form):
             'placeholder': 'Quick note (optional)...'
         })
     )
+    
+    def clean_device_id(self):
+        # The scanner fills in the raw QR text
+        try:
+            return decode(self.cleaned_data.get('device_id')).device_id
+        except InvalidQRPayload as e:
+            raise ValidationError(f"Invalid QR code: {e}")
 
 
 # ================================
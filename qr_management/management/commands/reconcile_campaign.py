@@ -0,0 +1,40 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from qr_management.models import QRCampaign
+from qr_management.reconciliation import rebuild, summary
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the stock-take reconciliation of a QR campaign and print its per-building summary'
+
+    def add_arguments(self, parser):
+        parser.add_argument('campaign_id', help='QRCampaign id')
+        parser.add_argument(
+            '--locations',
+            action='store_true',
+            help='Also print the counts of every location',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            campaign = QRCampaign.objects.get(pk=options['campaign_id'])
+        except (QRCampaign.DoesNotExist, ValidationError):
+            raise CommandError(f"Campaign {options['campaign_id']} not found")
+
+        self.stdout.write(f'Reconciling {campaign.name}...')
+        rebuild(campaign)
+        data = summary(campaign)
+
+        columns = ('expected', 'found', 'missing', 'misplaced_out', 'misplaced_in', 'unexpected')
+        self.stdout.write(f"{'':40} " + ' '.join(f'{column:>13}' for column in columns))
+        rows = [(building['building'], building) for building in data['buildings']]
+        if options['locations']:
+            rows += [(f"  {location['location']}", location) for location in data['locations']]
+        for label, counts in rows:
+            self.stdout.write(f'{label[:40]:40} ' + ' '.join(f'{counts[column]:>13}' for column in columns))
+
+        totals = ', '.join(f'{count} {status}' for status, count in data['totals'].items())
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Reconciled: {totals} ({data['progress_percentage']}% scanned)"
+        ))
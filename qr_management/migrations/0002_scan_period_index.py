@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("qr_management", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="qrcodescan",
+            index=models.Index(
+                fields=["timestamp", "scan_type", "verification_success"],
+                name="qr_manageme_timesta_45a2d1_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0009_hot_path_indexes"),
+        ("qr_management", "0002_scan_period_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="qrcampaign",
+            name="reconciled_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the expected device set was last built (see qr_management.reconciliation)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="qrcodescan",
+            name="campaign",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Stock-take campaign the scan was made for",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="scans",
+                to="qr_management.qrcampaign",
+            ),
+        ),
+        migrations.CreateModel(
+            name="QRCampaignDevice",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("MISSING", "Missing"),
+                            ("FOUND", "Found"),
+                            ("MISPLACED", "Misplaced"),
+                            ("UNEXPECTED", "Unexpected"),
+                        ],
+                        default="MISSING",
+                        max_length=15,
+                    ),
+                ),
+                ("scan_count", models.PositiveIntegerField(default=0)),
+                ("first_scanned_at", models.DateTimeField(blank=True, null=True)),
+                ("last_scanned_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reconciliation",
+                        to="qr_management.qrcampaign",
+                    ),
+                ),
+                (
+                    "device",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="campaign_reconciliation",
+                        to="inventory.device",
+                    ),
+                ),
+                (
+                    "expected_location",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Location of the device's active assignment when the campaign was reconciled",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="inventory.location",
+                    ),
+                ),
+                (
+                    "scanned_location",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Location of the latest campaign scan that recorded one",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="inventory.location",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["campaign", "status"],
+                        name="qr_manageme_campaig_da5e71_idx",
+                    ),
+                    models.Index(
+                        fields=["campaign", "expected_location", "status"],
+                        name="qr_manageme_campaig_4eb968_idx",
+                    ),
+                    models.Index(
+                        fields=["campaign", "scanned_location", "status"],
+                        name="qr_manageme_campaig_a1fa2b_idx",
+                    ),
+                ],
+                "unique_together": {("campaign", "device")},
+            },
+        ),
+    ]
@@ -138,6 +138,14 @@ class QRCodeScan(models.Model):
         blank=True,
         help_text="Order within batch scan"
     )
+    campaign = models.ForeignKey(
+        'QRCampaign',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='scans',
+        help_text="Stock-take campaign the scan was made for"
+    )
 
     class Meta:
         ordering = ['-timestamp']
@@ -147,6 +155,8 @@ class QRCodeScan(models.Model):
             models.Index(fields=['scan_type', 'timestamp']),
             models.Index(fields=['verification_success']),
             models.Index(fields=['batch_scan_id']),
+            # Period analytics: range on timestamp, type and outcome read from the index
+            models.Index(fields=['timestamp', 'scan_type', 'verification_success']),
         ]
         
     def __str__(self):
@@ -629,6 +639,11 @@ class QRCampaign(models.Model):
     devices_scanned = models.PositiveIntegerField(default=0)
     successful_scans = models.PositiveIntegerField(default=0)
     discrepancies_found = models.PositiveIntegerField(default=0)
+    reconciled_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the expected device set was last built (see qr_management.reconciliation)"
+    )
     
     # Campaign configuration
     scan_requirements = models.JSONField(
@@ -671,6 +686,58 @@ class QRCampaign(models.Model):
             return max(0, remaining.days)
         return 0
 
+class QRCampaignDevice(models.Model):
+    """Reconciliation state of one device in a campaign: where it should be and where it was scanned"""
+
+    STATUS_CHOICES = [
+        ('MISSING', 'Missing'),
+        ('FOUND', 'Found'),
+        ('MISPLACED', 'Misplaced'),
+        ('UNEXPECTED', 'Unexpected'),
+    ]
+
+    campaign = models.ForeignKey(
+        QRCampaign,
+        on_delete=models.CASCADE,
+        related_name='reconciliation'
+    )
+    device = models.ForeignKey(
+        'inventory.Device',
+        on_delete=models.CASCADE,
+        related_name='campaign_reconciliation'
+    )
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='MISSING')
+    expected_location = models.ForeignKey(
+        'inventory.Location',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Location of the device's active assignment when the campaign was reconciled"
+    )
+    scanned_location = models.ForeignKey(
+        'inventory.Location',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Location of the latest campaign scan that recorded one"
+    )
+    scan_count = models.PositiveIntegerField(default=0)
+    first_scanned_at = models.DateTimeField(null=True, blank=True)
+    last_scanned_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['campaign', 'device']
+        indexes = [
+            models.Index(fields=['campaign', 'status']),
+            models.Index(fields=['campaign', 'expected_location', 'status']),
+            models.Index(fields=['campaign', 'scanned_location', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.campaign.name}: {self.device_id} {self.get_status_display()}"
+
 class QRVerificationRule(models.Model):
     """Define rules for QR code verification and validation"""
     
@@ -1481,9 +1548,10 @@ class QRScanLocation(models.Model):
         queryset = cls.objects.all()
         
         if date_range:
+            from inventory.utils import day_range
             start_date, end_date = date_range
             queryset = queryset.filter(
-                created_at__date__range=[start_date, end_date]
+                **day_range('created_at', start_date, end_date)
             )
         
         analytics = {
@@ -0,0 +1,340 @@
+# qr_management/offline_sync.py - Offline Scanning Catalogue
+"""
+Delta-sync protocol that lets mobile scanners verify devices without a
+connection (basement server rooms) and upload their scans in bulk.
+
+1. Snapshot: catalogue(building) lists every device of a building with its
+   name, status and location, plus the building's location labels. A
+   device belongs to the building of its active assignment's location, or
+   of Device.location when it has no located assignment. The view serves
+   it gzip-compressed with an ETag, so an unchanged catalogue costs a 304.
+2. Deltas: changes(building, since) returns the devices whose row or whose
+   assignments changed after the watermark of the previous sync
+   (updated_at, both indexed). Devices that now belong to the building
+   are sent as upserts; the others as removals, which the client ignores
+   when it never had them. Every response carries the next watermark.
+   Windows overlap by OVERLAP_SECONDS so rows committed late by a slow
+   transaction are not skipped; applying an upsert twice is harmless.
+   Deleted devices are found through the tombstones of the change feed
+   (inventory.change_feed). Clients take a new snapshot once their
+   watermark is older than MAX_DELTA_AGE_HOURS.
+3. Upload: record_scans() stores the scans made offline with one
+   bulk_create, keeps the scan times the scanner recorded, skips scans
+   already uploaded (the client generates the scan ids, so retries are
+   idempotent) and feeds campaign scans to the reconciliation.
+
+Entries are lists rather than objects to keep the payload small:
+[device id, name, status, location id].
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from inventory.models import Assignment, ChangeFeedEntry, Device, Location
+
+from .models import QRCampaign, QRCodeScan, QRMobileSession
+from .payload import InvalidQRPayload, decode
+from .reconciliation import apply_scans
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QR_OFFLINE_SYNC = {
+    # Devices in these states are left out of the catalogue
+    'EXCLUDED_STATUSES': ['DISPOSED'],
+    'OVERLAP_SECONDS': 120,
+    'MAX_DELTA_AGE_HOURS': 24 * 7,
+    'MAX_UPLOAD_SCANS': 500,
+    'COMPRESS_LEVEL': 6,
+}
+
+CATALOGUE_VERSION = 1
+
+
+def get_offline_sync_setting(name):
+    return getattr(settings, 'QR_OFFLINE_SYNC', {}).get(name, DEFAULT_QR_OFFLINE_SYNC[name])
+
+
+class InvalidWatermark(ValueError):
+    """The since parameter of a delta request is not a timestamp"""
+
+
+# ================================
+# CATALOGUE ENTRIES
+# ================================
+
+def _resolve(device_rows, assignment_rows):
+    """{device id: (name, status, location id, building id)} from device and active assignment rows"""
+    devices = {
+        pk: [name, status, location_id, building_id]
+        for pk, name, status, location_id, building_id in device_rows
+    }
+    # Latest active assignment wins when there are several
+    for device_id, location_id, building_id, _ in sorted(assignment_rows, key=lambda row: row[3]):
+        if device_id in devices:
+            devices[device_id][2:] = [location_id, building_id]
+    return {pk: tuple(values) for pk, values in devices.items()}
+
+
+_DEVICE_COLUMNS = ('pk', 'device_name', 'status', 'location_id', 'location__building_id')
+_ASSIGNMENT_COLUMNS = ('device_id', 'assigned_to_location_id', 'assigned_to_location__building_id', 'pk')
+
+
+def _active_assignments():
+    return Assignment.objects.filter(is_active=True, assigned_to_location__isnull=False)
+
+
+def _devices():
+    return Device.objects.exclude(status__in=get_offline_sync_setting('EXCLUDED_STATUSES')).order_by()
+
+
+def building_devices(building_id):
+    """{device id: (name, status, location id, building id)} of the devices in a building"""
+    assigned_here = _active_assignments().filter(
+        assigned_to_location__building_id=building_id,
+    ).values('device_id')
+    device_rows = _devices().filter(
+        Q(location__building_id=building_id) | Q(pk__in=assigned_here)
+    ).values_list(*_DEVICE_COLUMNS)
+    assignment_rows = _active_assignments().filter(
+        Q(assigned_to_location__building_id=building_id) | Q(device__location__building_id=building_id)
+    ).values_list(*_ASSIGNMENT_COLUMNS)
+    resolved = _resolve(device_rows, assignment_rows)
+    return {pk: values for pk, values in resolved.items() if values[3] == building_id}
+
+
+def location_labels(building_id, since=None):
+    """{location id: label} of a building's active locations (changed after since)"""
+    locations = Location.objects.filter(building_id=building_id, is_active=True).order_by()
+    if since is not None:
+        locations = locations.filter(updated_at__gt=since)
+    labels = {}
+    for pk, *names in locations.values_list(
+            'pk', 'block__name', 'floor__name', 'department__name', 'room__room_number'):
+        labels[pk] = ' - '.join(name for name in names if name)
+    return labels
+
+
+def _entry(device_id, values):
+    name, status, location_id, building_id = values
+    return [device_id, name, status, location_id]
+
+
+# ================================
+# SNAPSHOTS AND DELTAS
+# ================================
+
+def catalogue(building_id):
+    """Full catalogue of a building and the watermark to request deltas from"""
+    # Taken before reading so changes made meanwhile are in the next delta
+    watermark = timezone.now()
+    devices = building_devices(building_id)
+    return {
+        'version': CATALOGUE_VERSION,
+        'building_id': building_id,
+        'watermark': watermark.isoformat(),
+        'locations': location_labels(building_id),
+        'device_count': len(devices),
+        'devices': [_entry(pk, values) for pk, values in sorted(devices.items())],
+    }
+
+
+def parse_watermark(value):
+    """Aware datetime of a watermark string; raises InvalidWatermark"""
+    try:
+        since = parse_datetime(value or '')
+    except ValueError:
+        since = None
+    if since is None:
+        raise InvalidWatermark(f'Invalid watermark: {value!r}')
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def changes(building_id, since):
+    """Upserts and removals for a building since a watermark"""
+    watermark = timezone.now()
+    if watermark - since > timedelta(hours=get_offline_sync_setting('MAX_DELTA_AGE_HOURS')):
+        return {'version': CATALOGUE_VERSION, 'building_id': building_id, 'full_resync': True}
+
+    window_start = since - timedelta(seconds=get_offline_sync_setting('OVERLAP_SECONDS'))
+    changed_ids = set(
+        Device.objects.filter(updated_at__gt=window_start).order_by().values_list('pk', flat=True)
+    )
+    changed_ids.update(
+        Assignment.objects.filter(updated_at__gt=window_start).order_by().values_list('device_id', flat=True)
+    )
+    # Deleted devices have no row left; they are sent as removals
+    changed_ids.update(
+        ChangeFeedEntry.objects.filter(
+            recorded_at__gt=window_start, model_name='device', action='DELETE',
+        ).order_by().values_list('object_id', flat=True)
+    )
+
+    upserts, removed = [], []
+    if changed_ids:
+        resolved = _resolve(
+            _devices().filter(pk__in=changed_ids).values_list(*_DEVICE_COLUMNS),
+            _active_assignments().filter(device__in=changed_ids).values_list(*_ASSIGNMENT_COLUMNS),
+        )
+        for device_id in sorted(changed_ids):
+            values = resolved.get(device_id)
+            if values is not None and values[3] == building_id:
+                upserts.append(_entry(device_id, values))
+            else:
+                removed.append(device_id)
+
+    return {
+        'version': CATALOGUE_VERSION,
+        'building_id': building_id,
+        'watermark': watermark.isoformat(),
+        'full_resync': False,
+        'locations': location_labels(building_id, since=window_start),
+        'upserts': upserts,
+        'removed': removed,
+    }
+
+
+def compress(data):
+    """(gzip-compressed JSON body, ETag) of a catalogue response"""
+    body = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+    # The watermark changes on every request; the ETag covers the content only
+    content = {key: value for key, value in data.items() if key != 'watermark'}
+    etag = hashlib.sha1(json.dumps(content, cls=DjangoJSONEncoder, sort_keys=True).encode()).hexdigest()
+    return gzip.compress(body, compresslevel=get_offline_sync_setting('COMPRESS_LEVEL'), mtime=0), f'"{etag}"'
+
+
+# ================================
+# BULK SCAN UPLOAD
+# ================================
+
+def _scan_time(value, now):
+    scanned_at = parse_datetime(value) if isinstance(value, str) else None
+    if scanned_at is None:
+        return now
+    if timezone.is_naive(scanned_at):
+        scanned_at = timezone.make_aware(scanned_at)
+    # A scanner clock running ahead must not put scans in the future
+    return min(scanned_at, now)
+
+
+def record_scans(user, data, client_fields=None):
+    """
+    Store a batch of offline scans. data is the uploaded JSON object:
+    {'scans': [{'id', 'scan_data', 'location_id', 'scan_type', 'scanned_at',
+    'notes'}], 'session_id', 'campaign_id', 'location_id'}. Returns
+    {'accepted': [...], 'duplicates': [...], 'rejected': [{'id', 'error'}]}.
+    """
+    scans = data.get('scans') or []
+    if not isinstance(scans, list):
+        raise ValidationError('scans must be a list')
+    if len(scans) > get_offline_sync_setting('MAX_UPLOAD_SCANS'):
+        raise ValidationError(f"At most {get_offline_sync_setting('MAX_UPLOAD_SCANS')} scans per upload")
+
+    campaign = None
+    if data.get('campaign_id'):
+        campaign = QRCampaign.objects.filter(pk=data['campaign_id'], status='ACTIVE').first()
+        if campaign is None:
+            raise ValidationError(f"Campaign {data['campaign_id']} is not active")
+    session = None
+    if data.get('session_id'):
+        session = QRMobileSession.objects.filter(pk=data['session_id'], user=user).first()
+
+    result = {'accepted': [], 'duplicates': [], 'rejected': []}
+    scan_types = dict(QRCodeScan.SCAN_TYPES)
+    parsed = []
+    for item in scans:
+        if not isinstance(item, dict):
+            result['rejected'].append({'id': None, 'error': 'Scan must be an object'})
+            continue
+        scan_id = item.get('id')
+        try:
+            scan_id = uuid.UUID(str(scan_id))
+            payload = decode(item.get('scan_data') or item.get('device_id') or '')
+        except (ValueError, InvalidQRPayload) as e:
+            result['rejected'].append({'id': str(scan_id) if scan_id else None, 'error': str(e)})
+            continue
+        parsed.append((scan_id, payload, item))
+
+    existing = set(QRCodeScan.objects.filter(pk__in=[scan_id for scan_id, _, _ in parsed]).values_list('pk', flat=True))
+    devices = Device.objects.in_bulk({payload.device_id for _, payload, _ in parsed})
+    assignments = {
+        assignment.device_id: assignment
+        for assignment in Assignment.objects.filter(device__in=devices, is_active=True).order_by('pk')
+    }
+    location_ids = set(Location.objects.filter(
+        pk__in={item.get('location_id') or data.get('location_id') for _, _, item in parsed} - {None, ''}
+    ).values_list('pk', flat=True))
+
+    now = timezone.now()
+    batch_scan_id = uuid.uuid4()
+    new_scans = []
+    for scan_id, payload, item in parsed:
+        if scan_id in existing:
+            result['duplicates'].append(str(scan_id))
+            continue
+        device = devices.get(payload.device_id)
+        if device is None:
+            result['rejected'].append({'id': str(scan_id), 'error': f'Device {payload.device_id} not found'})
+            continue
+        existing.add(scan_id)
+        assignment = assignments.get(device.pk)
+        location_id = item.get('location_id') or data.get('location_id')
+        fields = dict(client_fields or {})
+        fields['device_info'] = {
+            **fields.get('device_info', {}),
+            'verification_method': 'offline_sync',
+            'payload_version': payload.version,
+        }
+        new_scans.append(QRCodeScan(
+            id=scan_id,
+            device=device,
+            scanned_by=user,
+            scan_type=item.get('scan_type') if item.get('scan_type') in scan_types else 'MOBILE_SCAN',
+            verification_success=True,
+            scan_location_id=int(location_id) if str(location_id).isdigit() and int(location_id) in location_ids else None,
+            device_location_at_scan_id=assignment.assigned_to_location_id if assignment else device.location_id,
+            assigned_staff_at_scan_id=assignment.assigned_to_staff_id if assignment else None,
+            device_status_at_scan=device.status,
+            scan_notes=str(item.get('notes', ''))[:2000],
+            batch_scan_id=batch_scan_id,
+            batch_sequence=len(new_scans) + 1,
+            campaign=campaign,
+            **fields,
+        ))
+        result['accepted'].append(str(scan_id))
+
+    if new_scans:
+        QRCodeScan.objects.bulk_create(new_scans, ignore_conflicts=True)
+        # timestamp is auto_now_add; put back the time the scanner recorded
+        items = {scan_id: item for scan_id, _, item in parsed}
+        for scan in new_scans:
+            scan.timestamp = _scan_time(items[scan.pk].get('scanned_at'), now)
+        QRCodeScan.objects.bulk_update(new_scans, ['timestamp'])
+        apply_scans(new_scans)
+        if session is not None:
+            QRMobileSession.objects.filter(pk=session.pk).update(
+                scans_performed=F('scans_performed') + len(new_scans),
+                successful_scans=F('successful_scans') + len(new_scans),
+            )
+    if session is not None and result['rejected']:
+        QRMobileSession.objects.filter(pk=session.pk).update(
+            failed_scans=F('failed_scans') + len(result['rejected']),
+        )
+
+    logger.info(
+        f"Offline upload by {user}: {len(result['accepted'])} accepted, "
+        f"{len(result['duplicates'])} duplicates, {len(result['rejected'])} rejected"
+    )
+    return result
@@ -0,0 +1,136 @@
+# qr_management/payload.py - Compact Signed QR Payloads
+"""
+Encoding and decoding of the text printed in device QR codes.
+
+New codes carry only the device ID and a truncated HMAC-SHA256 signature:
+
+    BPS1:BPS-LAP-2024-0001:7KQ2M4XZ5T3ABCDE
+
+Everything in it is upper case, digits, '-' and ':', which QR encoders store
+in alphanumeric mode (5.5 bits per character instead of 8), so the code
+stays small enough to scan from a worn sticker. The device details the old
+JSON codes embedded went stale as soon as the device moved; scanners look
+them up from the ID instead.
+
+decode() understands every format that has been printed so far - the
+signed compact form, the legacy JSON documents (deviceId / device_id keys),
+verification URLs and bare device IDs - and reports which version it read.
+A compact payload with a wrong signature is rejected rather than treated as
+a bare ID, so a forged sticker cannot pass as a genuine one.
+"""
+
+import base64
+import json
+import re
+from collections import namedtuple
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+DEFAULT_QR_PAYLOAD = {
+    # Signature length before base32 encoding; 10 bytes is 16 characters
+    'SIGNATURE_BYTES': 10,
+    # When set, codes hold <URL_PREFIX>/verify/<payload>/ so phone cameras
+    # open the public verification page (mixed case, so byte mode)
+    'URL_PREFIX': '',
+    # Accept unsigned legacy formats (JSON, URLs and bare device IDs)
+    'ACCEPT_LEGACY': True,
+}
+
+PREFIX = 'BPS'
+CURRENT_VERSION = 1
+LEGACY_VERSION = 0
+
+_SALT = 'qr_management.payload'
+_COMPACT_RE = re.compile(r'^BPS(?P<version>\d+):(?P<device_id>[^:\s]+):(?P<signature>[A-Z2-7]+)$')
+_VERIFY_URL_RE = re.compile(r'/verify/(?P<value>[^/?#]+)/?(?:[?#].*)?$', re.IGNORECASE)
+
+QRPayload = namedtuple('QRPayload', ['device_id', 'version', 'signed'])
+
+
+class InvalidQRPayload(ValueError):
+    """Unreadable payload, or a compact payload whose signature does not match"""
+
+
+def get_qr_payload_setting(name):
+    return getattr(settings, 'QR_PAYLOAD', {}).get(name, DEFAULT_QR_PAYLOAD[name])
+
+
+def _signature(device_id, version, secret=None):
+    digest = salted_hmac(
+        _SALT, f'{version}:{device_id}', secret=secret, algorithm='sha256'
+    ).digest()[:get_qr_payload_setting('SIGNATURE_BYTES')]
+    return base64.b32encode(digest).decode('ascii').rstrip('=')
+
+
+def encode(device_id):
+    """Compact signed payload for a device ID"""
+    device_id = str(device_id).strip()
+    if not device_id or ':' in device_id or any(char.isspace() for char in device_id):
+        raise InvalidQRPayload(f'Device ID {device_id!r} cannot be encoded')
+    return f'{PREFIX}{CURRENT_VERSION}:{device_id}:{_signature(device_id, CURRENT_VERSION)}'
+
+
+def qr_content(device_id):
+    """Text to draw into a device's QR code"""
+    payload = encode(device_id)
+    url_prefix = get_qr_payload_setting('URL_PREFIX')
+    if url_prefix:
+        return f"{url_prefix.rstrip('/')}/verify/{payload}/"
+    return payload
+
+
+def _decode_compact(match):
+    version = int(match.group('version'))
+    if version != CURRENT_VERSION:
+        raise InvalidQRPayload(f'Unsupported QR payload version {version}')
+
+    device_id, signature = match.group('device_id'), match.group('signature')
+    # Codes printed before a SECRET_KEY rotation stay valid while the old
+    # key is listed in SECRET_KEY_FALLBACKS
+    secrets = [settings.SECRET_KEY, *getattr(settings, 'SECRET_KEY_FALLBACKS', [])]
+    if not any(constant_time_compare(signature, _signature(device_id, version, secret)) for secret in secrets):
+        raise InvalidQRPayload('QR code signature does not match')
+    return QRPayload(device_id, version, True)
+
+
+def _decode_legacy(text):
+    if text.startswith('{'):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            raise InvalidQRPayload('QR code data is not valid JSON')
+        device_id = data.get('deviceId') or data.get('device_id') if isinstance(data, dict) else None
+        if not device_id:
+            raise InvalidQRPayload('QR code data does not contain a device ID')
+        return QRPayload(str(device_id), LEGACY_VERSION, False)
+
+    if any(char.isspace() for char in text):
+        raise InvalidQRPayload('QR code data is not a device ID')
+    return QRPayload(text, LEGACY_VERSION, False)
+
+
+def decode(text):
+    """
+    Device ID in any QR payload format, as a QRPayload(device_id, version,
+    signed); version is 0 for the unsigned legacy formats.
+
+    Raises InvalidQRPayload for unreadable data, bad signatures and, when
+    QR_PAYLOAD['ACCEPT_LEGACY'] is off, unsigned payloads.
+    """
+    text = (text or '').strip()
+    if not text:
+        raise InvalidQRPayload('QR code data is empty')
+
+    url = _VERIFY_URL_RE.search(text) if not text.startswith('{') else None
+    if url:
+        text = unquote(url.group('value'))
+
+    match = _COMPACT_RE.match(text)
+    if match:
+        return _decode_compact(match)
+
+    if not get_qr_payload_setting('ACCEPT_LEGACY'):
+        raise InvalidQRPayload('Unsigned QR codes are not accepted')
+    return _decode_legacy(text)
@@ -0,0 +1,367 @@
+# qr_management/reconciliation.py - Stock-Take Reconciliation
+"""
+Reconciles a QRCampaign: which devices should be found where, and which
+were scanned where.
+
+One QRCampaignDevice row per device holds the outcome:
+- MISSING:    expected in the campaign's scope and not scanned yet;
+- FOUND:      scanned at its expected location (or by a scan that recorded
+              no location);
+- MISPLACED:  scanned, but at another location than the expected one;
+- UNEXPECTED: scanned in the campaign but not expected anywhere in its scope.
+
+rebuild() builds the rows from scratch: the expected set is read with one
+query over active assignments (a device without one is expected at
+Device.location) and the scanned set with one query over the campaign's
+scans; the outcome is then plain set arithmetic on the two dicts, so 40,000
+devices cost two queries and a few bulk inserts rather than a loop over
+locations and devices. The expected locations are a snapshot taken when
+the campaign is reconciled, so reassignments during the audit do not move
+the goalposts; rebuild again to pick them up.
+
+After that, apply_scans() moves only the rows of the scanned devices, and
+a post_save receiver calls it for every QRCodeScan created with a campaign
+(bulk inserts call it themselves). The campaign's progress counters and
+the per-location summary are GROUP BY queries over the indexed rows.
+"""
+
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from inventory.models import Assignment, Device, Location
+
+from .models import QRCampaign, QRCampaignDevice, QRCodeScan
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QR_RECONCILIATION = {
+    # Devices in these states are not expected on the shelves
+    'EXCLUDED_STATUSES': ['RETIRED', 'LOST', 'DISPOSED'],
+    'BATCH_SIZE': 1000,
+    # Devices listed per page of the summary endpoint
+    'PAGE_SIZE': 200,
+}
+
+# Statuses of the devices the campaign expects to find
+EXPECTED_STATUSES = ('MISSING', 'FOUND', 'MISPLACED')
+
+
+def get_reconciliation_setting(name):
+    return getattr(settings, 'QR_RECONCILIATION', {}).get(name, DEFAULT_QR_RECONCILIATION[name])
+
+
+def classify(expected_location_id, scanned_location_id, scanned, expected=True):
+    """Status of a device given where it is expected and where it was scanned"""
+    if not expected:
+        return 'UNEXPECTED'
+    if not scanned:
+        return 'MISSING'
+    if scanned_location_id is None or scanned_location_id == expected_location_id:
+        return 'FOUND'
+    return 'MISPLACED'
+
+
+# ================================
+# EXPECTED AND SCANNED SETS
+# ================================
+
+def campaign_scope(campaign):
+    """(location ids or None for all locations, set of targeted device ids)"""
+    location_ids = set(
+        Location.objects.filter(
+            Q(qr_campaigns=campaign) | Q(department__qr_campaigns=campaign)
+        ).values_list('pk', flat=True)
+    )
+    # target_devices may also hold filter criteria; only plain IDs are used here
+    device_ids = {str(value) for value in campaign.target_devices or [] if isinstance(value, (str, int))}
+    if not location_ids and not device_ids:
+        return None, set()
+    return location_ids, device_ids
+
+
+def expected_locations(campaign):
+    """{device id: expected location id} for every device the campaign should find"""
+    location_ids, device_ids = campaign_scope(campaign)
+    excluded = get_reconciliation_setting('EXCLUDED_STATUSES')
+
+    devices = Device.objects.exclude(status__in=excluded)
+    assignments = Assignment.objects.filter(
+        is_active=True, assigned_to_location__isnull=False,
+    ).exclude(device__status__in=excluded)
+    if location_ids is None:
+        devices = devices.filter(location__isnull=False)
+    else:
+        # An assignment elsewhere overrides Device.location, so fetch the
+        # assignments of devices located in scope too
+        devices = devices.filter(Q(location__in=location_ids) | Q(pk__in=device_ids))
+        assignments = assignments.filter(
+            Q(assigned_to_location__in=location_ids)
+            | Q(device__location__in=location_ids)
+            | Q(device__in=device_ids)
+        )
+
+    expected = dict(devices.values_list('pk', 'location_id'))
+    # Latest active assignment wins when there are several
+    expected.update(assignments.order_by('pk').values_list('device_id', 'assigned_to_location_id'))
+
+    if location_ids is None:
+        return expected
+    return {
+        device_id: location_id for device_id, location_id in expected.items()
+        if location_id in location_ids or device_id in device_ids
+    }
+
+
+def scanned_locations(campaign):
+    """{device id: (last recorded location id, scan count, first scan, last scan)}"""
+    scanned = {}
+    scans = QRCodeScan.objects.filter(campaign=campaign).order_by('timestamp').values_list(
+        'device_id', 'scan_location_id', 'timestamp',
+    )
+    for device_id, location_id, timestamp in scans.iterator(chunk_size=get_reconciliation_setting('BATCH_SIZE')):
+        previous = scanned.get(device_id)
+        if previous is None:
+            scanned[device_id] = (location_id, 1, timestamp, timestamp)
+        else:
+            scanned[device_id] = (
+                location_id if location_id is not None else previous[0],
+                previous[1] + 1, previous[2], timestamp,
+            )
+    return scanned
+
+
+# ================================
+# REBUILD AND INCREMENTAL UPDATES
+# ================================
+
+def rebuild(campaign):
+    """Recompute every reconciliation row of a campaign; returns the status totals"""
+    expected = expected_locations(campaign)
+    scanned = scanned_locations(campaign)
+    expected_ids, scanned_ids = set(expected), set(scanned)
+
+    rows = []
+    for device_id in expected_ids - scanned_ids:
+        rows.append(QRCampaignDevice(
+            campaign=campaign, device_id=device_id,
+            status='MISSING', expected_location_id=expected[device_id],
+        ))
+    for device_id in scanned_ids:
+        location_id, count, first, last = scanned[device_id]
+        is_expected = device_id in expected_ids
+        rows.append(QRCampaignDevice(
+            campaign=campaign, device_id=device_id,
+            status=classify(expected.get(device_id), location_id, True, is_expected),
+            expected_location_id=expected.get(device_id),
+            scanned_location_id=location_id,
+            scan_count=count, first_scanned_at=first, last_scanned_at=last,
+        ))
+
+    with transaction.atomic():
+        QRCampaignDevice.objects.filter(campaign=campaign).delete()
+        QRCampaignDevice.objects.bulk_create(rows, batch_size=get_reconciliation_setting('BATCH_SIZE'))
+        campaign.reconciled_at = timezone.now()
+        QRCampaign.objects.filter(pk=campaign.pk).update(reconciled_at=campaign.reconciled_at)
+        totals = refresh_counters(campaign)
+
+    logger.info(
+        f"Reconciled campaign {campaign.pk}: {len(expected_ids)} expected, "
+        f"{len(scanned_ids)} scanned"
+    )
+    return totals
+
+
+def apply_scans(scans):
+    """Fold newly recorded campaign scans into the reconciliation rows"""
+    by_campaign = defaultdict(list)
+    for scan in scans:
+        if scan.campaign_id:
+            by_campaign[scan.campaign_id].append(scan)
+
+    for campaign_id, campaign_scans in by_campaign.items():
+        try:
+            campaign = QRCampaign.objects.get(pk=campaign_id)
+            if campaign.reconciled_at is None:
+                # The first scan builds the expected set (the scans are already saved)
+                rebuild(campaign)
+            else:
+                _apply_campaign_scans(campaign, campaign_scans)
+        except Exception as e:
+            logger.error(f"Error reconciling scans of campaign {campaign_id}: {e}")
+
+
+def _apply_campaign_scans(campaign, scans):
+    scans = sorted(scans, key=lambda scan: scan.timestamp)
+    with transaction.atomic():
+        rows = {
+            row.device_id: row
+            for row in QRCampaignDevice.objects.select_for_update().filter(
+                campaign=campaign, device__in={scan.device_id for scan in scans},
+            )
+        }
+        new_rows = {}
+        for scan in scans:
+            row = rows.get(scan.device_id) or new_rows.get(scan.device_id)
+            if row is None:
+                # Not part of the expected set
+                row = new_rows[scan.device_id] = QRCampaignDevice(
+                    campaign=campaign, device_id=scan.device_id, status='UNEXPECTED',
+                )
+            if scan.scan_location_id is not None:
+                row.scanned_location_id = scan.scan_location_id
+            row.scan_count += 1
+            row.first_scanned_at = row.first_scanned_at or scan.timestamp
+            row.last_scanned_at = scan.timestamp
+            row.status = classify(
+                row.expected_location_id, row.scanned_location_id, True,
+                expected=row.status != 'UNEXPECTED',
+            )
+
+        QRCampaignDevice.objects.bulk_update(
+            rows.values(),
+            ['status', 'scanned_location', 'scan_count', 'first_scanned_at', 'last_scanned_at'],
+        )
+        # Concurrent first scans of the same unexpected device: one row wins
+        QRCampaignDevice.objects.bulk_create(new_rows.values(), ignore_conflicts=True)
+        refresh_counters(campaign)
+
+
+def status_totals(campaign):
+    """{status: number of devices} of a campaign"""
+    totals = dict.fromkeys(dict(QRCampaignDevice.STATUS_CHOICES), 0)
+    totals.update(
+        QRCampaignDevice.objects.filter(campaign=campaign)
+        .values_list('status').annotate(count=Count('pk')).order_by()
+    )
+    return totals
+
+
+def refresh_counters(campaign):
+    """Write the status totals to the campaign's progress counters and return them"""
+    totals = status_totals(campaign)
+    counters = {
+        'total_target_devices': sum(totals[status] for status in EXPECTED_STATUSES),
+        'devices_scanned': totals['FOUND'] + totals['MISPLACED'],
+        'successful_scans': totals['FOUND'],
+        'discrepancies_found': totals['MISPLACED'] + totals['UNEXPECTED'],
+    }
+    QRCampaign.objects.filter(pk=campaign.pk).update(**counters)
+    for name, value in counters.items():
+        setattr(campaign, name, value)
+    return totals
+
+
+# ================================
+# SUMMARY
+# ================================
+
+def _location_labels(location_ids):
+    labels = {}
+    locations = Location.objects.filter(pk__in=location_ids).values_list(
+        'pk', 'building_id', 'building__name', 'block__name', 'floor__name',
+        'department__name', 'room__room_number',
+    )
+    for pk, building_id, *names in locations:
+        labels[pk] = (building_id, names[0], ' - '.join(name for name in names if name))
+    return labels
+
+
+def summary(campaign):
+    """Status totals and per-location and per-building breakdowns of a campaign"""
+    rows = QRCampaignDevice.objects.filter(campaign=campaign).order_by()
+    per_location = defaultdict(lambda: {
+        'expected': 0, 'found': 0, 'missing': 0,
+        # Expected here but scanned elsewhere / scanned here but expected elsewhere
+        'misplaced_out': 0, 'misplaced_in': 0, 'unexpected': 0,
+    })
+
+    for location_id, status, count in rows.filter(status__in=EXPECTED_STATUSES).values_list(
+            'expected_location_id', 'status').annotate(count=Count('pk')):
+        counts = per_location[location_id]
+        counts['expected'] += count
+        counts[{'FOUND': 'found', 'MISSING': 'missing', 'MISPLACED': 'misplaced_out'}[status]] += count
+    for location_id, status, count in rows.filter(
+            status__in=('MISPLACED', 'UNEXPECTED'), scanned_location__isnull=False).values_list(
+            'scanned_location_id', 'status').annotate(count=Count('pk')):
+        per_location[location_id]['misplaced_in' if status == 'MISPLACED' else 'unexpected'] += count
+
+    labels = _location_labels([pk for pk in per_location if pk is not None])
+    locations, buildings = [], {}
+    for location_id, counts in sorted(per_location.items(), key=lambda item: labels.get(item[0], (0, '', ''))[2]):
+        building_id, building_name, label = labels.get(location_id, (None, None, 'No location'))
+        locations.append({'location_id': location_id, 'location': label, 'building_id': building_id, **counts})
+        building = buildings.setdefault(building_id, {
+            'building_id': building_id, 'building': building_name or 'No location',
+            **dict.fromkeys(counts, 0),
+        })
+        for name, count in counts.items():
+            building[name] += count
+
+    totals = status_totals(campaign)
+    expected = sum(totals[status] for status in EXPECTED_STATUSES)
+    scanned = totals['FOUND'] + totals['MISPLACED']
+    return {
+        'campaign_id': str(campaign.pk),
+        'name': campaign.name,
+        'status': campaign.status,
+        'reconciled_at': campaign.reconciled_at.isoformat() if campaign.reconciled_at else None,
+        'totals': {status.lower(): count for status, count in totals.items()},
+        'progress_percentage': round(scanned * 100 / expected, 1) if expected else 0,
+        'success_rate': round(totals['FOUND'] * 100 / scanned, 1) if scanned else 0,
+        'buildings': sorted(buildings.values(), key=lambda building: building['building']),
+        'locations': locations,
+    }
+
+
+def device_page(campaign, status=None, location_id=None, after=None, limit=None):
+    """Devices of one status (and location) ordered by device id, from after onwards"""
+    limit = min(limit or get_reconciliation_setting('PAGE_SIZE'), get_reconciliation_setting('PAGE_SIZE'))
+    rows = QRCampaignDevice.objects.filter(campaign=campaign)
+    if status:
+        rows = rows.filter(status=status)
+    if location_id:
+        # Missing and found devices belong to their expected location, strays to where they were scanned
+        rows = rows.filter(
+            Q(status__in=('MISSING', 'FOUND'), expected_location_id=location_id)
+            | Q(status__in=('MISPLACED', 'UNEXPECTED'), scanned_location_id=location_id)
+            | Q(status='MISPLACED', expected_location_id=location_id)
+        )
+    if after:
+        rows = rows.filter(device_id__gt=after)
+    page = list(rows.order_by('device_id').values(
+        'device_id', 'device__device_name', 'status', 'expected_location_id',
+        'scanned_location_id', 'scan_count', 'last_scanned_at',
+    )[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    return {
+        'devices': [{
+            'device_id': row['device_id'],
+            'name': row['device__device_name'],
+            'status': row['status'],
+            'expected_location_id': row['expected_location_id'],
+            'scanned_location_id': row['scanned_location_id'],
+            'scan_count': row['scan_count'],
+            'last_scanned_at': row['last_scanned_at'].isoformat() if row['last_scanned_at'] else None,
+        } for row in page],
+        'next_after': page[-1]['device_id'] if has_more else None,
+    }
+
+
+# ================================
+# SIGNALS
+# ================================
+
+def _on_scan_saved(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw and instance.campaign_id:
+        apply_scans([instance])
+
+
+def connect_signals():
+    post_save.connect(_on_scan_saved, sender=QRCodeScan, dispatch_uid='qr_reconciliation_scan_saved')
@@ -0,0 +1,64 @@
+# qr_management/scan_log.py - Buffered QR Scan Logging
+"""
+Background writer for QRCodeScan rows recorded by high-traffic endpoints.
+
+Callers enqueue plain field dicts and return immediately; a daemon thread
+drains the queue and inserts the scans with one bulk_create per batch, so a
+burst of phones scanning stickers costs a handful of inserts instead of one
+per request. When the queue is full the oldest pending scans are dropped
+rather than blocking the request.
+"""
+
+import atexit
+
+from django.conf import settings
+
+from bps_inventory.batch_writer import BatchWriter
+
+DEFAULT_SCAN_LOG = {
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL_SECONDS': 2,
+    'QUEUE_SIZE': 10000,
+}
+
+
+def get_scan_log_setting(name):
+    return getattr(settings, 'QR_SCAN_LOG', {}).get(name, DEFAULT_SCAN_LOG[name])
+
+
+class ScanLogWriter(BatchWriter):
+    """Queue of pending scans drained in batches by a daemon thread"""
+
+    thread_name = 'qr-scan-log'
+    item_name = 'QR scans'
+
+    def __init__(self, batch_size=None, flush_interval=None, queue_size=None):
+        super().__init__(
+            batch_size or get_scan_log_setting('BATCH_SIZE'),
+            flush_interval or get_scan_log_setting('FLUSH_INTERVAL_SECONDS'),
+            queue_size or get_scan_log_setting('QUEUE_SIZE'),
+        )
+
+    def log(self, **fields):
+        """Queue a QRCodeScan for insertion; never blocks the caller"""
+        self.put(fields)
+
+    def write_batch(self, batch):
+        from .models import QRCodeScan
+        from .reconciliation import apply_scans
+
+        scans = QRCodeScan.objects.bulk_create(
+            [QRCodeScan(**fields) for fields in batch],
+            batch_size=self.batch_size,
+        )
+        # bulk_create sends no post_save
+        apply_scans(scans)
+
+
+scan_log_writer = ScanLogWriter()
+atexit.register(scan_log_writer.flush)
+
+
+def log_scan(**fields):
+    """Record a QRCodeScan asynchronously (see ScanLogWriter)"""
+    scan_log_writer.log(**fields)
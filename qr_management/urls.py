@@ -1,6 +1,9 @@
 
 from django.urls import path
-from . import views
+from bps_inventory.lazy_views import LazyViewModule
+
+# View modules are imported on first request (see bps_inventory.lazy_views)
+views = LazyViewModule('qr_management.views')
 
 app_name = 'qr_management'
 
@@ -26,6 +29,18 @@ urlpatterns = [
     path('scan/<str:scan_id>/', views.qr_scan_detail, name='qr_scan_detail'),
     path('batch-verify/', views.qr_batch_verify, name='qr_batch_verify'),
     
+    # ================================
+    # CAMPAIGN RECONCILIATION
+    # ================================
+    path('campaigns/<uuid:campaign_id>/reconciliation/', views.qr_campaign_reconciliation, name='campaign_reconciliation'),
+    
+    # ================================
+    # OFFLINE SCANNING (DELTA SYNC)
+    # ================================
+    path('offline/buildings/<int:building_id>/catalogue/', views.qr_offline_catalogue, name='offline_catalogue'),
+    path('offline/buildings/<int:building_id>/changes/', views.qr_offline_changes, name='offline_changes'),
+    path('offline/scans/', views.qr_offline_upload, name='offline_upload'),
+    
     # ================================
     # ANALYTICS AND REPORTING - CONFIRMED EXISTS
     # ================================
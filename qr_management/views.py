@@ -1,44 +1,32 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, HttpResponseNotModified
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
 from django.conf import settings
 from django.urls import reverse
+from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
 from django.db.models import Count, Q, Sum, Avg
-import qrcode
-import qrcode.image.svg
+
+# qrcode and PIL are imported inside the views that draw images, so the
+# scan and verification endpoints do not load them
 from io import BytesIO
 import base64
 import json
-from PIL import Image, ImageDraw, ImageFont
+import uuid
 import zipfile
 import tempfile
 import os
 
-from inventory.models import Device, Location, Staff, Assignment
-from .models import QRCodeScan
-
-def generate_qr_code_data(device):
-    """Generate QR code data structure for device"""
-    current_assignment = device.assignments.filter(is_active=True).first()
-    
-    qr_data = {
-        "deviceId": device.device_id,
-        "assetTag": device.asset_tag,
-        "deviceName": device.device_name,
-        "category": device.device_type.subcategory.category.name if device.device_type else "Unknown",
-        "assignedTo": str(current_assignment.assigned_to_staff) if current_assignment and current_assignment.assigned_to_staff else None,
-        "assignedDepartment": str(current_assignment.assigned_to_department) if current_assignment and current_assignment.assigned_to_department else None,
-        "location": str(current_assignment.assigned_to_location) if current_assignment and current_assignment.assigned_to_location else None,
-        "lastUpdated": timezone.now().isoformat(),
-        "verifyUrl": f"/verify/{device.device_id}/"
-    }
-    
-    return qr_data
+from bps_inventory.pagination import approximate_count, paginate_keyset
+from inventory.models import Building, Device, Location, Staff, Assignment
+from inventory.utils import day_range
+from .models import QRCampaign, QRCampaignDevice, QRCodeScan
+from .payload import InvalidQRPayload, decode, qr_content
+from . import offline_sync, reconciliation
 
 @login_required
 def qr_scan_history(request):
@@ -69,9 +57,9 @@ def qr_scan_history(request):
         if user_filter:
             scans = scans.filter(scanned_by__username__icontains=user_filter)
         if date_from:
-            scans = scans.filter(timestamp__date__gte=date_from)
+            scans = scans.filter(**day_range('timestamp', date_from=date_from))
         if date_to:
-            scans = scans.filter(timestamp__date__lte=date_to)
+            scans = scans.filter(**day_range('timestamp', date_to=date_to))
         if verification_status:
             if verification_status == 'success':
                 scans = scans.filter(verification_success=True)
@@ -87,7 +75,8 @@ def qr_scan_history(request):
         total_scans = scans.count()
         successful_scans = scans.filter(verification_success=True).count()
         failed_scans = scans.filter(verification_success=False).count()
-        today_scans = scans.filter(timestamp__date=timezone.now().date()).count()
+        today = timezone.now().date()
+        today_scans = scans.filter(**day_range('timestamp', today, today)).count()
         
         context = {
             'page_obj': page_obj,
@@ -140,14 +129,14 @@ def qr_index(request):
         category_stats = Device.objects.values(
             'device_type__subcategory__category__name'
         ).annotate(
-            total_count=Count('id'),
-            qr_count=Count('id', filter=~Q(qr_code__isnull=True) & ~Q(qr_code=''))
+            total_count=Count('pk'),
+            qr_count=Count('pk', filter=~Q(qr_code__isnull=True) & ~Q(qr_code=''))
         ).order_by('-total_count')
         
         # Scanning activity (last 7 days)
         seven_days_ago = timezone.now().date() - timezone.timedelta(days=7)
         daily_scans = QRCodeScan.objects.filter(
-            timestamp__date__gte=seven_days_ago
+            **day_range('timestamp', date_from=seven_days_ago)
         ).extra(
             select={'day': "DATE(timestamp)"}
         ).values('day').annotate(
@@ -176,13 +165,14 @@ def qr_index(request):
 @login_required
 def qr_generate(request, device_id):
     """Generate QR code for a specific device"""
+    import qrcode
+    
     try:
         device = get_object_or_404(Device, device_id=device_id)
         
         if request.method == 'POST':
             # Generate QR code
-            qr_data = generate_qr_code_data(device)
-            qr_json = json.dumps(qr_data)
+            qr_text = qr_content(device.device_id)
             
             # Create QR code image
             qr = qrcode.QRCode(
@@ -191,7 +181,7 @@ def qr_generate(request, device_id):
                 box_size=10,
                 border=4,
             )
-            qr.add_data(qr_json)
+            qr.add_data(qr_text)
             qr.make(fit=True)
             
             # Generate image
@@ -230,6 +220,8 @@ def qr_generate(request, device_id):
 @login_required
 def qr_bulk_generate(request):
     """Bulk generate QR codes for multiple devices"""
+    import qrcode
+    
     if request.method == 'POST':
         device_ids = request.POST.getlist('device_ids')
         
@@ -246,8 +238,7 @@ def qr_bulk_generate(request):
                     device = Device.objects.get(device_id=device_id)
                     
                     # Generate QR code data
-                    qr_data = generate_qr_code_data(device)
-                    qr_json = json.dumps(qr_data)
+                    qr_text = qr_content(device.device_id)
                     
                     # Create QR code
                     qr = qrcode.QRCode(
@@ -256,7 +247,7 @@ def qr_bulk_generate(request):
                         box_size=10,
                         border=4,
                     )
-                    qr.add_data(qr_json)
+                    qr.add_data(qr_text)
                     qr.make(fit=True)
                     
                     img = qr.make_image(fill_color="black", back_color="white")
@@ -326,6 +317,8 @@ def qr_bulk_generate(request):
 
 def create_qr_label(device, size='medium', include_text=True):
     """Create a printable QR label for a device"""
+    from PIL import Image, ImageDraw, ImageFont
+    
     try:
         # Size configurations
         sizes = {
@@ -451,9 +444,41 @@ def qr_print_labels(request):
     
     return render(request, 'qr_management/generation/print_labels.html', context)
 
+def _active_campaign(campaign_id):
+    """(campaign or None, error message) for the campaign a scan is made for"""
+    if not campaign_id:
+        return None, None
+    try:
+        campaign = QRCampaign.objects.get(pk=campaign_id)
+    except (QRCampaign.DoesNotExist, ValueError, ValidationError):
+        return None, f'Campaign {campaign_id} not found'
+    if campaign.status != 'ACTIVE':
+        return None, f'Campaign {campaign.name} is not active'
+    return campaign, None
+
+def _scan_client_fields(request, method, payload_version):
+    """QRCodeScan fields describing the client and the QR payload it sent"""
+    return {
+        'ip_address': request.META.get('REMOTE_ADDR') or None,
+        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+        'device_info': {'verification_method': method, 'payload_version': payload_version},
+    }
+
 @login_required
 def qr_verify(request, device_id):
     """Verify QR code for a device (authenticated users)"""
+    # The URL carries either a bare device ID or a compact signed payload
+    try:
+        payload = decode(device_id)
+    except InvalidQRPayload as e:
+        context = {
+            'error': f"Invalid QR code: {str(e)}",
+            'device_id': device_id,
+            'verification_successful': False,
+        }
+        return render(request, 'qr_management/verification/qr_verify.html', context)
+    device_id = payload.device_id
+
     try:
         device = get_object_or_404(Device, device_id=device_id)
         current_assignment = device.assignments.filter(is_active=True).first()
@@ -467,11 +492,8 @@ def qr_verify(request, device_id):
             device_location_at_scan=current_assignment.assigned_to_location if current_assignment else None,
             assigned_staff_at_scan=current_assignment.assigned_to_staff if current_assignment else None,
             scan_location=None,  # Could be set based on user's location
-            additional_data={
-                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                'ip_address': request.META.get('REMOTE_ADDR', ''),
-                'verification_method': 'web_interface'
-            }
+            device_status_at_scan=device.status,
+            **_scan_client_fields(request, 'web_interface', payload.version)
         )
         
         context = {
@@ -492,12 +514,8 @@ def qr_verify(request, device_id):
                 scanned_by=request.user,
                 scan_type='VERIFICATION',
                 verification_success=False,
-                error_message=str(e),
-                additional_data={
-                    'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                    'ip_address': request.META.get('REMOTE_ADDR', ''),
-                    'verification_method': 'web_interface'
-                }
+                discrepancies_found=str(e),
+                **_scan_client_fields(request, 'web_interface', payload.version)
             )
         except:
             pass
@@ -514,17 +532,36 @@ def qr_scan_mobile(request):
     """Mobile-optimized QR scanning interface"""
     try:
         if request.method == 'POST':
-            device_id = request.POST.get('device_id')
-            scan_type = request.POST.get('scan_type', 'VERIFICATION')
-            location_id = request.POST.get('location_id')
-            notes = request.POST.get('notes', '')
+            if request.content_type == 'application/json':
+                data = json.loads(request.body or b'{}')
+            else:
+                data = request.POST
+            # Scanners post the raw QR text; manual entry posts a device ID
+            scan_data = data.get('scan_data') or data.get('device_id')
+            scan_type = data.get('scan_type', 'VERIFICATION')
+            location_id = data.get('location_id')
+            notes = data.get('notes', '')
+            scan_location = None
             
-            if not device_id:
+            if not scan_data:
                 return JsonResponse({
                     'success': False,
                     'error': 'Device ID is required'
                 })
             
+            campaign, error = _active_campaign(data.get('campaign_id'))
+            if error:
+                return JsonResponse({'success': False, 'error': error})
+            
+            try:
+                payload = decode(scan_data)
+            except InvalidQRPayload as e:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Invalid QR code: {str(e)}'
+                })
+            device_id = payload.device_id
+            
             try:
                 device = Device.objects.get(device_id=device_id)
                 current_assignment = device.assignments.filter(is_active=True).first()
@@ -546,12 +583,10 @@ def qr_scan_mobile(request):
                     device_location_at_scan=current_assignment.assigned_to_location if current_assignment else None,
                     assigned_staff_at_scan=current_assignment.assigned_to_staff if current_assignment else None,
                     scan_location=scan_location,
-                    notes=notes,
-                    additional_data={
-                        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                        'ip_address': request.META.get('REMOTE_ADDR', ''),
-                        'verification_method': 'mobile_interface'
-                    }
+                    device_status_at_scan=device.status,
+                    scan_notes=notes,
+                    campaign=campaign,
+                    **_scan_client_fields(request, 'mobile_interface', payload.version)
                 )
                 
                 return JsonResponse({
@@ -568,29 +603,15 @@ def qr_scan_mobile(request):
                 })
                 
             except Device.DoesNotExist:
-                # Create failed scan record
-                QRCodeScan.objects.create(
-                    device_id=device_id,
-                    scanned_by=request.user,
-                    scan_type=scan_type,
-                    verification_success=False,
-                    error_message=f"Device {device_id} not found",
-                    scan_location=scan_location,
-                    notes=notes,
-                    additional_data={
-                        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                        'ip_address': request.META.get('REMOTE_ADDR', ''),
-                        'verification_method': 'mobile_interface'
-                    }
-                )
-                
+                # Scans reference a device, so an unknown ID is not recorded
                 return JsonResponse({
                     'success': False,
                     'error': f'Device {device_id} not found'
                 })
         
-        # GET request - show mobile interface
-        locations = Location.objects.all().order_by('name')
+        # GET request - show mobile interface. Locations come with the
+        # building catalogue the scanner downloads (see offline_sync)
+        buildings = Building.objects.filter(is_active=True).values('id', 'name', 'code')
         scan_types = [
             ('VERIFICATION', 'Verification'),
             ('INVENTORY', 'Inventory Check'),
@@ -600,7 +621,7 @@ def qr_scan_mobile(request):
         ]
         
         context = {
-            'locations': locations,
+            'buildings': buildings,
             'scan_types': scan_types,
         }
         
@@ -631,7 +652,7 @@ def qr_scan_history(request):
         # Base queryset
         scans = QRCodeScan.objects.select_related(
             'device', 'scanned_by', 'scan_location', 'assigned_staff_at_scan'
-        ).order_by('-timestamp')
+        )
         
         # Apply filters
         if device_filter:
@@ -644,10 +665,10 @@ def qr_scan_history(request):
             scans = scans.filter(scanned_by__username__icontains=user_filter)
         
         if date_from:
-            scans = scans.filter(timestamp__date__gte=date_from)
+            scans = scans.filter(**day_range('timestamp', date_from=date_from))
         
         if date_to:
-            scans = scans.filter(timestamp__date__lte=date_to)
+            scans = scans.filter(**day_range('timestamp', date_to=date_to))
         
         if verification_status == 'success':
             scans = scans.filter(verification_success=True, discrepancies_found='')
@@ -656,26 +677,27 @@ def qr_scan_history(request):
         elif verification_status == 'failed':
             scans = scans.filter(verification_success=False)
         
-        # Pagination
-        paginator = Paginator(scans, 50)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        # Keyset pagination: deep pages of the scan log cost the same as the first
+        page_obj = paginate_keyset(request, scans, ('-timestamp', '-id'), per_page=50)
         
-        # Statistics
-        total_scans = QRCodeScan.objects.count()
-        successful_scans = QRCodeScan.objects.filter(verification_success=True).count()
+        # Statistics: today's figures come from the timestamp index, the
+        # all-time total from table statistics
+        today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        today = QRCodeScan.objects.filter(timestamp__gte=today_start).aggregate(
+            today_scans=Count('id'),
+            unique_scanners=Count('scanned_by', distinct=True),
+        )
+        total_scans = approximate_count(QRCodeScan.objects.all())
         failed_scans = QRCodeScan.objects.filter(verification_success=False).count()
-        today_scans = QRCodeScan.objects.filter(timestamp__date=timezone.now().date()).count()
+        successful_scans = max(total_scans - failed_scans, 0)
         
         context = {
             'page_obj': page_obj,
-            'scan_types': [
-                ('VERIFICATION', 'Verification'),
-                ('INVENTORY', 'Inventory Check'),
-                ('ASSIGNMENT', 'Assignment'),
-                ('MAINTENANCE', 'Maintenance'),
-                ('AUDIT', 'Audit'),
-            ],
+            'total_scans': total_scans,
+            'verified_scans': successful_scans,
+            'today_scans': today['today_scans'],
+            'unique_scanners': today['unique_scanners'],
+            'scan_types': QRCodeScan.SCAN_TYPES,
             'filters': {
                 'device': device_filter,
                 'scan_type': scan_type_filter,
@@ -688,7 +710,7 @@ def qr_scan_history(request):
                 'total_scans': total_scans,
                 'successful_scans': successful_scans,
                 'failed_scans': failed_scans,
-                'today_scans': today_scans,
+                'today_scans': today['today_scans'],
                 'success_rate': (successful_scans / total_scans * 100) if total_scans > 0 else 0,
             }
         }
@@ -725,16 +747,34 @@ def qr_scan_detail(request, scan_id):
 def qr_batch_verify(request):
     """Batch verification of multiple devices"""
     if request.method == 'POST':
-        device_ids = request.POST.getlist('device_ids')
+        # Ticked devices post one ID each, the identifier box one per line
+        codes = [
+            line.strip()
+            for value in request.POST.getlist('device_ids')
+            for line in value.splitlines() if line.strip()
+        ]
         location_id = request.POST.get('location_id')
+        device_ids = []
+        invalid_count = 0
+        for code in codes:
+            try:
+                device_ids.append(decode(code).device_id)
+            except InvalidQRPayload:
+                invalid_count += 1
         
         if not device_ids:
-            messages.error(request, 'No devices selected for verification.')
+            if invalid_count:
+                messages.error(request, f'None of the {invalid_count} codes is a valid QR code.')
+            else:
+                messages.error(request, 'No devices selected for verification.')
+            return redirect('qr_management:qr_batch_verify')
+        
+        campaign, error = _active_campaign(request.POST.get('campaign_id'))
+        if error:
+            messages.error(request, error)
             return redirect('qr_management:qr_batch_verify')
         
         try:
-            verified_count = 0
-            failed_count = 0
             scan_location = None
             
             if location_id:
@@ -743,55 +783,51 @@ def qr_batch_verify(request):
                 except Location.DoesNotExist:
                     pass
             
-            for device_id in device_ids:
-                try:
-                    device = Device.objects.get(device_id=device_id)
-                    current_assignment = device.assignments.filter(is_active=True).first()
-                    
-                    # Create scan record
-                    QRCodeScan.objects.create(
-                        device=device,
-                        scanned_by=request.user,
-                        scan_type='BATCH_VERIFICATION',
-                        verification_success=True,
-                        device_location_at_scan=current_assignment.assigned_to_location if current_assignment else None,
-                        assigned_staff_at_scan=current_assignment.assigned_to_staff if current_assignment else None,
-                        scan_location=scan_location,
-                        additional_data={
-                            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                            'ip_address': request.META.get('REMOTE_ADDR', ''),
-                            'verification_method': 'batch_verification'
-                        }
-                    )
-                    
-                    verified_count += 1
-                    
-                except Device.DoesNotExist:
-                    # Create failed scan record
-                    QRCodeScan.objects.create(
-                        device_id=device_id,
-                        scanned_by=request.user,
-                        scan_type='BATCH_VERIFICATION',
-                        verification_success=False,
-                        error_message=f"Device {device_id} not found",
-                        scan_location=scan_location,
-                        additional_data={
-                            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                            'ip_address': request.META.get('REMOTE_ADDR', ''),
-                            'verification_method': 'batch_verification'
-                        }
-                    )
-                    failed_count += 1
+            devices = Device.objects.in_bulk(device_ids)
+            assignments = {
+                assignment.device_id: assignment
+                for assignment in Assignment.objects.filter(device__in=devices, is_active=True)
+            }
+            batch_scan_id = uuid.uuid4()
+            scans = []
+            for sequence, device in enumerate(devices.values(), start=1):
+                current_assignment = assignments.get(device.device_id)
+                scans.append(QRCodeScan(
+                    device=device,
+                    scanned_by=request.user,
+                    scan_type='BATCH_VERIFICATION',
+                    verification_success=True,
+                    device_location_at_scan_id=current_assignment.assigned_to_location_id if current_assignment else None,
+                    assigned_staff_at_scan_id=current_assignment.assigned_to_staff_id if current_assignment else None,
+                    scan_location=scan_location,
+                    device_status_at_scan=device.status,
+                    batch_scan_id=batch_scan_id,
+                    batch_sequence=sequence,
+                    campaign=campaign,
+                    **_scan_client_fields(request, 'batch_verification', None)
+                ))
+            
+            # Unknown device IDs cannot be recorded (scans reference a device)
+            scans = QRCodeScan.objects.bulk_create(scans)
+            reconciliation.apply_scans(scans)
+            verified_count = len(scans)
+            failed_count = len(set(device_ids)) - verified_count + invalid_count
             
             messages.success(request, f'Verified {verified_count} devices. {failed_count} failed.')
             
         except Exception as e:
             messages.error(request, f'Error in batch verification: {str(e)}')
+            return redirect('qr_management:qr_batch_verify')
+        
+        # Redirect so a refresh does not post the batch again
+        if campaign:
+            return redirect('qr_management:campaign_reconciliation', campaign_id=campaign.pk)
+        return redirect('qr_management:qr_batch_verify')
     
     # GET request - show device selection
     search = request.GET.get('search', '')
     devices = Device.objects.select_related('device_type__subcategory__category')
-    locations = Location.objects.all().order_by('name')
+    locations = Location.objects.select_related('building', 'block', 'floor', 'department', 'room')
     
     if search:
         devices = devices.filter(
@@ -803,11 +839,101 @@ def qr_batch_verify(request):
     context = {
         'devices': devices[:100],  # Limit for display
         'locations': locations,
+        'campaigns': QRCampaign.objects.filter(status='ACTIVE').order_by('name'),
         'search': search,
     }
     
     return render(request, 'qr_management/verification/batch_verify.html', context)
 
+@login_required
+@require_http_methods(["GET", "POST"])
+def qr_campaign_reconciliation(request, campaign_id):
+    """
+    Stock-take reconciliation of a campaign as JSON: status totals and
+    per-building and per-location counts. ?status= and/or ?location= add a
+    page of devices (continue with ?after=<next_after>). POST rebuilds the
+    expected set (staff only).
+    """
+    campaign = get_object_or_404(QRCampaign, pk=campaign_id)
+    
+    if request.method == 'POST':
+        if not request.user.is_staff:
+            return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+        try:
+            reconciliation.rebuild(campaign)
+        except Exception as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    elif campaign.reconciled_at is None:
+        # Nothing scanned yet: build the expected set so the summary lists it
+        reconciliation.rebuild(campaign)
+    
+    data = reconciliation.summary(campaign)
+    status = request.GET.get('status', '').upper()
+    location_id = request.GET.get('location')
+    if status or location_id:
+        if status and status not in dict(QRCampaignDevice.STATUS_CHOICES):
+            return JsonResponse({'success': False, 'error': f'Unknown status {status}'}, status=400)
+        try:
+            limit = int(request.GET.get('limit', 0)) or None
+            location_id = int(location_id) if location_id else None
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'location and limit must be numbers'}, status=400)
+        data.update(reconciliation.device_page(
+            campaign, status=status or None, location_id=location_id,
+            after=request.GET.get('after'), limit=limit,
+        ))
+    
+    return JsonResponse({'success': True, **data})
+
+@login_required
+@require_http_methods(["GET"])
+def qr_offline_catalogue(request, building_id):
+    """Device catalogue of a building for offline scanning, gzip-compressed when accepted"""
+    get_object_or_404(Building, pk=building_id)
+    data = offline_sync.catalogue(building_id)
+    body, etag = offline_sync.compress(data)
+    
+    if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        response = HttpResponseNotModified()
+    elif 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+        response = HttpResponse(body, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = JsonResponse(data)
+    response['ETag'] = etag
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+@login_required
+@require_http_methods(["GET"])
+def qr_offline_changes(request, building_id):
+    """Catalogue changes of a building since ?since=<watermark of the last sync>"""
+    get_object_or_404(Building, pk=building_id)
+    try:
+        since = offline_sync.parse_watermark(request.GET.get('since'))
+    except offline_sync.InvalidWatermark as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse(offline_sync.changes(building_id, since))
+
+@login_required
+@require_http_methods(["POST"])
+def qr_offline_upload(request):
+    """Bulk upload of scans made offline (see offline_sync.record_scans)"""
+    try:
+        data = json.loads(request.body or b'{}')
+        if not isinstance(data, dict):
+            raise ValueError('Expected a JSON object')
+        result = offline_sync.record_scans(
+            request.user, data, _scan_client_fields(request, 'offline_sync', None),
+        )
+    except (ValueError, ValidationError) as e:
+        message = '; '.join(e.messages) if isinstance(e, ValidationError) else str(e)
+        return JsonResponse({'success': False, 'error': message}, status=400)
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    return JsonResponse({'success': True, **result})
+
 @login_required
 def qr_analytics(request):
     """QR code scanning analytics dashboard"""
@@ -818,7 +944,7 @@ def qr_analytics(request):
         
         # Basic statistics
         total_scans = QRCodeScan.objects.count()
-        period_scans = QRCodeScan.objects.filter(timestamp__date__gte=start_date)
+        period_scans = QRCodeScan.objects.filter(**day_range('timestamp', date_from=start_date))
         
         # Scan types distribution
         scan_types_data = period_scans.values('scan_type').annotate(
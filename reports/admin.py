@@ -25,6 +25,7 @@ class DashboardAdmin(admin.ModelAdmin):
         'dashboard_type', 'is_active', 'created_at'
     )
     search_fields = ('name', 'description', 'owner__username')
+    list_select_related = ('owner',)
     readonly_fields = ('created_at', 'updated_at')
     filter_horizontal = ('shared_with_users',)
     
@@ -63,6 +64,7 @@ class DashboardWidgetAdmin(admin.ModelAdmin):
         'widget_type', 'is_active', 'created_at'
     )
     search_fields = ('name', 'description')
+    list_select_related = ('created_by',)
     readonly_fields = ('id', 'created_at', 'updated_at')
     
     fieldsets = (
@@ -96,6 +98,7 @@ class CustomQueryAdmin(admin.ModelAdmin):
         'query_type', 'is_active', 'created_at'
     )
     search_fields = ('name', 'description')
+    list_select_related = ('created_by',)
     readonly_fields = ('created_at', 'updated_at', 'last_executed')
     
     fieldsets = (
@@ -129,6 +132,7 @@ class ReportTemplateAdmin(admin.ModelAdmin):
         'report_type', 'is_active', 'created_at'
     )
     search_fields = ('name', 'description')
+    list_select_related = ('created_by',)
     readonly_fields = ('created_at', 'updated_at')
     
     fieldsets = (
@@ -163,6 +167,7 @@ class ReportScheduleAdmin(admin.ModelAdmin):
         'frequency', 'is_active', 'next_run', 'last_run'
     )
     search_fields = ('name', 'template__name')
+    list_select_related = ('template',)
     readonly_fields = ('created_at', 'updated_at', 'last_run', 'next_run')
     
     fieldsets = (
@@ -207,6 +212,7 @@ class ReportGenerationAdmin(admin.ModelAdmin):
     search_fields = (
         'report_name', 'generated_by__username', 'file_path'
     )
+    list_select_related = ('template', 'generated_by')
     readonly_fields = ('created_at', 'completed_at', 'generation_time_seconds', 'file_size')
     date_hierarchy = 'created_at'
     
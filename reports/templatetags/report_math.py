@@ -0,0 +1,29 @@
+from django import template
+
+register = template.Library()
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@register.filter
+def mul(value, arg):
+    """value * arg"""
+    return _number(value) * _number(arg)
+
+
+@register.filter
+def div(value, arg):
+    """value / arg, 0 when arg is 0"""
+    divisor = _number(arg)
+    return _number(value) / divisor if divisor else 0.0
+
+
+@register.filter
+def sub(value, arg):
+    """value - arg"""
+    return _number(value) - _number(arg)
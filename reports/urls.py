@@ -3,7 +3,10 @@
 # COMPLETE: All views verified to exist in reports/views.py
 
 from django.urls import path
-from . import views
+from bps_inventory.lazy_views import LazyViewModule
+
+# View modules are imported on first request (see bps_inventory.lazy_views)
+views = LazyViewModule('reports.views')
 
 app_name = 'reports'
 
@@ -22,6 +25,7 @@ urlpatterns = [
     path('audit/', views.audit_report, name='audit_report'),
     path('warranty/', views.warranty_report, name='warranty_report'),
     path('department-utilization/', views.department_utilization_report, name='department_utilization'),
+    path('valuation/', views.asset_valuation_report, name='asset_valuation'),
     
     # ================================
     # CUSTOM REPORT GENERATION - CONFIRMED EXISTS
@@ -17,7 +17,9 @@ from inventory.models import (
     DeviceCategory, Vendor, MaintenanceSchedule, AuditLog
 )
 from django.contrib.auth.models import User
+from inventory.utils import day_range
 from qr_management.models import QRCodeScan
+from bps_inventory.instrumentation import query_budget
 from .models import ReportTemplate, ReportGeneration
 
 
@@ -65,6 +67,8 @@ def reports_dashboard(request):
 @login_required
 def inventory_report(request):
     """Generate comprehensive inventory report"""
+    from inventory.depreciation import valuation
+    
     try:
         # Get filter parameters
         category = request.GET.get('category')
@@ -109,6 +113,8 @@ def inventory_report(request):
             'devices': devices[:100],  # Limit for display
             'total_devices': total_devices,
             'total_value': total_value,
+            # Latest posted month-end valuation (depreciation ledger)
+            'valuation': next(iter(valuation()), None),
             'category_stats': category_stats,
             'status_stats': status_stats,
             'categories': DeviceCategory.objects.filter(is_active=True),
@@ -318,9 +324,9 @@ def audit_report(request):
         if user:
             audit_logs = audit_logs.filter(user_id=user)
         if date_from:
-            audit_logs = audit_logs.filter(timestamp__date__gte=date_from)
+            audit_logs = audit_logs.filter(**day_range('timestamp', date_from=date_from))
         if date_to:
-            audit_logs = audit_logs.filter(timestamp__date__lte=date_to)
+            audit_logs = audit_logs.filter(**day_range('timestamp', date_to=date_to))
         if model_name:
             audit_logs = audit_logs.filter(model_name=model_name)
         
@@ -342,7 +348,7 @@ def audit_report(request):
         # Daily activity trends (last 30 days)
         thirty_days_ago = timezone.now().date() - timedelta(days=30)
         daily_stats = audit_logs.filter(
-            timestamp__date__gte=thirty_days_ago
+            **day_range('timestamp', date_from=thirty_days_ago)
         ).extra(
             select={'day': "DATE(timestamp)"}
         ).values('day').annotate(
@@ -385,8 +391,11 @@ def audit_report(request):
         return redirect('reports:dashboard')
 
 @login_required
+@query_budget(max_queries=20, max_duplicates=4)
 def warranty_report(request):
     """Generate warranty analysis report"""
+    from inventory.lifecycle import portfolio_analytics
+    
     try:
         # Get filter parameters
         status = request.GET.get('status')  # active, expired, expiring
@@ -400,53 +409,40 @@ def warranty_report(request):
         
         # Apply filters
         today = timezone.now().date()
+        filters = {'warranty_end_date__isnull': False}
         if status == 'active':
-            devices = devices.filter(warranty_end_date__gt=today)
+            filters['warranty_end_date__gt'] = today
         elif status == 'expired':
-            devices = devices.filter(warranty_end_date__lt=today)
+            filters['warranty_end_date__lt'] = today
         elif status == 'expiring':
-            thirty_days = today + timedelta(days=30)
-            devices = devices.filter(
-                warranty_end_date__gte=today,
-                warranty_end_date__lte=thirty_days
-            )
+            filters['warranty_end_date__gte'] = today
+            filters['warranty_end_date__lte'] = today + timedelta(days=30)
         
         if vendor:
-            devices = devices.filter(vendor_id=vendor)
+            filters['vendor_id'] = vendor
         if category:
-            devices = devices.filter(device_type__subcategory__category_id=category)
-        
-        # Statistics
-        total_devices = devices.count()
-        active_warranties = devices.filter(warranty_end_date__gt=today).count()
-        expired_warranties = devices.filter(warranty_end_date__lt=today).count()
-        expiring_soon = devices.filter(
+            filters['device_type__subcategory__category_id'] = category
+        devices = devices.filter(**filters)
+        
+        # Statistics, vendor breakdown and the 12-month expiration timeline
+        # come from the vectorized lifecycle engine (cached for the day)
+        analytics = portfolio_analytics(filters, refresh=request.GET.get('refresh') == '1')
+        warranty = analytics['warranty']
+        total_devices = analytics['device_count']
+        expiring_soon = warranty['counts']['expiring_30']
+        expired_warranties = warranty['counts']['expired']
+        active_warranties = total_devices - expired_warranties - warranty['counts']['no_warranty']
+        vendor_stats = warranty['by_vendor']
+        expiration_timeline = warranty['timeline']
+        
+        expiring_soon_devices = devices.filter(
             warranty_end_date__gte=today,
             warranty_end_date__lte=today + timedelta(days=30)
-        ).count()
-        
-        # Vendor breakdown
-        vendor_stats = devices.values(
-            'vendor__name'
-        ).annotate(
-            count=Count('id'),
-            active_count=Count('id', filter=Q(warranty_end_date__gt=today)),
-            expired_count=Count('id', filter=Q(warranty_end_date__lt=today))
-        ).order_by('-count')
-        
-        # Warranty expiration timeline (next 12 months)
-        expiration_timeline = []
-        for i in range(12):
-            month_start = today + timedelta(days=i*30)
-            month_end = month_start + timedelta(days=30)
-            month_count = devices.filter(
-                warranty_end_date__gte=month_start,
-                warranty_end_date__lt=month_end
-            ).count()
-            expiration_timeline.append({
-                'month': month_start.strftime('%Y-%m'),
-                'count': month_count
-            })
+        ).order_by('warranty_end_date')[:20]
+        recently_expired_devices = devices.filter(
+            warranty_end_date__gte=today - timedelta(days=30),
+            warranty_end_date__lt=today
+        ).order_by('-warranty_end_date')[:20]
         
         context = {
             'devices': devices[:50],  # Limit for display
@@ -456,6 +452,10 @@ def warranty_report(request):
             'expiring_soon': expiring_soon,
             'vendor_stats': vendor_stats,
             'expiration_timeline': expiration_timeline,
+            'expiring_soon_devices': expiring_soon_devices,
+            'recently_expired_devices': recently_expired_devices,
+            'depreciation': analytics['depreciation'],
+            'today': today,
             'vendors': Vendor.objects.filter(is_active=True),
             'categories': DeviceCategory.objects.filter(is_active=True),
             'filters': {
@@ -474,6 +474,8 @@ def warranty_report(request):
 @login_required
 def department_utilization_report(request):
     """Generate department utilization analysis report"""
+    from inventory.depreciation import valuation
+    
     try:
         # Get filter parameters
         department = request.GET.get('department')
@@ -486,6 +488,9 @@ def department_utilization_report(request):
         if department:
             departments = departments.filter(id=department)
         
+        # Book value and TCO per department from the latest posted period
+        dept_valuation = {row['group_id']: row for row in valuation(dimension='DEPARTMENT')}
+        
         # Calculate utilization stats for each department
         dept_stats = []
         for dept in departments:
@@ -516,7 +521,7 @@ def department_utilization_report(request):
             # Device type breakdown
             device_types = assigned_devices.values(
                 'device_type__subcategory__category__name'
-            ).annotate(count=Count('id')).order_by('-count')
+            ).annotate(count=Count('device_id')).order_by('-count')
             
             dept_stats.append({
                 'department': dept,
@@ -526,6 +531,7 @@ def department_utilization_report(request):
                 'total_value': total_value,
                 'avg_value_per_staff': total_value / staff_count if staff_count > 0 else 0,
                 'device_types': device_types,
+                'valuation': dept_valuation.get(dept.id),
                 'utilization_rate': (active_assignments / staff_count * 100) if staff_count > 0 else 0
             })
         
@@ -551,12 +557,38 @@ def department_utilization_report(request):
             }
         }
         
-        return render(request, 'reports/standard/department_utilization_report.html', context)
+        return render(request, 'reports/standard/department_utilization.html', context)
         
     except Exception as e:
         messages.error(request, f"Error generating department utilization report: {str(e)}")
         return redirect('reports:dashboard')
 
+@login_required
+@require_http_methods(["GET"])
+def asset_valuation_report(request):
+    """Month-end book values and TCO from the depreciation ledger, as JSON or CSV"""
+    from inventory.depreciation import DIMENSIONS as VALUATION_DIMENSIONS, valuation
+    
+    dimension = request.GET.get('dimension', 'ALL').upper()
+    if dimension != 'ALL' and dimension not in VALUATION_DIMENSIONS:
+        return JsonResponse({'error': f"Unknown dimension '{dimension}'"}, status=400)
+    
+    period = request.GET.get('period')  # YYYY-MM, default: latest posted
+    try:
+        period = datetime.strptime(period, '%Y-%m').date() if period else None
+    except ValueError:
+        return JsonResponse({'error': 'period must be YYYY-MM'}, status=400)
+    
+    rows = valuation(period, dimension)
+    if request.GET.get('format') == 'csv':
+        return export_valuation_csv(rows, dimension)
+    
+    return JsonResponse({
+        'period': rows[0]['period'] if rows else None,
+        'dimension': dimension,
+        'results': rows,
+    })
+
 @login_required
 def generate_custom_report(request):
     """Generate custom report based on user parameters"""
@@ -664,4 +696,34 @@ def export_inventory_csv(devices):
             device.created_at.strftime('%Y-%m-%d %H:%M:%S')
         ])
     
-    return response
\ No newline at end of file
+    return response
+
+def export_valuation_csv(rows, dimension):
+    """Export depreciation ledger valuations to CSV"""
+    period = rows[0]['period'].strftime('%Y-%m') if rows else 'none'
+    response = HttpResponse(content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="asset_valuation_{dimension.lower()}_{period}.csv"'
+    
+    writer = csv.writer(response)
+    writer.writerow([
+        'Period', 'Group', 'Method', 'Devices', 'Purchase Value', 'Depreciation (Month)',
+        'Accumulated Depreciation', 'Book Value', 'Maintenance (Month)',
+        'Maintenance To Date', 'Total Cost of Ownership'
+    ])
+    
+    for row in rows:
+        writer.writerow([
+            row['period'].strftime('%Y-%m-%d'),
+            row['name'],
+            row['method'],
+            row['devices'],
+            row['purchase_value'],
+            row['depreciation'],
+            row['accumulated_depreciation'],
+            row['book_value'],
+            row['maintenance_cost'],
+            row['cumulative_maintenance'],
+            row['total_cost_of_ownership'],
+        ])
+    
+    return response
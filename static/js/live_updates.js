@@ -0,0 +1,97 @@
+/* static/js/live_updates.js - BPS Live Updates (Server-Sent Events) */
+
+// Subscribes to the server event stream once per page and re-broadcasts each
+// event as a DOM event ("bps:stats", "bps:notifications", "bps:session").
+// Pages that used to poll check BPSLive.isConnected() and only fall back to
+// their polling timers when the stream is unavailable (e.g. WSGI deployments).
+
+window.BPSLive = {
+    config: {
+        streamUrl: '/events/stream/'
+    },
+
+    source: null,
+    connected: false,
+    failed: false,
+    session: null,
+
+    init: function() {
+        if (!window.EventSource) {
+            this.fail();
+            return;
+        }
+
+        const source = new EventSource(this.config.streamUrl);
+        this.source = source;
+
+        source.onopen = function() {
+            BPSLive.connected = true;
+        };
+
+        source.onerror = function() {
+            BPSLive.connected = false;
+            // CLOSED means the server refused the stream (401/404); OPEN/CONNECTING retries on its own
+            if (source.readyState === EventSource.CLOSED) {
+                BPSLive.fail();
+            }
+        };
+
+        ['stats', 'notifications', 'session'].forEach(function(eventName) {
+            source.addEventListener(eventName, function(event) {
+                BPSLive.dispatch(eventName, JSON.parse(event.data));
+            });
+        });
+
+        document.addEventListener('bps:stats', function(event) {
+            BPSLive.applyStats(event.detail);
+        });
+        document.addEventListener('bps:notifications', function(event) {
+            BPSLive.applyNotifications(event.detail);
+        });
+        document.addEventListener('bps:session', function(event) {
+            BPSLive.session = event.detail;
+        });
+    },
+
+    isConnected: function() {
+        return this.connected;
+    },
+
+    fail: function() {
+        this.failed = true;
+        document.dispatchEvent(new CustomEvent('bps:live-unavailable'));
+    },
+
+    dispatch: function(eventName, data) {
+        document.dispatchEvent(new CustomEvent('bps:' + eventName, { detail: data }));
+    },
+
+    // Stat events carry only the counters that changed
+    applyStats: function(stats) {
+        Object.keys(stats).forEach(function(key) {
+            document.querySelectorAll('[data-live-stat="' + key + '"]').forEach(function(element) {
+                element.textContent = stats[key];
+            });
+        });
+    },
+
+    applyNotifications: function(data) {
+        document.querySelectorAll('[data-live-notifications]').forEach(function(element) {
+            element.textContent = data.unread;
+            element.classList.toggle('d-none', data.unread === 0);
+        });
+    },
+
+    // Run a polling callback only while the live stream is not delivering updates
+    pollWhenOffline: function(callback, interval) {
+        return setInterval(function() {
+            if (!BPSLive.isConnected()) {
+                callback();
+            }
+        }, interval);
+    }
+};
+
+document.addEventListener('DOMContentLoaded', function() {
+    BPSLive.init();
+});
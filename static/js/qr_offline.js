@@ -0,0 +1,265 @@
+/* static/js/qr_offline.js - BPS Offline Scanning */
+
+// Keeps a building's device catalogue in localStorage so the mobile scanner
+// can look devices up without a connection, and queues the scans made
+// meanwhile for one bulk upload (see qr_management/offline_sync.py).
+// The first sync downloads the full catalogue; later syncs only fetch the
+// changes since the stored watermark. Catalogue entries are
+// [device id, name, status, location id].
+
+window.BPSOffline = {
+    config: {
+        uploadUrl: null,
+        csrfToken: null,
+        maxUploadScans: 500,
+        storagePrefix: 'bps_offline_'
+    },
+
+    building: null,
+    catalogue: null,
+
+    init: function(options) {
+        Object.assign(this.config, options || {});
+        const building = this.load('building');
+        if (building) {
+            this.selectBuilding(building.id, building.catalogueUrl, building.changesUrl);
+        }
+        window.addEventListener('online', function() {
+            BPSOffline.flush();
+            if (BPSOffline.building) {
+                BPSOffline.sync();
+            }
+        });
+        this.notify();
+    },
+
+    // Storage
+
+    load: function(key) {
+        try {
+            return JSON.parse(localStorage.getItem(this.config.storagePrefix + key));
+        } catch (error) {
+            return null;
+        }
+    },
+
+    save: function(key, value) {
+        try {
+            localStorage.setItem(this.config.storagePrefix + key, JSON.stringify(value));
+            return true;
+        } catch (error) {
+            console.error('Offline storage full:', error);
+            return false;
+        }
+    },
+
+    notify: function() {
+        document.dispatchEvent(new CustomEvent('bps:offline', {detail: this.status()}));
+    },
+
+    status: function() {
+        const catalogue = this.catalogue;
+        return {
+            building: this.building ? this.building.id : null,
+            devices: catalogue ? Object.keys(catalogue.devices).length : 0,
+            syncedAt: catalogue ? catalogue.syncedAt : null,
+            queued: this.queue().length
+        };
+    },
+
+    // Catalogue
+
+    selectBuilding: function(id, catalogueUrl, changesUrl) {
+        this.building = {id: String(id), catalogueUrl: catalogueUrl, changesUrl: changesUrl};
+        this.save('building', this.building);
+        this.catalogue = this.load('catalogue_' + this.building.id);
+        this.notify();
+    },
+
+    sync: function() {
+        const building = this.building;
+        if (!building) {
+            return Promise.reject(new Error('No building selected'));
+        }
+        const catalogue = this.catalogue;
+        if (!catalogue) {
+            return this.download();
+        }
+        const url = building.changesUrl + '?since=' + encodeURIComponent(catalogue.watermark);
+        return fetch(url, {credentials: 'same-origin'})
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error('Sync failed (' + response.status + ')');
+                }
+                return response.json();
+            })
+            .then(function(data) {
+                if (data.full_resync) {
+                    return BPSOffline.download();
+                }
+                data.upserts.forEach(function(entry) {
+                    catalogue.devices[entry[0]] = entry.slice(1);
+                });
+                data.removed.forEach(function(deviceId) {
+                    delete catalogue.devices[deviceId];
+                });
+                Object.assign(catalogue.locations, data.locations);
+                catalogue.watermark = data.watermark;
+                return BPSOffline.store(catalogue);
+            });
+    },
+
+    download: function() {
+        const building = this.building;
+        const headers = {};
+        if (this.catalogue && this.catalogue.etag) {
+            headers['If-None-Match'] = this.catalogue.etag;
+        }
+        // The browser sends Accept-Encoding and inflates the gzip body itself
+        return fetch(building.catalogueUrl, {credentials: 'same-origin', headers: headers})
+            .then(function(response) {
+                if (response.status === 304) {
+                    return BPSOffline.store(BPSOffline.catalogue);
+                }
+                if (!response.ok) {
+                    throw new Error('Catalogue download failed (' + response.status + ')');
+                }
+                const etag = response.headers.get('ETag');
+                return response.json().then(function(data) {
+                    const devices = {};
+                    data.devices.forEach(function(entry) {
+                        devices[entry[0]] = entry.slice(1);
+                    });
+                    return BPSOffline.store({
+                        watermark: data.watermark,
+                        etag: etag,
+                        locations: data.locations,
+                        devices: devices
+                    });
+                });
+            });
+    },
+
+    store: function(catalogue) {
+        catalogue.syncedAt = new Date().toISOString();
+        this.catalogue = catalogue;
+        this.save('catalogue_' + this.building.id, catalogue);
+        this.notify();
+        return this.status();
+    },
+
+    // Device ID of a scanned code, read the way qr_management.payload does;
+    // the signature is checked by the server when the scan is uploaded
+    deviceId: function(scanData) {
+        const text = String(scanData || '').trim();
+        const compact = text.match(/^BPS\d+:([^:\s]+):[A-Z2-7]+$/);
+        if (compact) {
+            return compact[1];
+        }
+        const url = text.match(/\/verify\/([^/?#]+)\/?(?:[?#].*)?$/i);
+        if (url) {
+            return this.deviceId(decodeURIComponent(url[1]));
+        }
+        if (text.charAt(0) === '{') {
+            try {
+                const data = JSON.parse(text);
+                return data.deviceId || data.device_id || null;
+            } catch (error) {
+                return null;
+            }
+        }
+        return text || null;
+    },
+
+    lookup: function(scanData) {
+        const deviceId = this.deviceId(scanData);
+        const entry = deviceId && this.catalogue ? this.catalogue.devices[deviceId] : null;
+        if (!entry) {
+            return {device_id: deviceId, found: false};
+        }
+        return {
+            device_id: deviceId,
+            found: true,
+            device_name: entry[0],
+            status: entry[1],
+            location_id: entry[2],
+            location: entry[2] ? this.catalogue.locations[entry[2]] : null
+        };
+    },
+
+    // Scan queue
+
+    queue: function() {
+        return this.load('queue') || [];
+    },
+
+    newId: function() {
+        if (window.crypto && crypto.randomUUID) {
+            return crypto.randomUUID();
+        }
+        return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function(c) {
+            const r = Math.random() * 16 | 0;
+            return (c === 'x' ? r : (r & 0x3 | 0x8)).toString(16);
+        });
+    },
+
+    queueScan: function(scanData, locationId) {
+        const queue = this.queue();
+        queue.push({
+            // Generated here so a retried upload is recognised as a duplicate
+            id: this.newId(),
+            scan_data: scanData,
+            location_id: locationId || null,
+            scanned_at: new Date().toISOString()
+        });
+        this.save('queue', queue);
+        this.notify();
+        return queue.length;
+    },
+
+    flush: function() {
+        const queue = this.queue();
+        if (!queue.length || !navigator.onLine || !this.config.uploadUrl) {
+            return Promise.resolve(null);
+        }
+        const batch = queue.slice(0, this.config.maxUploadScans);
+        return fetch(this.config.uploadUrl, {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': this.config.csrfToken
+            },
+            body: JSON.stringify({scans: batch})
+        })
+            .then(function(response) {
+                return response.json().then(function(data) {
+                    if (!response.ok || !data.success) {
+                        throw new Error(data.error || 'Upload failed (' + response.status + ')');
+                    }
+                    return data;
+                });
+            })
+            .then(function(data) {
+                // Rejected scans would be rejected again; they are reported, not retried
+                const done = new Set(data.accepted.concat(data.duplicates));
+                data.rejected.forEach(function(item) {
+                    done.add(item.id);
+                });
+                BPSOffline.save('queue', BPSOffline.queue().filter(function(scan) {
+                    return !done.has(scan.id);
+                }));
+                BPSOffline.notify();
+                if (BPSOffline.queue().length && batch.length === BPSOffline.config.maxUploadScans) {
+                    return BPSOffline.flush().then(function(more) {
+                        return more ? {
+                            accepted: data.accepted.concat(more.accepted),
+                            duplicates: data.duplicates.concat(more.duplicates),
+                            rejected: data.rejected.concat(more.rejected)
+                        } : data;
+                    });
+                }
+                return data;
+            });
+    }
+};